@@ -0,0 +1,59 @@
+"""
+Microbenchmark: AgentState transitions (clone_with, diff, cache updates).
+
+Builds a state shaped like mid-run exploration (--elements ranked elements,
+--actions enumerated actions, --cache warmed cache entries) and times a
+one-field clone_with, diff() of the result, and adding one cache entry as a
+persistent map update versus copying a dict.
+
+USAGE:
+------
+cd packages/agent
+python -m benchmarks.bench_agent_state [--cache 500] [--rounds 50000]
+"""
+
+import argparse
+import time
+from dataclasses import replace
+
+from src.agent.domain import AgentState, diff
+from src.agent.domain.state import Advice, CacheEntry, EnumeratedAction
+from src.agent.domain.ui_element import Bounds, UIElement
+
+
+def timed(label: str, rounds: int, operation) -> None:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        operation()
+    print(f"{label:34s} {(time.perf_counter() - started) / rounds * 1e6:8.2f} µs")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--elements", type=int, default=40)
+    parser.add_argument("--actions", type=int, default=40)
+    parser.add_argument("--cache", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=50_000)
+    args = parser.parse_args()
+
+    cache = {f"sig-{n}": CacheEntry(advice=Advice(plan=[f"tap {n}"])) for n in range(args.cache)}
+    state = AgentState(
+        run_id="bench",
+        ranked_elements=[UIElement(role="button", text=f"b{n}", bounds=Bounds(0, n, 1, 1)) for n in range(args.elements)],
+        enumerated_actions=[EnumeratedAction(verb="tap", text_or_icon=f"b{n}") for n in range(args.actions)],
+        cache=cache,
+    )
+    clone = state.clone_with(plan_cursor=1)
+    entry = CacheEntry()
+
+    timed("clone_with(plan_cursor=1)", args.rounds, lambda: state.clone_with(plan_cursor=1))
+    timed("dataclasses.replace(plan_cursor=1)", args.rounds, lambda: replace(state, plan_cursor=1))
+    timed("diff (one field changed)", args.rounds, lambda: diff(state, clone))
+    timed(f"PMap.set ({args.cache} entries)", args.rounds, lambda: state.cache.set("new", entry))
+    timed(f"dict copy + set ({args.cache} entries)", args.rounds // 10, lambda: {**cache, "new": entry})
+    updated = state.clone_with(cache=state.cache.set("new", entry))
+    timed("diff (one cache entry added)", args.rounds, lambda: diff(state, updated))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Microbenchmark: CacheAdapter hit latency per tier.
+
+USAGE:
+------
+cd packages/agent
+python -m benchmarks.bench_cache [--entries 10000] [--lookups 20000]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from src.adapters.cache import CacheAdapter
+
+
+async def _measure(cache: CacheAdapter, keys, lookups: int):
+    samples = []
+    for i in range(lookups):
+        key = keys[i % len(keys)]
+        started = time.perf_counter()
+        await cache.get_prompt_cache(key)
+        samples.append((time.perf_counter() - started) * 1e6)
+    return statistics.median(samples), statistics.quantiles(samples, n=20)[18]
+
+
+async def main_async(args) -> None:
+    keys = [f"choose_action:model:{i:016x}:delta:topk:breadth" for i in range(args.entries)]
+    value = {"action_index": 3, "rationale": "tap the primary button", "confidence": 0.82}
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cache.sqlite3")
+        cache = CacheAdapter(path=path, max_entries=args.entries)
+        started = time.perf_counter()
+        for key in keys:
+            await cache.set_prompt_cache(key, value)
+        write_ms = (time.perf_counter() - started) * 1000
+        memory = await _measure(cache, keys, args.lookups)
+        await cache.close()
+
+        # Fresh process view: every first lookup goes to SQLite
+        cold = CacheAdapter(path=path, max_entries=1)
+        disk = await _measure(cold, keys, min(args.lookups, len(keys)))
+        await cold.close()
+
+    print(f"{args.entries} entries, write-through {write_ms / args.entries * 1000:.1f} us/set")
+    print(f"memory hit   median {memory[0]:7.1f} us   p95 {memory[1]:7.1f} us")
+    print(f"disk hit     median {disk[0]:7.1f} us   p95 {disk[1]:7.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=10_000)
+    parser.add_argument("--lookups", type=int, default=20_000)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
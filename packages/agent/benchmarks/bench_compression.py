@@ -0,0 +1,94 @@
+"""
+Microbenchmark: page-source compression ratio and throughput per codec.
+
+Trains each dictionary codec on the first captures (as AssetCodec does in a
+run) and measures the rest. Pass --dir with recorded hierarchies (*.xml,
+e.g. saved page sources of one app); otherwise synthetic UiAutomator2
+screens are generated.
+
+USAGE:
+------
+cd packages/agent
+python -m benchmarks.bench_compression [--dir recordings/] [--screens 200]
+"""
+
+import argparse
+import glob
+import os
+import random
+import tempfile
+import time
+import zlib
+
+from src.adapters.repo.compression import TRAIN_SAMPLES, AssetCodec, zstandard
+
+
+WIDGETS = ["TextView", "Button", "ImageView", "LinearLayout", "FrameLayout", "EditText", "RecyclerView"]
+LABELS = "Settings Account Profile Inbox Search Home Notifications Sign in Continue Cancel Privacy".split()
+
+
+def synthetic_screen(seed: int, nodes: int = 300) -> bytes:
+    rng = random.Random(seed)
+    rows = []
+    for index in range(nodes):
+        widget = rng.choice(WIDGETS)
+        top = rng.randint(0, 2200)
+        rows.append(
+            f'<android.widget.{widget} index="{index % 12}" package="com.example.shop" '
+            f'class="android.widget.{widget}" text="{rng.choice(LABELS) if widget in ("TextView", "Button") else ""}" '
+            f'resource-id="com.example.shop:id/{widget.lower()}_{rng.randint(0, 60)}" '
+            f'checkable="false" checked="false" clickable="{str(widget == "Button").lower()}" '
+            f'enabled="true" focusable="{str(widget == "EditText").lower()}" focused="false" '
+            f'long-clickable="false" password="false" scrollable="{str(widget == "RecyclerView").lower()}" '
+            f'selected="false" bounds="[0,{top}][1080,{top + rng.randint(40, 200)}]" displayed="true" />'
+        )
+    return ('<?xml version=\'1.0\' encoding=\'UTF-8\' standalone=\'yes\' ?><hierarchy index="0" '
+            'class="hierarchy" rotation="0" width="1080" height="2400">' + "".join(rows) + "</hierarchy>").encode()
+
+
+def measure(name: str, compress, decompress, samples) -> None:
+    raw = sum(len(sample) for sample in samples)
+    started = time.perf_counter()
+    blobs = [compress(sample) for sample in samples]
+    compress_s = time.perf_counter() - started
+    started = time.perf_counter()
+    for blob in blobs:
+        decompress(blob)
+    decompress_s = time.perf_counter() - started
+    stored = sum(len(blob) for blob in blobs)
+    print(f"{name:<22} ratio {raw / stored:6.1f}x   compress {raw / compress_s / 1e6:7.1f} MB/s   "
+          f"decompress {raw / decompress_s / 1e6:7.1f} MB/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dir", default=None, help="directory of recorded *.xml hierarchies")
+    parser.add_argument("--screens", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.dir:
+        paths = sorted(glob.glob(os.path.join(args.dir, "*.xml")))
+        screens = [open(path, "rb").read() for path in paths]
+    else:
+        screens = [synthetic_screen(seed) for seed in range(args.screens)]
+    train, test = screens[:TRAIN_SAMPLES], screens[TRAIN_SAMPLES:]
+    if not test:
+        parser.error(f"need more than {TRAIN_SAMPLES} hierarchies")
+    print(f"{len(test)} hierarchies measured, {sum(map(len, test)) / len(test) / 1024:.0f} KiB average")
+
+    measure("zlib", lambda data: zlib.compress(data, 6), zlib.decompress, test)
+    with tempfile.TemporaryDirectory() as directory:
+        codecs = [("zlib + dictionary", False)]
+        if zstandard is not None:
+            plain = zstandard.ZstdCompressor(level=6)
+            measure("zstd", plain.compress, zstandard.ZstdDecompressor().decompress, test)
+            codecs.append(("zstd + dictionary", True))
+        for name, use_zstd in codecs:
+            codec = AssetCodec(os.path.join(directory, name), use_zstd=use_zstd)
+            for sample in train:
+                codec.compress("page_sources", sample)
+            measure(name, lambda data: codec.compress("page_sources", data), codec.decompress, test)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Microbenchmark: RunEventLog size, append rate and state_at latency.
+
+Appends --steps states shaped like an exploration run (each step changes
+the signature, counters, ranked elements and actions of a screen picked
+from --screens), then compares the log size against full-state records and
+times state_at() for random steps and a full sequential replay.
+
+USAGE:
+------
+cd packages/agent
+python -m benchmarks.bench_event_log [--steps 5000] [--snapshot-every 64]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from src.adapters.repo import RunEventLog
+from src.agent.domain import AgentState, state_to_plain
+from src.agent.domain.state import Counters, EnumeratedAction, ScreenSignature
+from src.agent.domain.ui_element import Bounds, UIElement
+
+
+def screen(index: int):
+    elements = [
+        UIElement(role="button", text=f"Item {index}-{n}", bounds=Bounds(0, n * 40, 320, 40),
+                  clickable=True, metadata={"resource-id": f"id/item_{n}"})
+        for n in range(15)
+    ]
+    actions = [EnumeratedAction(verb="tap", target_role="button", text_or_icon=e.text) for e in elements]
+    return ScreenSignature(hash=f"{index:016x}"), elements, actions
+
+
+def run_states(steps: int, screens: int):
+    rng = random.Random(0)
+    catalog = [screen(index) for index in range(screens)]
+    state = AgentState(run_id="bench", app_id="com.example.app")
+    for step in range(steps):
+        signature, elements, actions = catalog[rng.randrange(screens)]
+        state = state.clone_with(
+            previous_signature=state.signature,
+            signature=signature,
+            ranked_elements=elements,
+            enumerated_actions=actions,
+            counters=Counters(steps_total=step),
+        )
+        yield state
+        state = state.clone_with(plan_cursor=step % 5)  # a cheap node: one field
+        yield state
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=5_000)
+    parser.add_argument("--screens", type=int, default=200)
+    parser.add_argument("--snapshot-every", type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        log = RunEventLog(directory, "bench", snapshot_every=args.snapshot_every)
+        full_bytes = 0
+        started = time.perf_counter()
+        for state in run_states(args.steps, args.screens):
+            log.append("Node", state)
+        log.flush()
+        append_s = time.perf_counter() - started
+        for state in run_states(args.steps, args.screens):
+            full_bytes += len(json.dumps(state_to_plain(state), separators=(",", ":")))
+        size = os.path.getsize(log.path)
+        records = len(log)
+        print(f"{records} records: log {size / 1e6:.2f} MB ({size / records:.0f} B/record), "
+              f"full states {full_bytes / 1e6:.2f} MB ({full_bytes / size:.1f}x)")
+        print(f"append: {records / append_s:9.0f} records/s")
+
+        rng = random.Random(1)
+        latencies = []
+        for _ in range(200):
+            step = rng.randrange(records)
+            started = time.perf_counter()
+            log.state_at(step)
+            latencies.append((time.perf_counter() - started) * 1e3)
+        print(f"state_at: median {statistics.median(latencies):.2f} ms, max {max(latencies):.2f} ms")
+
+        started = time.perf_counter()
+        scanned = sum(1 for _ in log.iter_records())
+        elapsed = time.perf_counter() - started
+        print(f"iter_records: {scanned / elapsed:9.0f} records/s ({size / elapsed / 1e6:.0f} MB/s)")
+        started = time.perf_counter()
+        replayed = sum(1 for _ in log.iter_states())
+        print(f"iter_states: {replayed / (time.perf_counter() - started):9.0f} states/s")
+        log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Microbenchmark: LocalFileStoreAdapter bytes written vs revisit rate.
+
+Simulates a run of --steps perceptions over a pool of distinct screens, each
+step storing a page source and a screenshot; --revisit is the probability a
+step lands on an already-seen screen. --write-behind wraps the store in
+WriteBehindFileStore: ms/step is then the latency PerceiveNode sees, and the
+final flush is timed separately. --latency-ms adds a per-put delay to model
+a network disk or object store.
+
+USAGE:
+------
+cd packages/agent
+python -m benchmarks.bench_filestore [--steps 500] [--revisit 0.7] [--write-behind] [--latency-ms 20]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from src.adapters.repo import LocalFileStoreAdapter, WriteBehindFileStore
+
+
+class _SlowStore(LocalFileStoreAdapter):
+    """Local store with added per-put latency."""
+
+    def __init__(self, root: str, latency_s: float):
+        super().__init__(root)
+        self.latency_s = latency_s
+
+    async def put(self, key, data, content_type="application/octet-stream"):
+        await asyncio.sleep(self.latency_s)
+        return await super().put(key, data, content_type)
+
+
+def _screen(index: int) -> tuple:
+    rng = random.Random(index)
+    xml = "".join(
+        f'<node class="android.widget.TextView" text="Item {index}-{i}" '
+        f'bounds="[0,{i * 48}][1080,{i * 48 + 48}]" clickable="{rng.random() < 0.3}"/>'
+        for i in range(200)
+    ).encode("utf-8")
+    png = rng.randbytes(150_000)
+    return xml, png
+
+
+async def main_async(args) -> None:
+    rng = random.Random(0)
+    seen = []
+    with tempfile.TemporaryDirectory() as directory:
+        local = _SlowStore(directory, args.latency_ms / 1000)
+        store = WriteBehindFileStore(local) if args.write_behind else local
+        started = time.perf_counter()
+        for step in range(args.steps):
+            if seen and rng.random() < args.revisit:
+                index = rng.choice(seen)
+            else:
+                index = len(seen)
+                seen.append(index)
+            xml, png = _screen(index)
+            step_id = f"step-{step:05d}"
+            await asyncio.gather(
+                store.put(store.generate_key("bench", "page_sources", step_id, "xml"), xml),
+                store.put(store.generate_key("bench", "screenshots", step_id, "png"), png),
+            )
+        elapsed = time.perf_counter() - started
+        await store.flush()
+        flushed = time.perf_counter() - started - elapsed
+        on_disk = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, files in os.walk(directory) for name in files
+        )
+
+    stats = local.get_stats()
+    offered = stats["bytes_written"] + stats["bytes_deduplicated"]
+    print(f"{args.steps} steps, {len(seen)} distinct screens, revisit rate {args.revisit:.0%}")
+    print(f"offered {offered / 2**20:8.1f} MiB   written {stats['bytes_written'] / 2**20:8.1f} MiB   "
+          f"on disk {on_disk / 2**20:8.1f} MiB")
+    print(f"dedup hits {stats['dedup_hits']} / {stats['puts']} puts   {elapsed / args.steps * 1000:.2f} ms/step   "
+          f"final flush {flushed * 1000:.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=500)
+    parser.add_argument("--revisit", type=float, default=0.7)
+    parser.add_argument("--write-behind", action="store_true")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
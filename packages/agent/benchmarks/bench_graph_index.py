@@ -0,0 +1,74 @@
+"""
+Microbenchmark: GraphIndex build, incremental updates and navigation queries.
+
+Builds an app-like graph of --nodes screens with --degree outgoing actions
+each (mostly to nearby screens, some to hub screens such as home/back
+targets), marks --frontier of the screens as having untried actions, then
+times shortest_path and nearest_frontier between random screens.
+
+USAGE:
+------
+cd packages/agent
+python -m benchmarks.bench_graph_index [--nodes 100000] [--degree 5] [--frontier 0.01]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from src.agent.domain import GraphIndex
+
+
+def _edges(nodes: int, degree: int, rng: random.Random):
+    hubs = max(nodes // 1000, 1)
+    for source in range(nodes):
+        for action in range(degree):
+            if rng.random() < 0.2:
+                target = rng.randrange(hubs)
+            else:
+                target = min(max(source + rng.randint(-50, 50), 0), nodes - 1)
+            yield f"s{source}", f"s{target}", f"tap:{action}"
+
+
+def _time(fn, args_list):
+    samples = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--degree", type=int, default=5)
+    parser.add_argument("--frontier", type=float, default=0.01)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    started = time.perf_counter()
+    graph = GraphIndex(_edges(args.nodes, args.degree, rng))
+    print(f"bulk load: {len(graph)} nodes, {graph.edge_count} edges in {time.perf_counter() - started:.2f} s")
+
+    for node in rng.sample(range(args.nodes), int(args.nodes * args.frontier)):
+        graph.set_action_count(f"s{node}", args.degree + 3)
+
+    updates = [(f"s{rng.randrange(args.nodes)}", f"s{rng.randrange(args.nodes)}", "tap:new") for _ in range(20_000)]
+    started = time.perf_counter()
+    for edge in updates:
+        graph.add_edge(*edge)
+    elapsed = time.perf_counter() - started
+    print(f"add_edge: {len(updates) / elapsed:,.0f} edges/s (incl. compactions)")
+
+    pairs = [(f"s{rng.randrange(args.nodes)}", f"s{rng.randrange(args.nodes)}") for _ in range(args.queries)]
+    median, worst = _time(graph.shortest_path, pairs)
+    print(f"shortest_path:    median {median:7.2f} ms   max {worst:7.2f} ms")
+    median, worst = _time(graph.nearest_frontier, [(source,) for source, _ in pairs])
+    print(f"nearest_frontier: median {median:7.2f} ms   max {worst:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Microbenchmark: perceptual hash of a 1080x2400 screenshot.
+
+Reports PNG decoding (Pillow, zlib-bound) and hashing (NumPy) separately.
+Requires the perception extra (numpy, Pillow).
+
+USAGE:
+------
+cd packages/agent
+python -m benchmarks.bench_phash [--repeat 50]
+"""
+
+import argparse
+import io
+import statistics
+import time
+
+import numpy as np
+from PIL import Image
+
+from src.agent.services.perceptual_hash import decode_grayscale, dhash, phash
+
+
+def synthetic_screenshot(width: int = 1080, height: int = 2400, seed: int = 7) -> bytes:
+    """Flat UI-like RGBA PNG: background, colored cards, dense 'text' dots."""
+    rng = np.random.default_rng(seed)
+    pixels = np.full((height, width, 3), 245, np.uint8)
+    for _ in range(60):
+        y, x = rng.integers(0, height - 100), rng.integers(0, width - 80)
+        pixels[y:y + 80, x:x + rng.integers(50, 400)] = rng.integers(0, 255, 3)
+    text = pixels[100:2000:7, 50:1000:3]
+    text[...] = rng.integers(0, 80, text.shape)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).convert("RGBA").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def bench(fn, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def report(label: str, samples: list) -> None:
+    p95 = statistics.quantiles(samples, n=20)[18]
+    print(f"{label:<24} median {statistics.median(samples):7.3f} ms   p95 {p95:7.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    png = synthetic_screenshot()
+    gray = decode_grayscale(png)
+    print(f"1080x2400 PNG, {len(png) / 1024:.0f} KiB, {args.repeat} runs")
+    report("decode (PNG -> L)", bench(lambda: decode_grayscale(png), args.repeat))
+    report("pHash (decoded)", bench(lambda: phash(gray), args.repeat))
+    report("dHash (decoded)", bench(lambda: dhash(gray), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
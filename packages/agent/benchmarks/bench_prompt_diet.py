@@ -0,0 +1,69 @@
+"""
+Microbenchmark: PromptDiet payload sizes and packing cost per LLM node.
+
+Compares the estimated tokens of each packed payload with the naive
+payload (the whole AgentState as plain JSON), and times pack() with a warm
+token-count cache (the steady state: screen texts repeat between steps).
+
+USAGE:
+------
+cd packages/agent
+python -m benchmarks.bench_prompt_diet [--actions 200] [--elements 500] [--repeat 200]
+"""
+
+import argparse
+import statistics
+import time
+
+from src.agent.domain import AgentState, ScreenSignature
+from src.agent.domain.state import Advice, Bounds, EnumeratedAction
+from src.agent.domain.state_codec import state_to_plain
+from src.agent.domain.ui_element import UIElement
+from src.agent.services.cache_key_builder import LLM_NODE_TYPES
+from src.agent.services.prompt_diet import PromptDiet
+from src.agent.services.token_estimator import estimate_value_tokens
+
+
+def build_state(actions: int, elements: int) -> AgentState:
+    return AgentState(
+        signature=ScreenSignature(hash="a" * 64, simhash=0x5A5A),
+        previous_signature=ScreenSignature(hash="b" * 64, simhash=0x5A5B),
+        enumerated_actions=[
+            EnumeratedAction(verb="tap", target_role="button", text_or_icon=f"Open settings section number {i}",
+                             expected_postcondition=f"Section {i} is shown")
+            for i in range(actions)
+        ],
+        ranked_elements=[
+            UIElement(role="text", text=f"List row {i} with a longer description label",
+                      bounds=Bounds(0.05, i / max(elements, 1), 0.9, 0.04))
+            for i in range(elements)
+        ],
+        advice=Advice(plan=[f"step {i}: tap item {i}" for i in range(12)], source="llm", confidence=0.7),
+        plan_cursor=4,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--actions", type=int, default=200)
+    parser.add_argument("--elements", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    state = build_state(args.actions, args.elements)
+    diet = PromptDiet()
+    naive = estimate_value_tokens(state_to_plain(state))
+    print(f"naive payload (full state): ~{naive} tokens")
+    for node_type in LLM_NODE_TYPES:
+        packed = diet.pack(node_type, state)
+        samples = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            diet.pack(node_type, state)
+            samples.append((time.perf_counter() - started) * 1e6)
+        print(f"{node_type:>16}: ~{packed.estimated_tokens:>4} / {packed.budget_tokens} tokens   "
+              f"pack {statistics.median(samples):7.1f} µs   dropped {packed.dropped or '-'}")
+
+
+if __name__ == "__main__":
+    main()
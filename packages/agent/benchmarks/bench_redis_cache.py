@@ -0,0 +1,63 @@
+"""
+Microbenchmark: RedisCacheAdapter serial GETs vs one pipelined MGET.
+
+Runs against FakeRedisServer by default (loopback, no network latency), so
+the gap shown is the per-round-trip overhead only; pass --url to measure a
+real server.
+
+USAGE:
+------
+cd packages/agent
+python -m benchmarks.bench_redis_cache [--keys 200] [--rounds 20] [--url redis://...]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from src.adapters.cache import RedisCacheAdapter
+from src.adapters.cache.fake_redis import FakeRedisServer
+
+
+async def _run(url: str, args) -> None:
+    cache = RedisCacheAdapter(url, namespace="bench:")
+    keys = [f"choose_action:model:{i:016x}:delta:topk:breadth" for i in range(args.keys)]
+    value = {"action_index": 3, "rationale": "tap the primary button", "confidence": 0.82}
+    await cache.set_prompt_cache_many({key: value for key in keys})
+
+    serial, batched = [], []
+    for _ in range(args.rounds):
+        started = time.perf_counter()
+        for key in keys:
+            await cache.get_prompt_cache(key)
+        serial.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        await cache.get_prompt_cache_many(keys)
+        batched.append((time.perf_counter() - started) * 1000)
+    await cache.invalidate("*")
+    await cache.close()
+
+    print(f"{args.keys} keys per lookup batch")
+    print(f"serial GET   median {statistics.median(serial):7.2f} ms")
+    print(f"MGET         median {statistics.median(batched):7.2f} ms")
+
+
+async def main_async(args) -> None:
+    if args.url:
+        await _run(args.url, args)
+        return
+    async with FakeRedisServer() as server:
+        await _run(server.url, args)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--keys", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--url", default=None)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
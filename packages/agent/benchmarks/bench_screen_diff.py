@@ -0,0 +1,61 @@
+"""
+Microbenchmark: element-level diff of consecutive screens.
+
+The second screen is the first with a few rows edited, a few inserted at
+the top of the hierarchy and a few removed; time should grow linearly with
+the element count.
+
+USAGE:
+------
+cd packages/agent
+python -m benchmarks.bench_screen_diff [--elements 500 2000 8000] [--repeat 30]
+"""
+
+import argparse
+
+from benchmarks.bench_signature import bench, build_table, report
+from src.agent.domain.element_table import ElementTable
+from src.agent.services.screen_diff import diff_tables, screen_delta
+
+
+def mutate(table: ElementTable, edits: int = 5) -> ElementTable:
+    """Copy of table with `edits` rows inserted first, `edits` dropped and `edits` retitled."""
+    copy = ElementTable()
+    mapping = {}
+    for i in range(edits):
+        copy.append("button", (0.0, 0.01 * i, 0.1, 0.01), 0, text=f"new {i}")
+    dropped = set(range(len(table) - edits, len(table)))
+    texted = [row for row in range(len(table)) if table.texts[row]]
+    retitled = set(texted[::max(len(texted) // edits, 1)][:edits])
+    for row in range(len(table)):
+        parent = table.parents[row]
+        if row in dropped or (parent >= 0 and parent not in mapping):
+            continue
+        text = table.texts[row]
+        if row in retitled:
+            text = text + " (edited)"
+        mapping[row] = copy.append(
+            table.role(row), table.bounds_of(row), table.flags[row],
+            parent=mapping.get(parent, -1), text=text,
+            resource_id=table.resource_ids[row], class_name=table.class_names[row],
+        )
+    return copy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--elements", type=int, nargs="+", default=[500, 2000, 8000])
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    for n in args.elements:
+        before = build_table(n)
+        after = mutate(before)
+        diff = diff_tables(before, after)
+        print(f"{n} elements: +{len(diff.added)} -{len(diff.removed)} ~{len(diff.changed)} ={diff.unchanged}")
+        report(f"  diff_tables ({n})", bench(lambda: diff_tables(before, after), args.repeat))
+        report(f"  screen_delta ({n})", bench(lambda: screen_delta(before, after), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Microbenchmark: compute_signature on large hierarchies.
+
+Target: under ~1 ms per screen for a 2,000-element hierarchy.
+
+USAGE:
+------
+cd packages/agent
+python -m benchmarks.bench_signature [--elements 2000] [--repeat 200]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from src.agent.domain.element_table import ElementTable, FLAG_VISIBLE, FLAG_CLICKABLE, ROLES
+from src.agent.domain.screen_signature import compute_signature
+
+
+WORDS = "settings account profile login sign up continue cancel search home inbox 12:30 notifications".split()
+
+
+def build_table(n_elements: int, seed: int = 7) -> ElementTable:
+    """Random but reproducible hierarchy; new rows attach to recent containers."""
+    rng = random.Random(seed)
+    table = ElementTable()
+    open_rows = [table.append("container", (0.0, 0.0, 1.0, 1.0), FLAG_VISIBLE)]
+    while len(table) < n_elements:
+        parent = rng.choice(open_rows[-8:])
+        role = rng.choice(ROLES[1:])
+        x, y = rng.random() * 0.9, rng.random() * 0.9
+        flags = FLAG_VISIBLE | (FLAG_CLICKABLE if role in ("button", "input") else 0)
+        text = " ".join(rng.sample(WORDS, 2)) if role in ("button", "text") else None
+        row = table.append(role, (x, y, rng.random() * 0.1, rng.random() * 0.1), flags, parent=parent, text=text)
+        if role in ("container", "list", "scroll", "cell"):
+            open_rows.append(row)
+    return table
+
+
+def bench(fn, repeat: int) -> list:
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name: str, samples: list) -> None:
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    print(f"{name:<28} median {statistics.median(samples):7.3f} ms   p95 {p95:7.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--elements", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    table = build_table(args.elements)
+    roots = table.to_ui_elements()
+    ocr_text = "\n".join(t for t in table.texts if t)
+
+    print(f"{len(table)} elements, max depth {max(table.depths)}, {args.repeat} runs")
+    report("ElementTable + OCR text", bench(lambda: compute_signature(table, ocr_text), args.repeat))
+    report("ElementTable, element text", bench(lambda: compute_signature(table), args.repeat))
+    report("UIElement tree + OCR text", bench(lambda: compute_signature(roots, ocr_text), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Microbenchmark: SimHashIndex lookups vs. a linear Hamming scan.
+
+USAGE:
+------
+cd packages/agent
+python -m benchmarks.bench_simhash_index [--entries 100000] [--queries 2000] [--distance 3]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from src.agent.domain.screen_signature import hamming_distance
+from src.agent.domain.simhash_index import SimHashIndex
+
+
+def _near(rng: random.Random, simhash: int, distance: int) -> int:
+    for bit in rng.sample(range(64), distance):
+        simhash ^= 1 << bit
+    return simhash
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--distance", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    hashes = [rng.getrandbits(64) for _ in range(args.entries)]
+    index = SimHashIndex(max_distance=args.distance)
+    started = time.perf_counter()
+    for key, simhash in enumerate(hashes):
+        index.add(key, simhash)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    # Half near-duplicates of known screens, half unseen screens
+    queries = [
+        _near(rng, rng.choice(hashes), rng.randint(0, args.distance)) if i % 2 else rng.getrandbits(64)
+        for i in range(args.queries)
+    ]
+
+    samples = []
+    hits = 0
+    for simhash in queries:
+        started = time.perf_counter()
+        hits += index.nearest(simhash) is not None
+        samples.append((time.perf_counter() - started) * 1e6)
+
+    scan = []
+    for simhash in queries[:50]:
+        started = time.perf_counter()
+        min(hamming_distance(simhash, other) for other in hashes)
+        scan.append((time.perf_counter() - started) * 1e6)
+
+    print(f"{args.entries} entries, max distance {args.distance}, build {build_ms:.0f} ms")
+    print(f"index lookup   median {statistics.median(samples):8.1f} us   "
+          f"p95 {statistics.quantiles(samples, n=20)[18]:8.1f} us   hits {hits}/{len(queries)}")
+    print(f"linear scan    median {statistics.median(scan):8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
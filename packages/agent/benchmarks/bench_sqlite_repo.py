@@ -0,0 +1,82 @@
+"""
+Microbenchmark: SQLiteRepoAdapter sustained upsert throughput.
+
+Simulates --steps iterations of PersistNode over --screens distinct screens:
+each step upserts the current node and the edge from the previous screen.
+Runs once per --batch size (1 = one transaction per upsert), then times the
+agent's read queries on the resulting graph.
+
+USAGE:
+------
+cd packages/agent
+python -m benchmarks.bench_sqlite_repo [--steps 20000] [--screens 2000] [--batch 1 256]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from src.adapters.repo import SQLiteRepoAdapter
+
+APP = "com.example.app"
+
+
+async def run_batch(args, batch: int, directory: str) -> SQLiteRepoAdapter:
+    rng = random.Random(0)
+    repo = SQLiteRepoAdapter(os.path.join(directory, f"graph-{batch}.sqlite3"), max_batch=batch)
+    previous = None
+    started = time.perf_counter()
+    for step in range(args.steps):
+        signature = f"sig-{rng.randrange(args.screens):06d}"
+        await repo.upsert_node(signature, {"app_id": APP, "run_id": "bench", "step": step})
+        if previous is not None:
+            await repo.upsert_edge(previous, signature, f"tap:{rng.randrange(20)}", {"run_id": "bench", "ok": True})
+        previous = signature
+    await repo.flush()
+    elapsed = time.perf_counter() - started
+    upserts = repo.get_stats()["upserts"]
+    print(f"batch {batch:5d}: {upserts} upserts in {elapsed:6.2f} s = {upserts / elapsed:9.0f} upserts/s   "
+          f"({repo.get_stats()['commits']} commits)")
+    return repo
+
+
+async def time_queries(repo: SQLiteRepoAdapter, screens: int, rounds: int = 500) -> None:
+    rng = random.Random(1)
+    queries = {
+        "get_node": lambda: repo.get_node(f"sig-{rng.randrange(screens):06d}"),
+        "get_neighbors": lambda: repo.get_neighbors(f"sig-{rng.randrange(screens):06d}"),
+        "get_top_nodes(200)": lambda: repo.get_top_nodes(APP, 200),
+        "get_exploration_stats": lambda: repo.get_exploration_stats("bench"),
+    }
+    for name, query in queries.items():
+        count = rounds if name != "get_exploration_stats" else 20
+        started = time.perf_counter()
+        for _ in range(count):
+            await query()
+        print(f"{name:24s} {(time.perf_counter() - started) / count * 1e6:9.1f} µs")
+
+
+async def main_async(args) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        repo = None
+        for batch in args.batch:
+            if repo is not None:
+                await repo.close()
+            repo = await run_batch(args, batch, directory)
+        await time_queries(repo, args.screens)
+        await repo.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=20_000)
+    parser.add_argument("--screens", type=int, default=2_000)
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 256])
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
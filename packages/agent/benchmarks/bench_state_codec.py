@@ -0,0 +1,106 @@
+"""
+Microbenchmark: AgentState serialization, bytes and µs per state.
+
+Builds a mid-run state (--elements ranked elements, --actions enumerated
+actions, --cache warmed entries) and compares a reflective baseline (a
+dataclasses.fields() walk per value, as asdict does; asdict itself leaves
+PMap fields unconverted) with the compiled codec's named/canonical JSON
+and compact forms, and the packed binary form (msgpack when installed).
+
+USAGE:
+------
+cd packages/agent
+python -m benchmarks.bench_state_codec [--rounds 2000] [--cache 50]
+"""
+
+import argparse
+import json
+import time
+from collections.abc import Mapping
+from dataclasses import fields, is_dataclass
+
+from src.adapters.repo.state_serializer import FORMAT_JSON, FORMAT_MSGPACK, msgpack, pack_state, unpack_state
+from src.agent.domain import AgentState, ScreenSignature
+from src.agent.domain.state import Advice, CacheEntry, EnumeratedAction
+from src.agent.domain.state_codec import (
+    from_compact,
+    state_from_json,
+    state_from_plain,
+    state_to_json,
+    state_to_plain,
+    to_compact,
+)
+from src.agent.domain.ui_element import Bounds, UIElement
+
+
+def reflective(value):
+    if is_dataclass(value):
+        return {f.name: reflective(getattr(value, f.name)) for f in fields(value)}
+    if isinstance(value, (list, tuple)):
+        return [reflective(item) for item in value]
+    if isinstance(value, Mapping):
+        return {key: reflective(item) for key, item in value.items()}
+    return value
+
+
+def build_state(args) -> AgentState:
+    elements = [
+        UIElement(role="button", text=f"Item {n}", bounds=Bounds(0.0, n / 40, 1.0, 0.025), clickable=True,
+                  metadata={"resource-id": f"com.example:id/item_{n}", "xpath": f"/hierarchy/list/item[{n}]"})
+        for n in range(args.elements)
+    ]
+    actions = [EnumeratedAction(verb="tap", target_role="button", text_or_icon=f"Item {n}") for n in range(args.actions)]
+    cache = {
+        f"{n:064x}": CacheEntry(advice=Advice(plan=["tap Item 1", "back"], confidence=0.8, source="llm"),
+                                safe_actions=actions[:3])
+        for n in range(args.cache)
+    }
+    return AgentState(
+        run_id="bench",
+        app_id="com.example.app",
+        signature=ScreenSignature(hash="a" * 64, layout_hash="b" * 64, ocr_stems_hash="c" * 64, simhash=2**63 + 1),
+        ranked_elements=elements,
+        enumerated_actions=actions,
+        cache=cache,
+    )
+
+
+def timed(rounds: int, operation) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        operation()
+    return (time.perf_counter() - started) / rounds * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--elements", type=int, default=40)
+    parser.add_argument("--actions", type=int, default=40)
+    parser.add_argument("--cache", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=2_000)
+    args = parser.parse_args()
+    state = build_state(args)
+    compact = lambda value: json.dumps(value, separators=(",", ":"), ensure_ascii=False)  # noqa: E731
+
+    forms = [
+        ("reflective + JSON", lambda: compact(reflective(state)), None),
+        ("named JSON", lambda: compact(state_to_plain(state)),
+         lambda blob: state_from_plain(json.loads(blob))),
+        ("canonical JSON", lambda: state_to_json(state), state_from_json),
+        ("compact JSON", lambda: compact(to_compact(state)),
+         lambda blob: from_compact(AgentState, json.loads(blob))),
+        ("packed (JSON body)", lambda: pack_state(state, FORMAT_JSON), unpack_state),
+    ]
+    if msgpack is not None:
+        forms.append(("packed (msgpack)", lambda: pack_state(state, FORMAT_MSGPACK), unpack_state))
+
+    print(f"{'form':28s} {'bytes':>8s} {'encode µs':>10s} {'decode µs':>10s}")
+    for label, encode, decode in forms:
+        blob = encode()
+        encode_us = timed(args.rounds, encode)
+        decode_us = timed(args.rounds, lambda: decode(blob)) if decode else float("nan")
+        print(f"{label:28s} {len(blob):8d} {encode_us:10.1f} {decode_us:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -204,6 +204,10 @@ class AppiumAdapter(DriverPort):
         platform: str,
         timeout_ms: int = 10000,
         max_timeout_ms: int = 30000,
+        device_name: str = "",
+        platform_version: str = "",
+        udid: Optional[str] = None,
+        app_package: Optional[str] = None,
     ):
         """
         Initialize AppiumAdapter.
@@ -213,9 +217,17 @@ class AppiumAdapter(DriverPort):
             platform: Platform name ("android" or "ios")
             timeout_ms: Default timeout in milliseconds
             max_timeout_ms: Maximum allowed timeout
+            device_name: Device name capability
+            platform_version: Platform version capability
+            udid: Device UDID (session pool and executor lane key)
+            app_package: App under test (reset when a pooled session is reused)
         """
         self.hub_url = hub_url
         self.platform = platform.lower()
+        self.device_name = device_name
+        self.platform_version = platform_version
+        self.udid = udid
+        self.app_package = app_package
         self.timeout_ms = min(timeout_ms, max_timeout_ms)
         self.max_timeout_ms = max_timeout_ms
         
@@ -233,19 +245,32 @@ class AppiumAdapter(DriverPort):
         """
         Establish connection to Appium server and device.
         
+        Sessions come from the process-wide session pool, so reconnecting to
+        the same device reuses a warm session.
+        
         Raises:
             DeviceOfflineError: If connection fails
         """
         try:
+            device_id = self.udid or self.device_name
             self._driver_config = create_driver_config(
-                hub_url=self.hub_url,
                 platform=self.platform,
+                device_name=self.device_name,
+                platform_version=self.platform_version,
+                server_url=self.hub_url,
+                app_package=self.app_package,
+                udid=self.udid,
             )
-            self._context = create_execution_context()
-            self._tools = await create_appium_tools(
-                config=self._driver_config,
-                context=self._context,
+            self._context = create_execution_context(
+                run_id="adapter",
+                session_id=f"adapter_{device_id}",
+                platform=self.platform,
+                device_id=device_id,
             )
+            self._tools = create_appium_tools(self.platform, self._driver_config, self._context)
+            result = await self._tools.connect(self._driver_config)
+            if not result.success:
+                raise DeviceOfflineError(result.error or "connect failed")
             logger.info("Connected to Appium server and device")
         except Exception as e:
             logger.error(f"Failed to connect: {e}")
@@ -253,13 +278,11 @@ class AppiumAdapter(DriverPort):
     
     async def disconnect(self) -> None:
         """
-        Close connection to device.
+        Close connection to device (a pooled session is kept warm).
         """
         if self._tools:
             try:
-                # Close driver session
-                if hasattr(self._tools, "driver"):
-                    await self._tools.driver.quit()
+                await self._tools.disconnect()
                 logger.info("Disconnected from device")
             except Exception as e:
                 logger.warning(f"Error during disconnect: {e}")
@@ -72,6 +72,7 @@ TIMEOUT_NOTIFICATIONS = 5000
 TIMEOUT_INITIALIZE = 5000
 TIMEOUT_CLEANUP = 10000
 TIMEOUT_UTILITY = 1000
+TIMEOUT_GET_ORIENTATION = 3000
 
 # Retry Configuration
 DEFAULT_MAX_RETRIES = 3
@@ -151,6 +152,12 @@ MAX_CONCURRENT_OPERATIONS = 5
 MAX_BATCH_SIZE = 10
 OPERATION_QUEUE_SIZE = 100
 
+# Driver Executor Configuration
+# Blocking driver calls run on a per-device worker lane (see driver_executor.py).
+# One worker per device: an Appium session must not be driven concurrently.
+DRIVER_EXECUTOR_MAX_WORKERS = 1
+DRIVER_EXECUTOR_QUEUE_SIZE = OPERATION_QUEUE_SIZE
+
 # Deep Link Configuration
 DEEP_LINK_TIMEOUT = 5  # seconds
 DEEP_LINK_SUPPORTED_SCHEMES = ['http', 'https', 'app', 'myapp']
@@ -224,6 +231,10 @@ FEATURE_ENABLE_USAGE_STATS = True
 FEATURE_ENABLE_RETRY = True
 FEATURE_ENABLE_BATCH_OPERATIONS = True
 FEATURE_ENABLE_SCREENSHOT_COMPRESSION = True
+# Answer element queries from one parsed page_source instead of per-element calls
+FEATURE_ENABLE_PAGE_SOURCE_SNAPSHOT = True
+# Keep driver sessions warm across runs instead of quitting them on disconnect
+FEATURE_ENABLE_SESSION_POOL = True
 
 # API Configuration
 API_VERSION = "v1"
@@ -237,8 +248,12 @@ PYTHON_MIN_VERSION = "3.8"
 
 # Session Configuration
 SESSION_MAX_DURATION = 3600  # seconds (1 hour)
-SESSION_IDLE_TIMEOUT = 300  # seconds (5 minutes)
+SESSION_IDLE_TIMEOUT = 300  # seconds (5 minutes); also the pool's idle TTL
 SESSION_MAX_CONCURRENT = 10
+# Warm sessions kept per (server_url, device, capabilities) key (see session_pool.py)
+SESSION_POOL_MAX_IDLE_PER_KEY = 1
+# Pooled sessions get appium:newCommandTimeout >= idle TTL + this margin (seconds)
+SESSION_POOL_COMMAND_TIMEOUT_MARGIN = 60
 
 # Cache Configuration
 CACHE_ENABLED = True
@@ -270,6 +285,15 @@ __all__ = [
     'DEFAULT_COMMAND_TIMEOUT',
     'DEFAULT_NEW_COMMAND_TIMEOUT',
     
+    # Driver Executor Configuration
+    'DRIVER_EXECUTOR_MAX_WORKERS',
+    'DRIVER_EXECUTOR_QUEUE_SIZE',
+    
+    # Session Pool Configuration
+    'SESSION_IDLE_TIMEOUT',
+    'SESSION_POOL_MAX_IDLE_PER_KEY',
+    'FEATURE_ENABLE_SESSION_POOL',
+    
     # Platform Configuration
     'ANDROID_DEFAULT_AUTOMATION_NAME',
     'ANDROID_DEFAULT_CAPABILITIES',
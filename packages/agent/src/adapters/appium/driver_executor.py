@@ -0,0 +1,219 @@
+"""
+Driver call executor for AppiumTools.
+
+Selenium/Appium driver calls are blocking HTTP round trips. This module runs
+them on a bounded worker pool per device so the asyncio event loop (and every
+other session served by the same process) stays live while a slow command such
+as `page_source` is in flight.
+
+Each device gets its own lane (a single worker thread by default, because an
+Appium session is not safe to drive concurrently). Calls are awaitable, carry a
+timeout taken from the `TIMEOUT_*` constants in config.py, and are cancelled if
+the awaiting task is cancelled before the call starts running.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import (
+    DRIVER_EXECUTOR_MAX_WORKERS,
+    DRIVER_EXECUTOR_QUEUE_SIZE,
+    ERROR_TIMEOUT,
+)
+
+
+class DriverCallTimeoutError(TimeoutError):
+    """A driver call did not finish within its timeout."""
+    pass
+
+
+class DriverQueueFullError(RuntimeError):
+    """The device lane already has the maximum number of pending calls."""
+    pass
+
+
+@dataclass
+class DriverExecutorMetrics:
+    """Point-in-time metrics for one device lane."""
+    device_id: str
+    max_workers: int
+    max_queue_size: int
+    queue_depth: int = 0  # submitted, not yet started
+    in_flight: int = 0  # currently running on a worker thread
+    peak_queue_depth: int = 0
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    cancelled: int = 0
+    total_wait_ms: float = 0.0  # time spent queued before a worker picked the call up
+    total_run_ms: float = 0.0  # time spent executing on a worker
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+class DriverExecutor:
+    """
+    Bounded executor lane for blocking driver calls of a single device.
+
+    USAGE:
+    ------
+    executor = get_driver_executor("emulator-5554")
+    source = await executor.run(lambda: driver.page_source, timeout_ms=TIMEOUT_GET_PAGE_SOURCE)
+    """
+
+    def __init__(
+        self,
+        device_id: str = "default",
+        max_workers: int = DRIVER_EXECUTOR_MAX_WORKERS,
+        max_queue_size: int = DRIVER_EXECUTOR_QUEUE_SIZE,
+    ):
+        self.device_id = device_id
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=f"appium-{device_id}",
+        )
+        self._lock = threading.Lock()
+        self._metrics = DriverExecutorMetrics(
+            device_id=device_id,
+            max_workers=max_workers,
+            max_queue_size=max_queue_size,
+        )
+        self._closed = False
+
+    async def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        timeout_ms: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Run a blocking call on this lane and await its result.
+
+        Args:
+            fn: Blocking callable (usually a bound driver method or a small closure).
+            timeout_ms: Maximum time to wait, including time spent queued.
+
+        Returns:
+            Whatever fn returns.
+
+        Raises:
+            DriverCallTimeoutError: If the call did not finish in time.
+            DriverQueueFullError: If the lane already holds max_queue_size calls.
+            Any exception raised by fn.
+        """
+        if self._closed:
+            raise RuntimeError(f"Driver executor for {self.device_id} is shut down")
+
+        with self._lock:
+            pending = self._metrics.queue_depth + self._metrics.in_flight
+            if pending >= self.max_queue_size:
+                raise DriverQueueFullError(
+                    f"Driver queue full for {self.device_id}: {pending} pending calls"
+                )
+            self._metrics.submitted += 1
+            self._metrics.queue_depth += 1
+            if self._metrics.queue_depth > self._metrics.peak_queue_depth:
+                self._metrics.peak_queue_depth = self._metrics.queue_depth
+
+        submitted_at = time.perf_counter()
+        future = self._pool.submit(self._execute, submitted_at, fn, args, kwargs)
+        future.add_done_callback(self._on_done)
+
+        timeout = timeout_ms / 1000 if timeout_ms is not None else None
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError as e:
+            with self._lock:
+                self._metrics.timed_out += 1
+            raise DriverCallTimeoutError(ERROR_TIMEOUT.format(timeout)) from e
+
+    def metrics(self) -> DriverExecutorMetrics:
+        """Return a snapshot of this lane's metrics."""
+        with self._lock:
+            return DriverExecutorMetrics(**asdict(self._metrics))
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting calls and cancel everything still queued."""
+        self._closed = True
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+    def _execute(
+        self,
+        submitted_at: float,
+        fn: Callable[..., Any],
+        args: tuple,
+        kwargs: Dict[str, Any],
+    ) -> Any:
+        """Worker-thread side of run(); keeps queue/in-flight accounting."""
+        started_at = time.perf_counter()
+        with self._lock:
+            self._metrics.queue_depth -= 1
+            self._metrics.in_flight += 1
+            self._metrics.total_wait_ms += (started_at - submitted_at) * 1000
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._metrics.in_flight -= 1
+                self._metrics.total_run_ms += (time.perf_counter() - started_at) * 1000
+
+    def _on_done(self, future: Future) -> None:
+        """Record the outcome of a finished, failed or cancelled call."""
+        with self._lock:
+            if future.cancelled():
+                # Never reached _execute, so it is still counted as queued
+                self._metrics.queue_depth -= 1
+                self._metrics.cancelled += 1
+            elif future.exception() is not None:
+                self._metrics.failed += 1
+            else:
+                self._metrics.completed += 1
+
+
+# Process-wide registry: one lane per device
+_executors: Dict[str, DriverExecutor] = {}
+_registry_lock = threading.Lock()
+
+
+def get_driver_executor(device_id: str) -> DriverExecutor:
+    """
+    Get (or create) the executor lane for a device.
+
+    Args:
+        device_id: Device UDID, device name, or another stable device key.
+
+    Returns:
+        DriverExecutor shared by every tools instance driving that device.
+    """
+    with _registry_lock:
+        executor = _executors.get(device_id)
+        if executor is None or executor._closed:
+            executor = DriverExecutor(device_id=device_id)
+            _executors[device_id] = executor
+        return executor
+
+
+def get_driver_executor_metrics() -> List[DriverExecutorMetrics]:
+    """Return metrics for every registered device lane."""
+    with _registry_lock:
+        executors = list(_executors.values())
+    return [executor.metrics() for executor in executors]
+
+
+def shutdown_driver_executors(wait: bool = False) -> None:
+    """Shut down every registered device lane (process shutdown)."""
+    with _registry_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
@@ -33,6 +33,22 @@ from ..interfaces.action_tools import ActionTools
 from ..interfaces.device_management_tools import DeviceManagementTools, SettingsPage
 from ..interfaces.app_management_tools import AppManagementTools
 from ..interfaces.navigation_tools import NavigationTools
+from ..driver_executor import DriverExecutor, DriverExecutorMetrics, get_driver_executor
+from ..page_source_snapshot import PageSourceSnapshot
+from ..session_pool import SessionPool, get_session_pool, pooled_capabilities, session_key
+from ..config import (
+    TIMEOUT_CONNECTION, TIMEOUT_DISCONNECT, TIMEOUT_SET_IMPLICIT_WAIT, TIMEOUT_GET_CONTEXTS,
+    TIMEOUT_SET_CONTEXT, TIMEOUT_SCREENSHOT, TIMEOUT_GET_PAGE_SOURCE, TIMEOUT_GET_BOUNDS,
+    TIMEOUT_GET_ELEMENTS, TIMEOUT_EXISTS, TIMEOUT_FIND_TEXT, TIMEOUT_GET_PLATFORM_INFO,
+    TIMEOUT_GET_SCREEN_SIZE, TIMEOUT_GET_ORIENTATION, TIMEOUT_TAP, TIMEOUT_TAP_COORDINATES,
+    TIMEOUT_TYPE_TEXT, TIMEOUT_CLEAR_TEXT, TIMEOUT_HIDE_KEYBOARD, TIMEOUT_SET_ORIENTATION,
+    TIMEOUT_LOCK_SCREEN, TIMEOUT_UNLOCK_SCREEN, TIMEOUT_SET_CLIPBOARD, TIMEOUT_GET_CLIPBOARD,
+    TIMEOUT_PRESS_BUTTON, TIMEOUT_INSTALL_APP, TIMEOUT_UNINSTALL_APP, TIMEOUT_LAUNCH_APP,
+    TIMEOUT_CLOSE_APP, TIMEOUT_TERMINATE_APP, TIMEOUT_RESET_APP, TIMEOUT_BACKGROUND_APP,
+    TIMEOUT_IS_APP_INSTALLED, TIMEOUT_IS_APP_RUNNING, TIMEOUT_GET_APP_INFO,
+    TIMEOUT_OPEN_DEEP_LINK, TIMEOUT_NAVIGATION, TIMEOUT_NOTIFICATIONS, TIMEOUT_CLEANUP,
+    TIMEOUT_UTILITY, FEATURE_ENABLE_PAGE_SOURCE_SNAPSHOT, FEATURE_ENABLE_SESSION_POOL
+)
 
 
 class AndroidAppiumTools(AppiumTools):
@@ -41,11 +57,28 @@ class AndroidAppiumTools(AppiumTools):
     
     This class provides Android-specific implementations of all tool methods
     using the Appium Python client and Android-specific capabilities.
+    
+    The Appium client is blocking, so every driver call goes through
+    `_driver_call`, which runs it on the device's executor lane with the
+    matching `TIMEOUT_*` budget instead of on the event loop.
+    
+    In snapshot mode, element queries are answered from one parsed
+    `page_source` (see page_source_snapshot.py) instead of 7+ WebDriver
+    round trips per element. Actions go through `_driver_action`, which
+    invalidates the snapshot.
+    
+    With the session pool enabled, `connect` reuses a warm session for the
+    same server, device and capabilities (health-checked, app state reset)
+    and `disconnect` hands it back instead of quitting it.
     """
     
     def __init__(self):
         """Initialize the Android AppiumTools."""
         self.driver: Optional[webdriver.Remote] = None
+        self.executor: Optional[DriverExecutor] = None
+        self.snapshot_mode = FEATURE_ENABLE_PAGE_SOURCE_SNAPSHOT
+        self._snapshot: Optional[PageSourceSnapshot] = None
+        self.session_pool: Optional[SessionPool] = get_session_pool() if FEATURE_ENABLE_SESSION_POOL else None
         self.execution_context: Optional[ToolExecutionContext] = None
         self.logger = logging.getLogger(__name__)
         self.usage_stats = ToolUsageStats()
@@ -737,8 +770,8 @@ class AndroidAppiumTools(AppiumTools):
         """Cleanup resources and disconnect."""
         try:
             if self.driver:
-                self.driver.quit()
-                self.driver = None
+                await self._end_session(timeout_ms=TIMEOUT_CLEANUP)
+            self.invalidate_snapshot()
             self._log('info', 'cleanup', 'Tools cleaned up successfully')
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
@@ -769,30 +802,80 @@ class AndroidAppiumTools(AppiumTools):
     
     # Connection Tools Implementation
     async def connect(self, config: DriverConfig) -> ToolResult[bool]:
-        """Initialize the Appium driver connection."""
-        try:
-            self.driver = webdriver.Remote(
-                command_executor=config.server_url,
-                desired_capabilities=config.capabilities
-            )
+        """Initialize the Appium driver connection (warm session from the pool if available)."""
+        try:
+            device_id = config.udid or config.device_name or config.server_url
+            self.executor = get_driver_executor(device_id)
+            self.invalidate_snapshot()
+            pool = self.session_pool
+            capabilities = config.capabilities
+            if pool is not None:
+                capabilities = pooled_capabilities(capabilities, pool.idle_ttl_s)
+
+            async def create():
+                return await self._driver_call(
+                    lambda: webdriver.Remote(
+                        command_executor=config.server_url,
+                        desired_capabilities=capabilities
+                    ),
+                    timeout_ms=TIMEOUT_CONNECTION
+                )
+
+            if pool is None:
+                self.driver = await create()
+            else:
+                executor = self.executor
+
+                async def reset(driver):
+                    await self._reset_app_state(driver, config.app_package)
+
+                async def close(driver):
+                    await executor.run(driver.quit, timeout_ms=TIMEOUT_DISCONNECT)
+
+                self.driver = await pool.acquire(
+                    session_key(config),
+                    create=create,
+                    check=self._session_alive,
+                    reset=reset,
+                    close=close,
+                )
             self._log('info', 'connect', f'Connected to Android device via {config.server_url}')
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
+            self.driver = None
             self._log('error', 'connect', f'Failed to connect: {str(e)}')
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
     
     async def disconnect(self) -> ToolResult[bool]:
-        """Disconnect from the Appium driver."""
+        """Disconnect from the Appium driver (pooled sessions stay open for reuse)."""
         try:
             if self.driver:
-                self.driver.quit()
-                self.driver = None
+                await self._end_session(timeout_ms=TIMEOUT_DISCONNECT)
+            self.invalidate_snapshot()
             self._log('info', 'disconnect', 'Disconnected from Android device')
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             self._log('error', 'disconnect', f'Failed to disconnect: {str(e)}')
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
     
+    async def _end_session(self, timeout_ms: int) -> None:
+        """Release the driver to the pool, or quit it if it is not pooled."""
+        driver, self.driver = self.driver, None
+        if self.session_pool is not None and self.session_pool.owns(driver):
+            await self.session_pool.release(driver)
+        else:
+            await self._driver_call(driver.quit, timeout_ms=timeout_ms)
+    
+    async def _session_alive(self, driver: webdriver.Remote) -> bool:
+        """Pool health check: the session answers a round trip (self.driver is untouched)."""
+        return (await self._session_info(driver)).success
+    
+    async def _reset_app_state(self, driver: webdriver.Remote, app_package: Optional[str]) -> None:
+        """Pool reset: restart the app under test instead of recreating the session."""
+        if app_package:
+            await self._driver_action(driver.terminate_app, app_package, timeout_ms=TIMEOUT_TERMINATE_APP)
+            await self._driver_action(driver.activate_app, app_package, timeout_ms=TIMEOUT_LAUNCH_APP)
+    
     async def is_connected(self) -> ToolResult[bool]:
         """Check if the driver is currently connected."""
         try:
@@ -805,7 +888,7 @@ class AndroidAppiumTools(AppiumTools):
         """Set implicit element wait timeout."""
         try:
             if self.driver:
-                self.driver.implicitly_wait(milliseconds / 1000)  # Convert to seconds
+                await self._driver_call(self.driver.implicitly_wait, milliseconds / 1000, timeout_ms=TIMEOUT_SET_IMPLICIT_WAIT)  # Convert to seconds
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -816,7 +899,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            contexts = self.driver.contexts
+            contexts = await self._driver_call(lambda: self.driver.contexts, timeout_ms=TIMEOUT_GET_CONTEXTS)
             automation_contexts = []
             for context in contexts:
                 automation_contexts.append(AutomationContext(
@@ -835,7 +918,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.switch_to.context(context_name)
+            await self._driver_action(self.driver.switch_to.context, context_name, timeout_ms=TIMEOUT_SET_CONTEXT)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -846,7 +929,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            current_context = self.driver.current_context
+            current_context = await self._driver_call(lambda: self.driver.current_context, timeout_ms=TIMEOUT_GET_CONTEXTS)
             context = AutomationContext(
                 name=current_context,
                 type='WEBVIEW' if 'WEBVIEW' in current_context else 'NATIVE_APP',
@@ -863,7 +946,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.reset()
+            await self._driver_action(self.driver.reset, timeout_ms=TIMEOUT_RESET_APP)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -873,13 +956,29 @@ class AndroidAppiumTools(AppiumTools):
         try:
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
+            return await self._session_info(self.driver)
+        except Exception as e:
+            return ToolResult(success=False, error=str(e), timestamp=datetime.now())
+    
+    async def _session_info(self, driver: webdriver.Remote) -> ToolResult[DriverSessionInfo]:
+        """Session information for a given driver."""
+        try:
+            # GET /session/:id is a real round trip (driver.capabilities is cached locally)
+            capabilities = await self._driver_call(
+                lambda: driver.execute('getCapabilities')['value'], timeout_ms=TIMEOUT_UTILITY
+            )
+            
+            def capability(name):
+                return capabilities.get(name, capabilities.get(f'appium:{name}', ''))
             
             session_info = DriverSessionInfo(
-                session_id=self.driver.session_id,
+                session_id=driver.session_id,
                 platform='android',
-                capabilities=self.driver.capabilities,
-                server_url=self.driver.command_executor._url,
-                connected_at=self.start_time,
+                device_name=capability('deviceName'),
+                platform_version=str(capability('platformVersion')),
+                automation_name=capability('automationName'),
+                capabilities=capabilities,
+                created_at=self.start_time,
                 last_activity=datetime.now()
             )
             
@@ -894,7 +993,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            screenshot_base64 = self.driver.get_screenshot_as_base64()
+            screenshot_base64 = await self._driver_call(self.driver.get_screenshot_as_base64, timeout_ms=TIMEOUT_SCREENSHOT)
             return ToolResult(success=True, data=screenshot_base64, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -905,7 +1004,10 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            page_source = self.driver.page_source
+            page_source = await self._driver_call(lambda: self.driver.page_source, timeout_ms=TIMEOUT_GET_PAGE_SOURCE)
+            if self.snapshot_mode:
+                # Parsed lazily, so seeding costs nothing if no query follows
+                self._snapshot = PageSourceSnapshot(page_source)
             return ToolResult(success=True, data=page_source, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -932,17 +1034,26 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
+            matches = await self._find_in_snapshot(selector_type, selector)
+            if matches is not None:
+                if not matches or matches[0].bounds is None:
+                    return ToolResult(success=False, error="Element not found", timestamp=datetime.now())
+                return ToolResult(success=True, data=matches[0].bounds, timestamp=datetime.now())
+            
             by_selector = self._get_by_selector(selector_type, selector)
-            element = self.driver.find_element(by_selector, selector)
-            location = element.location
-            size = element.size
             
-            bounds = Bounds(
-                x=location['x'],
-                y=location['y'],
-                width=size['width'],
-                height=size['height']
-            )
+            def find_bounds() -> Bounds:
+                element = self.driver.find_element(by_selector, selector)
+                location = element.location
+                size = element.size
+                return Bounds(
+                    x=location['x'],
+                    y=location['y'],
+                    width=size['width'],
+                    height=size['height']
+                )
+            
+            bounds = await self._driver_call(find_bounds, timeout_ms=TIMEOUT_GET_BOUNDS)
             
             return ToolResult(success=True, data=bounds, timestamp=datetime.now())
         except NoSuchElementException:
@@ -956,34 +1067,15 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
+            element_infos = await self._find_in_snapshot(selector_type, selector)
+            if element_infos is not None:
+                return ToolResult(success=True, data=element_infos, timestamp=datetime.now())
+            
             by_selector = self._get_by_selector(selector_type, selector)
-            elements = self.driver.find_elements(by_selector, selector)
-            
-            element_infos = []
-            for element in elements:
-                try:
-                    location = element.location
-                    size = element.size
-                    element_info = ElementInfo(
-                        text=element.text,
-                        content_description=element.get_attribute('content-desc'),
-                        class_name=element.get_attribute('class'),
-                        package_name=element.get_attribute('package'),
-                        bounds=Bounds(
-                            x=location['x'],
-                            y=location['y'],
-                            width=size['width'],
-                            height=size['height']
-                        ),
-                        enabled=element.is_enabled(),
-                        selected=element.is_selected(),
-                        displayed=element.is_displayed(),
-                        attributes={}
-                    )
-                    element_infos.append(element_info)
-                except Exception as e:
-                    self.logger.warning(f"Failed to get info for element: {e}")
-                    continue
+            element_infos = await self._driver_call(
+                lambda: self._collect_element_infos(self.driver.find_elements(by_selector, selector)),
+                timeout_ms=TIMEOUT_GET_ELEMENTS
+            )
             
             return ToolResult(success=True, data=element_infos, timestamp=datetime.now())
         except Exception as e:
@@ -995,26 +1087,16 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
+            matches = await self._find_in_snapshot(selector_type, selector)
+            if matches is not None:
+                if not matches:
+                    return ToolResult(success=False, error="Element not found", timestamp=datetime.now())
+                return ToolResult(success=True, data=matches[0], timestamp=datetime.now())
+            
             by_selector = self._get_by_selector(selector_type, selector)
-            element = self.driver.find_element(by_selector, selector)
-            
-            location = element.location
-            size = element.size
-            element_info = ElementInfo(
-                text=element.text,
-                content_description=element.get_attribute('content-desc'),
-                class_name=element.get_attribute('class'),
-                package_name=element.get_attribute('package'),
-                bounds=Bounds(
-                    x=location['x'],
-                    y=location['y'],
-                    width=size['width'],
-                    height=size['height']
-                ),
-                enabled=element.is_enabled(),
-                selected=element.is_selected(),
-                displayed=element.is_displayed(),
-                attributes={}
+            element_info = await self._driver_call(
+                lambda: self._to_element_info(self.driver.find_element(by_selector, selector)),
+                timeout_ms=TIMEOUT_GET_ELEMENTS
             )
             
             return ToolResult(success=True, data=element_info, timestamp=datetime.now())
@@ -1029,8 +1111,12 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
+            matches = await self._find_in_snapshot(selector_type, selector)
+            if matches is not None:
+                return ToolResult(success=True, data=len(matches) > 0, timestamp=datetime.now())
+            
             by_selector = self._get_by_selector(selector_type, selector)
-            elements = self.driver.find_elements(by_selector, selector)
+            elements = await self._driver_call(self.driver.find_elements, by_selector, selector, timeout_ms=TIMEOUT_EXISTS)
             exists = len(elements) > 0
             
             return ToolResult(success=True, data=exists, timestamp=datetime.now())
@@ -1043,11 +1129,18 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
+            # Waiting implies the screen is expected to change
+            self.invalidate_snapshot()
             by_selector = self._get_by_selector(selector_type, selector)
             wait = WebDriverWait(self.driver, timeout_ms / 1000)
             
             try:
-                wait.until(EC.presence_of_element_located((by_selector, selector)))
+                # Allow one extra utility budget on top of the wait so the
+                # WebDriverWait, not the executor, decides the outcome
+                await self._driver_call(
+                    wait.until, EC.presence_of_element_located((by_selector, selector)),
+                    timeout_ms=timeout_ms + TIMEOUT_UTILITY
+                )
                 return ToolResult(success=True, data=True, timestamp=datetime.now())
             except TimeoutException:
                 return ToolResult(success=True, data=False, timestamp=datetime.now())
@@ -1060,9 +1153,13 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
+            if self.snapshot_mode:
+                snapshot = await self._get_snapshot()
+                return ToolResult(success=True, data=len(snapshot.find_text(text)) > 0, timestamp=datetime.now())
+            
             # Try to find element by text using XPath
             xpath = f"//*[contains(@text, '{text}') or contains(@content-desc, '{text}')]"
-            elements = self.driver.find_elements(By.XPATH, xpath)
+            elements = await self._driver_call(self.driver.find_elements, By.XPATH, xpath, timeout_ms=TIMEOUT_FIND_TEXT)
             found = len(elements) > 0
             
             return ToolResult(success=True, data=found, timestamp=datetime.now())
@@ -1075,34 +1172,15 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
+            if self.snapshot_mode:
+                snapshot = await self._get_snapshot()
+                return ToolResult(success=True, data=snapshot.find_text(text), timestamp=datetime.now())
+            
             xpath = f"//*[contains(@text, '{text}') or contains(@content-desc, '{text}')]"
-            elements = self.driver.find_elements(By.XPATH, xpath)
-            
-            element_infos = []
-            for element in elements:
-                try:
-                    location = element.location
-                    size = element.size
-                    element_info = ElementInfo(
-                        text=element.text,
-                        content_description=element.get_attribute('content-desc'),
-                        class_name=element.get_attribute('class'),
-                        package_name=element.get_attribute('package'),
-                        bounds=Bounds(
-                            x=location['x'],
-                            y=location['y'],
-                            width=size['width'],
-                            height=size['height']
-                        ),
-                        enabled=element.is_enabled(),
-                        selected=element.is_selected(),
-                        displayed=element.is_displayed(),
-                        attributes={}
-                    )
-                    element_infos.append(element_info)
-                except Exception as e:
-                    self.logger.warning(f"Failed to get info for element: {e}")
-                    continue
+            element_infos = await self._driver_call(
+                lambda: self._collect_element_infos(self.driver.find_elements(By.XPATH, xpath)),
+                timeout_ms=TIMEOUT_FIND_TEXT
+            )
             
             return ToolResult(success=True, data=element_infos, timestamp=datetime.now())
         except Exception as e:
@@ -1114,7 +1192,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            capabilities = self.driver.capabilities
+            capabilities = await self._driver_call(lambda: self.driver.capabilities, timeout_ms=TIMEOUT_GET_PLATFORM_INFO)
             platform_info = PlatformInfo(
                 platform='android',
                 version=capabilities.get('platformVersion', 'Unknown'),
@@ -1133,7 +1211,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            size = self.driver.get_window_size()
+            size = await self._driver_call(self.driver.get_window_size, timeout_ms=TIMEOUT_GET_SCREEN_SIZE)
             screen_size = ScreenSize(
                 width=size['width'],
                 height=size['height']
@@ -1162,7 +1240,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            current_activity = self.driver.current_activity
+            current_activity = await self._driver_call(lambda: self.driver.current_activity, timeout_ms=TIMEOUT_UTILITY)
             return ToolResult(success=True, data=current_activity, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1173,7 +1251,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            orientation = self.driver.orientation
+            orientation = await self._driver_call(lambda: self.driver.orientation, timeout_ms=TIMEOUT_GET_ORIENTATION)
             return ToolResult(success=True, data=orientation, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1184,7 +1262,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            clipboard_text = self.driver.get_clipboard_text()
+            clipboard_text = await self._driver_call(self.driver.get_clipboard_text, timeout_ms=TIMEOUT_GET_CLIPBOARD)
             return ToolResult(success=True, data=clipboard_text, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1195,8 +1273,10 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            current_package = self.driver.current_package
-            current_activity = self.driver.current_activity
+            current_package, current_activity = await self._driver_call(
+                lambda: (self.driver.current_package, self.driver.current_activity),
+                timeout_ms=TIMEOUT_GET_APP_INFO
+            )
             
             app_state = AppStateInfo(
                 package_name=current_package or 'Unknown',
@@ -1248,8 +1328,10 @@ class AndroidAppiumTools(AppiumTools):
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
             by_selector = self._get_by_selector(selector_type, selector)
-            element = self.driver.find_element(by_selector, selector)
-            element.click()
+            await self._driver_action(
+                lambda: self.driver.find_element(by_selector, selector).click(),
+                timeout_ms=TIMEOUT_TAP
+            )
             
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except NoSuchElementException:
@@ -1263,7 +1345,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.tap([(x, y)])
+            await self._driver_action(self.driver.tap, [(x, y)], timeout_ms=TIMEOUT_TAP_COORDINATES)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1275,8 +1357,10 @@ class AndroidAppiumTools(AppiumTools):
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
             xpath = f"//*[contains(@text, '{text}') or contains(@content-desc, '{text}')]"
-            element = self.driver.find_element(By.XPATH, xpath)
-            element.click()
+            await self._driver_action(
+                lambda: self.driver.find_element(By.XPATH, xpath).click(),
+                timeout_ms=TIMEOUT_TAP
+            )
             
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except NoSuchElementException:
@@ -1302,12 +1386,14 @@ class AndroidAppiumTools(AppiumTools):
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
             by_selector = self._get_by_selector(selector_type, selector)
-            element = self.driver.find_element(by_selector, selector)
             
-            if clear_first:
-                element.clear()
+            def type_into_element() -> None:
+                element = self.driver.find_element(by_selector, selector)
+                if clear_first:
+                    element.clear()
+                element.send_keys(text)
             
-            element.send_keys(text)
+            await self._driver_action(type_into_element, timeout_ms=TIMEOUT_TYPE_TEXT)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except NoSuchElementException:
             return ToolResult(success=False, error="Element not found", timestamp=datetime.now())
@@ -1320,12 +1406,15 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            if clear_first:
-                self.driver.press_keycode(123)  # KEYCODE_MOVE_END
-                self.driver.press_keycode(67)   # KEYCODE_DEL
+            def type_at_focus() -> None:
+                if clear_first:
+                    self.driver.press_keycode(123)  # KEYCODE_MOVE_END
+                    self.driver.press_keycode(67)   # KEYCODE_DEL
+                
+                self.driver.press_keycode(84)  # KEYCODE_SEARCH (simplified approach)
+                # In practice, you'd use a more sophisticated text input method
             
-            self.driver.press_keycode(84)  # KEYCODE_SEARCH (simplified approach)
-            # In practice, you'd use a more sophisticated text input method
+            await self._driver_action(type_at_focus, timeout_ms=TIMEOUT_TYPE_TEXT)
             
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
@@ -1338,8 +1427,10 @@ class AndroidAppiumTools(AppiumTools):
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
             by_selector = self._get_by_selector(selector_type, selector)
-            element = self.driver.find_element(by_selector, selector)
-            element.clear()
+            await self._driver_action(
+                lambda: self.driver.find_element(by_selector, selector).clear(),
+                timeout_ms=TIMEOUT_CLEAR_TEXT
+            )
             
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except NoSuchElementException:
@@ -1404,7 +1495,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.hide_keyboard()
+            await self._driver_action(self.driver.hide_keyboard, timeout_ms=TIMEOUT_HIDE_KEYBOARD)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1420,6 +1511,82 @@ class AndroidAppiumTools(AppiumTools):
         return ToolResult(success=False, error="Not implemented", timestamp=datetime.now())
     
     # Utility methods
+    async def _driver_call(self, fn: Callable[..., Any], *args: Any, timeout_ms: Optional[int] = None) -> Any:
+        """Run a blocking driver call on this device's executor lane."""
+        if self.executor is None:
+            self.executor = get_driver_executor(f"android-{id(self):x}")
+        return await self.executor.run(fn, *args, timeout_ms=timeout_ms)
+    
+    async def _driver_action(self, fn: Callable[..., Any], *args: Any, timeout_ms: Optional[int] = None) -> Any:
+        """Run a driver call that may change the screen, invalidating the snapshot."""
+        self.invalidate_snapshot()
+        try:
+            return await self._driver_call(fn, *args, timeout_ms=timeout_ms)
+        finally:
+            # A query may have re-captured the screen while the action was queued
+            self.invalidate_snapshot()
+    
+    def invalidate_snapshot(self) -> None:
+        """Drop the cached page source snapshot; the next query re-fetches it."""
+        self._snapshot = None
+    
+    async def _get_snapshot(self) -> PageSourceSnapshot:
+        """Get the current snapshot, fetching page_source once if needed."""
+        snapshot = self._snapshot
+        if snapshot is None:
+            page_source = await self._driver_call(lambda: self.driver.page_source, timeout_ms=TIMEOUT_GET_PAGE_SOURCE)
+            snapshot = PageSourceSnapshot(page_source)
+            self._snapshot = snapshot
+        if not snapshot.is_parsed:
+            await asyncio.to_thread(snapshot.parse)
+        return snapshot
+    
+    async def _find_in_snapshot(self, selector_type: SelectorType, selector: str) -> Optional[List[ElementInfo]]:
+        """Answer a selector query from the snapshot, or None to use the live driver."""
+        if not self.snapshot_mode or not PageSourceSnapshot.supports(selector_type, selector):
+            return None
+        snapshot = await self._get_snapshot()
+        return snapshot.find(selector_type, selector)
+    
+    def get_executor_metrics(self) -> Optional[DriverExecutorMetrics]:
+        """Get queue depth and latency metrics for this device's executor lane."""
+        return self.executor.metrics() if self.executor else None
+    
+    def _to_element_info(self, element) -> ElementInfo:
+        """Build ElementInfo from a WebElement (blocking, runs on the executor)."""
+        location = element.location
+        size = element.size
+        class_name = element.get_attribute('class')
+        return ElementInfo(
+            element_id=element.id,
+            tag_name=class_name or '',
+            text=element.text,
+            content_description=element.get_attribute('content-desc'),
+            resource_id=element.get_attribute('resource-id'),
+            class_name=class_name,
+            bounds=Bounds(
+                x=location['x'],
+                y=location['y'],
+                width=size['width'],
+                height=size['height']
+            ),
+            enabled=element.is_enabled(),
+            selected=element.is_selected(),
+            displayed=element.is_displayed(),
+            attributes={'package': element.get_attribute('package')}
+        )
+    
+    def _collect_element_infos(self, elements) -> List[ElementInfo]:
+        """Build ElementInfo for each element, skipping stale ones (blocking)."""
+        element_infos = []
+        for element in elements:
+            try:
+                element_infos.append(self._to_element_info(element))
+            except Exception as e:
+                self.logger.warning(f"Failed to get info for element: {e}")
+                continue
+        return element_infos
+    
     def _log(self, level: str, operation: str, message: str, duration: Optional[float] = None, success: bool = True, error: Optional[str] = None):
         """Log a tool operation."""
         if not self.logging_enabled:
@@ -1429,12 +1596,12 @@ class AndroidAppiumTools(AppiumTools):
             timestamp=datetime.now(),
             level=level,
             message=message,
-            tool='AndroidAppiumTools',
+            tool_name='AndroidAppiumTools',
             operation=operation,
-            duration=duration,
+            duration_ms=int(duration) if duration is not None else None,
             success=success,
             error=error,
-            context={'platform': 'android'}
+            metadata={'platform': 'android'}
         )
         
         self.logs.append(log_entry)
@@ -1495,7 +1662,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.orientation = orientation.value
+            await self._driver_action(setattr, self.driver, 'orientation', orientation.value, timeout_ms=TIMEOUT_SET_ORIENTATION)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1506,7 +1673,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            orientation = self.driver.orientation
+            orientation = await self._driver_call(lambda: self.driver.orientation, timeout_ms=TIMEOUT_GET_ORIENTATION)
             return ToolResult(success=True, data=DeviceOrientation(orientation), timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1517,7 +1684,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.lock()
+            await self._driver_action(self.driver.lock, timeout_ms=TIMEOUT_LOCK_SCREEN)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1528,7 +1695,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.unlock()
+            await self._driver_action(self.driver.unlock, timeout_ms=TIMEOUT_UNLOCK_SCREEN)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1551,7 +1718,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.set_clipboard_text(text)
+            await self._driver_call(self.driver.set_clipboard_text, text, timeout_ms=TIMEOUT_SET_CLIPBOARD)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1583,7 +1750,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.press_keycode(4)  # KEYCODE_BACK
+            await self._driver_action(self.driver.press_keycode, 4, timeout_ms=TIMEOUT_PRESS_BUTTON)  # KEYCODE_BACK
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1594,7 +1761,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.press_keycode(3)  # KEYCODE_HOME
+            await self._driver_action(self.driver.press_keycode, 3, timeout_ms=TIMEOUT_PRESS_BUTTON)  # KEYCODE_HOME
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1605,7 +1772,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.press_keycode(82)  # KEYCODE_MENU
+            await self._driver_action(self.driver.press_keycode, 82, timeout_ms=TIMEOUT_PRESS_BUTTON)  # KEYCODE_MENU
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1616,7 +1783,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.press_keycode(187)  # KEYCODE_APP_SWITCH
+            await self._driver_action(self.driver.press_keycode, 187, timeout_ms=TIMEOUT_PRESS_BUTTON)  # KEYCODE_APP_SWITCH
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1627,7 +1794,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.press_keycode(26)  # KEYCODE_POWER
+            await self._driver_action(self.driver.press_keycode, 26, timeout_ms=TIMEOUT_PRESS_BUTTON)  # KEYCODE_POWER
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1638,7 +1805,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.press_keycode(24)  # KEYCODE_VOLUME_UP
+            await self._driver_action(self.driver.press_keycode, 24, timeout_ms=TIMEOUT_PRESS_BUTTON)  # KEYCODE_VOLUME_UP
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1649,7 +1816,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.press_keycode(25)  # KEYCODE_VOLUME_DOWN
+            await self._driver_action(self.driver.press_keycode, 25, timeout_ms=TIMEOUT_PRESS_BUTTON)  # KEYCODE_VOLUME_DOWN
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1746,7 +1913,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.install_app(app_path)
+            await self._driver_action(self.driver.install_app, app_path, timeout_ms=TIMEOUT_INSTALL_APP)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1757,7 +1924,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.remove_app(package_name)
+            await self._driver_action(self.driver.remove_app, package_name, timeout_ms=TIMEOUT_UNINSTALL_APP)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1769,9 +1936,9 @@ class AndroidAppiumTools(AppiumTools):
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
             if activity_name:
-                self.driver.start_activity(package_name, activity_name)
+                await self._driver_action(self.driver.start_activity, package_name, activity_name, timeout_ms=TIMEOUT_LAUNCH_APP)
             else:
-                self.driver.activate_app(package_name)
+                await self._driver_action(self.driver.activate_app, package_name, timeout_ms=TIMEOUT_LAUNCH_APP)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1782,7 +1949,10 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.terminate_app(self.driver.current_package)
+            await self._driver_action(
+                lambda: self.driver.terminate_app(self.driver.current_package),
+                timeout_ms=TIMEOUT_CLOSE_APP
+            )
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1793,7 +1963,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.terminate_app(package_name)
+            await self._driver_action(self.driver.terminate_app, package_name, timeout_ms=TIMEOUT_TERMINATE_APP)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1804,7 +1974,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.reset()
+            await self._driver_action(self.driver.reset, timeout_ms=TIMEOUT_RESET_APP)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1815,7 +1985,11 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.background_app(milliseconds / 1000)  # Convert to seconds
+            # Budget covers the time the app spends in the background
+            await self._driver_action(
+                self.driver.background_app, milliseconds / 1000,  # Convert to seconds
+                timeout_ms=milliseconds + TIMEOUT_BACKGROUND_APP
+            )
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1826,7 +2000,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.activate_app(package_name)
+            await self._driver_action(self.driver.activate_app, package_name, timeout_ms=TIMEOUT_LAUNCH_APP)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1837,7 +2011,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            installed = self.driver.is_app_installed(package_name)
+            installed = await self._driver_call(self.driver.is_app_installed, package_name, timeout_ms=TIMEOUT_IS_APP_INSTALLED)
             return ToolResult(success=True, data=installed, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1848,7 +2022,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            current_package = self.driver.current_package
+            current_package = await self._driver_call(lambda: self.driver.current_package, timeout_ms=TIMEOUT_IS_APP_RUNNING)
             running = current_package == package_name
             return ToolResult(success=True, data=running, timestamp=datetime.now())
         except Exception as e:
@@ -1860,7 +2034,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            installed = self.driver.is_app_installed(package_name)
+            installed = await self._driver_call(self.driver.is_app_installed, package_name, timeout_ms=TIMEOUT_GET_APP_INFO)
             app_info = AppInfo(
                 package_name=package_name,
                 is_installed=installed
@@ -1883,7 +2057,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            current_package = self.driver.current_package
+            current_package = await self._driver_call(lambda: self.driver.current_package, timeout_ms=TIMEOUT_GET_APP_INFO)
             if current_package:
                 app_info = AppInfo(
                     package_name=current_package,
@@ -1901,7 +2075,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.get(url)
+            await self._driver_action(self.driver.get, url, timeout_ms=TIMEOUT_OPEN_DEEP_LINK)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -1991,7 +2165,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            self.driver.press_keycode(4)  # KEYCODE_BACK
+            await self._driver_action(self.driver.press_keycode, 4, timeout_ms=TIMEOUT_NAVIGATION)  # KEYCODE_BACK
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -2051,13 +2225,13 @@ class AndroidAppiumTools(AppiumTools):
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
             # Swipe down from top of screen
-            size = self.driver.get_window_size()
+            size = await self._driver_action(self.driver.get_window_size, timeout_ms=TIMEOUT_GET_SCREEN_SIZE)
             start_x = size['width'] // 2
             start_y = 50
             end_x = start_x
             end_y = size['height'] // 2
             
-            self.driver.swipe(start_x, start_y, end_x, end_y, 500)
+            await self._driver_action(self.driver.swipe, start_x, start_y, end_x, end_y, 500, timeout_ms=TIMEOUT_NOTIFICATIONS)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -2069,13 +2243,13 @@ class AndroidAppiumTools(AppiumTools):
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
             # Swipe up from bottom of screen
-            size = self.driver.get_window_size()
+            size = await self._driver_action(self.driver.get_window_size, timeout_ms=TIMEOUT_GET_SCREEN_SIZE)
             start_x = size['width'] // 2
             start_y = size['height'] - 50
             end_x = start_x
             end_y = size['height'] // 2
             
-            self.driver.swipe(start_x, start_y, end_x, end_y, 500)
+            await self._driver_action(self.driver.swipe, start_x, start_y, end_x, end_y, 500, timeout_ms=TIMEOUT_NOTIFICATIONS)
             return ToolResult(success=True, data=True, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -2114,7 +2288,7 @@ class AndroidAppiumTools(AppiumTools):
             if not self.driver:
                 return ToolResult(success=False, error="Driver not connected", timestamp=datetime.now())
             
-            current_url = self.driver.current_url
+            current_url = await self._driver_call(lambda: self.driver.current_url, timeout_ms=TIMEOUT_NAVIGATION)
             return ToolResult(success=True, data=current_url, timestamp=datetime.now())
         except Exception as e:
             return ToolResult(success=False, error=str(e), timestamp=datetime.now())
@@ -969,12 +969,12 @@ class IOSAppiumTools(AppiumTools):
             timestamp=datetime.now(),
             level=level,
             message=message,
-            tool='IOSAppiumTools',
+            tool_name='IOSAppiumTools',
             operation=operation,
-            duration=duration,
+            duration_ms=int(duration) if duration is not None else None,
             success=success,
             error=error,
-            context={'platform': 'ios'}
+            metadata={'platform': 'ios'}
         )
         
         self.logs.append(log_entry)
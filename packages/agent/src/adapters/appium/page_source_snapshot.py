@@ -0,0 +1,235 @@
+"""
+Page source snapshot for AppiumTools.
+
+Building ElementInfo through WebDriver costs one HTTP round trip per property
+(text, location, size, attributes, enabled/selected/displayed), i.e. 7+ calls
+per matched element. A snapshot fetches `page_source` once and answers
+selector, text and XPath queries against the parsed tree locally.
+
+The snapshot is a point-in-time view: the tools keep it until an action
+(tap, type, navigation, app management, ...) invalidates it.
+
+Supported locally:
+- ID / ACCESSIBILITY_ID / CLASS_NAME / TAG_NAME / NAME selectors
+- Text search over text, content-desc and iOS name/label/value
+- The XPath subset understood by xml.etree.ElementTree
+
+Anything else (UiAutomator, predicates, full XPath 1.0 functions such as
+contains()) reports as unsupported so the caller can fall back to the driver.
+"""
+
+import re
+import threading
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .types import Bounds, ElementInfo, SelectorType
+
+
+_ANDROID_BOUNDS = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+
+# Root tags that wrap the hierarchy but are not UI elements themselves
+_ROOT_TAGS = frozenset(['hierarchy', 'AppiumAUT'])
+
+_LOCAL_SELECTORS = frozenset([
+    SelectorType.ID,
+    SelectorType.ACCESSIBILITY_ID,
+    SelectorType.CLASS_NAME,
+    SelectorType.TAG_NAME,
+    SelectorType.NAME,
+    SelectorType.XPATH,
+])
+
+
+def parse_bounds(attrib: Dict[str, str]) -> Optional[Bounds]:
+    """
+    Parse element bounds from Android `bounds="[x1,y1][x2,y2]"` or
+    iOS `x`/`y`/`width`/`height` attributes.
+    """
+    raw = attrib.get('bounds')
+    if raw:
+        match = _ANDROID_BOUNDS.match(raw)
+        if match:
+            x1, y1, x2, y2 = (int(v) for v in match.groups())
+            return Bounds(x=x1, y=y1, width=x2 - x1, height=y2 - y1)
+        return None
+    if 'x' in attrib and 'width' in attrib:
+        try:
+            return Bounds(
+                x=int(float(attrib['x'])),
+                y=int(float(attrib.get('y', 0))),
+                width=int(float(attrib['width'])),
+                height=int(float(attrib.get('height', 0)))
+            )
+        except ValueError:
+            return None
+    return None
+
+
+def _compile_xpath(selector: str) -> Optional[str]:
+    """
+    Translate an absolute XPath into an ElementTree path relative to the
+    document wrapper, or return None if ElementTree cannot evaluate it.
+    """
+    if not selector.startswith('/'):
+        return None
+    path = '.' + selector
+    try:
+        # Compile (and cache) against an empty element to validate syntax
+        ET.Element('probe').findall(path)
+    except (SyntaxError, KeyError, TypeError):
+        return None
+    return path
+
+
+def _flag(attrib: Dict[str, str], name: str, default: bool) -> bool:
+    value = attrib.get(name)
+    if value is None:
+        return default
+    return value == 'true'
+
+
+class PageSourceSnapshot:
+    """
+    In-memory element tree parsed from one `page_source` fetch.
+
+    Parsing is lazy: constructing a snapshot only stores the XML, so caching
+    every fetched page source costs nothing until a query needs it.
+
+    USAGE:
+    ------
+    snapshot = PageSourceSnapshot(driver.page_source)
+    if PageSourceSnapshot.supports(SelectorType.ID, 'login'):
+        elements = snapshot.find(SelectorType.ID, 'login')
+    """
+
+    def __init__(self, page_source: str, captured_at: Optional[datetime] = None):
+        self.page_source = page_source
+        self.captured_at = captured_at or datetime.now()
+        self._document: Optional[ET.Element] = None
+        self._elements: List[ElementInfo] = []
+        self._by_node: Dict[ET.Element, ElementInfo] = {}
+        self._parse_lock = threading.Lock()
+
+    @property
+    def elements(self) -> List[ElementInfo]:
+        """All elements in document order."""
+        self._ensure_parsed()
+        return self._elements
+
+    @property
+    def is_parsed(self) -> bool:
+        """Whether the XML has been parsed yet."""
+        return self._document is not None
+
+    def parse(self) -> 'PageSourceSnapshot':
+        """Parse the XML now (e.g. off the event loop) instead of on first query."""
+        self._ensure_parsed()
+        return self
+
+    @staticmethod
+    def supports(selector_type: SelectorType, selector: str) -> bool:
+        """Check if a query can be answered from a snapshot."""
+        if selector_type not in _LOCAL_SELECTORS:
+            return False
+        if selector_type == SelectorType.XPATH:
+            return _compile_xpath(selector) is not None
+        return True
+
+    def find(self, selector_type: SelectorType, selector: str) -> List[ElementInfo]:
+        """
+        Find elements matching a selector.
+
+        Raises:
+            ValueError: If the selector is not supported locally (see supports()).
+        """
+        self._ensure_parsed()
+        if selector_type == SelectorType.XPATH:
+            path = _compile_xpath(selector)
+            if path is None:
+                raise ValueError(f"XPath not supported by snapshot: {selector}")
+            return [
+                self._by_node[node]
+                for node in self._document.iterfind(path)
+                if node in self._by_node
+            ]
+        if selector_type not in _LOCAL_SELECTORS:
+            raise ValueError(f"Selector type not supported by snapshot: {selector_type.value}")
+        return [e for e in self._elements if self._matches(e, selector_type, selector)]
+
+    def find_text(self, text: str) -> List[ElementInfo]:
+        """Find elements whose text, content-desc, name, label or value contains text."""
+        self._ensure_parsed()
+        matches = []
+        for element in self._elements:
+            attrs = element.attributes or {}
+            candidates = (
+                element.text, element.content_description,
+                attrs.get('name'), attrs.get('label'), attrs.get('value')
+            )
+            if any(c and text in c for c in candidates):
+                matches.append(element)
+        return matches
+
+    def _matches(self, element: ElementInfo, selector_type: SelectorType, selector: str) -> bool:
+        attrs = element.attributes or {}
+        if selector_type == SelectorType.ID:
+            resource_id = element.resource_id or ''
+            # UiAutomator2 accepts both "pkg:id/name" and the bare "name"
+            return (
+                resource_id == selector
+                or resource_id.endswith(':id/' + selector)
+                or attrs.get('name') == selector
+            )
+        if selector_type == SelectorType.ACCESSIBILITY_ID:
+            return element.content_description == selector or attrs.get('name') == selector
+        if selector_type == SelectorType.CLASS_NAME:
+            return element.class_name == selector
+        if selector_type == SelectorType.TAG_NAME:
+            return element.tag_name == selector
+        if selector_type == SelectorType.NAME:
+            return attrs.get('name') == selector or element.text == selector
+        return False
+
+    def _ensure_parsed(self) -> None:
+        if self._document is not None:
+            return
+        with self._parse_lock:
+            if self._document is not None:
+                return
+            root = ET.fromstring(self.page_source)
+            # Wrap the root so absolute paths like /hierarchy/... resolve
+            document = ET.Element('document')
+            document.append(root)
+
+            index = 0
+            for node in root.iter():
+                if node.tag in _ROOT_TAGS:
+                    continue
+                element = self._to_element_info(node, index)
+                self._elements.append(element)
+                self._by_node[node] = element
+                index += 1
+            self._document = document
+
+    def _to_element_info(self, node: ET.Element, index: int) -> ElementInfo:
+        attrib = node.attrib
+        class_name = attrib.get('class') or attrib.get('type') or node.tag
+        if 'text' in attrib:
+            text = attrib['text']
+        else:
+            text = attrib.get('value') or attrib.get('label')
+        return ElementInfo(
+            element_id=f"snapshot:{index}",
+            tag_name=node.tag,
+            text=text,
+            content_description=attrib.get('content-desc'),
+            resource_id=attrib.get('resource-id'),
+            class_name=class_name,
+            bounds=parse_bounds(attrib),
+            enabled=_flag(attrib, 'enabled', True),
+            displayed=_flag(attrib, 'displayed', _flag(attrib, 'visible', True)),
+            selected=_flag(attrib, 'selected', False),
+            attributes=dict(attrib)
+        )
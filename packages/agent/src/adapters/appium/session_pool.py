@@ -0,0 +1,293 @@
+"""
+Warm Appium session pool.
+
+Creating a UiAutomator2/XCUITest session installs and starts the automation
+server on the device, which costs 5-20 s. This pool keeps sessions open after
+a run ends and hands them to the next run with the same key, (server_url,
+device, capabilities hash), so back-to-back runs on a device start in well
+under a second.
+
+A pooled session is health-checked before reuse; a dead session is closed and
+replaced. Reuse resets the app state (terminate + activate) instead of tearing
+the session down. Sessions idle for longer than the TTL are closed on the next
+acquire/release, or by evict_idle().
+
+Appium ends a session that receives no command for newCommandTimeout seconds
+(60 s by default), which would kill idle pooled sessions long before the TTL.
+Sessions created for the pool use pooled_capabilities(), which raises
+appium:newCommandTimeout above the TTL.
+
+The pool does not know about WebDriver: callers pass async callables to create,
+check, reset and close a session, so every blocking call still runs on the
+device's executor lane (see driver_executor.py).
+"""
+
+import hashlib
+import json
+import math
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from .config import (
+    SESSION_IDLE_TIMEOUT,
+    SESSION_POOL_MAX_IDLE_PER_KEY,
+    SESSION_POOL_COMMAND_TIMEOUT_MARGIN,
+)
+
+
+class SessionKey(NamedTuple):
+    """Sessions are interchangeable only within one key."""
+    server_url: str
+    device_id: str
+    capabilities_hash: str
+
+
+def session_key(config: Any) -> SessionKey:
+    """
+    Pool key for a DriverConfig.
+
+    Args:
+        config: DriverConfig (server_url, udid/device_name, capabilities).
+    """
+    capabilities = json.dumps(config.capabilities or {}, sort_keys=True, default=str)
+    digest = hashlib.blake2b(capabilities.encode("utf-8"), digest_size=16).hexdigest()
+    device_id = config.udid or config.device_name or ""
+    return SessionKey(config.server_url, device_id, digest)
+
+
+def pooled_capabilities(capabilities: Optional[Dict[str, Any]], idle_ttl_s: float) -> Dict[str, Any]:
+    """
+    Capabilities for a session that may sit idle in the pool for idle_ttl_s.
+
+    Sets appium:newCommandTimeout to at least the TTL plus a margin (a larger
+    value already in the capabilities is kept), so the server does not end
+    the session while it waits in the pool.
+    """
+    capabilities = dict(capabilities or {})
+    minimum = math.ceil(idle_ttl_s) + SESSION_POOL_COMMAND_TIMEOUT_MARGIN
+    current = capabilities.pop('newCommandTimeout', None)
+    current = capabilities.get('appium:newCommandTimeout', current)
+    capabilities['appium:newCommandTimeout'] = max(int(current or 0), minimum)
+    return capabilities
+
+
+@dataclass
+class SessionPoolMetrics:
+    """Point-in-time metrics for the pool."""
+    idle: int = 0
+    in_use: int = 0
+    hits: int = 0  # acquires served by a warm session
+    misses: int = 0  # acquires that created a session
+    evicted_idle: int = 0  # closed after the idle TTL
+    evicted_unhealthy: int = 0  # failed the health check or the reset
+    total_create_ms: float = 0.0
+    total_reuse_ms: float = 0.0  # health check + reset of reused sessions
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+@dataclass
+class _Entry:
+    key: SessionKey
+    session: Any
+    close: Callable[[Any], Awaitable[Any]]
+    created_at: float
+    last_used: float
+    uses: int = 0
+
+
+class SessionPool:
+    """
+    Keyed pool of warm driver sessions.
+
+    USAGE:
+    ------
+    pool = get_session_pool()
+    driver = await pool.acquire(
+        session_key(config),
+        create=lambda: executor.run(lambda: webdriver.Remote(...)),
+        check=lambda d: session_is_alive(d),
+        reset=lambda d: reset_app(d),
+        close=lambda d: executor.run(d.quit),
+    )
+    ...
+    await pool.release(driver)  # back to the pool, still open
+    """
+
+    def __init__(
+        self,
+        idle_ttl_s: float = SESSION_IDLE_TIMEOUT,
+        max_idle_per_key: int = SESSION_POOL_MAX_IDLE_PER_KEY,
+    ):
+        self.idle_ttl_s = idle_ttl_s
+        self.max_idle_per_key = max_idle_per_key
+        self._lock = threading.Lock()
+        self._idle: Dict[SessionKey, List[_Entry]] = {}
+        self._in_use: Dict[int, _Entry] = {}
+        self._metrics = SessionPoolMetrics()
+        self._closed = False
+
+    async def acquire(
+        self,
+        key: SessionKey,
+        create: Callable[[], Awaitable[Any]],
+        check: Callable[[Any], Awaitable[bool]],
+        reset: Callable[[Any], Awaitable[Any]],
+        close: Callable[[Any], Awaitable[Any]],
+    ) -> Any:
+        """
+        Get a warm session for key, or create one.
+
+        Args:
+            key: session_key(config).
+            create: Open a new session.
+            check: True if a pooled session is still alive.
+            reset: Bring a reused session back to a clean app state.
+            close: Quit a session (used on eviction).
+
+        Returns:
+            The session; hand it back with release().
+        """
+        if self._closed:
+            raise RuntimeError("Session pool is shut down")
+        await self.evict_idle()
+
+        while True:
+            with self._lock:
+                stack = self._idle.get(key)
+                entry = stack.pop() if stack else None  # most recently used first
+                if stack is not None and not stack:
+                    del self._idle[key]
+            if entry is None:
+                break
+
+            started = time.perf_counter()
+            try:
+                healthy = await check(entry.session)
+                if healthy:
+                    await reset(entry.session)
+            except Exception:
+                healthy = False
+            if healthy:
+                entry.last_used = time.monotonic()
+                entry.uses += 1
+                with self._lock:
+                    self._in_use[id(entry.session)] = entry
+                    self._metrics.hits += 1
+                    self._metrics.total_reuse_ms += (time.perf_counter() - started) * 1000
+                return entry.session
+
+            with self._lock:
+                self._metrics.evicted_unhealthy += 1
+            await self._close(entry)
+
+        started = time.perf_counter()
+        session = await create()
+        now = time.monotonic()
+        entry = _Entry(key=key, session=session, close=close, created_at=now, last_used=now, uses=1)
+        with self._lock:
+            self._in_use[id(session)] = entry
+            self._metrics.misses += 1
+            self._metrics.total_create_ms += (time.perf_counter() - started) * 1000
+        return session
+
+    async def release(self, session: Any, healthy: bool = True) -> bool:
+        """
+        Return a session to the pool.
+
+        Args:
+            session: A session from acquire().
+            healthy: False to close it instead (e.g. after a crash).
+
+        Returns:
+            True if the session was pooled, False if it was closed or unknown.
+        """
+        with self._lock:
+            entry = self._in_use.pop(id(session), None)
+            if entry is None:
+                return False
+            pooled = (
+                healthy
+                and not self._closed
+                and len(self._idle.get(entry.key, ())) < self.max_idle_per_key
+            )
+            if pooled:
+                entry.last_used = time.monotonic()
+                self._idle.setdefault(entry.key, []).append(entry)
+        if not pooled:
+            await self._close(entry)
+        await self.evict_idle()
+        return pooled
+
+    def owns(self, session: Any) -> bool:
+        """True if session was acquired from this pool and not yet released."""
+        with self._lock:
+            return id(session) in self._in_use
+
+    async def evict_idle(self, now: Optional[float] = None) -> int:
+        """Close sessions idle for longer than the TTL; returns how many."""
+        now = time.monotonic() if now is None else now
+        expired: List[_Entry] = []
+        with self._lock:
+            for key in list(self._idle):
+                keep = []
+                for entry in self._idle[key]:
+                    (expired if now - entry.last_used > self.idle_ttl_s else keep).append(entry)
+                if keep:
+                    self._idle[key] = keep
+                else:
+                    del self._idle[key]
+            self._metrics.evicted_idle += len(expired)
+        for entry in expired:
+            await self._close(entry)
+        return len(expired)
+
+    def metrics(self) -> SessionPoolMetrics:
+        """Return a snapshot of the pool's metrics."""
+        with self._lock:
+            metrics = SessionPoolMetrics(**asdict(self._metrics))
+            metrics.idle = sum(len(stack) for stack in self._idle.values())
+            metrics.in_use = len(self._in_use)
+        return metrics
+
+    async def shutdown(self) -> None:
+        """Close every idle session; sessions in use are closed on release."""
+        self._closed = True
+        with self._lock:
+            entries = [entry for stack in self._idle.values() for entry in stack]
+            self._idle.clear()
+        for entry in entries:
+            await self._close(entry)
+
+    async def _close(self, entry: _Entry) -> None:
+        try:
+            await entry.close(entry.session)
+        except Exception:
+            pass  # a dead session may fail to quit; it is dropped either way
+
+
+# Process-wide pool shared by every tools instance
+_pool: Optional[SessionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_session_pool() -> SessionPool:
+    """Get (or create) the process-wide session pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._closed:
+            _pool = SessionPool()
+        return _pool
+
+
+async def shutdown_session_pool() -> None:
+    """Close every pooled session (process shutdown)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        await pool.shutdown()
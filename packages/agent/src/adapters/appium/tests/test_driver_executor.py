@@ -0,0 +1,194 @@
+"""
+Unit tests for the driver call executor.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from unittest.mock import Mock
+
+from src.adapters.appium.driver_executor import (
+    DriverExecutor, DriverCallTimeoutError, DriverQueueFullError,
+    get_driver_executor, get_driver_executor_metrics, shutdown_driver_executors
+)
+from src.adapters.appium.implementations import android_appium_tools
+from src.adapters.appium.implementations.android_appium_tools import AndroidAppiumTools
+from src.adapters.appium.types import SelectorType
+
+
+@pytest.fixture
+def executor():
+    """Fixture for a single-worker executor lane."""
+    executor = DriverExecutor(device_id='test-device', max_workers=1, max_queue_size=4)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+class TestDriverExecutor:
+    """Tests for DriverExecutor."""
+
+    @pytest.mark.asyncio
+    async def test_run_returns_result_off_loop_thread(self, executor):
+        """Calls run on a worker thread and return their result."""
+        loop_thread = threading.get_ident()
+        result, thread_id = await executor.run(lambda: ('ok', threading.get_ident()))
+        assert result == 'ok'
+        assert thread_id != loop_thread
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_live_during_blocking_call(self, executor):
+        """A blocking call does not stall other coroutines."""
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(executor.run(time.sleep, 0.1), ticker())
+        assert len(ticks) == 5
+        assert ticks[-1] - ticks[0] < 0.1
+
+    @pytest.mark.asyncio
+    async def test_exception_propagates(self, executor):
+        """Exceptions raised by the call reach the caller and are counted."""
+        def boom():
+            raise ValueError('boom')
+
+        with pytest.raises(ValueError):
+            await executor.run(boom)
+        assert executor.metrics().failed == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout(self, executor):
+        """Calls that overrun their budget raise DriverCallTimeoutError."""
+        with pytest.raises(DriverCallTimeoutError):
+            await executor.run(time.sleep, 0.2, timeout_ms=20)
+        assert executor.metrics().timed_out == 1
+
+    @pytest.mark.asyncio
+    async def test_queued_call_cancelled_on_timeout(self, executor):
+        """A call still queued when its caller times out never runs."""
+        ran = Mock()
+        blocker = asyncio.ensure_future(executor.run(time.sleep, 0.1))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(DriverCallTimeoutError):
+            await executor.run(ran, timeout_ms=10)
+        await blocker
+
+        metrics = executor.metrics()
+        ran.assert_not_called()
+        assert metrics.cancelled == 1
+        assert metrics.queue_depth == 0
+        assert metrics.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_queue_depth_metrics_and_backpressure(self, executor):
+        """Queue depth is tracked and the lane rejects calls beyond its bound."""
+        calls = [asyncio.ensure_future(executor.run(time.sleep, 0.05)) for _ in range(4)]
+        await asyncio.sleep(0.01)
+
+        metrics = executor.metrics()
+        assert metrics.in_flight == 1
+        assert metrics.queue_depth == 3
+        with pytest.raises(DriverQueueFullError):
+            await executor.run(time.sleep, 0)
+
+        await asyncio.gather(*calls)
+        metrics = executor.metrics()
+        assert metrics.completed == 4
+        assert metrics.peak_queue_depth >= 3
+        assert metrics.queue_depth == 0
+
+    @pytest.mark.asyncio
+    async def test_single_worker_serializes_calls(self, executor):
+        """One worker per device means calls never overlap."""
+        active = []
+        overlaps = []
+
+        def call():
+            active.append(1)
+            overlaps.append(len(active))
+            time.sleep(0.01)
+            active.pop()
+
+        await asyncio.gather(*(executor.run(call) for _ in range(3)))
+        assert max(overlaps) == 1
+
+
+class TestDriverExecutorRegistry:
+    """Tests for the per-device executor registry."""
+
+    def test_one_lane_per_device(self):
+        """The same device id always maps to the same lane."""
+        try:
+            assert get_driver_executor('device-a') is get_driver_executor('device-a')
+            assert get_driver_executor('device-a') is not get_driver_executor('device-b')
+            device_ids = {m.device_id for m in get_driver_executor_metrics()}
+            assert {'device-a', 'device-b'} <= device_ids
+        finally:
+            shutdown_driver_executors()
+
+    def test_shutdown_clears_registry(self):
+        """Shutting down drops every lane."""
+        get_driver_executor('device-c')
+        shutdown_driver_executors()
+        assert get_driver_executor_metrics() == []
+
+
+class TestAndroidToolsExecutor:
+    """Tests for AndroidAppiumTools routing driver calls through the executor."""
+
+    @pytest.fixture
+    def android_tools(self):
+        """Fixture for AndroidAppiumTools with a mocked driver."""
+        tools = AndroidAppiumTools()
+        tools.driver = Mock()
+        tools.executor = DriverExecutor(device_id='tools-device')
+        yield tools
+        tools.executor.shutdown(wait=True)
+
+    @pytest.mark.asyncio
+    async def test_get_page_source_uses_executor(self, android_tools):
+        """page_source is read on the executor lane."""
+        android_tools.driver.page_source = '<hierarchy/>'
+        result = await android_tools.get_page_source()
+
+        assert result.success
+        assert result.data == '<hierarchy/>'
+        assert android_tools.get_executor_metrics().completed == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_driver_call_times_out(self, android_tools, monkeypatch):
+        """A driver call that overruns its TIMEOUT_* budget fails the tool call."""
+        android_tools.driver.get_screenshot_as_base64.side_effect = lambda: time.sleep(0.2)
+        monkeypatch.setattr(android_appium_tools, 'TIMEOUT_SCREENSHOT', 20)
+        result = await android_tools.screenshot()
+
+        assert not result.success
+        assert 'timed out' in result.error
+
+    @pytest.mark.asyncio
+    async def test_get_elements_by_selector(self, android_tools):
+        """Live element lookups build ElementInfo on the executor lane."""
+        android_tools.snapshot_mode = False
+        element = Mock()
+        element.id = 'el-1'
+        element.text = 'Login'
+        element.location = {'x': 1, 'y': 2}
+        element.size = {'width': 3, 'height': 4}
+        element.get_attribute.side_effect = lambda name: {
+            'class': 'android.widget.Button',
+            'resource-id': 'com.example:id/login',
+        }.get(name)
+        android_tools.driver.find_elements.return_value = [element]
+
+        result = await android_tools.get_elements_by_selector(SelectorType.ID, 'login')
+
+        assert result.success
+        assert result.data[0].element_id == 'el-1'
+        assert result.data[0].resource_id == 'com.example:id/login'
+        assert result.data[0].bounds.width == 3
@@ -0,0 +1,165 @@
+"""
+Unit tests for page source snapshots.
+"""
+
+import pytest
+from unittest.mock import Mock, PropertyMock
+
+from src.adapters.appium.driver_executor import DriverExecutor
+from src.adapters.appium.implementations.android_appium_tools import AndroidAppiumTools
+from src.adapters.appium.page_source_snapshot import PageSourceSnapshot, parse_bounds
+from src.adapters.appium.types import SelectorType
+
+
+ANDROID_SOURCE = """<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>
+<hierarchy index="0" class="hierarchy" rotation="0" width="1080" height="2220">
+  <android.widget.FrameLayout index="0" text="" resource-id="" class="android.widget.FrameLayout" package="com.example" content-desc="" enabled="true" selected="false" displayed="true" bounds="[0,0][1080,2220]">
+    <android.widget.TextView index="0" text="Welcome back" resource-id="com.example:id/title" class="android.widget.TextView" package="com.example" content-desc="" enabled="true" selected="false" displayed="true" bounds="[40,100][1040,180]" />
+    <android.widget.Button index="1" text="Log in" resource-id="com.example:id/login" class="android.widget.Button" package="com.example" content-desc="Login button" enabled="true" selected="false" displayed="true" bounds="[40,400][1040,520]" />
+    <android.widget.Button index="2" text="Sign up" resource-id="com.example:id/signup" class="android.widget.Button" package="com.example" content-desc="" enabled="false" selected="false" displayed="true" bounds="[40,560][1040,680]" />
+  </android.widget.FrameLayout>
+</hierarchy>"""
+
+IOS_SOURCE = """<?xml version="1.0" encoding="UTF-8"?>
+<AppiumAUT>
+  <XCUIElementTypeApplication type="XCUIElementTypeApplication" name="Example" enabled="true" visible="true" x="0" y="0" width="390" height="844">
+    <XCUIElementTypeButton type="XCUIElementTypeButton" name="login" label="Log in" enabled="true" visible="true" x="20" y="400" width="350" height="44" />
+  </XCUIElementTypeApplication>
+</AppiumAUT>"""
+
+
+class TestPageSourceSnapshot:
+    """Tests for PageSourceSnapshot queries."""
+
+    @pytest.fixture
+    def snapshot(self):
+        """Fixture for an Android snapshot."""
+        return PageSourceSnapshot(ANDROID_SOURCE)
+
+    def test_parse_is_lazy(self, snapshot):
+        """Constructing a snapshot does not parse the XML."""
+        assert not snapshot.is_parsed
+        assert len(snapshot.elements) == 4
+        assert snapshot.is_parsed
+
+    def test_element_info_fields(self, snapshot):
+        """Elements carry bounds, flags and attributes from the XML."""
+        login = snapshot.find(SelectorType.ID, 'com.example:id/login')[0]
+        assert login.text == 'Log in'
+        assert login.class_name == 'android.widget.Button'
+        assert login.content_description == 'Login button'
+        assert (login.bounds.x, login.bounds.y, login.bounds.width, login.bounds.height) == (40, 400, 1000, 120)
+        assert login.enabled
+        assert login.attributes['package'] == 'com.example'
+
+    def test_find_by_bare_id(self, snapshot):
+        """Bare ids match the name part of resource-id."""
+        assert [e.text for e in snapshot.find(SelectorType.ID, 'signup')] == ['Sign up']
+
+    def test_find_by_accessibility_id_and_class(self, snapshot):
+        """Accessibility id and class name selectors are answered locally."""
+        assert snapshot.find(SelectorType.ACCESSIBILITY_ID, 'Login button')[0].text == 'Log in'
+        assert len(snapshot.find(SelectorType.CLASS_NAME, 'android.widget.Button')) == 2
+
+    def test_find_by_xpath(self, snapshot):
+        """The ElementTree XPath subset is answered locally."""
+        assert len(snapshot.find(SelectorType.XPATH, "//android.widget.Button")) == 2
+        matches = snapshot.find(SelectorType.XPATH, "//*[@resource-id='com.example:id/title']")
+        assert [e.text for e in matches] == ['Welcome back']
+        matches = snapshot.find(SelectorType.XPATH, "/hierarchy/android.widget.FrameLayout/android.widget.Button[2]")
+        assert [e.text for e in matches] == ['Sign up']
+
+    def test_unsupported_selectors(self, snapshot):
+        """XPath functions and driver-only strategies report as unsupported."""
+        assert not PageSourceSnapshot.supports(SelectorType.XPATH, "//*[contains(@text, 'Log')]")
+        assert not PageSourceSnapshot.supports(SelectorType.ANDROID_UIAUTOMATOR, 'new UiSelector()')
+        assert PageSourceSnapshot.supports(SelectorType.XPATH, '//android.widget.Button')
+        with pytest.raises(ValueError):
+            snapshot.find(SelectorType.ANDROID_UIAUTOMATOR, 'new UiSelector()')
+
+    def test_find_text(self, snapshot):
+        """Text search covers text and content-desc."""
+        assert [e.text for e in snapshot.find_text('Log')] == ['Log in']
+        assert [e.text for e in snapshot.find_text('button')] == ['Log in']
+        assert snapshot.find_text('missing') == []
+
+    def test_ios_source(self):
+        """iOS sources parse x/y/width/height bounds and name/label."""
+        snapshot = PageSourceSnapshot(IOS_SOURCE)
+        button = snapshot.find(SelectorType.ACCESSIBILITY_ID, 'login')[0]
+        assert button.text == 'Log in'
+        assert button.bounds.width == 350
+        assert snapshot.find_text('Log in') == [button]
+
+    def test_parse_bounds_invalid(self):
+        """Malformed bounds parse to None."""
+        assert parse_bounds({'bounds': 'garbage'}) is None
+        assert parse_bounds({}) is None
+
+
+class TestAndroidToolsSnapshotMode:
+    """Tests for AndroidAppiumTools answering queries from a snapshot."""
+
+    @pytest.fixture
+    def android_tools(self):
+        """Fixture for AndroidAppiumTools with a mocked driver."""
+        tools = AndroidAppiumTools()
+        tools.driver = Mock()
+        tools.executor = DriverExecutor(device_id='snapshot-device')
+        tools.snapshot_mode = True
+        yield tools
+        tools.executor.shutdown(wait=True)
+
+    @pytest.fixture
+    def page_source(self, android_tools):
+        """Count page_source fetches on the mocked driver."""
+        page_source = PropertyMock(return_value=ANDROID_SOURCE)
+        type(android_tools.driver).page_source = page_source
+        return page_source
+
+    @pytest.mark.asyncio
+    async def test_queries_share_one_page_source_fetch(self, android_tools, page_source):
+        """Selector, text and XPath queries reuse a single fetch and make no element calls."""
+        elements = await android_tools.get_elements_by_selector(SelectorType.CLASS_NAME, 'android.widget.Button')
+        by_text = await android_tools.get_elements_by_text('Welcome')
+        exists = await android_tools.exists(SelectorType.XPATH, '//android.widget.Button')
+        bounds = await android_tools.get_bounds_by_selector(SelectorType.ID, 'login')
+
+        assert [e.text for e in elements.data] == ['Log in', 'Sign up']
+        assert by_text.data[0].resource_id == 'com.example:id/title'
+        assert exists.data is True
+        assert bounds.data.y == 400
+        assert page_source.call_count == 1
+        android_tools.driver.find_elements.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_action_invalidates_snapshot(self, android_tools, page_source):
+        """An action forces the next query to re-fetch page_source."""
+        await android_tools.exists(SelectorType.ID, 'login')
+        await android_tools.tap_by_selector(SelectorType.ID, 'login')
+        await android_tools.exists(SelectorType.ID, 'login')
+        assert page_source.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_page_source_seeds_snapshot(self, android_tools, page_source):
+        """A page source fetched for the caller is reused by later queries."""
+        await android_tools.get_page_source()
+        result = await android_tools.get_element_info(SelectorType.ID, 'title')
+        assert result.data.text == 'Welcome back'
+        assert page_source.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_element(self, android_tools, page_source):
+        """Queries for missing elements fail the same way as the live path."""
+        result = await android_tools.get_element_info(SelectorType.ID, 'missing')
+        assert not result.success
+        assert result.error == 'Element not found'
+
+    @pytest.mark.asyncio
+    async def test_unsupported_selector_uses_driver(self, android_tools, page_source):
+        """Selectors the snapshot cannot evaluate fall back to the driver."""
+        android_tools.driver.find_elements.return_value = []
+        result = await android_tools.get_elements_by_selector(SelectorType.ANDROID_UIAUTOMATOR, 'new UiSelector()')
+        assert result.success
+        android_tools.driver.find_elements.assert_called_once()
+        assert page_source.call_count == 0
@@ -0,0 +1,185 @@
+"""
+Unit tests for the warm Appium session pool.
+"""
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.adapters.appium.implementations import android_appium_tools
+from src.adapters.appium.implementations.android_appium_tools import AndroidAppiumTools
+from src.adapters.appium.session_pool import SessionPool, pooled_capabilities, session_key
+from src.adapters.appium.types import DriverConfig
+
+
+class FakeSessions:
+    """Async create/check/reset/close callbacks over plain objects."""
+
+    def __init__(self):
+        self.created = []
+        self.closed = []
+        self.resets = 0
+        self.dead = set()
+
+    async def create(self):
+        session = object()
+        self.created.append(session)
+        return session
+
+    async def check(self, session):
+        return session not in self.dead
+
+    async def reset(self, session):
+        self.resets += 1
+
+    async def close(self, session):
+        self.closed.append(session)
+
+    def callbacks(self):
+        return dict(create=self.create, check=self.check, reset=self.reset, close=self.close)
+
+
+def _config(**overrides):
+    values = dict(
+        platform_name='Android',
+        udid='emulator-5554',
+        capabilities={'platformName': 'Android', 'appium:udid': 'emulator-5554'},
+    )
+    values.update(overrides)
+    return DriverConfig(**values)
+
+
+class TestSessionPool:
+    """Tests for SessionPool."""
+
+    def test_session_key(self):
+        """Keys depend on server, device and capabilities (order-insensitive)."""
+        a = session_key(_config(capabilities={'a': 1, 'b': 2}))
+        assert a == session_key(_config(capabilities={'b': 2, 'a': 1}))
+        assert a != session_key(_config(capabilities={'a': 1, 'b': 3}))
+        assert a != session_key(_config(capabilities={'a': 1, 'b': 2}, udid='emulator-5556'))
+
+    def test_pooled_capabilities_outlive_idle_ttl(self):
+        """Pooled sessions get a server-side command timeout above the pool TTL."""
+        capabilities = pooled_capabilities({'platformName': 'Android'}, idle_ttl_s=300)
+        assert capabilities['appium:newCommandTimeout'] > 300
+        assert capabilities['platformName'] == 'Android'
+        # A longer timeout already requested is kept
+        assert pooled_capabilities({'appium:newCommandTimeout': 3600}, 300)['appium:newCommandTimeout'] == 3600
+        assert 'newCommandTimeout' not in pooled_capabilities({'newCommandTimeout': 60}, 300)
+
+    @pytest.mark.asyncio
+    async def test_reuse_resets_instead_of_recreating(self):
+        """A released session is handed to the next acquire of the same key."""
+        pool = SessionPool(idle_ttl_s=60)
+        fake = FakeSessions()
+        key = session_key(_config())
+
+        first = await pool.acquire(key, **fake.callbacks())
+        assert await pool.release(first)
+        second = await pool.acquire(key, **fake.callbacks())
+
+        assert second is first
+        assert len(fake.created) == 1
+        assert fake.resets == 1
+        metrics = pool.metrics()
+        assert (metrics.hits, metrics.misses, metrics.in_use, metrics.idle) == (1, 1, 1, 0)
+
+        other = await pool.acquire(session_key(_config(udid='emulator-5556')), **fake.callbacks())
+        assert other is not first
+
+    @pytest.mark.asyncio
+    async def test_unhealthy_session_is_replaced(self):
+        pool = SessionPool()
+        fake = FakeSessions()
+        key = session_key(_config())
+        first = await pool.acquire(key, **fake.callbacks())
+        await pool.release(first)
+        fake.dead.add(first)
+
+        second = await pool.acquire(key, **fake.callbacks())
+        assert second is not first
+        assert fake.closed == [first]
+        assert pool.metrics().evicted_unhealthy == 1
+
+    @pytest.mark.asyncio
+    async def test_idle_ttl_and_capacity(self):
+        pool = SessionPool(idle_ttl_s=10, max_idle_per_key=1)
+        fake = FakeSessions()
+        key = session_key(_config())
+        a = await pool.acquire(key, **fake.callbacks())
+        b = await pool.acquire(key, **fake.callbacks())
+        assert await pool.release(a)
+        assert not await pool.release(b)  # over max_idle_per_key
+        assert fake.closed == [b]
+
+        assert await pool.evict_idle() == 0
+        import time
+        assert await pool.evict_idle(now=time.monotonic() + 11) == 1
+        assert fake.closed == [b, a]
+        assert pool.metrics().idle == 0
+
+    @pytest.mark.asyncio
+    async def test_unhealthy_release_and_shutdown(self):
+        pool = SessionPool()
+        fake = FakeSessions()
+        key = session_key(_config())
+        a = await pool.acquire(key, **fake.callbacks())
+        assert not await pool.release(a, healthy=False)
+        b = await pool.acquire(key, **fake.callbacks())
+        await pool.release(b)
+        await pool.shutdown()
+        assert fake.closed == [a, b]
+        with pytest.raises(RuntimeError):
+            await pool.acquire(key, **fake.callbacks())
+
+
+class TestAndroidToolsSessionPool:
+    """AndroidAppiumTools reuses pooled sessions across connect/disconnect."""
+
+    @pytest.mark.asyncio
+    async def test_back_to_back_connects_reuse_session(self):
+        pool = SessionPool()
+        driver = MagicMock()
+        driver.execute.return_value = {'value': {'appium:deviceName': 'Pixel', 'platformVersion': '14'}}
+        config = _config(app_package='com.example')
+
+        with patch.object(android_appium_tools.webdriver, 'Remote', return_value=driver) as remote:
+            for _ in range(2):
+                tools = AndroidAppiumTools()
+                tools.session_pool = pool
+                assert (await tools.connect(config)).success
+                assert tools.driver is driver
+                assert (await tools.disconnect()).success
+
+        assert remote.call_count == 1
+        requested = remote.call_args.kwargs['desired_capabilities']
+        assert requested['appium:newCommandTimeout'] > pool.idle_ttl_s
+        driver.quit.assert_not_called()
+        driver.terminate_app.assert_called_once_with('com.example')
+        driver.activate_app.assert_called_once_with('com.example')
+        assert pool.metrics().hits == 1
+        await pool.shutdown()
+        driver.quit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_get_session_info_round_trip(self):
+        tools = AndroidAppiumTools()
+        tools.driver = MagicMock()
+        tools.driver.session_id = 'abc'
+        tools.driver.execute.return_value = {
+            'value': {'appium:deviceName': 'Pixel', 'platformVersion': '14', 'automationName': 'UiAutomator2'}
+        }
+        result = await tools.get_session_info()
+        assert result.success
+        tools.driver.execute.assert_called_once_with('getCapabilities')
+        info = result.data
+        assert (info.session_id, info.device_name, info.platform_version) == ('abc', 'Pixel', '14')
+        assert info.automation_name == 'UiAutomator2'
+
+    @pytest.mark.asyncio
+    async def test_health_check_does_not_assign_driver(self):
+        tools = AndroidAppiumTools()
+        pooled = MagicMock()
+        pooled.execute.return_value = {'value': {}}
+        assert await tools._session_alive(pooled)
+        assert tools.driver is None
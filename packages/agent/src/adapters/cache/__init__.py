@@ -17,8 +17,14 @@ DEPENDENCIES (FORBIDDEN):
 
 IMPLEMENTATION:
 ---------------
-- CacheAdapter: Main adapter class
-- key_builder: Build cache keys from state
+- CacheAdapter: Main adapter class (adapter.py)
+- memory_tier: LRU + TTL in-memory tier
+- sqlite_tier: Persistent SQLite tier
+- RedisCacheAdapter: Shared Redis-protocol backend (redis_adapter.py)
+- resp_client: Pipelined asyncio RESP client (no redis SDK)
+- fake_redis: In-process Redis stand-in for tests
+- create_cache_adapter: CacheConfig → adapter (factory.py)
+- key building: agent/services/cache_key_builder.py (nodes build keys)
 - serializer: Serialize/deserialize domain types
 
 CACHE OPTIONS:
@@ -29,15 +35,22 @@ CACHE OPTIONS:
 
 CACHE KEYS:
 -----------
-- Prompt cache: {node_type}:{model}:{signature}:{delta_hash}:{topK_hash}
+- Prompt cache: {node_type}:{model}:p{prompt_version}:{signature}:{delta_hash}:{topK_hash}:{policy}
 - Advice store: advice:{signature}
 
 TODO:
 -----
-- [ ] Implement CacheAdapter class (in-memory + Redis)
-- [ ] Add key building logic
-- [ ] Add serialization (domain types ↔ JSON)
-- [ ] Add TTL support
-- [ ] Add stats tracking (hits, misses, evictions)
+- [x] Implement CacheAdapter class (in-memory LRU + SQLite)
+- [x] Add Redis backend (RedisCacheAdapter)
+- [x] Add key building logic (CacheKeyBuilder)
+- [x] Add serialization (domain types ↔ JSON)
+- [x] Add TTL support
+- [x] Add stats tracking (hits, misses, evictions)
 """
 
+from .adapter import CacheAdapter
+from .factory import create_cache_adapter
+from .redis_adapter import RedisCacheAdapter
+
+__all__ = ["CacheAdapter", "RedisCacheAdapter", "create_cache_adapter"]
+
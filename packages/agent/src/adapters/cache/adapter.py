@@ -0,0 +1,224 @@
+"""
+CacheAdapter: Tiered CachePort Implementation
+
+PURPOSE:
+--------
+Cache LLM outputs and advice in process, so a repeated screen costs a dict
+lookup instead of an LLM call.
+
+ALLOWED DEPENDENCIES:
+---------------------
+- src.agent.ports.cache_port (CachePort interface)
+- src.agent.domain (Advice)
+- src.agent.orchestrator.policy.constants (TTL policy)
+- asyncio, sqlite3 (stdlib)
+
+FORBIDDEN DEPENDENCIES:
+-----------------------
+- NO other adapters
+- NO Redis/Memcached SDKs (a distributed tier can be added behind the
+  same two-tier interface)
+
+TIERS:
+------
+1. Memory: LRU bounded by entries and bytes, per-entry TTL (memory_tier.py)
+2. Disk: SQLite in WAL mode, persistent across restarts (sqlite_tier.py);
+   optional (path=None → memory only)
+
+- Reads: memory → disk; a disk hit is promoted to memory
+- get_advice_many(): one disk query for all memory misses, so cache
+  warm-up at session start loads the hot set into memory in one call
+- Writes: write-through to both tiers
+- Disk calls run in asyncio.to_thread so the event loop never blocks on I/O
+
+TTL:
+----
+- Prompt cache and advice: LLM_CACHE_TTL_SECONDS (7 days)
+- Routing decisions (should_continue:*, switch_policy:* keys):
+  ROUTING_CACHE_TTL_SECONDS (1 hour)
+- An explicit ttl argument always wins
+
+STATS:
+------
+get_stats(): hits, misses, memory_hits, disk_hits, sets, evictions,
+expirations, invalidations, size, bytes, disk_size
+
+USAGE:
+------
+cache = CacheAdapter(path="/var/cache/screengraph/cache.sqlite3")
+await cache.set_prompt_cache(key, {"action_index": 3})
+value = await cache.get_prompt_cache(key)
+await cache.close()
+"""
+
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.agent.domain import Advice
+from src.agent.orchestrator.policy.constants import (
+    LLM_CACHE_TTL_SECONDS,
+    ROUTING_CACHE_TTL_SECONDS,
+)
+from src.agent.ports.cache_port import CachePort
+
+from .memory_tier import MemoryTier
+from .serializer import dump_advice, dump_json, load_advice, load_json
+from .sqlite_tier import SQLiteTier
+
+
+ADVICE_PREFIX = "advice:"
+ROUTING_KEY_PREFIXES = ("should_continue:", "switch_policy:")
+PURGE_EVERY_SETS = 1000  # expired disk rows are deleted every N writes
+
+
+class CacheAdapter(CachePort):
+    """
+    Two-tier (memory LRU + SQLite) implementation of CachePort.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 2**20,
+        prompt_ttl_s: int = LLM_CACHE_TTL_SECONDS,
+        advice_ttl_s: int = LLM_CACHE_TTL_SECONDS,
+        routing_ttl_s: int = ROUTING_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path: SQLite file for the disk tier (None: memory only).
+            max_entries, max_bytes: Memory tier bounds.
+            prompt_ttl_s, advice_ttl_s, routing_ttl_s: Default TTLs.
+            clock: Wall clock (seconds); injectable for tests.
+        """
+        self.clock = clock
+        self.prompt_ttl_s = prompt_ttl_s
+        self.advice_ttl_s = advice_ttl_s
+        self.routing_ttl_s = routing_ttl_s
+        self.memory = MemoryTier(max_entries=max_entries, max_bytes=max_bytes, clock=clock)
+        self.disk = SQLiteTier(path, clock=clock) if path else None
+        self._disk_hits = 0
+        self._misses = 0  # lookups that missed both tiers
+        self._sets = 0
+        self._invalidations = 0
+
+    # ------------------------------------------------------------------
+    # CachePort
+    # ------------------------------------------------------------------
+
+    async def get_prompt_cache(self, key: str) -> Optional[Dict[str, Any]]:
+        return await self._get(key, load_json)
+
+    async def set_prompt_cache(
+        self,
+        key: str,
+        value: Dict[str, Any],
+        ttl: Optional[int] = None,
+    ) -> None:
+        """Store an LLM output; ttl defaults by key (routing keys: 1 hour, else 7 days)."""
+        if ttl is None:
+            ttl = self.routing_ttl_s if key.startswith(ROUTING_KEY_PREFIXES) else self.prompt_ttl_s
+        await self._set(key, value, dump_json(value), ttl)
+
+    async def get_advice(self, signature: str) -> Optional[Advice]:
+        return await self._get(ADVICE_PREFIX + signature, load_advice)
+
+    async def get_advice_many(self, signatures: List[str]) -> Dict[str, Advice]:
+        """Memory probe per signature, then one disk query for the misses (promoted)."""
+        found: Dict[str, Advice] = {}
+        missing = []
+        for signature in signatures:
+            advice = self.memory.get(ADVICE_PREFIX + signature)
+            if advice is not None:
+                found[signature] = advice
+            else:
+                missing.append(ADVICE_PREFIX + signature)
+        if not missing or self.disk is None:
+            self._misses += len(missing)
+            return found
+        rows = await asyncio.to_thread(self.disk.get_many, missing)
+        for key, (blob, expires_at) in rows.items():
+            advice = load_advice(blob)
+            self.memory.set(key, advice, len(blob), expires_at)
+            found[key[len(ADVICE_PREFIX):]] = advice
+        self._disk_hits += len(rows)
+        self._misses += len(missing) - len(rows)
+        return found
+
+    async def set_advice(self, signature: str, advice: Advice, ttl: Optional[int] = None) -> None:
+        await self._set(
+            ADVICE_PREFIX + signature,
+            advice,
+            dump_advice(advice),
+            self.advice_ttl_s if ttl is None else ttl,
+        )
+
+    async def invalidate(self, pattern: str) -> int:
+        """
+        Invalidate keys matching a glob pattern in both tiers.
+
+        Returns:
+            Number of keys removed from the disk tier (every write goes
+            through to disk, so memory holds a subset); the memory count
+            when there is no disk tier.
+        """
+        count = self.memory.invalidate(pattern)
+        if self.disk is not None:
+            count = await asyncio.to_thread(self.disk.invalidate, pattern)
+        self._invalidations += count
+        return count
+
+    async def get_stats(self) -> Dict[str, int]:
+        memory = self.memory.stats
+        return {
+            "hits": memory.hits + self._disk_hits,
+            "misses": self._misses,
+            "memory_hits": memory.hits,
+            "disk_hits": self._disk_hits,
+            "sets": self._sets,
+            "evictions": memory.evictions,
+            "expirations": memory.expirations,
+            "invalidations": self._invalidations,
+            "size": len(self.memory),
+            "bytes": self.memory.bytes,
+            "disk_size": await asyncio.to_thread(self.disk.count) if self.disk is not None else 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def close(self) -> None:
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.close)
+            self.disk = None
+
+    # ------------------------------------------------------------------
+    # Tiering
+    # ------------------------------------------------------------------
+
+    async def _get(self, key: str, decode: Callable[[bytes], Any]) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        row = await asyncio.to_thread(self.disk.get, key) if self.disk is not None else None
+        if row is None:
+            self._misses += 1
+            return None
+        blob, expires_at = row
+        value = decode(blob)
+        self.memory.set(key, value, len(blob), expires_at)
+        self._disk_hits += 1
+        return value
+
+    async def _set(self, key: str, value: Any, blob: bytes, ttl: int) -> None:
+        expires_at = self.clock() + ttl
+        self.memory.set(key, value, len(blob), expires_at)
+        self._sets += 1
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, blob, expires_at)
+            if self._sets % PURGE_EVERY_SETS == 0:
+                await asyncio.to_thread(self.disk.purge_expired)
@@ -0,0 +1,37 @@
+"""
+Cache adapter factory.
+
+Builds the CachePort implementation selected by RuntimeConfig.CacheConfig:
+"memory" → CacheAdapter (in-process LRU, optional SQLite disk tier),
+"redis" → RedisCacheAdapter (shared across workers).
+"""
+
+from typing import Optional
+
+from src.agent.config.runtime_config import CacheConfig
+from src.agent.ports.cache_port import CachePort
+
+from .adapter import CacheAdapter
+from .redis_adapter import RedisCacheAdapter
+
+
+def create_cache_adapter(config: CacheConfig, path: Optional[str] = None) -> CachePort:
+    """
+    Create the cache adapter for a CacheConfig.
+
+    Args:
+        config: Cache type, Redis URL and default TTL.
+        path: SQLite file for the memory adapter's disk tier (None: memory only).
+
+    Raises:
+        ValueError: Unknown cache_type.
+    """
+    if config.cache_type == "memory":
+        return CacheAdapter(path=path, prompt_ttl_s=config.ttl_seconds, advice_ttl_s=config.ttl_seconds)
+    if config.cache_type == "redis":
+        return RedisCacheAdapter(
+            config.redis_url,
+            prompt_ttl_s=config.ttl_seconds,
+            advice_ttl_s=config.ttl_seconds,
+        )
+    raise ValueError(f"Unsupported cache_type: {config.cache_type} (expected memory | redis)")
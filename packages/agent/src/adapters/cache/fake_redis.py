@@ -0,0 +1,215 @@
+"""
+FakeRedisServer: in-process Redis-protocol server for tests.
+
+Serves the command subset RedisCacheAdapter uses (PING, GET, SET with
+EX/PX/NX, MGET, MSET, DEL/UNLINK, EXPIRE, TTL, PTTL, SCAN, DBSIZE, FLUSHDB,
+SELECT, AUTH) on a loopback port from the running event loop, so the cache
+tests exercise the real RESP client and pipelining without a Redis server.
+Expiry follows an injectable clock; reply_delay_s holds back every reply
+(slow-server tests).
+"""
+
+import asyncio
+import time
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .resp_client import RespError, read_reply
+
+
+class FakeRedisServer:
+    """
+    Loopback Redis stand-in (one shared keyspace, single-threaded).
+
+    USAGE:
+    ------
+    async with FakeRedisServer() as server:
+        cache = RedisCacheAdapter(server.url)
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.commands: List[str] = []  # command names, in arrival order
+        self.reply_delay_s = 0.0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.port = 0
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.port}/0"
+
+    async def start(self) -> "FakeRedisServer":
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "FakeRedisServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    # ------------------------------------------------------------------
+    # Protocol
+    # ------------------------------------------------------------------
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                reply = self._dispatch(await read_reply(reader))
+                if self.reply_delay_s:
+                    await asyncio.sleep(self.reply_delay_s)
+                writer.write(_encode_reply(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _dispatch(self, request: Any) -> Any:
+        if not isinstance(request, list) or not request:
+            return RespError("ERR protocol error")
+        name = request[0].decode("ascii").upper()
+        self.commands.append(name)
+        handler = getattr(self, f"_cmd_{name.lower()}", None)
+        if handler is None:
+            return RespError(f"ERR unknown command '{name}'")
+        try:
+            return handler(*request[1:])
+        except (TypeError, ValueError):
+            return RespError(f"ERR wrong arguments for '{name}' command")
+
+    # ------------------------------------------------------------------
+    # Keyspace
+    # ------------------------------------------------------------------
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= self.clock():
+            del self.data[key]
+            return None
+        return value
+
+    def _cmd_ping(self, *args: bytes) -> Any:
+        return args[0] if args else "PONG"
+
+    def _cmd_auth(self, *args: bytes) -> str:
+        return "OK"
+
+    def _cmd_select(self, db: bytes) -> str:
+        int(db)
+        return "OK"
+
+    def _cmd_get(self, key: bytes) -> Optional[bytes]:
+        return self._live(key)
+
+    def _cmd_mget(self, *keys: bytes) -> List[Optional[bytes]]:
+        return [self._live(key) for key in keys]
+
+    def _cmd_set(self, key: bytes, value: bytes, *options: bytes) -> Optional[str]:
+        expires_at = None
+        nx = False
+        opts = iter(options)
+        for option in opts:
+            option = option.upper()
+            if option == b"EX":
+                expires_at = self.clock() + int(next(opts))
+            elif option == b"PX":
+                expires_at = self.clock() + int(next(opts)) / 1000
+            elif option == b"NX":
+                nx = True
+            else:
+                raise ValueError(option)
+        if nx and self._live(key) is not None:
+            return None
+        self.data[key] = (value, expires_at)
+        return "OK"
+
+    def _cmd_mset(self, *pairs: bytes) -> str:
+        if not pairs or len(pairs) % 2:
+            raise ValueError("odd number of arguments")
+        for key, value in zip(pairs[::2], pairs[1::2]):
+            self.data[key] = (value, None)
+        return "OK"
+
+    def _cmd_del(self, *keys: bytes) -> int:
+        removed = [key for key in dict.fromkeys(keys) if self._live(key) is not None]
+        for key in removed:
+            del self.data[key]
+        return len(removed)
+
+    _cmd_unlink = _cmd_del
+
+    def _cmd_expire(self, key: bytes, seconds: bytes) -> int:
+        value = self._live(key)
+        if value is None:
+            return 0
+        self.data[key] = (value, self.clock() + int(seconds))
+        return 1
+
+    def _cmd_ttl(self, key: bytes) -> int:
+        if self._live(key) is None:
+            return -2
+        expires_at = self.data[key][1]
+        return -1 if expires_at is None else int(round(expires_at - self.clock()))
+
+    def _cmd_pttl(self, key: bytes) -> int:
+        if self._live(key) is None:
+            return -2
+        expires_at = self.data[key][1]
+        return -1 if expires_at is None else int(round((expires_at - self.clock()) * 1000))
+
+    def _cmd_scan(self, cursor: bytes, *options: bytes) -> List[Any]:
+        pattern = "*"
+        count = 10
+        opts = iter(options)
+        for option in opts:
+            option = option.upper()
+            if option == b"MATCH":
+                pattern = next(opts).decode("utf-8")
+            elif option == b"COUNT":
+                count = int(next(opts))
+            else:
+                raise ValueError(option)
+        keys = sorted(self.data)
+        start = int(cursor)
+        page = keys[start:start + count]
+        next_cursor = start + count if start + count < len(keys) else 0
+        matched = [
+            key for key in page
+            if fnmatchcase(key.decode("utf-8"), pattern) and self._live(key) is not None
+        ]
+        return [str(next_cursor).encode("ascii"), matched]
+
+    def _cmd_dbsize(self) -> int:
+        return sum(self._live(key) is not None for key in list(self.data))
+
+    def _cmd_flushdb(self, *args: bytes) -> str:
+        self.data.clear()
+        return "OK"
+
+
+def _encode_reply(reply: Any) -> bytes:
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, RespError):
+        return b"-%s\r\n" % str(reply).encode("utf-8")
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode("utf-8")
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    if isinstance(reply, list):
+        return b"*%d\r\n" % len(reply) + b"".join(_encode_reply(item) for item in reply)
+    raise TypeError(f"Cannot encode reply {type(reply).__name__}")
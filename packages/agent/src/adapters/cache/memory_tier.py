@@ -0,0 +1,111 @@
+"""
+Memory tier: size-bounded LRU with per-entry TTL.
+
+Hot tier of CacheAdapter. Lookups are a dict probe plus an OrderedDict
+move_to_end, so a hit costs about a microsecond. Entries are evicted in LRU
+order when either max_entries or max_bytes would be exceeded; expired
+entries are dropped lazily when read (or by purge_expired()).
+
+Values are stored as given and returned by reference: callers must treat
+them as read-only (Advice is frozen; prompt-cache dicts are not copied).
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Any, Callable, Optional, Tuple
+
+
+@dataclass
+class MemoryTierStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # LRU capacity evictions
+    expirations: int = 0  # entries dropped after their TTL
+
+
+class MemoryTier:
+    """
+    LRU + TTL in-memory cache.
+
+    USAGE:
+    ------
+    tier = MemoryTier(max_entries=10_000, max_bytes=64 * 2**20)
+    tier.set("key", value, size=len(blob), expires_at=time.time() + ttl)
+    value = tier.get("key")
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 2**20,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.bytes = 0
+        self.stats = MemoryTierStats()
+        # key -> (value, size, expires_at); order = least recently used first
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Value for key, or None on miss / expiry."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        if entry[2] <= self.clock():
+            self._drop(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry[0]
+
+    def set(self, key: str, value: Any, size: int, expires_at: float) -> None:
+        """Insert or replace an entry, evicting LRU entries to stay in bounds."""
+        if key in self._entries:
+            self._drop(key)
+        if size > self.max_bytes:
+            return  # would evict everything and still not fit
+        self._entries[key] = (value, size, expires_at)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.stats.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        if key not in self._entries:
+            return False
+        self._drop(key)
+        return True
+
+    def invalidate(self, pattern: str) -> int:
+        """Drop keys matching a glob pattern; returns how many."""
+        keys = [key for key in self._entries if fnmatchcase(key, pattern)]
+        for key in keys:
+            self._drop(key)
+        return len(keys)
+
+    def purge_expired(self) -> int:
+        now = self.clock()
+        keys = [key for key, entry in self._entries.items() if entry[2] <= now]
+        for key in keys:
+            self._drop(key)
+        self.stats.expirations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+    def _drop(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.bytes -= size
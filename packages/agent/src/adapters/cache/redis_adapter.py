@@ -0,0 +1,247 @@
+"""
+RedisCacheAdapter: Shared CachePort Implementation
+
+PURPOSE:
+--------
+Share cached LLM outputs and advice across BFF workers and hosts, so a
+screen one worker has already paid for is a cache hit for every other
+worker exploring the same app.
+
+ALLOWED DEPENDENCIES:
+---------------------
+- src.agent.ports.cache_port (CachePort interface)
+- src.agent.domain (Advice)
+- src.agent.orchestrator.policy.constants (TTL policy)
+- asyncio (stdlib); msgpack (optional "redis" extra)
+
+FORBIDDEN DEPENDENCIES:
+-----------------------
+- NO other adapters
+- NO redis SDK: resp_client.py speaks the protocol directly
+
+PROTOCOL:
+---------
+- Reads: MGET, chunked and pipelined (one round trip per call, single or
+  batched)
+- Writes: SET key value EX ttl, so expiry is enforced server-side; batched
+  writes pipeline one SET EX per key (MSET cannot carry a TTL)
+- invalidate(): SCAN MATCH + UNLINK, never KEYS
+- Keys are namespaced (default "sg:") so several apps can share a server
+
+VALUES:
+-------
+serializer.pack(): msgpack when installed, else compact JSON, behind a
+one-byte format tag.
+
+FAILURES:
+---------
+The cache is an optimization: connection and server errors are counted
+(stats["errors"]) and degrade to misses / dropped writes instead of failing
+the agent run.
+
+USAGE:
+------
+cache = RedisCacheAdapter("redis://cache.internal:6379/0")
+hits = await cache.get_prompt_cache_many(keys)
+await cache.set_prompt_cache(key, {"action_index": 3})
+await cache.close()
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.agent.domain import Advice
+from src.agent.orchestrator.policy.constants import (
+    LLM_CACHE_TTL_SECONDS,
+    ROUTING_CACHE_TTL_SECONDS,
+)
+from src.agent.ports.cache_port import CachePort
+
+from .adapter import ADVICE_PREFIX, ROUTING_KEY_PREFIXES
+from .resp_client import RespClient, RespError
+from .serializer import advice_from_dict, advice_to_dict, pack, unpack
+
+
+DEFAULT_NAMESPACE = "sg:"
+MGET_CHUNK = 512  # keys per MGET; chunks of one call share a pipeline
+SCAN_COUNT = 1000
+
+_FAILURES = (ConnectionError, OSError, RespError, asyncio.TimeoutError, asyncio.IncompleteReadError)
+
+
+class RedisCacheAdapter(CachePort):
+    """
+    Redis-protocol implementation of CachePort.
+    """
+
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379",
+        namespace: str = DEFAULT_NAMESPACE,
+        prompt_ttl_s: int = LLM_CACHE_TTL_SECONDS,
+        advice_ttl_s: int = LLM_CACHE_TTL_SECONDS,
+        routing_ttl_s: int = ROUTING_CACHE_TTL_SECONDS,
+    ):
+        """
+        Args:
+            url: redis://[user:password@]host[:port][/db]
+            namespace: Prefix added to every key on the server.
+            prompt_ttl_s, advice_ttl_s, routing_ttl_s: Default TTLs.
+        """
+        self.client = RespClient(url)
+        self.namespace = namespace
+        self.prompt_ttl_s = prompt_ttl_s
+        self.advice_ttl_s = advice_ttl_s
+        self.routing_ttl_s = routing_ttl_s
+        self._hits = 0
+        self._misses = 0
+        self._sets = 0
+        self._invalidations = 0
+        self._errors = 0
+
+    # ------------------------------------------------------------------
+    # CachePort
+    # ------------------------------------------------------------------
+
+    async def get_prompt_cache(self, key: str) -> Optional[Dict[str, Any]]:
+        return (await self._get_many([key])).get(key)
+
+    async def set_prompt_cache(
+        self,
+        key: str,
+        value: Dict[str, Any],
+        ttl: Optional[int] = None,
+    ) -> None:
+        """Store an LLM output; ttl defaults by key (routing keys: 1 hour, else 7 days)."""
+        await self._set_many({key: value}, ttl)
+
+    async def get_advice(self, signature: str) -> Optional[Advice]:
+        return (await self.get_advice_many([signature])).get(signature)
+
+    async def set_advice(self, signature: str, advice: Advice, ttl: Optional[int] = None) -> None:
+        await self._set_many(
+            {ADVICE_PREFIX + signature: advice_to_dict(advice)},
+            self.advice_ttl_s if ttl is None else ttl,
+        )
+
+    async def invalidate(self, pattern: str) -> int:
+        """Delete keys matching a glob pattern (Redis MATCH syntax)."""
+        count = 0
+        cursor = "0"
+        try:
+            while True:
+                cursor, keys = await self.client.execute(
+                    "SCAN", cursor, "MATCH", self.namespace + pattern, "COUNT", SCAN_COUNT,
+                )
+                cursor = cursor.decode("ascii")
+                if keys:
+                    count += await self.client.execute("UNLINK", *keys)
+                if cursor == "0":
+                    break
+        except _FAILURES:
+            self._errors += 1
+        self._invalidations += count
+        return count
+
+    async def get_stats(self) -> Dict[str, int]:
+        """Local hit/miss counters plus the server's DBSIZE (all namespaces)."""
+        try:
+            size = await self.client.execute("DBSIZE")
+        except _FAILURES:
+            self._errors += 1
+            size = 0
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "sets": self._sets,
+            "invalidations": self._invalidations,
+            "errors": self._errors,
+            "size": size,
+        }
+
+    # ------------------------------------------------------------------
+    # Batched access
+    # ------------------------------------------------------------------
+
+    async def get_prompt_cache_many(self, keys: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Cached values for the keys that hit, in one round trip."""
+        return await self._get_many(keys)
+
+    async def set_prompt_cache_many(
+        self,
+        values: Dict[str, Dict[str, Any]],
+        ttl: Optional[int] = None,
+    ) -> None:
+        """Store several LLM outputs in one round trip."""
+        await self._set_many(values, ttl)
+
+    async def get_advice_many(self, signatures: List[str]) -> Dict[str, Advice]:
+        """Advice for the signatures that hit, in one round trip."""
+        found = await self._get_many([ADVICE_PREFIX + signature for signature in signatures])
+        return {
+            key[len(ADVICE_PREFIX):]: advice_from_dict(data)
+            for key, data in found.items()
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _get_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        chunks = [keys[start:start + MGET_CHUNK] for start in range(0, len(keys), MGET_CHUNK)]
+        try:
+            replies = await self.client.pipeline(
+                [("MGET", *(self.namespace + key for key in chunk)) for chunk in chunks]
+            )
+        except _FAILURES:
+            self._errors += 1
+            self._misses += len(keys)
+            return {}
+        found = {}
+        for chunk, reply in zip(chunks, replies):
+            if isinstance(reply, RespError):
+                self._errors += 1
+                reply = [None] * len(chunk)
+            for key, blob in zip(chunk, reply):
+                value = unpack(blob) if blob is not None else None
+                if value is None:
+                    self._misses += 1
+                else:
+                    self._hits += 1
+                    found[key] = value
+        return found
+
+    async def _set_many(self, values: Dict[str, Any], ttl: Optional[int]) -> None:
+        if not values:
+            return
+        commands = [
+            ("SET", self.namespace + key, pack(value), "EX", max(1, int(self._ttl_for(key, ttl))))
+            for key, value in values.items()
+        ]
+        try:
+            replies = await self.client.pipeline(commands)
+        except _FAILURES:
+            self._errors += 1
+            return
+        self._errors += sum(isinstance(reply, RespError) for reply in replies)
+        self._sets += sum(not isinstance(reply, RespError) for reply in replies)
+
+    def _ttl_for(self, key: str, ttl: Optional[int]) -> int:
+        if ttl is not None:
+            return ttl
+        if key.startswith(ADVICE_PREFIX):
+            return self.advice_ttl_s
+        if key.startswith(ROUTING_KEY_PREFIXES):
+            return self.routing_ttl_s
+        return self.prompt_ttl_s
+
@@ -0,0 +1,174 @@
+"""
+RESP client: minimal asyncio Redis-protocol connection.
+
+Speaks RESP2 over one asyncio stream, which is all RedisCacheAdapter needs
+(GET/SET/MGET/DEL/SCAN/DBSIZE). Works against Redis, Valkey, KeyDB or the
+in-process FakeRedisServer used by the tests, with no redis SDK installed.
+
+pipeline() writes a batch of commands in one send and then reads the
+replies in order, so N commands cost one round trip instead of N. A lock
+serializes requests on the connection. Each reply must arrive within
+read_timeout_s. Once a batch is written, any failure before all its replies
+are read (error, timeout, cancellation) drops the connection: the unread
+replies would otherwise be read by the next caller as its own. The next
+call reconnects.
+"""
+
+import asyncio
+from typing import Any, List, Optional, Sequence, Tuple, Union
+from urllib.parse import unquote, urlparse
+
+
+Arg = Union[str, bytes, int, float]
+
+DEFAULT_PORT = 6379
+CONNECT_TIMEOUT_S = 5.0
+READ_TIMEOUT_S = 5.0  # per reply
+
+
+class RespError(Exception):
+    """Error reply from the server (e.g. "ERR unknown command")."""
+
+
+def encode_command(args: Sequence[Arg]) -> bytes:
+    """RESP array of bulk strings for one command."""
+    out = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, bytes):
+            data = arg
+        elif isinstance(arg, str):
+            data = arg.encode("utf-8")
+        else:
+            data = str(arg).encode("ascii")
+        out.append(b"$%d\r\n" % len(data))
+        out.append(data)
+        out.append(b"\r\n")
+    return b"".join(out)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """
+    Read one RESP reply.
+
+    Returns bytes for bulk strings, str for simple strings, int, None for
+    nil, or a list; error replies are returned as RespError instances so a
+    pipeline can keep reading the replies after them.
+    """
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("Connection closed by server")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"+":
+        return payload.decode("utf-8")
+    if kind == b":":
+        return int(payload)
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    if kind == b"-":
+        return RespError(payload.decode("utf-8"))
+    raise ConnectionError(f"Invalid RESP reply type: {kind!r}")
+
+
+class RespClient:
+    """
+    One pipelined connection to a Redis-protocol server.
+
+    USAGE:
+    ------
+    client = RespClient("redis://localhost:6379/0")
+    await client.execute("SET", "k", b"v", "EX", 60)
+    values = await client.pipeline([("GET", "a"), ("GET", "b")])
+    await client.close()
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379", read_timeout_s: float = READ_TIMEOUT_S):
+        parsed = urlparse(url)
+        if parsed.scheme not in ("redis", ""):
+            raise ValueError(f"Unsupported cache URL scheme: {parsed.scheme}")
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or DEFAULT_PORT
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.username = unquote(parsed.username) if parsed.username else None
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.read_timeout_s = read_timeout_s
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def execute(self, *args: Arg) -> Any:
+        """Run one command; raises RespError on an error reply."""
+        (reply,) = await self.pipeline([args])
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    async def pipeline(self, commands: Sequence[Sequence[Arg]]) -> List[Any]:
+        """
+        Run commands in one round trip.
+
+        Returns:
+            Replies in command order; error replies are RespError instances.
+        """
+        if not commands:
+            return []
+        payload = b"".join(encode_command(command) for command in commands)
+        async with self._lock:
+            reader, writer = await self._connection()
+            try:
+                writer.write(payload)
+                await writer.drain()
+                return [await self._read(reader) for _ in commands]
+            except BaseException:
+                # Includes timeouts and cancellation: unread replies stay queued
+                await self._drop()
+                raise
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._drop()
+
+    async def _connection(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self._writer is None or self._writer.is_closing():
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port),
+                timeout=CONNECT_TIMEOUT_S,
+            )
+            setup: List[Sequence[Arg]] = []
+            if self.password is not None:
+                auth = ("AUTH", self.username, self.password) if self.username else ("AUTH", self.password)
+                setup.append(auth)
+            if self.db:
+                setup.append(("SELECT", self.db))
+            if setup:
+                try:
+                    self._writer.write(b"".join(encode_command(command) for command in setup))
+                    await self._writer.drain()
+                    for _ in setup:
+                        reply = await self._read(self._reader)
+                        if isinstance(reply, RespError):
+                            raise reply
+                except BaseException:
+                    await self._drop()
+                    raise
+        return self._reader, self._writer
+
+    async def _read(self, reader: asyncio.StreamReader) -> Any:
+        return await asyncio.wait_for(read_reply(reader), timeout=self.read_timeout_s)
+
+    async def _drop(self) -> None:
+        writer, self._reader, self._writer = self._writer, None, None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
@@ -0,0 +1,73 @@
+"""
+Cache serializer: domain types ↔ bytes.
+
+Prompt-cache values are JSON dicts; advice is stored as the JSON form of the
+frozen Advice dataclass. Compact separators keep the stored blobs small.
+
+Values sent over the network (RedisCacheAdapter) use pack()/unpack(): one
+format byte, then msgpack when the optional "redis" extra is installed, else
+the compact JSON. unpack() reads either format, so workers with and without
+msgpack can share a cache (a worker without msgpack treats msgpack blobs as
+misses).
+"""
+
+import json
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
+from src.agent.domain import Advice
+
+try:
+    import msgpack
+except ImportError:  # optional "redis" extra
+    msgpack = None
+
+
+FORMAT_JSON = b"j"
+FORMAT_MSGPACK = b"m"
+
+
+def dump_json(value: Dict[str, Any]) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def load_json(blob: bytes) -> Dict[str, Any]:
+    return json.loads(blob)
+
+
+def dump_advice(advice: Advice) -> bytes:
+    return dump_json(advice_to_dict(advice))
+
+
+def load_advice(blob: bytes) -> Advice:
+    return advice_from_dict(load_json(blob))
+
+
+def advice_to_dict(advice: Advice) -> Dict[str, Any]:
+    return asdict(advice)
+
+
+def advice_from_dict(data: Dict[str, Any]) -> Advice:
+    return Advice(
+        plan=list(data.get("plan", [])),
+        confidence=float(data.get("confidence", 0.0)),
+        rationale=data.get("rationale"),
+        source=data.get("source", "cache"),
+    )
+
+
+def pack(value: Any) -> bytes:
+    """Format-tagged binary encoding of a JSON-like value."""
+    if msgpack is not None:
+        return FORMAT_MSGPACK + msgpack.packb(value, use_bin_type=True)
+    return FORMAT_JSON + dump_json(value)
+
+
+def unpack(blob: bytes) -> Optional[Any]:
+    """Inverse of pack(); None for a format this process cannot read."""
+    tag, body = blob[:1], blob[1:]
+    if tag == FORMAT_JSON:
+        return load_json(body)
+    if tag == FORMAT_MSGPACK and msgpack is not None:
+        return msgpack.unpackb(body, raw=False)
+    return None
@@ -0,0 +1,109 @@
+"""
+SQLite tier: persistent local cache.
+
+Cold tier of CacheAdapter, so cached LLM outputs survive process restarts.
+One table keyed by cache key, holding the serialized value and its absolute
+expiry time. WAL journaling keeps reads from blocking on writes; expired rows
+are filtered on read and deleted by purge_expired().
+
+The methods are blocking (sub-millisecond on local disk); CacheAdapter runs
+them with asyncio.to_thread. A lock serializes access to the one connection.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Optional, Sequence
+
+
+MAX_BATCH_KEYS = 500  # stays under SQLite's default 999 bound parameters
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at);
+"""
+
+
+class SQLiteTier:
+    """
+    Persistent key → bytes store with expiry.
+
+    USAGE:
+    ------
+    tier = SQLiteTier("/var/cache/screengraph/cache.sqlite3")
+    tier.set("key", b"...", expires_at=time.time() + ttl)
+    blob, expires_at = tier.get("key")
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.clock = clock
+        if path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[tuple]:
+        """(blob, expires_at) for a live key, else None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ? AND expires_at > ?",
+                (key, self.clock()),
+            ).fetchone()
+        return row
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, tuple]:
+        """(blob, expires_at) by key for the live keys among `keys`."""
+        found: Dict[str, tuple] = {}
+        now = self.clock()
+        with self._lock:
+            for start in range(0, len(keys), MAX_BATCH_KEYS):
+                batch = keys[start:start + MAX_BATCH_KEYS]
+                rows = self._conn.execute(
+                    "SELECT key, value, expires_at FROM cache "
+                    f"WHERE key IN ({','.join('?' * len(batch))}) AND expires_at > ?",
+                    (*batch, now),
+                )
+                for key, value, expires_at in rows:
+                    found[key] = (value, expires_at)
+        return found
+
+    def set(self, key: str, value: bytes, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO cache (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+                (key, value, expires_at),
+            )
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._conn.execute("DELETE FROM cache WHERE key = ?", (key,)).rowcount > 0
+
+    def invalidate(self, pattern: str) -> int:
+        """Delete keys matching a glob pattern (SQLite GLOB: *, ?, [...])."""
+        with self._lock:
+            return self._conn.execute("DELETE FROM cache WHERE key GLOB ?", (pattern,)).rowcount
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM cache WHERE expires_at <= ?", (self.clock(),)
+            ).rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,5 @@
+"""
+Cache Adapter Tests
+
+Unit tests for CacheAdapter and its memory and SQLite tiers.
+"""
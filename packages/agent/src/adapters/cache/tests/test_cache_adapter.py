@@ -0,0 +1,124 @@
+"""
+Unit tests for CacheAdapter.
+"""
+
+from src.adapters.cache import CacheAdapter
+from src.adapters.cache.memory_tier import MemoryTier
+from src.agent.domain import Advice
+
+
+class Clock:
+    """Manually advanced wall clock."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestMemoryTier:
+    """Tests for the LRU + TTL memory tier."""
+
+    def test_lru_eviction_by_entries_and_bytes(self):
+        tier = MemoryTier(max_entries=2, max_bytes=100)
+        tier.set("a", 1, size=10, expires_at=float("inf"))
+        tier.set("b", 2, size=10, expires_at=float("inf"))
+        assert tier.get("a") == 1  # b is now least recently used
+        tier.set("c", 3, size=10, expires_at=float("inf"))
+        assert tier.get("b") is None
+        assert tier.get("a") == 1 and tier.get("c") == 3
+
+        tier.set("big", 4, size=95, expires_at=float("inf"))
+        assert len(tier) == 1 and tier.bytes == 95
+        assert tier.stats.evictions == 3
+
+    def test_ttl_expiry(self):
+        clock = Clock()
+        tier = MemoryTier(clock=clock)
+        tier.set("k", "v", size=1, expires_at=clock.now + 5)
+        assert tier.get("k") == "v"
+        clock.now += 5
+        assert tier.get("k") is None
+        assert tier.stats.expirations == 1
+
+
+class TestCacheAdapter:
+    """Tests for the two-tier CacheAdapter."""
+
+    async def test_prompt_cache_round_trip_and_stats(self):
+        cache = CacheAdapter()
+        assert await cache.get_prompt_cache("choose_action:m:sig") is None
+        await cache.set_prompt_cache("choose_action:m:sig", {"action_index": 3})
+        assert await cache.get_prompt_cache("choose_action:m:sig") == {"action_index": 3}
+        stats = await cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["sets"], stats["size"]) == (1, 1, 1, 1)
+
+    async def test_default_ttls(self):
+        """Routing keys expire after 1 hour, prompts and advice after 7 days."""
+        clock = Clock()
+        cache = CacheAdapter(clock=clock)
+        await cache.set_prompt_cache("should_continue:m:sig", {"route": "continue"})
+        await cache.set_prompt_cache("choose_action:m:sig", {"action_index": 1})
+        await cache.set_advice("sig", Advice(plan=["tap Login"], confidence=0.9, source="llm"))
+
+        clock.now += 3601
+        assert await cache.get_prompt_cache("should_continue:m:sig") is None
+        assert await cache.get_prompt_cache("choose_action:m:sig") is not None
+        assert (await cache.get_advice("sig")).plan == ["tap Login"]
+
+        clock.now += 7 * 86400
+        assert await cache.get_prompt_cache("choose_action:m:sig") is None
+        assert await cache.get_advice("sig") is None
+
+    async def test_disk_tier_persists_and_promotes(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        cache = CacheAdapter(path=path)
+        advice = Advice(plan=["scroll down"], confidence=0.5, rationale="ref", source="llm")
+        await cache.set_advice("sig", advice)
+        await cache.set_prompt_cache("verify:m:sig", {"success": True})
+        await cache.close()
+
+        reopened = CacheAdapter(path=path)
+        assert await reopened.get_advice("sig") == advice
+        assert await reopened.get_advice("sig") == advice  # now from memory
+        assert await reopened.get_advice("other") is None
+        stats = await reopened.get_stats()
+        assert (stats["disk_hits"], stats["memory_hits"], stats["disk_size"]) == (1, 1, 2)
+        # A promoted disk hit is a hit, not a miss; only "other" missed both tiers
+        assert (stats["hits"], stats["misses"]) == (2, 1)
+        await reopened.close()
+
+    async def test_invalidate_pattern(self, tmp_path):
+        cache = CacheAdapter(path=str(tmp_path / "cache.sqlite3"))
+        await cache.set_prompt_cache("choose_action:m:a", {"i": 1})
+        await cache.set_prompt_cache("choose_action:m:b", {"i": 2})
+        await cache.set_prompt_cache("verify:m:a", {"ok": True})
+
+        assert await cache.invalidate("choose_action:*") == 2
+        assert await cache.get_prompt_cache("choose_action:m:a") is None
+        assert await cache.get_prompt_cache("verify:m:a") == {"ok": True}
+        assert (await cache.get_stats())["disk_size"] == 1
+        await cache.close()
+
+
+class TestAdviceWarmUp:
+    """Tests for the batched advice lookup used by cache warm-up."""
+
+    async def test_get_advice_many_promotes_disk_hits(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        writer = CacheAdapter(path=path)
+        for index in range(3):
+            await writer.set_advice(f"sig{index}", Advice(plan=[f"step {index}"], confidence=0.5))
+        await writer.close()
+
+        cache = CacheAdapter(path=path)
+        await cache.set_advice("hot", Advice(plan=["memory"]))
+        found = await cache.get_advice_many(["sig0", "sig2", "hot", "missing"])
+        assert {key: advice.plan for key, advice in found.items()} == {
+            "sig0": ["step 0"], "sig2": ["step 2"], "hot": ["memory"],
+        }
+        stats = await cache.get_stats()
+        assert (stats["disk_hits"], stats["size"]) == (2, 3)
+        assert (stats["hits"], stats["misses"]) == (3, 1)
+        await cache.close()
@@ -0,0 +1,174 @@
+"""
+Unit tests for RedisCacheAdapter, run against the in-process FakeRedisServer.
+"""
+
+import asyncio
+
+import pytest
+
+from src.adapters.cache import CacheAdapter, RedisCacheAdapter, create_cache_adapter
+from src.adapters.cache.fake_redis import FakeRedisServer
+from src.adapters.cache.resp_client import RespClient, RespError
+from src.adapters.cache.serializer import FORMAT_JSON, pack, unpack
+from src.agent.config.runtime_config import CacheConfig
+from src.agent.domain import Advice
+
+
+class Clock:
+    """Manually advanced wall clock."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+async def server():
+    async with FakeRedisServer(clock=Clock()) as fake:
+        yield fake
+
+
+@pytest.fixture
+async def cache(server):
+    adapter = RedisCacheAdapter(server.url)
+    yield adapter
+    await adapter.close()
+
+
+class TestRespClient:
+    """Tests for the RESP client."""
+
+    async def test_pipeline_and_error_replies(self, server):
+        client = RespClient(server.url)
+        replies = await client.pipeline([
+            ("SET", "k", b"v\r\nwith crlf"),
+            ("GET", "k"),
+            ("NOPE",),
+            ("GET", "missing"),
+        ])
+        assert replies[0] == "OK" and replies[1] == b"v\r\nwith crlf"
+        assert isinstance(replies[2], RespError) and replies[3] is None
+        with pytest.raises(RespError):
+            await client.execute("NOPE")
+        assert await client.execute("PING") == "PONG"
+        await client.close()
+
+    async def test_reconnects_after_close(self, server):
+        client = RespClient(server.url)
+        await client.execute("SET", "k", 1)
+        await client.close()
+        assert await client.execute("GET", "k") == b"1"
+        await client.close()
+
+    async def test_cancelled_pipeline_does_not_leak_replies(self, server):
+        client = RespClient(server.url)
+        await client.pipeline([("SET", "a", b"first"), ("SET", "b", b"second")])
+        server.reply_delay_s = 0.05
+        pending = asyncio.create_task(client.execute("GET", "a"))
+        while "GET" not in server.commands:
+            await asyncio.sleep(0)
+        pending.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await pending
+
+        server.reply_delay_s = 0.0
+        assert await client.execute("GET", "b") == b"second"
+        await client.close()
+
+    async def test_read_timeout_drops_connection(self, server):
+        client = RespClient(server.url, read_timeout_s=0.01)
+        await client.execute("SET", "a", b"first")
+        await client.execute("SET", "b", b"second")
+        server.reply_delay_s = 0.1
+        with pytest.raises(asyncio.TimeoutError):
+            await client.execute("GET", "a")
+
+        server.reply_delay_s = 0.0
+        assert await client.execute("GET", "b") == b"second"
+        await client.close()
+
+
+class TestRedisCacheAdapter:
+    """Tests for the Redis-protocol CachePort."""
+
+    async def test_round_trip_and_stats(self, cache):
+        assert await cache.get_prompt_cache("choose_action:m:sig") is None
+        await cache.set_prompt_cache("choose_action:m:sig", {"action_index": 3})
+        assert await cache.get_prompt_cache("choose_action:m:sig") == {"action_index": 3}
+
+        advice = Advice(plan=["tap Login"], confidence=0.8, rationale=None, source="llm")
+        await cache.set_advice("sig", advice)
+        assert await cache.get_advice("sig") == advice
+
+        stats = await cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["sets"], stats["size"]) == (2, 1, 2, 2)
+
+    async def test_batched_reads_use_one_mget(self, cache, server):
+        await cache.set_prompt_cache_many({f"verify:m:{i}": {"ok": i} for i in range(5)})
+        server.commands.clear()
+        found = await cache.get_prompt_cache_many([f"verify:m:{i}" for i in range(8)])
+        assert found == {f"verify:m:{i}": {"ok": i} for i in range(5)}
+        assert server.commands == ["MGET"]
+
+        await cache.set_advice("a", Advice(plan=["x"], confidence=1.0))
+        advice = await cache.get_advice_many(["a", "b"])
+        assert list(advice) == ["a"] and advice["a"].plan == ["x"]
+
+    async def test_server_side_ttls(self, cache, server):
+        """Routing keys expire after 1 hour, prompts and advice after 7 days."""
+        await cache.set_prompt_cache("should_continue:m:sig", {"continue": True})
+        await cache.set_prompt_cache("choose_action:m:sig", {"action_index": 1})
+        await cache.set_prompt_cache("verify:m:sig", {"ok": True}, ttl=5)
+        assert await cache.client.execute("TTL", "sg:should_continue:m:sig") == 3600
+        assert await cache.client.execute("TTL", "sg:choose_action:m:sig") == 7 * 24 * 3600
+
+        server.clock.now += 3600
+        assert await cache.get_prompt_cache("should_continue:m:sig") is None
+        assert await cache.get_prompt_cache("verify:m:sig") is None
+        assert await cache.get_prompt_cache("choose_action:m:sig") == {"action_index": 1}
+
+    async def test_invalidate_scans_namespace(self, cache, server):
+        await cache.set_prompt_cache_many({f"choose_action:m:{i}": {"i": i} for i in range(25)})
+        await cache.set_prompt_cache("verify:m:1", {"ok": True})
+        server.data[b"other:choose_action:m:1"] = (b"x", None)
+
+        assert await cache.invalidate("choose_action:m:*") == 25
+        assert await cache.get_prompt_cache("verify:m:1") == {"ok": True}
+        assert b"other:choose_action:m:1" in server.data
+        assert "KEYS" not in server.commands
+
+    async def test_workers_share_entries(self, server):
+        first, second = RedisCacheAdapter(server.url), RedisCacheAdapter(server.url)
+        await first.set_prompt_cache("choose_action:m:sig", {"action_index": 2})
+        assert await second.get_prompt_cache("choose_action:m:sig") == {"action_index": 2}
+        await first.close()
+        await second.close()
+
+    async def test_unreachable_server_degrades_to_misses(self, server):
+        cache = RedisCacheAdapter(server.url)
+        await server.stop()
+        await cache.set_prompt_cache("k", {"v": 1})
+        assert await cache.get_prompt_cache("k") is None
+        stats = await cache.get_stats()
+        assert stats["errors"] == 3 and stats["misses"] == 1
+        await cache.close()
+
+
+class TestSerializerAndFactory:
+    """Tests for packed values and the config factory."""
+
+    def test_pack_round_trip(self):
+        value = {"plan": ["a", "b"], "confidence": 0.5, "nested": {"x": None}}
+        assert unpack(pack(value)) == value
+        assert unpack(FORMAT_JSON + b'{"a":1}') == {"a": 1}
+        assert unpack(b"?garbage") is None
+
+    def test_create_cache_adapter(self):
+        assert isinstance(create_cache_adapter(CacheConfig()), CacheAdapter)
+        redis = create_cache_adapter(CacheConfig(cache_type="redis", redis_url="redis://h:7000/2"))
+        assert isinstance(redis, RedisCacheAdapter)
+        assert (redis.client.host, redis.client.port, redis.client.db) == ("h", 7000, 2)
+        with pytest.raises(ValueError):
+            create_cache_adapter(CacheConfig(cache_type="memcached"))
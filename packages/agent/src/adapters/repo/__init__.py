@@ -20,7 +20,18 @@ DEPENDENCIES (FORBIDDEN):
 IMPLEMENTATION:
 ---------------
 - RepoAdapter: Implements RepoPort (Postgres)
+  - SQLiteRepoAdapter: embedded SQLite (WAL), batched idempotent upserts
+    (sqlite_repo.py)
 - FileStoreAdapter: Implements FileStorePort (S3/GCS/local)
+  - LocalFileStoreAdapter: content-addressed local disk, deduplicating
+    (local_filestore.py)
+  - WriteBehindFileStore: wraps a store whose refs are known upfront;
+    put() returns at once, writes are batched in the background and made
+    durable by flush() (write_behind.py)
+- RunEventLog: per-run append-only AgentState history (diffs + periodic
+  snapshots), state_at(step) and sequential replay (event_log.py)
+- state_serializer: AgentState ↔ bytes (schema-tagged msgpack, or compact
+  JSON without the "redis" extra)
 - schema: Database schema for nodes/edges/runs
 
 DATABASE SCHEMA:
@@ -32,13 +43,22 @@ DATABASE SCHEMA:
 FILE STORE:
 -----------
 - S3/GCS: runs/{run_id}/screenshots/{screen_id}.png
-- Local: /tmp/screengraph/{run_id}/...
+- Local: {root}/cas/ab/cd/<sha256> (content-addressed; put() returns
+  "cas/<sha256>", identical assets share one blob)
 
 TODO:
 -----
-- [ ] Implement RepoAdapter (upsert_node, upsert_edge, etc.)
-- [ ] Implement FileStoreAdapter (put, get, delete, etc.)
+- [x] Implement RepoAdapter (upsert_node, upsert_edge, etc.) — SQLite
+- [ ] Add Postgres RepoAdapter
+- [x] Implement FileStoreAdapter (put, get, delete, etc.) — local disk
+- [ ] Add S3/GCS FileStoreAdapter
 - [ ] Add connection pooling
-- [ ] Add transaction support
+- [x] Add transaction support (SQLite: batched transactions)
 """
 
+from .event_log import RunEventLog
+from .local_filestore import LocalFileStoreAdapter
+from .sqlite_repo import SQLiteRepoAdapter
+from .write_behind import WriteBehindFileStore
+
+__all__ = ["LocalFileStoreAdapter", "RunEventLog", "SQLiteRepoAdapter", "WriteBehindFileStore"]
@@ -0,0 +1,322 @@
+"""
+Asset compression: per-app dictionaries for page sources and OCR JSON.
+
+UiAutomator2/XCUITest XML repeats the same attribute names, class names and
+package names on every node, and OCR JSON repeats its keys, so a dictionary
+trained on a few early captures of an app compresses later captures far
+better than a generic compressor can on its own.
+
+- zstd (optional "storage" extra, zstandard package): dictionaries trained
+  with zstandard.train_dictionary() from the first TRAIN_SAMPLES captures of
+  each category (page_sources, ocr, ...)
+- zlib fallback (stdlib): the same flow with a deflate preset dictionary
+  (zdict) built from the most recent sample bytes, capped at 32 KiB
+- Binary assets (PNG screenshots) are already compressed and stored as-is
+
+Blob framing: MAGIC + codec byte + 4-byte dictionary id (0 = none) + frame.
+Stored-as-is blobs are framed too (CODEC_RAW, RAW_HEADER), so content that
+happens to start with MAGIC is never mistaken for a compressed frame;
+unframed files (written before CODEC_RAW) still read as raw bytes.
+Dictionaries are persisted under {root}/dicts/ by id, so any process can
+read any blob; {root}/dicts/index.json maps "{app_id}/{category}" to the
+dictionary new writes use, so later runs of the same app start trained.
+
+Decompression is streamed (iter_decompressed) in READ_CHUNK_BYTES pieces;
+streamed writes compress incrementally (compressobj) with the category's
+current dictionary, without feeding training.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # optional "storage" extra
+    zstandard = None
+
+
+MAGIC = b"\x89SGC"
+CODEC_ZSTD = b"z"
+CODEC_ZLIB = b"d"
+CODEC_RAW = b"r"  # stored as-is after the header
+HEADER_BYTES = len(MAGIC) + 1 + 4
+RAW_HEADER = MAGIC + CODEC_RAW + bytes(4)
+
+TRAIN_SAMPLES = 24  # captures per category before a dictionary is trained
+SAMPLE_BYTES = 256 * 1024  # prefix of each capture kept for training
+DICT_BYTES = 64 * 1024  # zstd dictionary size
+ZLIB_DICT_BYTES = 32 * 1024  # deflate window: larger preset dictionaries are ignored
+ZSTD_LEVEL = 6
+ZLIB_LEVEL = 6
+READ_CHUNK_BYTES = 256 * 1024
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/xml")
+
+
+def is_compressible(content_type: str) -> bool:
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def is_framed(prefix: bytes) -> bool:
+    """True if a blob starts with the frame header."""
+    return prefix[:len(MAGIC)] == MAGIC
+
+
+def frame_codec(prefix: bytes) -> Optional[bytes]:
+    """Codec byte of a framed blob (from its first HEADER_BYTES), None if unframed."""
+    if len(prefix) < HEADER_BYTES or not is_framed(prefix):
+        return None
+    return prefix[len(MAGIC):len(MAGIC) + 1]
+
+
+class AssetCodec:
+    """
+    Dictionary-trained compressor for one store root and app.
+
+    Thread-safe: compress/decompress run in worker threads; training happens
+    once per category under a lock.
+
+    USAGE:
+    ------
+    codec = AssetCodec("/var/lib/screengraph/assets/dicts", app_id="com.example.app")
+    framed = codec.compress("page_sources", xml_bytes)
+    xml_bytes = b"".join(codec.iter_decompressed(open(path, "rb")))
+    """
+
+    def __init__(self, directory: str, app_id: str = "default", use_zstd: Optional[bool] = None):
+        """
+        Args:
+            directory: Where dictionaries and index.json live.
+            app_id: Dictionary scope; captures of different apps share nothing.
+            use_zstd: Force a codec (default: zstd when installed).
+        """
+        self.directory = directory
+        self.app_id = app_id
+        self.use_zstd = zstandard is not None if use_zstd is None else use_zstd
+        if self.use_zstd and zstandard is None:
+            raise ImportError("zstd compression requires zstandard (pip install agent[storage])")
+        self.codec = CODEC_ZSTD if self.use_zstd else CODEC_ZLIB
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._samples: Dict[str, List[bytes]] = {}
+        self._dicts: Dict[int, bytes] = {}
+        self._active: Dict[str, int] = {}  # category → dictionary id
+        self._local = threading.local()  # zstd (de)compressors are per thread
+        self._load_index()
+
+    # ------------------------------------------------------------------
+    # Compression
+    # ------------------------------------------------------------------
+
+    def compress(self, category: str, data: bytes) -> bytes:
+        """Framed compressed bytes; feeds training until the category has a dictionary."""
+        dict_id = self._active.get(category)
+        if dict_id is None:
+            dict_id = self._observe(category, data)
+        header = MAGIC + self.codec + dict_id.to_bytes(4, "big")
+        if self.codec == CODEC_ZSTD:
+            return header + self._zstd_compressor(dict_id).compress(data)
+        if dict_id:
+            compressor = zlib.compressobj(ZLIB_LEVEL, zdict=self._dictionary(dict_id))
+        else:
+            compressor = zlib.compressobj(ZLIB_LEVEL)
+        return header + compressor.compress(data) + compressor.flush()
+
+    def compressobj(self, category: str) -> Tuple[bytes, Any]:
+        """
+        Frame header and incremental compressor (compress()/flush()) for a
+        streamed write. Uses the current dictionary of the category, if any.
+        """
+        dict_id = self._active.get(category, 0)
+        header = MAGIC + self.codec + dict_id.to_bytes(4, "big")
+        if self.codec == CODEC_ZSTD:
+            # Fresh compressor: a stream may span worker threads
+            dictionary = zstandard.ZstdCompressionDict(self._dictionary(dict_id)) if dict_id else None
+            return header, zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dictionary).compressobj()
+        if dict_id:
+            return header, zlib.compressobj(ZLIB_LEVEL, zdict=self._dictionary(dict_id))
+        return header, zlib.compressobj(ZLIB_LEVEL)
+
+    def iter_decompressed(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Stream-decompress a framed blob given as chunks (e.g. file reads).
+
+        Raises:
+            ValueError: Not a framed blob, unknown codec or dictionary.
+        """
+        chunks = iter(chunks)
+        head = b""
+        for chunk in chunks:
+            head += chunk
+            if len(head) >= HEADER_BYTES:
+                break
+        if len(head) < HEADER_BYTES or not is_framed(head):
+            raise ValueError("not a compressed asset")
+        codec = head[len(MAGIC):len(MAGIC) + 1]
+        dict_id = int.from_bytes(head[len(MAGIC) + 1:HEADER_BYTES], "big")
+        rest = head[HEADER_BYTES:]
+        if codec == CODEC_RAW:
+            yield from (chunk for chunk in _prepend(rest, chunks) if chunk)
+            return
+        if codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise ValueError("zstd asset but zstandard is not installed")
+            dictionary = zstandard.ZstdCompressionDict(self._dictionary(dict_id)) if dict_id else None
+            decompressor = zstandard.ZstdDecompressor(dict_data=dictionary).decompressobj()
+        elif codec == CODEC_ZLIB:
+            decompressor = zlib.decompressobj(zdict=self._dictionary(dict_id)) if dict_id else zlib.decompressobj()
+        else:
+            raise ValueError(f"unknown asset codec {codec!r}")
+        for chunk in _prepend(rest, chunks):
+            if chunk:
+                out = decompressor.decompress(chunk)
+                if out:
+                    yield out
+        if codec == CODEC_ZLIB:
+            tail = decompressor.flush()
+            if tail:
+                yield tail
+
+    def decompress(self, blob: bytes) -> bytes:
+        return b"".join(self.iter_decompressed([blob]))
+
+    def dictionary_id(self, category: str) -> int:
+        """Dictionary new writes of a category use (0 while still sampling)."""
+        return self._active.get(category, 0)
+
+    # ------------------------------------------------------------------
+    # Training
+    # ------------------------------------------------------------------
+
+    def _observe(self, category: str, data: bytes) -> int:
+        with self._lock:
+            if category in self._active:
+                return self._active[category]
+            samples = self._samples.setdefault(category, [])
+            samples.append(bytes(data[:SAMPLE_BYTES]))
+            if len(samples) < TRAIN_SAMPLES:
+                return 0
+            del self._samples[category]
+            dictionary = self._train(samples)
+            if dictionary is None:
+                return 0
+            dict_id = _dictionary_id(dictionary)
+            self._save_dictionary(dict_id, dictionary)
+            self._active[category] = dict_id
+            self._save_index()
+            return dict_id
+
+    def _train(self, samples: List[bytes]) -> Optional[bytes]:
+        if self.codec == CODEC_ZSTD:
+            try:
+                return zstandard.train_dictionary(DICT_BYTES, samples).as_bytes()
+            except zstandard.ZstdError:
+                return None  # too little / too uniform data; keep plain zstd
+        # Deflate matches against the end of the preset dictionary first
+        joined = b"".join(samples)
+        return joined[-ZLIB_DICT_BYTES:] or None
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _dictionary(self, dict_id: int) -> bytes:
+        dictionary = self._dicts.get(dict_id)
+        if dictionary is None:
+            try:
+                with open(self._dict_path(dict_id), "rb") as handle:
+                    dictionary = handle.read()
+            except FileNotFoundError:
+                raise ValueError(f"unknown compression dictionary {dict_id:08x}") from None
+            self._dicts[dict_id] = dictionary
+        return dictionary
+
+    def _zstd_compressor(self, dict_id: int) -> "zstandard.ZstdCompressor":
+        # ZstdCompressor instances must not be shared across threads
+        compressors = getattr(self._local, "compressors", None)
+        if compressors is None:
+            compressors = self._local.compressors = {}
+        compressor = compressors.get(dict_id)
+        if compressor is None:
+            dictionary = zstandard.ZstdCompressionDict(self._dictionary(dict_id)) if dict_id else None
+            compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL, dict_data=dictionary)
+            compressors[dict_id] = compressor
+        return compressor
+
+    def _dict_path(self, dict_id: int) -> str:
+        return os.path.join(self.directory, f"{dict_id:08x}.dict")
+
+    def _save_dictionary(self, dict_id: int, dictionary: bytes) -> None:
+        self._dicts[dict_id] = dictionary
+        _atomic_write(self._dict_path(dict_id), dictionary)
+
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, "index.json")
+
+    def _load_index(self) -> None:
+        try:
+            with open(self._index_path(), "r", encoding="utf-8") as handle:
+                index = json.load(handle)
+        except (FileNotFoundError, ValueError):
+            return
+        prefix = f"{self.app_id}/{self.codec.decode()}/"
+        for scope, dict_id in index.items():
+            if scope.startswith(prefix):
+                self._active[scope[len(prefix):]] = int(dict_id)
+
+    def _save_index(self) -> None:
+        try:
+            with open(self._index_path(), "r", encoding="utf-8") as handle:
+                index = json.load(handle)
+        except (FileNotFoundError, ValueError):
+            index = {}
+        prefix = f"{self.app_id}/{self.codec.decode()}/"
+        index.update({prefix + category: dict_id for category, dict_id in self._active.items()})
+        _atomic_write(self._index_path(), json.dumps(index, sort_keys=True).encode("utf-8"))
+
+
+def _dictionary_id(dictionary: bytes) -> int:
+    # Non-zero 32-bit id derived from the content (0 means "no dictionary")
+    return int.from_bytes(hashlib.sha256(dictionary).digest()[:4], "big") or 1
+
+
+def _prepend(first: bytes, rest: Iterator[bytes]) -> Iterator[bytes]:
+    yield first
+    yield from rest
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def read_chunks(path: str, chunk_bytes: int = READ_CHUNK_BYTES, offset: int = 0) -> Iterator[bytes]:
+    """File contents from offset as a chunk iterator."""
+    with open(path, "rb") as handle:
+        handle.seek(offset)
+        while True:
+            chunk = handle.read(chunk_bytes)
+            if not chunk:
+                return
+            yield chunk
+
+
+def category_of(key: str) -> str:
+    """Asset category from a generate_key() key (runs/{run}/{category}/...)."""
+    parts = key.split("/")
+    return parts[2] if len(parts) >= 4 and parts[0] == "runs" else "default"
+
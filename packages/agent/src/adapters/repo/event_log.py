@@ -0,0 +1,311 @@
+"""
+RunEventLog: Append-Only AgentState History per Run
+
+PURPOSE:
+--------
+Record every state transition of a run so it can be replayed, inspected
+and resumed after a crash, without storing a full AgentState per step:
+each record holds only the fields the node changed, with a full snapshot
+every snapshot_every records.
+
+ALLOWED DEPENDENCIES:
+---------------------
+- src.agent.domain (AgentState, state.diff)
+- state_serializer (field packing)
+- bisect, os, struct, zlib (stdlib)
+
+FORBIDDEN DEPENDENCIES:
+-----------------------
+- NO other adapters (state_serializer is part of this one)
+
+FILES:
+------
+{root}/{run_id}.log  records, append-only
+{root}/{run_id}.idx  snapshot index: 12-byte entries (u32 step, u64 offset)
+
+RECORD FORMAT (little-endian):
+------------------------------
+u32 body length | u32 crc32(body) | body
+body = u8 kind (0 snapshot, 1 diff) | u32 step | u16 node name length |
+       node name (utf-8) | state_serializer.pack_fields() of the changed
+       fields (msgpack or JSON, tagged with the schema id; a snapshot holds
+       every field)
+
+- Steps are record sequence numbers (one per appended state, i.e. per node
+  transition), starting at 0; step 0 is always a snapshot
+- A torn tail (crash mid-write) fails its length/CRC check: readers stop
+  there and reopening for append truncates it
+- The index is a cache: it is rebuilt from the log if missing or stale
+- A log written under another AgentState schema (a field added or changed
+  since) opens non-resumable: resumable is False, last_state is None and
+  reading its records raises ValueError; appends start with a snapshot
+
+READS:
+------
+- state_at(k): bisect the snapshot index (O(log n)), then apply at most
+  snapshot_every - 1 diffs
+- iter_records(): sequential scan in READ_CHUNK_BYTES reads, decoding
+  only the changed fields of each record (analytics)
+- iter_states(): every state in order, decoding only changed fields
+
+WRITES:
+-------
+append() buffers; flush() writes through (fsync=True also syncs). The
+AgentGraph on_transition hook makes it record every node's output.
+
+USAGE:
+------
+log = RunEventLog("/var/lib/screengraph/runs", run_id)
+final = await graph.run(state, on_transition=log.append)
+log.close()
+state_7 = RunEventLog("/var/lib/screengraph/runs", run_id).state_at(7)
+"""
+
+import bisect
+import os
+import struct
+import zlib
+from dataclasses import dataclass, fields, replace
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.agent.domain import AgentState, diff
+
+from .state_serializer import pack_fields, unpack_fields
+
+
+SNAPSHOT_EVERY = 64
+READ_CHUNK_BYTES = 1 << 20
+
+KIND_SNAPSHOT = 0
+KIND_DIFF = 1
+
+_FRAME = struct.Struct("<II")  # body length, crc32
+_BODY = struct.Struct("<BIH")  # kind, step, node name length
+_INDEX = struct.Struct("<IQ")  # step, offset
+
+
+@dataclass(frozen=True)
+class EventRecord:
+    """One decoded log record."""
+    step: int
+    kind: int
+    node: str
+    fields: Dict[str, Any]  # AgentState field values
+    offset: int
+
+
+class RunEventLog:
+    """
+    Per-run event log: writer and reader over one file pair.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        run_id: str,
+        snapshot_every: int = SNAPSHOT_EVERY,
+        fsync: bool = False,
+    ):
+        """
+        Opens (or creates) the run's log; an existing log is validated, its
+        torn tail truncated, and appends continue after its last record.
+
+        Args:
+            root: Directory holding run logs.
+            run_id: Run identifier (file name stem).
+            snapshot_every: Records between full snapshots.
+            fsync: Sync the log on flush() (durability vs. latency).
+        """
+        if snapshot_every <= 0:
+            raise ValueError("snapshot_every must be positive")
+        os.makedirs(root, exist_ok=True)
+        self.path = os.path.join(root, f"{run_id}.log")
+        self.index_path = os.path.join(root, f"{run_id}.idx")
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self._snapshots: List[Tuple[int, int]] = []  # (step, offset)
+        self._last: Optional[AgentState] = None
+        self._steps = 0
+        self.resumable = True  # False: last state written under another schema
+        self._recover()
+        self._file = open(self.path, "ab")
+        self._index = open(self.index_path, "ab")
+
+    def __len__(self) -> int:
+        return self._steps
+
+    @property
+    def last_state(self) -> Optional[AgentState]:
+        """Latest recorded state (the resume point after a crash)."""
+        return self._last
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, node: str, state: AgentState) -> int:
+        """
+        Record a transition; returns its step.
+
+        Signature matches AgentGraph.run(on_transition=...).
+        """
+        step = self._steps
+        if self._last is None or step % self.snapshot_every == 0:
+            kind, payload = KIND_SNAPSHOT, {name: getattr(state, name) for name in _FIELD_NAMES}
+        else:
+            kind, payload = KIND_DIFF, diff(self._last, state)
+        offset = self._file.tell()
+        self._file.write(_encode(kind, step, node, payload))
+        if kind == KIND_SNAPSHOT:
+            self._snapshots.append((step, offset))
+            self._index.write(_INDEX.pack(step, offset))
+        self._last = state
+        self._steps += 1
+        return step
+
+    def flush(self) -> None:
+        """Write buffered records (and fsync if configured)."""
+        # Log first: an index entry must never point past the log
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._index.flush()
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+            self._index.close()
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def state_at(self, step: int) -> AgentState:
+        """
+        State after the step-th transition.
+
+        Raises:
+            IndexError: step outside [0, len(self)).
+        """
+        if not 0 <= step < self._steps:
+            raise IndexError(f"step {step} not in log of {self._steps}")
+        self._file.flush()
+        position = bisect.bisect_right(self._snapshots, (step, float("inf"))) - 1
+        _, offset = self._snapshots[position]
+        state = None
+        for record in self.iter_records(offset):
+            state = _apply(state, record)
+            if record.step == step:
+                return state
+        raise IndexError(f"step {step} missing from log")
+
+    def iter_records(self, offset: int = 0) -> Iterator[EventRecord]:
+        """Records from a byte offset to the end (or the first invalid one)."""
+        self._file.flush()
+        for record_offset, body in _scan(self.path, offset):
+            yield _decode(body, record_offset)
+
+    def iter_states(self) -> Iterator[Tuple[int, str, AgentState]]:
+        """(step, node, state) for every record, in order."""
+        state = None
+        for record in self.iter_records():
+            state = _apply(state, record)
+            yield record.step, record.node, state
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+
+    def _recover(self) -> None:
+        """Validate an existing log, truncate a torn tail, rebuild the index."""
+        if not os.path.exists(self.path):
+            for path in (self.path, self.index_path):
+                open(path, "wb").close()
+            return
+        end = 0
+        last_snapshot = None
+        snapshots = []
+        steps = 0
+        for offset, body in _scan(self.path, 0):
+            kind, step, _ = _BODY.unpack_from(body)
+            if kind == KIND_SNAPSHOT:
+                snapshots.append((step, offset))
+                last_snapshot = offset
+            end = offset + _FRAME.size + len(body)
+            steps = step + 1
+        if os.path.getsize(self.path) != end:
+            with open(self.path, "r+b") as handle:
+                handle.truncate(end)
+        self._snapshots = snapshots
+        self._steps = steps
+        if self._read_index() != snapshots:
+            with open(self.index_path, "wb") as handle:
+                handle.write(b"".join(_INDEX.pack(step, offset) for step, offset in snapshots))
+        if last_snapshot is not None:
+            state = None
+            try:
+                for record in (_decode(body, offset) for offset, body in _scan(self.path, last_snapshot)):
+                    state = _apply(state, record)
+            except ValueError:
+                # Another schema: keep the records, but there is no state to resume from
+                self.resumable = False
+                return
+            self._last = state
+
+    def _read_index(self) -> List[Tuple[int, int]]:
+        try:
+            with open(self.index_path, "rb") as handle:
+                data = handle.read()
+        except FileNotFoundError:
+            return []
+        usable = len(data) - len(data) % _INDEX.size
+        return [_INDEX.unpack_from(data, position) for position in range(0, usable, _INDEX.size)]
+
+
+_FIELD_NAMES = tuple(f.name for f in fields(AgentState))
+
+
+def _apply(state: Optional[AgentState], record: EventRecord) -> AgentState:
+    if record.kind == KIND_SNAPSHOT:
+        return AgentState(**record.fields)
+    return replace(state, **record.fields)
+
+
+def _encode(kind: int, step: int, node: str, payload: Dict[str, Any]) -> bytes:
+    name = node.encode("utf-8")
+    body = _BODY.pack(kind, step, len(name)) + name + pack_fields(payload)
+    return _FRAME.pack(len(body), zlib.crc32(body)) + body
+
+
+def _decode(body: bytes, offset: int) -> EventRecord:
+    kind, step, name_length = _BODY.unpack_from(body)
+    start = _BODY.size
+    node = body[start:start + name_length].decode("utf-8")
+    return EventRecord(step, kind, node, unpack_fields(body[start + name_length:]), offset)
+
+
+def _scan(path: str, offset: int) -> Iterator[Tuple[int, bytes]]:
+    """(offset, body) of each valid record from offset; stops at a torn/corrupt one."""
+    with open(path, "rb") as handle:
+        handle.seek(offset)
+        buffer = b""
+        position = 0  # start of buffer within the file, relative to offset
+        while True:
+            chunk = handle.read(READ_CHUNK_BYTES)
+            buffer = buffer + chunk if buffer else chunk
+            cursor = 0
+            while len(buffer) - cursor >= _FRAME.size:
+                length, crc = _FRAME.unpack_from(buffer, cursor)
+                end = cursor + _FRAME.size + length
+                if end > len(buffer):
+                    break
+                body = buffer[cursor + _FRAME.size:end]
+                if zlib.crc32(body) != crc or length < _BODY.size:
+                    return
+                yield offset + position + cursor, body
+                cursor = end
+            buffer = buffer[cursor:]
+            position += cursor
+            if not chunk:
+                return
@@ -0,0 +1,527 @@
+"""
+LocalFileStoreAdapter: Content-Addressed FileStorePort on Local Disk
+
+PURPOSE:
+--------
+Store screenshots, page sources, OCR results and rationales once per
+distinct content. Revisiting a screen produces byte-identical page sources
+(and often identical PNGs); those puts return the existing ref without
+touching the disk, so per-run storage and write I/O fall with the revisit
+rate.
+
+ALLOWED DEPENDENCIES:
+---------------------
+- src.agent.ports.filestore_port (FileStorePort interface)
+- src.agent.errors (FileStoreError)
+- asyncio, hashlib, mmap, os, tempfile, zlib (stdlib); zstandard (optional
+  "storage" extra)
+
+FORBIDDEN DEPENDENCIES:
+-----------------------
+- NO other adapters
+- NO cloud SDKs (an S3/GCS store can reuse the same ref scheme)
+
+REFS:
+-----
+put(key, data) returns "cas/<sha256 hex>": the digest of the content, not
+the logical key. Equal data → equal ref, whatever key it was put under.
+get/exists/delete take refs. The logical key (generate_key) only names
+the asset in telemetry and errors.
+
+LAYOUT:
+-------
+{root}/cas/ab/cd/abcd…  (two 2-hex-digit shard levels: 65,536 directories,
+so no directory grows past a few hundred files on long runs)
+
+- Writes go to a temp file in the shard directory, then os.replace():
+  readers never see a partial blob, and concurrent puts of the same
+  content are harmless (same bytes, same name)
+- A known-digest set skips even the stat() for repeated content
+- Blocking file I/O runs in asyncio.to_thread
+
+COMPRESSION:
+------------
+Text assets (page sources, OCR JSON, rationales: text/*, application/json)
+are compressed by AssetCodec (compression.py) with a dictionary trained
+per app and category from its first captures (zstd; zlib preset dictionary
+when zstandard is not installed). Screenshots are stored as-is behind a
+raw frame header (RAW_HEADER), so no content can pass for a compressed
+frame. Digests and refs cover the uncompressed bytes, so compression never
+changes a ref; get() reads the frame header and stream-decompresses.
+
+STREAMING:
+----------
+- open_read(ref) yields chunks straight from disk (decompressed on the fly)
+- open_write(key) hashes and compresses chunk by chunk into a temp file and
+  renames it to its digest on close; a blob that already exists is
+  deduplicated and the temp file dropped
+- get_range(ref, offset, length) preads raw blobs; compressed blobs are
+  decompressed up to offset + length and the prefix discarded
+- get_view(ref) returns an mmap-backed read-only memoryview of a raw blob
+  (screenshots): zero-copy hashing/decoding. Compressed blobs come back as
+  a view over the decompressed bytes
+
+DURABILITY:
+-----------
+Blobs are renamed into place without fsync, so put() stays cheap; flush()
+fsyncs every blob written since the last flush (and its shard directory)
+in one worker-thread pass. FinalizeRunUsecase flushes before returning.
+
+STATS:
+------
+get_stats(): puts, dedup_hits, bytes_written (uncompressed), bytes_stored
+(on disk), bytes_deduplicated, distinct_blobs (seen by this process)
+
+USAGE:
+------
+store = LocalFileStoreAdapter("/var/lib/screengraph/assets", app_id="com.example.app")
+ref = await store.put(store.generate_key(run_id, "page_sources", step_id, "xml"), xml)
+data = await store.get(ref)
+"""
+
+import asyncio
+import hashlib
+import mmap
+import os
+import tempfile
+from typing import AsyncIterator, Dict, Iterator, Optional, Set, Tuple
+
+from src.agent.errors.error_types import FileStoreError
+from src.agent.ports.filestore_port import DEFAULT_CHUNK_BYTES, BlobWriter, FileStorePort
+
+from .compression import (
+    CODEC_RAW,
+    HEADER_BYTES,
+    RAW_HEADER,
+    AssetCodec,
+    category_of,
+    frame_codec,
+    is_compressible,
+    read_chunks,
+)
+
+
+REF_PREFIX = "cas/"
+SHARD_WIDTH = 2  # hex digits per shard level
+SHARD_LEVELS = 2
+INLINE_HASH_BYTES = 64 * 1024  # larger blobs are hashed in a worker thread
+
+
+def content_digest(data: bytes) -> str:
+    """SHA-256 hex digest (hashlib releases the GIL on large buffers)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class LocalFileStoreAdapter(FileStorePort):
+    """
+    Content-addressed, deduplicating local-disk implementation of FileStorePort.
+    """
+
+    def __init__(self, root: str, app_id: str = "default", compress: bool = True):
+        """
+        Args:
+            root: Base directory; created if missing.
+            app_id: Scope of the trained compression dictionaries.
+            compress: Compress text assets (reads handle both either way).
+        """
+        self.root = os.path.abspath(root)
+        os.makedirs(os.path.join(self.root, REF_PREFIX), exist_ok=True)
+        self.codec = AssetCodec(os.path.join(self.root, "dicts"), app_id=app_id)
+        self.compress = compress
+        self._known: Set[str] = set()
+        self._unsynced: Set[str] = set()  # blob paths written since the last flush()
+        self._puts = 0
+        self._dedup_hits = 0
+        self._bytes_written = 0
+        self._bytes_stored = 0
+        self._bytes_deduplicated = 0
+
+    # ------------------------------------------------------------------
+    # FileStorePort
+    # ------------------------------------------------------------------
+
+    async def put(
+        self,
+        key: str,
+        data: bytes,
+        content_type: str = "application/octet-stream",
+    ) -> str:
+        """
+        Store data once per distinct content.
+
+        Returns:
+            Content ref ("cas/<sha256>"); identical data always yields the same ref.
+
+        Raises:
+            FileStoreError: If the write failed.
+        """
+        self._puts += 1
+        digest = (
+            content_digest(data)
+            if len(data) < INLINE_HASH_BYTES
+            else await asyncio.to_thread(content_digest, data)
+        )
+        if digest in self._known:
+            return self._deduplicated(digest, len(data))
+        category = category_of(key) if self.compress and is_compressible(content_type) else None
+        try:
+            stored = await asyncio.to_thread(self._write_once, digest, data, category)
+        except OSError as error:
+            raise FileStoreError(f"put {key} failed: {error}") from error
+        return self._committed(digest, len(data), stored)
+
+    async def get(self, key: str) -> bytes:
+        """
+        Read a blob by ref.
+
+        Raises:
+            FileStoreError: Unknown ref or read failure.
+        """
+        path = self._path(key)
+        try:
+            return await asyncio.to_thread(self._read_blob, path)
+        except FileNotFoundError:
+            raise FileStoreError(f"missing key {key}") from None
+        except (OSError, ValueError) as error:
+            raise FileStoreError(f"get {key} failed: {error}") from error
+
+    async def delete(self, key: str) -> bool:
+        """Delete a blob; every put that returned this ref shares it."""
+        path = self._path(key)
+        self._known.discard(key[len(REF_PREFIX):])
+        self._unsynced.discard(path)
+        try:
+            await asyncio.to_thread(os.remove, path)
+        except FileNotFoundError:
+            return False
+        except OSError as error:
+            raise FileStoreError(f"delete {key} failed: {error}") from error
+        return True
+
+    async def exists(self, key: str) -> bool:
+        if key[len(REF_PREFIX):] in self._known:
+            return True
+        try:
+            path = self._path(key)
+        except FileStoreError:
+            return False
+        return await asyncio.to_thread(os.path.exists, path)
+
+    async def open_read(self, key: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> AsyncIterator[bytes]:
+        """
+        Stream a blob (decompressed) in chunks of at most chunk_bytes.
+
+        Raises:
+            FileStoreError: Unknown ref or read failure.
+        """
+        chunks = self._iter_blob(self._path(key), chunk_bytes)
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                except FileNotFoundError:
+                    raise FileStoreError(f"missing key {key}") from None
+                except (OSError, ValueError) as error:
+                    raise FileStoreError(f"read {key} failed: {error}") from error
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            chunks.close()
+
+    def open_write(self, key: str, content_type: str = "application/octet-stream") -> BlobWriter:
+        """
+        Streaming put(): close() returns the same ref put() would for the same bytes.
+        """
+        category = category_of(key) if self.compress and is_compressible(content_type) else None
+        return _LocalBlobWriter(self, key, category)
+
+    async def get_range(self, key: str, offset: int, length: int) -> bytes:
+        """
+        Read length bytes at offset of the (decompressed) blob.
+
+        Raises:
+            FileStoreError: Unknown ref or read failure.
+            ValueError: Negative offset or length.
+        """
+        if offset < 0 or length < 0:
+            raise ValueError("offset and length must be non-negative")
+        path = self._path(key)
+        try:
+            return await asyncio.to_thread(self._read_range, path, offset, length)
+        except FileNotFoundError:
+            raise FileStoreError(f"missing key {key}") from None
+        except (OSError, ValueError) as error:
+            raise FileStoreError(f"read {key} failed: {error}") from error
+
+    async def get_view(self, key: str) -> memoryview:
+        """
+        Read-only view of a blob; mmap-backed (no copy) for raw blobs.
+
+        The mapping stays valid while the view (or slices of it) is alive,
+        even if the blob is deleted meanwhile.
+
+        Raises:
+            FileStoreError: Unknown ref or read failure.
+        """
+        path = self._path(key)
+        try:
+            return await asyncio.to_thread(self._map_blob, path)
+        except FileNotFoundError:
+            raise FileStoreError(f"missing key {key}") from None
+        except (OSError, ValueError) as error:
+            raise FileStoreError(f"get {key} failed: {error}") from error
+
+    def ref_for(self, key: str, data: bytes) -> Optional[str]:
+        return REF_PREFIX + content_digest(data)
+
+    async def flush(self) -> None:
+        """
+        fsync blobs written since the last flush.
+
+        Raises:
+            FileStoreError: If syncing failed.
+        """
+        paths, self._unsynced = self._unsynced, set()
+        if not paths:
+            return
+        try:
+            await asyncio.to_thread(_fsync_all, paths)
+        except OSError as error:
+            self._unsynced |= paths
+            raise FileStoreError(f"flush failed: {error}") from error
+
+    def generate_key(
+        self,
+        run_id: str,
+        category: str,
+        screen_id: str,
+        extension: str,
+    ) -> str:
+        return f"runs/{run_id}/{category}/{screen_id}.{extension}"
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "puts": self._puts,
+            "dedup_hits": self._dedup_hits,
+            "bytes_written": self._bytes_written,
+            "bytes_stored": self._bytes_stored,
+            "bytes_deduplicated": self._bytes_deduplicated,
+            "distinct_blobs": len(self._known),
+        }
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+
+    def _path(self, ref: str) -> str:
+        digest = ref[len(REF_PREFIX):] if ref.startswith(REF_PREFIX) else ""
+        if len(digest) != 64 or not all(c in "0123456789abcdef" for c in digest):
+            raise FileStoreError(f"not a content ref: {ref}")
+        return self._blob_path(digest)
+
+    def _blob_path(self, digest: str) -> str:
+        shards = [digest[i * SHARD_WIDTH:(i + 1) * SHARD_WIDTH] for i in range(SHARD_LEVELS)]
+        return os.path.join(self.root, REF_PREFIX, *shards, digest)
+
+    def _write_once(self, digest: str, data: bytes, category: Optional[str]) -> Optional[int]:
+        """Write the blob unless present; bytes stored, or None when it already existed."""
+        path = self._blob_path(digest)
+        if os.path.exists(path):
+            return None
+        if category is not None:
+            header, data = b"", self.codec.compress(category, data)
+        else:
+            header = RAW_HEADER
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(header)
+                handle.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return len(header) + len(data)
+
+    def _iter_blob(self, path: str, chunk_bytes: int) -> Iterator[bytes]:
+        codec = _codec_of(path)
+        if codec is None or codec == CODEC_RAW:
+            yield from read_chunks(path, chunk_bytes, 0 if codec is None else HEADER_BYTES)
+            return
+        for out in self.codec.iter_decompressed(read_chunks(path, chunk_bytes)):
+            # Decompressed pieces can be far larger than the reads
+            for start in range(0, len(out), chunk_bytes):
+                yield out[start:start + chunk_bytes]
+
+    def _read_range(self, path: str, offset: int, length: int) -> bytes:
+        with open(path, "rb") as handle:
+            codec = frame_codec(handle.read(HEADER_BYTES))
+            if codec is None or codec == CODEC_RAW:
+                start = 0 if codec is None else HEADER_BYTES
+                return os.pread(handle.fileno(), length, start + offset)
+        parts = []
+        position = 0  # decompressed offset of the next piece
+        end = offset + length
+        for out in self.codec.iter_decompressed(read_chunks(path)):
+            if position + len(out) > offset:
+                parts.append(out[max(offset - position, 0):end - position])
+            position += len(out)
+            if position >= end:
+                break
+        return b"".join(parts)
+
+    def _map_blob(self, path: str) -> memoryview:
+        with open(path, "rb") as handle:
+            codec = frame_codec(handle.read(HEADER_BYTES))
+            if codec is not None and codec != CODEC_RAW:
+                return memoryview(self._read_blob(path))
+            start = 0 if codec is None else HEADER_BYTES
+            if os.fstat(handle.fileno()).st_size == start:
+                return memoryview(b"")  # mmap rejects empty files
+            # The mapping outlives the descriptor; slicing off the header copies nothing
+            return memoryview(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))[start:]
+
+    def _read_blob(self, path: str) -> bytes:
+        codec = _codec_of(path)
+        if codec is None or codec == CODEC_RAW:
+            return b"".join(read_chunks(path, offset=0 if codec is None else HEADER_BYTES))
+        return b"".join(self.codec.iter_decompressed(read_chunks(path)))
+
+    def _committed(self, digest: str, size: int, stored: Optional[int]) -> str:
+        self._known.add(digest)
+        if stored is None:
+            return self._deduplicated(digest, size)
+        self._unsynced.add(self._blob_path(digest))
+        self._bytes_written += size
+        self._bytes_stored += stored
+        return REF_PREFIX + digest
+
+    def _deduplicated(self, digest: str, size: int) -> str:
+        self._dedup_hits += 1
+        self._bytes_deduplicated += size
+        return REF_PREFIX + digest
+
+
+def _fsync_all(paths: Set[str]) -> None:
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            continue  # deleted since
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    # The renames are durable once their directories are synced
+    for directory in {os.path.dirname(path) for path in paths}:
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            continue  # platforms without directory fds (Windows)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def _codec_of(path: str) -> Optional[bytes]:
+    """Frame codec of a stored blob; None for unframed (pre-CODEC_RAW) files."""
+    with open(path, "rb") as handle:
+        return frame_codec(handle.read(HEADER_BYTES))
+
+
+class _LocalBlobWriter(BlobWriter):
+    """
+    Streaming writer: hashes (and compresses) each chunk into a temp file in
+    {root}/cas/, then renames it to its digest path on close.
+    """
+
+    def __init__(self, store: LocalFileStoreAdapter, key: str, category: Optional[str]):
+        self.store = store
+        self.key = key
+        self._hash = hashlib.sha256()
+        self._size = 0
+        self._stored = 0
+        self._header, self._compressor = store.codec.compressobj(category) if category else (RAW_HEADER, None)
+        self._handle = None
+        self._tmp_path: Optional[str] = None
+        self._done = False
+
+    async def write(self, data: bytes) -> None:
+        if self._done:
+            raise FileStoreError(f"write {self.key} after close")
+        try:
+            await asyncio.to_thread(self._write, data)
+        except OSError as error:
+            await self.abort()
+            raise FileStoreError(f"write {self.key} failed: {error}") from error
+
+    async def close(self) -> str:
+        if self._done:
+            if self.ref is None:
+                raise FileStoreError(f"write {self.key} was aborted")
+            return self.ref
+        self.store._puts += 1
+        try:
+            digest, stored = await asyncio.to_thread(self._commit)
+        except OSError as error:
+            await self.abort()
+            raise FileStoreError(f"put {self.key} failed: {error}") from error
+        self._done = True
+        self.ref = self.store._committed(digest, self._size, stored)
+        return self.ref
+
+    async def abort(self) -> None:
+        self._done = True
+        await asyncio.to_thread(self._discard)
+
+    def _write(self, data: bytes) -> None:
+        if self._handle is None:
+            self._open()
+        self._hash.update(data)
+        self._size += len(data)
+        self._emit(self._compressor.compress(data) if self._compressor else data)
+
+    def _open(self) -> None:
+        fd, self._tmp_path = tempfile.mkstemp(dir=os.path.join(self.store.root, REF_PREFIX), prefix=".tmp-")
+        self._handle = os.fdopen(fd, "wb")
+        self._emit(self._header)
+
+    def _emit(self, data: bytes) -> None:
+        if data:
+            self._handle.write(data)
+            self._stored += len(data)
+
+    def _commit(self) -> Tuple[str, Optional[int]]:
+        if self._handle is None:
+            self._open()
+        if self._compressor:
+            self._emit(self._compressor.flush())
+        self._handle.close()
+        digest = self._hash.hexdigest()
+        path = self.store._blob_path(digest)
+        if os.path.exists(path):
+            os.remove(self._tmp_path)
+            return digest, None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(self._tmp_path, path)
+        return digest, self._stored
+
+    def _discard(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+        if self._tmp_path is not None:
+            try:
+                os.remove(self._tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,446 @@
+"""
+SQLiteRepoAdapter: Embedded RepoPort for the ScreenGraph
+
+PURPOSE:
+--------
+Persist ScreenGraph nodes and edges in one local SQLite file, so a laptop
+run needs no database server and later runs of the same app start from its
+graph (StartSessionUsecase cache warm-up reads get_top_nodes()).
+
+ALLOWED DEPENDENCIES:
+---------------------
+- src.agent.ports.repo_port (RepoPort, Node, Edge, ExplorationStats)
+- src.agent.domain (GraphIndex)
+- src.agent.errors (DatabaseError)
+- asyncio, json, sqlite3, threading (stdlib)
+
+FORBIDDEN DEPENDENCIES:
+-----------------------
+- NO other adapters
+- NO ORM
+
+SCHEMA:
+-------
+nodes: signature (PK), app_id, visits, first_run_id, last_run_id,
+       metadata (JSON), created_at, updated_at
+edges: (from_signature, to_signature, action) (PK), traversals,
+       first_run_id, last_run_id, metadata (JSON), created_at, updated_at
+
+Both tables are WITHOUT ROWID (clustered on the key), so:
+- get_node: primary-key lookup
+- get_neighbors: range scan of the edges key prefix from_signature
+- get_top_nodes: nodes_app_visits index (app_id, visits DESC)
+- get_exploration_stats: nodes_last_run / edges_last_run indexes
+
+GRAPH QUERIES:
+--------------
+find_path()/nearest_frontier() run on an in-memory GraphIndex (CSR
+adjacency), loaded from the edges table on first use and then updated by
+every upsert_edge() (and upsert_node() metadata["action_count"]), so
+navigation queries cost no SQL.
+
+UPSERTS:
+--------
+INSERT ... ON CONFLICT DO UPDATE, keyed by signature and (from, to, action):
+- node: visits + 1 (metadata["visits"] sets it instead), metadata merged
+  with json_patch (a key set to None removes it), last_run_id and
+  updated_at refreshed; created_at and first_run_id kept
+- edge: traversals + 1, metadata merged, last_run_id refreshed
+run_id and app_id are taken from metadata when present.
+
+BATCHING:
+---------
+upsert_*() append to an in-memory batch and return the deterministic id at
+once. The batch is applied in ONE transaction (executemany over cached
+prepared statements) once it holds max_batch upserts or is older than
+max_delay_s, and before any read, so reads always see every upsert
+(read-your-writes). flush() commits the tail; StopNode and
+FinalizeRunUsecase call it. A crash loses at most the uncommitted tail,
+which the next visit of those screens re-creates (upserts are idempotent).
+
+- WAL journal, synchronous=NORMAL: commits do not fsync the database file,
+  readers never block the writer
+- Blocking calls run in asyncio.to_thread; a lock serializes the connection
+
+USAGE:
+------
+repo = SQLiteRepoAdapter("/var/lib/screengraph/graph.sqlite3")
+await repo.upsert_node(signature, {"app_id": app_id, "run_id": run_id})
+await repo.upsert_edge(prev, signature, "tap:Login", {"run_id": run_id, "verified": True})
+await repo.flush()
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.agent.domain import GraphIndex
+from src.agent.errors.error_types import DatabaseError
+from src.agent.ports.repo_port import Edge, ExplorationStats, Node, RepoPort
+
+
+MAX_BATCH = 256  # upserts per transaction
+MAX_DELAY_S = 1.0  # oldest uncommitted upsert
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    signature TEXT PRIMARY KEY,
+    app_id TEXT,
+    visits INTEGER NOT NULL,
+    first_run_id TEXT,
+    last_run_id TEXT,
+    metadata TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS nodes_app_visits ON nodes (app_id, visits DESC);
+CREATE INDEX IF NOT EXISTS nodes_last_run ON nodes (last_run_id);
+
+CREATE TABLE IF NOT EXISTS edges (
+    from_signature TEXT NOT NULL,
+    to_signature TEXT NOT NULL,
+    action TEXT NOT NULL,
+    traversals INTEGER NOT NULL,
+    first_run_id TEXT,
+    last_run_id TEXT,
+    metadata TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (from_signature, to_signature, action)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS edges_last_run ON edges (last_run_id);
+"""
+
+# Parameters: signature, app_id, visits (NULL: count a visit), run_id, metadata, now
+_UPSERT_NODE = """
+INSERT INTO nodes (signature, app_id, visits, first_run_id, last_run_id, metadata, created_at, updated_at)
+VALUES (?1, ?2, COALESCE(?3, 1), ?4, ?4, ?5, ?6, ?6)
+ON CONFLICT (signature) DO UPDATE SET
+    app_id = COALESCE(excluded.app_id, nodes.app_id),
+    visits = COALESCE(?3, nodes.visits + 1),
+    last_run_id = COALESCE(excluded.last_run_id, nodes.last_run_id),
+    first_run_id = COALESCE(nodes.first_run_id, excluded.first_run_id),
+    metadata = json_patch(nodes.metadata, excluded.metadata),
+    updated_at = excluded.updated_at
+"""
+
+# Parameters: from, to, action, run_id, metadata, now
+_UPSERT_EDGE = """
+INSERT INTO edges (from_signature, to_signature, action, traversals, first_run_id, last_run_id,
+                   metadata, created_at, updated_at)
+VALUES (?1, ?2, ?3, 1, ?4, ?4, ?5, ?6, ?6)
+ON CONFLICT (from_signature, to_signature, action) DO UPDATE SET
+    traversals = edges.traversals + 1,
+    last_run_id = COALESCE(excluded.last_run_id, edges.last_run_id),
+    first_run_id = COALESCE(edges.first_run_id, excluded.first_run_id),
+    metadata = json_patch(edges.metadata, excluded.metadata),
+    updated_at = excluded.updated_at
+"""
+
+_NODE_COLUMNS = "signature, visits, metadata, created_at, updated_at"
+
+
+def edge_id(from_signature: str, to_signature: str, action: str) -> str:
+    """Deterministic edge id (the edge's primary key)."""
+    return f"{from_signature}|{to_signature}|{action}"
+
+
+class SQLiteRepoAdapter(RepoPort):
+    """
+    Embedded, transaction-batching implementation of RepoPort.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_batch: int = MAX_BATCH,
+        max_delay_s: float = MAX_DELAY_S,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            path: SQLite file (":memory:" for tests).
+            max_batch: Upserts per transaction.
+            max_delay_s: Commit once the oldest pending upsert is this old.
+            clock: Wall clock (seconds); injectable for tests.
+        """
+        self.path = path
+        self.max_batch = max_batch
+        self.max_delay_s = max_delay_s
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._nodes: List[Tuple] = []  # pending _UPSERT_NODE parameters
+        self._edges: List[Tuple] = []  # pending _UPSERT_EDGE parameters
+        self._oldest_pending: Optional[float] = None
+        self._commit_lock = asyncio.Lock()
+        self._graph: Optional[GraphIndex] = None  # loaded on first graph query
+        self._commits = 0
+        self._upserts = 0
+
+    # ------------------------------------------------------------------
+    # RepoPort
+    # ------------------------------------------------------------------
+
+    async def upsert_node(self, signature: str, metadata: Dict[str, Any]) -> str:
+        """
+        Queue a node upsert (one visit) and return its id (the signature).
+
+        Raises:
+            DatabaseError: If the batch this upsert completed failed to commit.
+        """
+        visits = metadata.get("visits")
+        if self._graph is not None and metadata.get("action_count") is not None:
+            self._graph.set_action_count(signature, int(metadata["action_count"]))
+        self._nodes.append((
+            signature,
+            metadata.get("app_id"),
+            int(visits) if visits is not None else None,
+            metadata.get("run_id"),
+            _dumps({k: v for k, v in metadata.items() if k != "visits"}),
+            self._now(),
+        ))
+        await self._queued()
+        return signature
+
+    async def upsert_edge(
+        self,
+        from_signature: str,
+        to_signature: str,
+        action: str,
+        metadata: Dict[str, Any],
+    ) -> str:
+        """
+        Queue an edge upsert (one traversal) and return its id.
+
+        Raises:
+            DatabaseError: If the batch this upsert completed failed to commit.
+        """
+        if self._graph is not None:
+            self._graph.add_edge(from_signature, to_signature, action)
+        self._edges.append((
+            from_signature,
+            to_signature,
+            action,
+            metadata.get("run_id"),
+            _dumps(metadata),
+            self._now(),
+        ))
+        await self._queued()
+        return edge_id(from_signature, to_signature, action)
+
+    async def get_node(self, signature: str) -> Optional[Node]:
+        rows = await self._read(f"SELECT {_NODE_COLUMNS} FROM nodes WHERE signature = ?", (signature,))
+        return _node(rows[0]) if rows else None
+
+    async def get_neighbors(self, signature: str) -> List[Node]:
+        rows = await self._read(
+            f"SELECT {_NODE_COLUMNS} FROM nodes WHERE signature IN "
+            "(SELECT to_signature FROM edges WHERE from_signature = ?) ORDER BY signature",
+            (signature,),
+        )
+        return [_node(row) for row in rows]
+
+    async def get_edges(self, from_signature: str) -> List[Edge]:
+        """Outgoing edges of a node (adapter extension)."""
+        rows = await self._read(
+            "SELECT from_signature, to_signature, action, traversals, metadata, created_at "
+            "FROM edges WHERE from_signature = ? ORDER BY to_signature, action",
+            (from_signature,),
+        )
+        return [
+            Edge(frm, to, action, {**json.loads(metadata), "traversals": traversals}, created_at)
+            for frm, to, action, traversals, metadata, created_at in rows
+        ]
+
+    async def get_top_nodes(self, app_id: str, limit: int) -> List[Node]:
+        rows = await self._read(
+            f"SELECT {_NODE_COLUMNS} FROM nodes WHERE app_id = ? ORDER BY visits DESC LIMIT ?",
+            (app_id, limit),
+        )
+        return [_node(row) for row in rows]
+
+    async def get_exploration_stats(self, run_id: str) -> ExplorationStats:
+        """
+        Nodes/edges touched by the run; screens_new: nodes first seen in it;
+        coverage_pct: share of the app's known nodes the run visited.
+        """
+        await self._commit_pending()
+        try:
+            return await asyncio.to_thread(self._stats, run_id)
+        except sqlite3.Error as error:
+            raise DatabaseError(f"stats for {run_id} failed: {error}") from error
+
+    async def find_path(self, from_signature: str, to_signature: str) -> Optional[List[Tuple[str, str]]]:
+        """
+        Fewest-actions route between two known screens (adapter extension).
+
+        Returns:
+            [(action, next_signature), ...] ([] if from == to), or None if
+            no recorded edges connect them.
+        """
+        return (await self.graph()).shortest_path(from_signature, to_signature)
+
+    async def nearest_frontier(self, signature: str) -> Optional[Tuple[str, List[Tuple[str, str]]]]:
+        """
+        Closest screen reachable from signature with untried actions (adapter extension).
+
+        Returns:
+            (frontier_signature, path), or None if none is reachable.
+        """
+        return (await self.graph()).nearest_frontier(signature)
+
+    async def graph(self) -> GraphIndex:
+        """
+        The in-memory GraphIndex, loaded from the database on first call.
+
+        Raises:
+            DatabaseError: If loading failed.
+        """
+        if self._graph is None:
+            await self._commit_pending()
+            # Holding the lock keeps upserts made during the load pending,
+            # so they are replayed below instead of being missed
+            async with self._commit_lock:
+                if self._graph is None:
+                    try:
+                        graph = await asyncio.to_thread(self._load_graph)
+                    except sqlite3.Error as error:
+                        raise DatabaseError(f"loading graph index failed: {error}") from error
+                    for signature, _, _, _, metadata, _ in self._nodes:
+                        action_count = json.loads(metadata).get("action_count")
+                        if action_count is not None:
+                            graph.set_action_count(signature, int(action_count))
+                    for from_signature, to_signature, action, _, _, _ in self._edges:
+                        graph.add_edge(from_signature, to_signature, action)
+                    self._graph = graph
+        return self._graph
+
+    async def flush(self) -> None:
+        """
+        Commit pending upserts.
+
+        Raises:
+            DatabaseError: If the commit failed (the upserts stay pending).
+        """
+        await self._commit_pending()
+
+    # ------------------------------------------------------------------
+    # Stats / lifecycle
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "upserts": self._upserts,
+            "commits": self._commits,
+            "pending": len(self._nodes) + len(self._edges),
+        }
+
+    async def close(self) -> None:
+        """Commit pending upserts and close the connection."""
+        await self._commit_pending()
+        await asyncio.to_thread(self._close)
+
+    # ------------------------------------------------------------------
+    # Batching
+    # ------------------------------------------------------------------
+
+    async def _queued(self) -> None:
+        self._upserts += 1
+        now = self.clock()
+        if self._oldest_pending is None:
+            self._oldest_pending = now
+        pending = len(self._nodes) + len(self._edges)
+        if pending >= self.max_batch or now - self._oldest_pending >= self.max_delay_s:
+            await self._commit_pending()
+
+    async def _commit_pending(self) -> None:
+        # The asyncio lock orders commits and the reads waiting on them
+        async with self._commit_lock:
+            if not self._nodes and not self._edges:
+                return
+            nodes, edges = self._nodes, self._edges
+            self._nodes, self._edges, self._oldest_pending = [], [], None
+            try:
+                await asyncio.to_thread(self._commit, nodes, edges)
+            except sqlite3.Error as error:
+                # Keep them (ahead of newer upserts) for the next commit
+                self._nodes[:0], self._edges[:0] = nodes, edges
+                self._oldest_pending = self.clock()
+                raise DatabaseError(f"commit of {len(nodes) + len(edges)} upserts failed: {error}") from error
+            self._commits += 1
+
+    def _commit(self, nodes: List[Tuple], edges: List[Tuple]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Nodes first: an edge batch may reference nodes of the same batch
+                self._conn.executemany(_UPSERT_NODE, nodes)
+                self._conn.executemany(_UPSERT_EDGE, edges)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    async def _read(self, sql: str, params: Tuple) -> List[Tuple]:
+        await self._commit_pending()
+        try:
+            return await asyncio.to_thread(self._fetchall, sql, params)
+        except sqlite3.Error as error:
+            raise DatabaseError(f"query failed: {error}") from error
+
+    def _fetchall(self, sql: str, params: Tuple) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _stats(self, run_id: str) -> ExplorationStats:
+        with self._lock:
+            nodes_total, screens_new, app_id = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(first_run_id = ?1), 0), MAX(app_id) "
+                "FROM nodes WHERE last_run_id = ?1",
+                (run_id,),
+            ).fetchone()
+            edges_total = self._conn.execute(
+                "SELECT COUNT(*) FROM edges WHERE last_run_id = ?", (run_id,)
+            ).fetchone()[0]
+            known = self._conn.execute(
+                "SELECT COUNT(*) FROM nodes WHERE app_id = ?", (app_id,)
+            ).fetchone()[0] if app_id is not None else 0
+        coverage = 100.0 * nodes_total / known if known else 0.0
+        return ExplorationStats(nodes_total, edges_total, screens_new, coverage)
+
+    def _load_graph(self) -> GraphIndex:
+        with self._lock:
+            graph = GraphIndex(
+                self._conn.execute("SELECT from_signature, to_signature, action FROM edges").fetchall()
+            )
+            rows = self._conn.execute(
+                "SELECT signature, json_extract(metadata, '$.action_count') FROM nodes "
+                "WHERE json_extract(metadata, '$.action_count') IS NOT NULL"
+            )
+            for signature, action_count in rows:
+                graph.set_action_count(signature, int(action_count))
+        return graph
+
+    def _close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _now(self) -> str:
+        return datetime.fromtimestamp(self.clock(), timezone.utc).isoformat(timespec="milliseconds")
+
+
+def _dumps(metadata: Dict[str, Any]) -> str:
+    return json.dumps(metadata, separators=(",", ":"), default=str)
+
+
+def _node(row: Tuple) -> Node:
+    signature, visits, metadata, created_at, updated_at = row
+    return Node(signature, {**json.loads(metadata), "visits": visits}, created_at, updated_at)
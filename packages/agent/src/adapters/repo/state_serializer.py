@@ -0,0 +1,100 @@
+"""
+State serializer: AgentState ↔ bytes.
+
+Binary form for checkpoints, the run event log and cross-process handoff:
+one format byte, the 4-byte schema id of AgentState (domain state_codec),
+then the compact (positional) encoding as msgpack when the optional
+"redis" extra is installed, else as compact JSON. Unpacking reads either
+format and rejects data written under another schema; use the canonical
+JSON form (state_codec.state_to_json) where readers may run other
+versions.
+
+pack_fields()/unpack_fields() carry a subset of fields (event log diffs)
+as flat [field index, value, ...] pairs under the same header.
+"""
+
+import json
+import struct
+from typing import Any, Dict, Optional
+
+from src.agent.domain import AgentState
+from src.agent.domain.state_codec import field_codecs, from_compact, schema_id, to_compact
+
+try:
+    import msgpack
+except ImportError:  # optional "redis" extra
+    msgpack = None
+
+
+FORMAT_JSON = b"j"
+FORMAT_MSGPACK = b"m"
+
+_SCHEMA = struct.Struct("<I")
+_HEADER_BYTES = 1 + _SCHEMA.size
+
+
+def default_format() -> bytes:
+    return FORMAT_MSGPACK if msgpack is not None else FORMAT_JSON
+
+
+def pack_state(state: AgentState, format: Optional[bytes] = None) -> bytes:
+    return _pack(to_compact(state), format)
+
+
+def unpack_state(blob: bytes) -> AgentState:
+    """
+    Raises:
+        ValueError: Unknown/unavailable format or another schema.
+    """
+    return from_compact(AgentState, _unpack(blob))
+
+
+def pack_fields(values: Dict[str, Any], format: Optional[bytes] = None) -> bytes:
+    """Pack selected AgentState field values ({name: value})."""
+    flat = []
+    for name, value in values.items():
+        index, codec = _FIELDS[name]
+        flat.append(index)
+        flat.append(codec.encode(value))
+    return _pack(flat, format)
+
+
+def unpack_fields(blob: bytes) -> Dict[str, Any]:
+    """Inverse of pack_fields(); raises ValueError like unpack_state()."""
+    flat = _unpack(blob)
+    values = {}
+    for position in range(0, len(flat), 2):
+        name, codec = _BY_INDEX[flat[position]]
+        values[name] = codec.decode(flat[position + 1])
+    return values
+
+
+def _pack(value: Any, format: Optional[bytes]) -> bytes:
+    format = format or default_format()
+    header = format + _SCHEMA.pack(schema_id(AgentState))
+    if format == FORMAT_MSGPACK:
+        if msgpack is None:
+            raise ValueError("msgpack format requested but msgpack is not installed")
+        return header + msgpack.packb(value, use_bin_type=True)
+    if format == FORMAT_JSON:
+        return header + json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    raise ValueError(f"unknown state format {format!r}")
+
+
+def _unpack(blob: bytes) -> Any:
+    if len(blob) < _HEADER_BYTES:
+        raise ValueError("truncated state blob")
+    format = blob[:1]
+    (schema,) = _SCHEMA.unpack_from(blob, 1)
+    if schema != schema_id(AgentState):
+        raise ValueError(f"state schema {schema:#010x} does not match {schema_id(AgentState):#010x}")
+    body = memoryview(blob)[_HEADER_BYTES:]
+    if format == FORMAT_JSON:
+        return json.loads(bytes(body))
+    if format == FORMAT_MSGPACK and msgpack is not None:
+        return msgpack.unpackb(body, raw=False, strict_map_key=False)
+    raise ValueError(f"cannot read state format {format!r}")
+
+
+_FIELDS = {name: (index, codec) for index, (name, codec) in enumerate(field_codecs(AgentState, compact=True).items())}
+_BY_INDEX = {index: (name, codec) for name, (index, codec) in _FIELDS.items()}
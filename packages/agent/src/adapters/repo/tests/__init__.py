@@ -0,0 +1,5 @@
+"""
+Repo Adapter Tests
+
+Unit tests for the FileStorePort adapters.
+"""
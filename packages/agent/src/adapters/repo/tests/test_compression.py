@@ -0,0 +1,89 @@
+"""
+Unit tests for AssetCodec and compressed LocalFileStoreAdapter assets.
+"""
+
+import os
+import random
+
+import pytest
+
+from src.adapters.repo import LocalFileStoreAdapter
+from src.adapters.repo.compression import TRAIN_SAMPLES, AssetCodec, is_framed
+
+
+def _page_source(seed: int, nodes: int = 120) -> bytes:
+    rng = random.Random(seed)
+    rows = [
+        f'<android.widget.TextView index="{i}" package="com.example.app" '
+        f'class="android.widget.TextView" text="Row {rng.randint(0, 10**6)}" '
+        f'resource-id="com.example.app:id/title_{rng.randint(0, 40)}" checkable="false" '
+        f'clickable="{"true" if rng.random() < 0.3 else "false"}" enabled="true" '
+        f'bounds="[0,{i * 48}][1080,{i * 48 + 48}]" />'
+        for i in range(nodes)
+    ]
+    return ('<?xml version="1.0" encoding="UTF-8"?><hierarchy rotation="0">' + "".join(rows) + "</hierarchy>").encode()
+
+
+@pytest.fixture(params=["zlib", "zstd"])
+def use_zstd(request):
+    if request.param == "zstd":
+        pytest.importorskip("zstandard")
+    return request.param == "zstd"
+
+
+class TestAssetCodec:
+    """Tests for dictionary training and framing."""
+
+    def test_round_trip_and_dictionary_training(self, tmp_path, use_zstd):
+        codec = AssetCodec(str(tmp_path), app_id="com.example.app", use_zstd=use_zstd)
+        early = [codec.compress("page_sources", _page_source(i)) for i in range(TRAIN_SAMPLES)]
+        assert codec.dictionary_id("page_sources") != 0
+        assert codec.dictionary_id("ocr") == 0
+
+        sample = _page_source(1000)
+        trained = codec.compress("page_sources", sample)
+        plain = AssetCodec(str(tmp_path / "other"), use_zstd=use_zstd).compress("page_sources", sample)
+        assert is_framed(trained) and len(trained) < len(plain)
+        assert codec.decompress(trained) == sample
+        assert codec.decompress(early[0]) == _page_source(0)
+
+        # A fresh process reuses the persisted dictionary for reads and writes
+        reloaded = AssetCodec(str(tmp_path), app_id="com.example.app", use_zstd=use_zstd)
+        assert reloaded.dictionary_id("page_sources") == codec.dictionary_id("page_sources")
+        assert reloaded.decompress(trained) == sample
+        assert AssetCodec(str(tmp_path), app_id="com.other", use_zstd=use_zstd).dictionary_id("page_sources") == 0
+
+    def test_streamed_decompression(self, tmp_path, use_zstd):
+        codec = AssetCodec(str(tmp_path), use_zstd=use_zstd)
+        data = _page_source(7, nodes=2000)
+        framed = codec.compress("page_sources", data)
+        chunks = [framed[i:i + 3] for i in range(0, 30, 3)] + [framed[30:]]
+        assert b"".join(codec.iter_decompressed(chunks)) == data
+        with pytest.raises(ValueError):
+            codec.decompress(b"not framed at all")
+
+
+class TestCompressedFileStore:
+    """Tests for transparent compression in LocalFileStoreAdapter."""
+
+    async def test_text_compressed_binary_raw(self, tmp_path):
+        store = LocalFileStoreAdapter(str(tmp_path), app_id="com.example.app")
+        xml = _page_source(1)
+        png = b"\x89PNG\r\n\x1a\n" + os.urandom(1000)
+        xml_ref = await store.put("runs/r/page_sources/s.xml", xml, content_type="text/xml")
+        png_ref = await store.put("runs/r/screenshots/s.png", png, content_type="image/png")
+
+        assert await store.get(xml_ref) == xml and await store.get(png_ref) == png
+        with open(store._path(xml_ref), "rb") as handle:
+            assert is_framed(handle.read())
+        stats = store.get_stats()
+        assert stats["bytes_written"] == len(xml) + len(png)
+        assert stats["bytes_stored"] < len(xml) // 3 + len(png) + 100
+
+    async def test_refs_independent_of_compression(self, tmp_path):
+        compressed = LocalFileStoreAdapter(str(tmp_path / "a"))
+        raw = LocalFileStoreAdapter(str(tmp_path / "b"), compress=False)
+        xml = _page_source(3)
+        ref = await compressed.put("runs/r/page_sources/s.xml", xml, content_type="text/xml")
+        assert await raw.put("runs/r/page_sources/s.xml", xml, content_type="text/xml") == ref
+        assert await raw.get(ref) == xml
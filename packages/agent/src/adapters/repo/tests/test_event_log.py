@@ -0,0 +1,93 @@
+"""
+Unit tests for RunEventLog.
+"""
+
+import os
+
+import pytest
+
+from src.adapters.repo import RunEventLog, state_serializer
+from src.adapters.repo.event_log import KIND_DIFF, KIND_SNAPSHOT
+from src.agent.domain import AgentState
+from src.agent.domain.state import Counters, EnumeratedAction
+
+
+def _states(count):
+    state = AgentState(run_id="r1", app_id="com.example.app")
+    states = [state]
+    for step in range(1, count):
+        state = state.clone_with(
+            counters=Counters(steps_total=step),
+            enumerated_actions=[EnumeratedAction(verb="tap", text_or_icon=f"b{step}")] if step % 3 else state.enumerated_actions,
+        )
+        states.append(state)
+    return states
+
+
+@pytest.fixture
+def log(tmp_path):
+    handle = RunEventLog(str(tmp_path), "r1", snapshot_every=4)
+    yield handle
+    handle.close()
+
+
+class TestRunEventLog:
+    """Tests for diffs, snapshots, lookup and recovery."""
+
+    def test_diffs_and_snapshots(self, log):
+        states = _states(10)
+        for state in states:
+            log.append("Step", state)
+        records = list(log.iter_records())
+        assert [r.step for r in records] == list(range(10))
+        assert [r.kind for r in records] == [KIND_SNAPSHOT if s % 4 == 0 else KIND_DIFF for s in range(10)]
+        assert set(records[1].fields) == {"timestamps", "counters", "enumerated_actions"}
+        assert "run_id" not in records[1].fields
+
+    def test_state_at_and_iter_states(self, log):
+        states = _states(11)
+        for state in states:
+            log.append("Step", state)
+        assert all(log.state_at(step) == states[step] for step in range(11))
+        assert [state for _, _, state in log.iter_states()] == states
+        with pytest.raises(IndexError):
+            log.state_at(11)
+
+    def test_reopen_truncates_torn_tail_and_resumes(self, tmp_path):
+        states = _states(7)
+        log = RunEventLog(str(tmp_path), "r1", snapshot_every=4)
+        for state in states[:6]:
+            log.append("Step", state)
+        log.close()
+        with open(log.path, "ab") as handle:
+            handle.write(b"\x40\x00\x00\x00garbage")
+        os.remove(log.index_path)
+
+        reopened = RunEventLog(str(tmp_path), "r1", snapshot_every=4)
+        assert len(reopened) == 6
+        assert reopened.last_state == states[5]
+        assert reopened.append("Step", states[6]) == 6
+        reopened.close()
+
+        replay = RunEventLog(str(tmp_path), "r1", snapshot_every=4)
+        assert [state for _, _, state in replay.iter_states()] == states
+        assert replay.state_at(5) == states[5]
+        replay.close()
+
+    def test_other_schema_opens_non_resumable(self, tmp_path, monkeypatch):
+        states = _states(3)
+        monkeypatch.setattr(state_serializer, "schema_id", lambda cls: 0x0BADC0DE)
+        log = RunEventLog(str(tmp_path), "r1", snapshot_every=4)
+        for state in states[:2]:
+            log.append("Step", state)
+        log.close()
+        monkeypatch.undo()
+
+        reopened = RunEventLog(str(tmp_path), "r1", snapshot_every=4)
+        assert (len(reopened), reopened.resumable, reopened.last_state) == (2, False, None)
+        with pytest.raises(ValueError, match="schema"):
+            reopened.state_at(1)
+        # Appending continues with a snapshot under the current schema
+        assert reopened.append("Step", states[2]) == 2
+        assert reopened.state_at(2) == states[2]
+        reopened.close()
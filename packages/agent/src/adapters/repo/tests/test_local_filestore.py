@@ -0,0 +1,99 @@
+"""
+Unit tests for LocalFileStoreAdapter.
+"""
+
+import os
+
+import pytest
+
+from src.adapters.repo import LocalFileStoreAdapter
+from src.adapters.repo.compression import MAGIC
+from src.agent.errors.error_types import FileStoreError, StorageError
+
+
+class TestLocalFileStore:
+    """Tests for content addressing, deduplication and sharding."""
+
+    async def test_round_trip_and_sharded_layout(self, tmp_path):
+        store = LocalFileStoreAdapter(str(tmp_path))
+        key = store.generate_key("run-1", "page_sources", "step-00000", "xml")
+        ref = await store.put(key, b"<hierarchy/>", content_type="text/xml")
+
+        assert ref.startswith("cas/") and len(ref) == 4 + 64
+        digest = ref[4:]
+        assert os.path.isfile(tmp_path / "cas" / digest[:2] / digest[2:4] / digest)
+        assert await store.get(ref) == b"<hierarchy/>"
+        assert await store.exists(ref) and not await store.exists(key)
+
+    async def test_duplicates_share_one_blob(self, tmp_path):
+        store = LocalFileStoreAdapter(str(tmp_path))
+        refs = [
+            await store.put(store.generate_key("run-1", "page_sources", f"step-{i}", "xml"), b"<same/>")
+            for i in range(5)
+        ]
+        other = await store.put("runs/run-1/page_sources/step-9.xml", b"<other/>")
+
+        assert len(set(refs)) == 1 and other != refs[0]
+        stats = store.get_stats()
+        assert (stats["puts"], stats["dedup_hits"], stats["distinct_blobs"]) == (6, 4, 2)
+        assert stats["bytes_written"] == len(b"<same/>") + len(b"<other/>")
+        blobs = [name for _, _, files in os.walk(tmp_path) for name in files]
+        assert len(blobs) == 2
+
+    async def test_dedup_survives_restart(self, tmp_path):
+        ref = await LocalFileStoreAdapter(str(tmp_path)).put("a.png", b"png-bytes")
+        store = LocalFileStoreAdapter(str(tmp_path))
+        assert await store.put("b.png", b"png-bytes") == ref
+        assert store.get_stats()["bytes_written"] == 0
+
+    @pytest.mark.parametrize("compress", [True, False])
+    async def test_raw_blob_starting_with_frame_magic(self, tmp_path, compress):
+        store = LocalFileStoreAdapter(str(tmp_path), compress=compress)
+        data = MAGIC + b"raw payload, not a frame"
+        ref = await store.put("runs/r/blobs/1.bin", data)
+        assert await store.get(ref) == data
+        assert await store.get_range(ref, 2, 5) == data[2:7]
+        assert bytes(await store.get_view(ref)) == data
+        assert b"".join([chunk async for chunk in store.open_read(ref, chunk_bytes=4)]) == data
+
+        writer = store.open_write("runs/r/blobs/2.bin")
+        for start in range(0, len(data), 3):
+            await writer.write(data[start:start + 3])
+        assert await writer.close() == ref
+
+    async def test_reads_unframed_blobs(self, tmp_path):
+        """Raw blobs stored before frame headers were added still read back as-is."""
+        store = LocalFileStoreAdapter(str(tmp_path))
+        ref = store.ref_for("a.png", b"png-bytes")
+        path = store._path(ref)
+        os.makedirs(os.path.dirname(path))
+        with open(path, "wb") as handle:
+            handle.write(b"png-bytes")
+        assert await store.get(ref) == b"png-bytes"
+        assert bytes(await store.get_view(ref)) == b"png-bytes"
+        assert await store.get_range(ref, 4, 10) == b"bytes"
+
+    async def test_missing_and_invalid_refs(self, tmp_path):
+        store = LocalFileStoreAdapter(str(tmp_path))
+        ref = await store.put("k", b"data")
+        assert await store.delete(ref) and not await store.delete(ref)
+        with pytest.raises(StorageError):
+            await store.get(ref)
+        with pytest.raises(FileStoreError):
+            await store.get("../../etc/passwd")
+        assert not await store.exists("cas/not-hex")
+
+    async def test_flush_fsyncs_new_blobs(self, tmp_path, monkeypatch):
+        store = LocalFileStoreAdapter(str(tmp_path))
+        synced = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+        await store.put("runs/r/a/1.bin", b"one")
+        await store.put("runs/r/a/2.bin", b"one")
+        deleted = await store.put("runs/r/a/3.bin", b"two")
+        await store.delete(deleted)
+
+        await store.flush()
+        assert len(synced) == 2  # the remaining blob and its shard directory
+        await store.flush()
+        assert len(synced) == 2
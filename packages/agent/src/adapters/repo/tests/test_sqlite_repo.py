@@ -0,0 +1,112 @@
+"""
+Unit tests for SQLiteRepoAdapter.
+"""
+
+import sqlite3
+
+import pytest
+
+from src.adapters.repo import SQLiteRepoAdapter
+from src.agent.errors.error_types import DatabaseError
+from src.agent.test.fakes import FakeTelemetryPort
+from src.agent.usecases.start_session import StartSessionUsecase
+
+APP = "com.example.app"
+
+
+@pytest.fixture
+async def repo(tmp_path):
+    adapter = SQLiteRepoAdapter(str(tmp_path / "graph.sqlite3"), max_batch=8)
+    yield adapter
+    await adapter.close()
+
+
+class TestSQLiteRepo:
+    """Tests for idempotent upserts, batching and the agent's queries."""
+
+    async def test_idempotent_upserts_merge_and_count(self, repo):
+        assert await repo.upsert_node("a", {"app_id": APP, "run_id": "r1", "title": "Home"}) == "a"
+        await repo.upsert_node("a", {"run_id": "r1", "bundle": {"screenshot_ref": "cas/1"}})
+        await repo.upsert_node("b", {"app_id": APP, "run_id": "r1"})
+        edge = await repo.upsert_edge("a", "b", "tap:Login", {"run_id": "r1", "verified": False})
+        assert await repo.upsert_edge("a", "b", "tap:Login", {"run_id": "r1", "verified": True}) == edge
+
+        node = await repo.get_node("a")
+        assert node.metadata == {
+            "app_id": APP, "run_id": "r1", "title": "Home", "bundle": {"screenshot_ref": "cas/1"}, "visits": 2,
+        }
+        assert node.created_at <= node.updated_at
+        assert await repo.get_node("missing") is None
+        assert [n.signature for n in await repo.get_neighbors("a")] == ["b"]
+        (stored,) = await repo.get_edges("a")
+        assert stored.metadata == {"run_id": "r1", "verified": True, "traversals": 2}
+
+    async def test_batches_commit_together_and_reads_see_pending(self, repo, tmp_path):
+        for i in range(5):
+            await repo.upsert_node(f"s{i}", {"app_id": APP})
+        assert repo.get_stats() == {"upserts": 5, "commits": 0, "pending": 5}
+        outside = sqlite3.connect(str(tmp_path / "graph.sqlite3"))
+        assert outside.execute("SELECT COUNT(*) FROM nodes").fetchone()[0] == 0
+
+        assert (await repo.get_node("s4")).metadata["visits"] == 1  # read commits first
+        assert repo.get_stats()["commits"] == 1
+        for i in range(8):
+            await repo.upsert_node(f"t{i}", {"app_id": APP})
+        assert repo.get_stats() == {"upserts": 13, "commits": 2, "pending": 0}  # max_batch reached
+        assert outside.execute("SELECT COUNT(*) FROM nodes").fetchone()[0] == 13
+        outside.close()
+
+    async def test_top_nodes_and_run_stats(self, repo):
+        for signature, visits in [("a", 3), ("b", 9), ("c", 1)]:
+            await repo.upsert_node(signature, {"app_id": APP, "run_id": "r1", "visits": visits})
+        await repo.upsert_node("z", {"app_id": "com.other", "visits": 50})
+        await repo.upsert_node("a", {"run_id": "r2"})
+        await repo.upsert_node("d", {"app_id": APP, "run_id": "r2"})
+        await repo.upsert_edge("a", "d", "tap:Next", {"run_id": "r2"})
+
+        assert [n.signature for n in await repo.get_top_nodes(APP, 2)] == ["b", "a"]
+        assert (await repo.get_node("a")).metadata["visits"] == 4
+        stats = await repo.get_exploration_stats("r2")
+        assert (stats.nodes_total, stats.edges_total, stats.screens_new) == (2, 1, 1)
+        assert stats.coverage_pct == pytest.approx(50.0)
+
+    async def test_survives_reopen_and_warms_session(self, tmp_path):
+        path = str(tmp_path / "graph.sqlite3")
+        first = SQLiteRepoAdapter(path)
+        await first.upsert_node("home", {"app_id": APP, "safe_actions": [{"verb": "tap", "text_or_icon": "Go"}]})
+        await first.flush()
+        await first.close()
+
+        reopened = SQLiteRepoAdapter(path)
+        state = await StartSessionUsecase(reopened, FakeTelemetryPort()).execute("run-2", APP)
+        assert state.cache["home"].safe_actions[0].text_or_icon == "Go"
+        await reopened.close()
+
+    async def test_failed_commit_keeps_upserts(self, repo, tmp_path):
+        await repo.upsert_node("a", {"app_id": APP})
+        repo._conn.execute("DROP TABLE edges")
+        await repo.upsert_edge("a", "b", "tap", {})
+        with pytest.raises(DatabaseError):
+            await repo.flush()
+        assert repo.get_stats()["pending"] == 2
+
+        await SQLiteRepoAdapter(str(tmp_path / "graph.sqlite3")).close()  # recreates the schema
+        await repo.flush()
+        assert repo.get_stats()["pending"] == 0 and await repo.get_neighbors("a") == []
+
+    async def test_graph_queries_load_then_track_upserts(self, tmp_path):
+        path = str(tmp_path / "graph.sqlite3")
+        first = SQLiteRepoAdapter(path)
+        await first.upsert_edge("home", "login", "tap:Login", {})
+        await first.upsert_node("login", {"app_id": APP, "action_count": 2})
+        await first.close()
+
+        repo = SQLiteRepoAdapter(path)
+        await repo.upsert_edge("login", "feed", "tap:Submit", {})  # pending while the index loads
+        assert await repo.find_path("home", "feed") == [("tap:Login", "login"), ("tap:Submit", "feed")]
+        assert await repo.nearest_frontier("home") == ("login", [("tap:Login", "login")])
+
+        await repo.upsert_edge("login", "help", "tap:Help", {})  # second action tried
+        await repo.upsert_node("feed", {"action_count": 4})
+        assert await repo.nearest_frontier("home") == ("feed", [("tap:Login", "login"), ("tap:Submit", "feed")])
+        await repo.close()
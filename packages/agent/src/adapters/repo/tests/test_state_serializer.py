@@ -0,0 +1,55 @@
+"""
+Unit tests for the AgentState binary serializer.
+"""
+
+import struct
+
+import pytest
+
+from src.adapters.repo import state_serializer
+from src.adapters.repo.state_serializer import (
+    FORMAT_JSON,
+    FORMAT_MSGPACK,
+    pack_fields,
+    pack_state,
+    unpack_fields,
+    unpack_state,
+)
+from src.agent.domain import AgentState
+from src.agent.domain.state import Counters, EnumeratedAction
+
+FORMATS = [FORMAT_JSON, pytest.param(FORMAT_MSGPACK, marks=pytest.mark.skipif(
+    state_serializer.msgpack is None, reason="msgpack not installed"))]
+
+
+def _state():
+    return AgentState(
+        run_id="r1",
+        enumerated_actions=[EnumeratedAction(verb="tap", text_or_icon="Login")],
+        counters=Counters(steps_total=4),
+    )
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_state_round_trip(format):
+    state = _state()
+    blob = pack_state(state, format)
+    assert blob[:1] == format
+    assert unpack_state(blob) == state
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_fields_round_trip(format):
+    state = _state()
+    values = {"counters": state.counters, "enumerated_actions": state.enumerated_actions}
+    assert unpack_fields(pack_fields(values, format)) == values
+
+
+def test_rejects_other_schema_and_format():
+    blob = pack_state(_state(), FORMAT_JSON)
+    with pytest.raises(ValueError):
+        unpack_state(blob[:1] + struct.pack("<I", 0) + blob[5:])
+    with pytest.raises(ValueError):
+        unpack_state(b"x" + blob[1:])
+    with pytest.raises(ValueError):
+        unpack_state(blob[:3])
@@ -0,0 +1,96 @@
+"""
+Unit tests for streaming, ranged and mmap-backed FileStorePort access.
+"""
+
+import hashlib
+import mmap
+import random
+
+import pytest
+
+from src.adapters.repo import LocalFileStoreAdapter
+from src.agent.errors.error_types import FileStoreError
+from src.agent.test.fakes import FakeFileStorePort
+
+XML = b"".join(b'<node index="%d" class="android.widget.TextView" text="Row %d"/>' % (i, i * 7) for i in range(4000))
+PNG = random.Random(7).randbytes(300_000)
+
+
+@pytest.fixture(params=[True, False], ids=["compressed", "raw"])
+def store(request, tmp_path):
+    return LocalFileStoreAdapter(str(tmp_path), compress=request.param)
+
+
+async def _collect(store, ref, chunk_bytes):
+    return [chunk async for chunk in store.open_read(ref, chunk_bytes)]
+
+
+class TestStreaming:
+    """Tests for open_read/open_write/get_range/get_view."""
+
+    async def test_open_read_chunks(self, store):
+        for data, content_type in [(XML, "text/xml"), (PNG, "image/png")]:
+            ref = await store.put("runs/r/page_sources/s.xml", data, content_type)
+            chunks = await _collect(store, ref, 10_000)
+            assert b"".join(chunks) == data
+            assert max(map(len, chunks)) <= 10_000
+
+    async def test_open_write_matches_put_and_deduplicates(self, store, tmp_path):
+        async with store.open_write("runs/r/page_sources/s.xml", "text/xml") as writer:
+            for start in range(0, len(XML), 7_000):
+                await writer.write(XML[start:start + 7_000])
+        assert writer.ref == "cas/" + hashlib.sha256(XML).hexdigest()
+        assert await store.get(writer.ref) == XML
+
+        assert await store.put("runs/r/page_sources/t.xml", XML, "text/xml") == writer.ref
+        again = store.open_write("runs/r/page_sources/u.xml", "text/xml")
+        await again.write(XML)
+        assert await again.close() == writer.ref
+        stats = store.get_stats()
+        assert (stats["puts"], stats["dedup_hits"], stats["distinct_blobs"]) == (3, 2, 1)
+        assert not list((tmp_path / "cas").glob(".tmp-*"))
+
+    async def test_failed_write_leaves_nothing(self, store, tmp_path):
+        with pytest.raises(RuntimeError):
+            async with store.open_write("runs/r/screenshots/s.png", "image/png") as writer:
+                await writer.write(PNG[:1000])
+                raise RuntimeError("capture failed")
+        assert writer.ref is None
+        assert store.get_stats()["distinct_blobs"] == 0
+        assert not list((tmp_path / "cas").glob(".tmp-*"))
+        with pytest.raises(FileStoreError):
+            await writer.write(b"late")
+
+    async def test_get_range(self, store):
+        for data, content_type in [(XML, "text/xml"), (PNG, "image/png")]:
+            ref = await store.put("runs/r/page_sources/s.xml", data, content_type)
+            for offset, length in [(0, 10), (123_456, 5_000), (len(data) - 3, 100), (len(data) + 5, 10)]:
+                assert await store.get_range(ref, offset, length) == data[offset:offset + length]
+        with pytest.raises(ValueError):
+            await store.get_range(ref, -1, 10)
+        with pytest.raises(FileStoreError):
+            await store.get_range("cas/" + "0" * 64, 0, 10)
+
+    async def test_get_view(self, store):
+        png_ref = await store.put("runs/r/screenshots/s.png", PNG, "image/png")
+        view = await store.get_view(png_ref)
+        assert isinstance(view.obj, mmap.mmap) and view.readonly
+        assert hashlib.sha256(view).hexdigest() == png_ref[4:]
+        assert bytes(view[10:20]) == PNG[10:20]
+
+        xml_ref = await store.put("runs/r/page_sources/s.xml", XML, "text/xml")
+        assert (await store.get_view(xml_ref)) == XML
+        assert (await store.get_view(await store.put("runs/r/ocr/e.json", b""))) == b""
+
+
+class TestPortDefaults:
+    """The buffering defaults on FileStorePort serve adapters without overrides."""
+
+    async def test_defaults(self):
+        store = FakeFileStorePort()
+        async with store.open_write("k", "text/plain") as writer:
+            await writer.write(b"hello ")
+            await writer.write(b"world")
+        assert writer.ref == "k" and store.blobs["k"] == b"hello world"
+        assert [chunk async for chunk in store.open_read("k", 4)] == [b"hell", b"o wo", b"rld"]
+        assert await store.get_range("k", 6, 100) == b"world"
@@ -0,0 +1,108 @@
+"""
+Unit tests for WriteBehindFileStore.
+"""
+
+import asyncio
+import hashlib
+import os
+
+import pytest
+
+from src.adapters.repo import LocalFileStoreAdapter, WriteBehindFileStore
+from src.agent.domain import AgentState
+from src.agent.errors.error_types import FileStoreError, StorageError
+from src.agent.orchestrator.nodes.stop import StopNode
+from src.agent.test.fakes import FakeFileStorePort, FakeRepoPort, FakeTelemetryPort
+from src.agent.usecases.finalize_run import FinalizeRunUsecase
+
+
+class FailingFileStore(FakeFileStorePort):
+    broken = True
+
+    async def put(self, key, data, content_type="application/octet-stream"):
+        if self.broken and b"bad" in data:
+            raise StorageError("disk full")
+        return await super().put(key, data, content_type)
+
+
+class TestWriteBehind:
+    """Tests for deferred, batched writes and flush durability."""
+
+    async def test_put_returns_before_write(self):
+        inner = FakeFileStorePort(delay_s=0.05)
+        store = WriteBehindFileStore(inner)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        refs = await asyncio.gather(*(store.put(f"runs/r/a/{i}", b"x%d" % i) for i in range(3)))
+        assert loop.time() - started < 0.04
+        assert refs == ["runs/r/a/0", "runs/r/a/1", "runs/r/a/2"]
+        assert inner.blobs == {} and await store.get(refs[1]) == b"x1" and await store.exists(refs[2])
+        assert await store.get_range(refs[0], 1, 5) == b"0"
+
+        await store.flush()
+        assert inner.blobs == {"runs/r/a/0": b"x0", "runs/r/a/1": b"x1", "runs/r/a/2": b"x2"}
+        stats = store.get_stats()
+        assert (stats["written"], stats["batches"], stats["pending"], stats["pending_bytes"]) == (3, 1, 0, 0)
+
+    async def test_bounded_memory_and_coalescing(self):
+        inner = FakeFileStorePort(delay_s=0.01)
+        store = WriteBehindFileStore(inner, max_pending_bytes=10, max_batch=2)
+        high_water = 0
+        for i in range(6):
+            await store.put(f"k{i}", b"12345")
+            await store.put(f"k{i}", b"12345")
+            high_water = max(high_water, store.get_stats()["pending_bytes"])
+        await store.flush()
+        assert high_water <= 10 and len(inner.blobs) == 6
+        assert store.get_stats()["coalesced"] == 6
+
+    async def test_failures_surface_on_flush(self):
+        inner = FailingFileStore()
+        store = WriteBehindFileStore(inner)
+        assert await store.put("good", b"ok") == "good"
+        assert await store.put("broken", b"bad bytes") == "broken"
+
+        telemetry = FakeTelemetryPort()
+        stop = StopNode(repo=None, cache=None, telemetry=telemetry, filestore=store)
+        await stop.run(AgentState(run_id="r"))  # logs, never raises
+        assert any("asset flush failed" in message for _, message, _ in telemetry.logs)
+
+        # StopNode consumed nothing: Finalize retries the write and still reports it
+        finalize = FinalizeRunUsecase(repo=FakeRepoPort(), telemetry=telemetry, filestore=store)
+        with pytest.raises(FileStoreError, match="broken"):
+            await finalize.execute(AgentState(run_id="r"))
+        assert store.get_stats()["failed"] == 1 and "broken" not in inner.blobs
+
+        inner.broken = False
+        await store.flush()  # the retry lands
+        assert inner.blobs["broken"] == b"bad bytes"
+        assert store.get_stats()["failed"] == 0
+
+    async def test_write_through_without_upfront_refs(self):
+        class OpaqueStore(FakeFileStorePort):
+            def ref_for(self, key, data):
+                return None
+
+        inner = OpaqueStore()
+        store = WriteBehindFileStore(inner)
+        assert await store.put("k", b"v") == "k" and inner.blobs == {"k": b"v"}
+        assert store.get_stats()["write_through"] == 1
+
+    async def test_durable_after_finalize_with_local_store(self, tmp_path):
+        store = WriteBehindFileStore(LocalFileStoreAdapter(str(tmp_path)))
+        data = [os.urandom(100_000), b"<hierarchy/>", b'{"full_text": ""}']
+        refs = await asyncio.gather(*(
+            store.put(f"runs/r/{category}/step-00000.x", blob, content_type)
+            for category, blob, content_type in zip(
+                ["screenshots", "page_sources", "ocr"], data, ["image/png", "text/xml", "application/json"]
+            )
+        ))
+        assert refs == ["cas/" + hashlib.sha256(blob).hexdigest() for blob in data]
+
+        summary = await FinalizeRunUsecase(repo=FakeRepoPort(), telemetry=FakeTelemetryPort(), filestore=store).execute(
+            AgentState(run_id="r", stop_reason="max_steps")
+        )
+        assert summary["stop_reason"] == "max_steps"
+        reopened = LocalFileStoreAdapter(str(tmp_path))
+        assert [await reopened.get(ref) for ref in refs] == data
@@ -0,0 +1,260 @@
+"""
+WriteBehindFileStore: Deferred, Batched FileStorePort Writes
+
+PURPOSE:
+--------
+Take asset writes off the perception critical path. PerceiveNode stores the
+screenshot, page source and OCR JSON of every step; with a content-addressed
+store the refs are known as soon as the bytes are hashed, so put() can
+return the ref immediately and the actual writes run in a background task.
+
+ALLOWED DEPENDENCIES:
+---------------------
+- src.agent.ports.filestore_port (FileStorePort interface)
+- src.agent.errors (FileStoreError)
+- asyncio, collections (stdlib)
+
+FORBIDDEN DEPENDENCIES:
+-----------------------
+- NO concrete store: wraps any FileStorePort whose ref_for() is not None
+
+BEHAVIOUR:
+----------
+- put(): ref = inner.ref_for(key, data); the write is queued and the ref
+  returned. Stores that cannot predict refs (ref_for() → None) are written
+  through synchronously
+- Coalescing: a ref already queued or in flight is not queued again
+- Batching: one background task drains the queue, up to max_batch inner
+  puts concurrently per batch (the three assets of a step land in one batch)
+- Bounded memory: once max_pending_bytes are queued, put() waits for the
+  writer to catch up (a single oversized blob is still accepted)
+- Read-your-writes: get/exists/open_read/get_range serve queued blobs from
+  memory
+- flush(): waits until everything accepted so far is written, then flushes
+  the inner store. Failed writes are reported there (FileStoreError), not by
+  the put() that queued them, and are kept: every flush retries them and
+  raises again until they are written (or re-put, or deleted). StopNode and
+  FinalizeRunUsecase flush, so a run's assets are durable before finalize
+  returns, even when StopNode already logged the failure
+
+USAGE:
+------
+filestore = WriteBehindFileStore(LocalFileStoreAdapter(root, app_id=app_id))
+ref = await filestore.put(key, png, content_type="image/png")  # returns at once
+...
+await filestore.flush()
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+
+from src.agent.errors.error_types import FileStoreError
+from src.agent.ports.filestore_port import DEFAULT_CHUNK_BYTES, BlobWriter, FileStorePort
+
+
+MAX_PENDING_BYTES = 64 * 1024 * 1024
+MAX_BATCH = 16
+INLINE_HASH_BYTES = 64 * 1024  # larger blobs are hashed (ref_for) in a worker thread
+
+
+@dataclass(frozen=True)
+class _PendingWrite:
+    key: str
+    data: bytes
+    content_type: str
+    ref: str
+
+
+class WriteBehindFileStore(FileStorePort):
+    """
+    FileStorePort decorator that defers and batches writes of an inner store.
+    """
+
+    def __init__(
+        self,
+        inner: FileStorePort,
+        max_pending_bytes: int = MAX_PENDING_BYTES,
+        max_batch: int = MAX_BATCH,
+    ):
+        """
+        Args:
+            inner: Store that performs the writes.
+            max_pending_bytes: Memory bound for queued and in-flight blobs.
+            max_batch: Inner puts issued concurrently per batch.
+        """
+        if max_pending_bytes <= 0 or max_batch <= 0:
+            raise ValueError("max_pending_bytes and max_batch must be positive")
+        self.inner = inner
+        self.max_pending_bytes = max_pending_bytes
+        self.max_batch = max_batch
+        self._pending: Dict[str, _PendingWrite] = {}  # ref → write, until written
+        self._queue: Deque[str] = deque()
+        self._pending_bytes = 0
+        self._progress = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        self._failed: Dict[str, Tuple[_PendingWrite, BaseException]] = {}  # ref → last failure
+        self._queued = 0
+        self._coalesced = 0
+        self._written = 0
+        self._batches = 0
+        self._write_through = 0
+
+    # ------------------------------------------------------------------
+    # FileStorePort
+    # ------------------------------------------------------------------
+
+    async def put(
+        self,
+        key: str,
+        data: bytes,
+        content_type: str = "application/octet-stream",
+    ) -> str:
+        """
+        Queue a write and return its ref (see flush() for durability).
+
+        Raises:
+            StorageError: Only for write-through stores (ref unknown upfront).
+        """
+        ref = (
+            self.inner.ref_for(key, data)
+            if len(data) < INLINE_HASH_BYTES
+            else await asyncio.to_thread(self.inner.ref_for, key, data)
+        )
+        if ref is None:
+            self._write_through += 1
+            return await self.inner.put(key, data, content_type)
+        if ref in self._pending:
+            self._coalesced += 1
+            return ref
+        while self._pending and self._pending_bytes + len(data) > self.max_pending_bytes:
+            self._progress.clear()
+            await self._progress.wait()
+            if ref in self._pending:
+                self._coalesced += 1
+                return ref
+        self._enqueue(_PendingWrite(key, data, content_type, ref))
+        self._queued += 1
+        return ref
+
+    async def get(self, key: str) -> bytes:
+        pending = self._pending.get(key)
+        if pending is not None:
+            return pending.data
+        return await self.inner.get(key)
+
+    async def delete(self, key: str) -> bool:
+        """Delete after pending writes land, so a queued write cannot resurrect the blob."""
+        await self._wait_idle()
+        self._failed.pop(key, None)
+        return await self.inner.delete(key)
+
+    async def exists(self, key: str) -> bool:
+        return key in self._pending or await self.inner.exists(key)
+
+    def generate_key(
+        self,
+        run_id: str,
+        category: str,
+        screen_id: str,
+        extension: str,
+    ) -> str:
+        return self.inner.generate_key(run_id, category, screen_id, extension)
+
+    async def open_read(self, key: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> AsyncIterator[bytes]:
+        source = super().open_read(key, chunk_bytes) if key in self._pending else self.inner.open_read(key, chunk_bytes)
+        async for chunk in source:
+            yield chunk
+
+    def open_write(self, key: str, content_type: str = "application/octet-stream") -> BlobWriter:
+        # Streamed writes never hold the whole blob, so they go straight through
+        return self.inner.open_write(key, content_type)
+
+    async def get_range(self, key: str, offset: int, length: int) -> bytes:
+        if key in self._pending:
+            return await super().get_range(key, offset, length)
+        return await self.inner.get_range(key, offset, length)
+
+    def ref_for(self, key: str, data: bytes) -> Optional[str]:
+        return self.inner.ref_for(key, data)
+
+    async def flush(self) -> None:
+        """
+        Wait for every queued write, then flush the inner store.
+
+        Writes that failed earlier are retried first.
+
+        Raises:
+            FileStoreError: If any deferred write is still failing.
+        """
+        await self._wait_idle()
+        if self._failed:
+            for write, _ in list(self._failed.values()):
+                self._enqueue(write)
+            await self._wait_idle()
+        if self._failed:
+            write, error = next(iter(self._failed.values()))
+            raise FileStoreError(
+                f"{len(self._failed)} deferred write(s) failed; first: {write.key}: {error}"
+            ) from error
+        await self.inner.flush()
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queued,
+            "coalesced": self._coalesced,
+            "written": self._written,
+            "batches": self._batches,
+            "write_through": self._write_through,
+            "pending": len(self._pending),
+            "pending_bytes": self._pending_bytes,
+            "failed": len(self._failed),
+        }
+
+    # ------------------------------------------------------------------
+    # Background writer
+    # ------------------------------------------------------------------
+
+    def _enqueue(self, write: _PendingWrite) -> None:
+        # A new or retried write supersedes the ref's earlier failure
+        self._failed.pop(write.ref, None)
+        self._pending[write.ref] = write
+        self._pending_bytes += len(write.data)
+        self._queue.append(write.ref)
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._drain())
+
+    async def _drain(self) -> None:
+        try:
+            # Let the puts issued alongside the first one join its batch
+            await asyncio.sleep(0)
+            while self._queue:
+                batch = [self._pending[self._queue.popleft()] for _ in range(min(self.max_batch, len(self._queue)))]
+                results = await asyncio.gather(
+                    *(self.inner.put(write.key, write.data, write.content_type) for write in batch),
+                    return_exceptions=True,
+                )
+                for write, result in zip(batch, results):
+                    if isinstance(result, BaseException):
+                        self._failed[write.ref] = (write, result)
+                    elif result != write.ref:
+                        self._failed[write.ref] = (write, FileStoreError(f"stored as {result}, promised {write.ref}"))
+                    else:
+                        self._written += 1
+                    del self._pending[write.ref]
+                    self._pending_bytes -= len(write.data)
+                self._batches += 1
+                self._progress.set()
+        finally:
+            self._worker = None
+            self._progress.set()
+
+    async def _wait_idle(self) -> None:
+        while self._worker is not None:
+            # shield: a cancelled flush must not cancel the shared writer
+            await asyncio.shield(self._worker)
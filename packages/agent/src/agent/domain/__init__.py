@@ -8,8 +8,16 @@ PUBLIC API:
 -----------
 - AgentState: The canonical state object
 - ScreenSignature: Deterministic screen identity
+- SimHashIndex: Near-duplicate signature lookup by Hamming distance
+- GraphIndex: CSR adjacency over the ScreenGraph (shortest action paths,
+  nearest unexplored frontier)
 - UIElement, UIAction: Screen interaction primitives
+- ElementTable, UIElementView: Array-backed element hierarchy with lazy views
 - Advice, Bundle, Counters, Budgets: State components
+- ScreenDelta, ElementDelta: Element-level changes since the previous screen
+- PVector, PMap: Persistent collections behind AgentState's list/dict fields
+- diff: Changed AgentState fields between two states
+- state_to_plain, state_from_plain, changed_fields: JSON-compatible codec
 
 DEPENDENCIES (ALLOWED):
 -----------------------
@@ -27,6 +35,8 @@ from .state import (
     AgentState,
     ScreenSignature,
     Bundle,
+    ElementDelta,
+    ScreenDelta,
     EnumeratedAction,
     Advice,
     Counters,
@@ -35,12 +45,20 @@ from .state import (
     PersistResultSummary,
     Timestamps,
     Bounds,
+    diff,
 )
+from .persistent import PMap, PVector
+from .element_table import ElementTable, UIElementView
+from .simhash_index import SimHashIndex
+from .graph_index import GraphIndex
+from .state_codec import changed_fields, state_from_plain, state_to_plain
 
 __all__ = [
     "AgentState",
     "ScreenSignature",
     "Bundle",
+    "ElementDelta",
+    "ScreenDelta",
     "EnumeratedAction",
     "Advice",
     "Counters",
@@ -49,5 +67,15 @@ __all__ = [
     "PersistResultSummary",
     "Timestamps",
     "Bounds",
+    "diff",
+    "PMap",
+    "PVector",
+    "ElementTable",
+    "UIElementView",
+    "SimHashIndex",
+    "GraphIndex",
+    "changed_fields",
+    "state_from_plain",
+    "state_to_plain",
 ]
 
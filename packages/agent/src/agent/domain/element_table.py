@@ -0,0 +1,315 @@
+"""
+ElementTable: Flat, Array-Backed UI Element Storage
+
+PURPOSE:
+--------
+Hold a parsed screen hierarchy as parallel columns instead of a tree of
+frozen UIElement dataclasses. Deep UiAutomator2/XCUITest hierarchies have
+thousands of nodes per frame; a columnar table keeps that to a handful of
+compact arrays and lets services (signature, salience) scan columns directly.
+
+UIElement-shaped access is still available through lazy UIElementView objects,
+which read from the table on attribute access and allocate nothing up front.
+
+DEPENDENCIES (ALLOWED):
+-----------------------
+- array, dataclasses, typing (stdlib)
+- UIElement, Bounds (same package)
+
+DEPENDENCIES (FORBIDDEN):
+-------------------------
+- NO Appium types or XML parsing (see services/page_source_parser.py)
+- NO adapter imports
+- NO I/O operations
+
+LAYOUT:
+-------
+Row i (pre-order, parents always precede children):
+- roles[i]: uint8 index into ROLES
+- bounds[4*i : 4*i+4]: float32 normalized x, y, width, height
+- qbounds[4*i : 4*i+4]: uint16 bounds quantized to 2 decimals (int(v*100+0.5)),
+  the canonical form hashed by screen_signature
+- flags[i]: uint16 bitfield (FLAG_*)
+- parents[i]: int32 parent row, -1 for roots
+- depths[i]: uint16 hierarchy depth
+- first_child[i], next_sibling[i]: int32 rows, -1 if none
+- texts / resource_ids / class_names: per-row Python objects (None if absent)
+
+INVARIANTS:
+-----------
+- Rows are appended in document (pre-order) order
+- parents[i] < i for every non-root row
+- bounds are normalized (0.0 to 1.0) by the parser
+
+USAGE:
+------
+table = ElementTable()
+root = table.append("container", (0.0, 0.0, 1.0, 1.0), FLAG_VISIBLE)
+table.append("button", (0.1, 0.8, 0.8, 0.1), FLAG_VISIBLE | FLAG_CLICKABLE, parent=root, text="Sign In")
+for view in table.views():
+    if view.is_interactive():
+        ...
+"""
+
+from array import array
+from typing import Iterator, List, Optional, Tuple, Dict, Any
+
+from .ui_element import UIElement, Bounds
+
+
+# Role vocabulary (uint8 ids). Append only: ids are stored in tables.
+ROLES: Tuple[str, ...] = (
+    "unknown",
+    "container",
+    "button",
+    "input",
+    "text",
+    "image",
+    "list",
+    "checkbox",
+    "switch",
+    "scroll",
+    "tab",
+    "link",
+    "cell",
+    "webview",
+)
+_ROLE_IDS: Dict[str, int] = {name: i for i, name in enumerate(ROLES)}
+
+# Flag bits (uint16)
+FLAG_CLICKABLE = 1 << 0
+FLAG_FOCUSABLE = 1 << 1
+FLAG_VISIBLE = 1 << 2
+FLAG_ENABLED = 1 << 3
+FLAG_SCROLLABLE = 1 << 4
+FLAG_CHECKABLE = 1 << 5
+FLAG_CHECKED = 1 << 6
+FLAG_SELECTED = 1 << 7
+FLAG_LONG_CLICKABLE = 1 << 8
+FLAG_FOCUSED = 1 << 9
+FLAG_PASSWORD = 1 << 10
+
+
+def quantize(value: float) -> int:
+    """Quantize a normalized coordinate to 2 decimals, as a uint16."""
+    q = int(value * 100 + 0.5)
+    return 0 if q < 0 else (q if q < 0xFFFF else 0xFFFF)
+
+
+def role_id(role: str) -> int:
+    """Map a role name to its uint8 id (unknown roles map to 0)."""
+    return _ROLE_IDS.get(role, 0)
+
+
+class ElementTable:
+    """
+    Columnar storage for one screen's element hierarchy.
+
+    Rows are only ever appended; a table is treated as immutable once the
+    parser hands it over.
+    """
+
+    __slots__ = (
+        "roles", "bounds", "qbounds", "flags", "parents", "depths",
+        "first_child", "next_sibling", "texts", "resource_ids", "class_names",
+        "_last_child",
+    )
+
+    def __init__(self) -> None:
+        self.roles = array("B")
+        self.bounds = array("f")
+        self.qbounds = array("H")
+        self.flags = array("H")
+        self.parents = array("i")
+        self.depths = array("H")
+        self.first_child = array("i")
+        self.next_sibling = array("i")
+        self.texts: List[Optional[str]] = []
+        self.resource_ids: List[Optional[str]] = []
+        self.class_names: List[Optional[str]] = []
+        self._last_child = array("i")
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    def append(
+        self,
+        role: str,
+        bounds: Tuple[float, float, float, float],
+        flags: int,
+        parent: int = -1,
+        text: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        class_name: Optional[str] = None,
+    ) -> int:
+        """
+        Append a row and return its index.
+
+        Args:
+            role: Semantic role name (see ROLES).
+            bounds: Normalized (x, y, width, height).
+            flags: FLAG_* bitfield.
+            parent: Index of an existing row, or -1 for a root.
+        """
+        index = len(self.roles)
+        self.roles.append(_ROLE_IDS.get(role, 0))
+        self.bounds.extend(bounds)
+        # Quantize the stored float32 values so views/materialized elements agree
+        self.qbounds.extend(quantize(v) for v in self.bounds[-4:])
+        self.flags.append(flags)
+        self.parents.append(parent)
+        self.depths.append(self.depths[parent] + 1 if parent >= 0 else 0)
+        self.first_child.append(-1)
+        self.next_sibling.append(-1)
+        self._last_child.append(-1)
+        self.texts.append(text)
+        self.resource_ids.append(resource_id)
+        self.class_names.append(class_name)
+
+        if parent >= 0:
+            previous = self._last_child[parent]
+            if previous < 0:
+                self.first_child[parent] = index
+            else:
+                self.next_sibling[previous] = index
+            self._last_child[parent] = index
+        return index
+
+    def role(self, index: int) -> str:
+        """Role name of a row."""
+        return ROLES[self.roles[index]]
+
+    def bounds_of(self, index: int) -> Tuple[float, float, float, float]:
+        """Normalized (x, y, width, height) of a row."""
+        offset = 4 * index
+        return tuple(self.bounds[offset:offset + 4])
+
+    def has_flag(self, index: int, flag: int) -> bool:
+        """Check a FLAG_* bit of a row."""
+        return bool(self.flags[index] & flag)
+
+    def children(self, index: int) -> Iterator[int]:
+        """Iterate child rows of a row in document order."""
+        child = self.first_child[index]
+        while child >= 0:
+            yield child
+            child = self.next_sibling[child]
+
+    def roots(self) -> Iterator[int]:
+        """Iterate root rows (normally exactly one)."""
+        return (i for i, parent in enumerate(self.parents) if parent < 0)
+
+    def view(self, index: int) -> "UIElementView":
+        """Lazy UIElement-shaped view of a row."""
+        if not 0 <= index < len(self.roles):
+            raise IndexError(index)
+        return UIElementView(self, index)
+
+    def views(self) -> Iterator["UIElementView"]:
+        """Lazy views of every row in document order."""
+        return (UIElementView(self, i) for i in range(len(self.roles)))
+
+    def to_ui_elements(self) -> List[UIElement]:
+        """Materialize the full UIElement tree (root elements with nested children)."""
+        return [self.view(i).materialize() for i in self.roots()]
+
+
+class UIElementView:
+    """
+    Read-only UIElement facade over one ElementTable row.
+
+    Exposes the same attributes and helpers as UIElement, computed on access.
+    Use materialize() where a real (hashable, frozen) UIElement is required.
+    """
+
+    __slots__ = ("table", "index")
+
+    def __init__(self, table: ElementTable, index: int):
+        self.table = table
+        self.index = index
+
+    @property
+    def role(self) -> str:
+        return self.table.role(self.index)
+
+    @property
+    def text(self) -> Optional[str]:
+        return self.table.texts[self.index]
+
+    @property
+    def bounds(self) -> Bounds:
+        return Bounds(*self.table.bounds_of(self.index))
+
+    @property
+    def clickable(self) -> bool:
+        return self.table.has_flag(self.index, FLAG_CLICKABLE)
+
+    @property
+    def focusable(self) -> bool:
+        return self.table.has_flag(self.index, FLAG_FOCUSABLE)
+
+    @property
+    def visible(self) -> bool:
+        return self.table.has_flag(self.index, FLAG_VISIBLE)
+
+    @property
+    def flags(self) -> int:
+        return self.table.flags[self.index]
+
+    @property
+    def parent(self) -> Optional["UIElementView"]:
+        parent = self.table.parents[self.index]
+        return UIElementView(self.table, parent) if parent >= 0 else None
+
+    @property
+    def children(self) -> List["UIElementView"]:
+        return [UIElementView(self.table, i) for i in self.table.children(self.index)]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        metadata: Dict[str, Any] = {}
+        resource_id = self.table.resource_ids[self.index]
+        class_name = self.table.class_names[self.index]
+        if resource_id:
+            metadata["resource-id"] = resource_id
+        if class_name:
+            metadata["class"] = class_name
+        return metadata
+
+    def is_interactive(self) -> bool:
+        """Determine if element can be interacted with."""
+        return bool(self.table.flags[self.index] & (FLAG_CLICKABLE | FLAG_FOCUSABLE))
+
+    def get_tap_point(self) -> tuple[float, float]:
+        """Return normalized tap coordinates (center of bounds)."""
+        x, y, width, height = self.table.bounds_of(self.index)
+        return (x + width / 2, y + height / 2)
+
+    def has_text(self) -> bool:
+        """Check if element has visible text."""
+        text = self.table.texts[self.index]
+        return text is not None and len(text.strip()) > 0
+
+    def materialize(self, with_children: bool = True) -> UIElement:
+        """Build a frozen UIElement for this row (children materialized unless disabled)."""
+        return UIElement(
+            role=self.role,
+            text=self.text,
+            bounds=self.bounds,
+            clickable=self.clickable,
+            focusable=self.focusable,
+            visible=self.visible,
+            children=[child.materialize() for child in self.children] if with_children else [],
+            metadata=self.metadata,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, UIElementView):
+            return NotImplemented
+        return self.table is other.table and self.index == other.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.table), self.index))
+
+    def __repr__(self) -> str:
+        return f"UIElementView(index={self.index}, role={self.role!r}, text={self.text!r})"
@@ -0,0 +1,350 @@
+"""
+GraphIndex: In-Memory ScreenGraph Adjacency for Navigation Queries
+
+PURPOSE:
+--------
+Answer "which actions lead from this screen to that one?" and "where is the
+nearest screen with actions not tried yet?" without a database round trip
+per hop. After a restart the agent lands on the launch screen and must
+navigate back to the unexplored frontier; both questions are graph
+searches over every edge seen so far.
+
+DEPENDENCIES (ALLOWED):
+-----------------------
+- array, typing (stdlib)
+
+DEPENDENCIES (FORBIDDEN):
+-------------------------
+- NO ports or adapters
+- NO I/O operations (persistence is the repo's job; rebuild on load)
+
+LAYOUT (CSR + delta):
+---------------------
+- Signatures are interned to dense int ids; action labels to int ids
+- Out-edges in compressed sparse rows: targets[offsets[u]:offsets[u+1]]
+  with parallel labels; in-edges the same way (for backward search)
+- add_edge() appends to a per-node delta list; once the deltas exceed
+  COMPACT_RATIO of the CSR (and COMPACT_MIN_EDGES), compact() merges them,
+  so updates are O(degree) amortized and queries scan contiguous arrays
+
+QUERIES:
+--------
+- shortest_path(src, dst): bidirectional BFS (fewest actions); explores
+  about 2·b^(d/2) nodes instead of b^d
+- nearest_frontier(src): BFS until a node with unexplored actions
+  (action_count known and greater than its distinct outgoing actions)
+Paths are lists of (action, next_signature) hops. Edges are unweighted;
+among equally short paths the one found first wins.
+
+INVARIANTS:
+-----------
+- An edge (from, to, action) is stored once; re-adding it is a no-op
+- Node ids never change; nodes are never removed (the graph only grows)
+
+USAGE:
+------
+graph = GraphIndex()
+graph.add_edge("home", "login", "tap:Login")
+graph.set_action_count("login", 5)
+path = graph.shortest_path("home", "login")  # [("tap:Login", "login")]
+target, path = graph.nearest_frontier("home")
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+COMPACT_MIN_EDGES = 4096
+COMPACT_RATIO = 0.25  # delta edges / CSR edges that trigger compaction
+
+Path = List[Tuple[str, str]]  # (action, next_signature) hops
+
+
+class GraphIndex:
+    """
+    Directed multigraph over screen signatures with action-labelled edges.
+    """
+
+    __slots__ = (
+        "_ids", "_signatures", "_action_ids", "_actions", "_action_counts", "_explored",
+        "_offsets", "_targets", "_labels", "_r_offsets", "_r_sources", "_r_labels",
+        "_out_delta", "_in_delta", "_delta_edges", "_edges",
+    )
+
+    def __init__(self, edges: Iterable[Tuple[str, str, str]] = ()):
+        """
+        Args:
+            edges: Initial (from, to, action) triples (bulk load, then compacted).
+        """
+        self._ids: Dict[str, int] = {}
+        self._signatures: List[str] = []
+        self._action_ids: Dict[str, int] = {}
+        self._actions: List[str] = []
+        self._action_counts = array("i")  # -1: unknown
+        self._explored = array("i")  # distinct outgoing actions
+        self._offsets = array("i", [0])
+        self._targets = array("i")
+        self._labels = array("i")
+        self._r_offsets = array("i", [0])
+        self._r_sources = array("i")
+        self._r_labels = array("i")
+        self._out_delta: Dict[int, List[Tuple[int, int]]] = {}
+        self._in_delta: Dict[int, List[Tuple[int, int]]] = {}
+        self._delta_edges = 0
+        self._edges = 0
+        for from_signature, to_signature, action in edges:
+            self.add_edge(from_signature, to_signature, action, compact=False)
+        self.compact()
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, signature: str) -> bool:
+        return signature in self._ids
+
+    @property
+    def edge_count(self) -> int:
+        return self._edges
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def add_node(self, signature: str) -> int:
+        """Intern a signature; returns its id."""
+        node = self._ids.get(signature)
+        if node is None:
+            node = self._ids[signature] = len(self._signatures)
+            self._signatures.append(signature)
+            self._action_counts.append(-1)
+            self._explored.append(0)
+        return node
+
+    def set_action_count(self, signature: str, count: int) -> None:
+        """Number of actions enumerated on a screen (defines its frontier status)."""
+        self._action_counts[self.add_node(signature)] = count
+
+    def add_edge(self, from_signature: str, to_signature: str, action: str, compact: bool = True) -> bool:
+        """
+        Add an edge; returns False if it was already present.
+
+        Args:
+            compact: Merge deltas into the CSR when they grow large.
+        """
+        source = self.add_node(from_signature)
+        target = self.add_node(to_signature)
+        label = self._action_ids.get(action)
+        if label is None:
+            label = self._action_ids[action] = len(self._actions)
+            self._actions.append(action)
+        known_action = False
+        for other_target, other_label in self._out_edges(source):
+            if other_label == label:
+                if other_target == target:
+                    return False
+                known_action = True
+        if not known_action:
+            self._explored[source] += 1
+        self._out_delta.setdefault(source, []).append((target, label))
+        self._in_delta.setdefault(target, []).append((source, label))
+        self._delta_edges += 1
+        self._edges += 1
+        if compact and self._delta_edges >= max(COMPACT_MIN_EDGES, COMPACT_RATIO * len(self._targets)):
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        """Merge delta edges into the CSR arrays (O(nodes + edges))."""
+        if not self._delta_edges and len(self._offsets) == len(self._signatures) + 1:
+            return
+        count = len(self._signatures)
+        self._offsets, self._targets, self._labels = _merge(
+            count, self._offsets, self._targets, self._labels, self._out_delta
+        )
+        self._r_offsets, self._r_sources, self._r_labels = _merge(
+            count, self._r_offsets, self._r_sources, self._r_labels, self._in_delta
+        )
+        self._out_delta = {}
+        self._in_delta = {}
+        self._delta_edges = 0
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def neighbors(self, signature: str) -> Path:
+        """Outgoing (action, target) pairs of a screen."""
+        node = self._ids.get(signature)
+        if node is None:
+            return []
+        return [(self._actions[label], self._signatures[target]) for target, label in self._out_edges(node)]
+
+    def unexplored(self, signature: str) -> Optional[int]:
+        """Actions not taken yet on a screen (None: action count unknown)."""
+        node = self._ids.get(signature)
+        if node is None or self._action_counts[node] < 0:
+            return None
+        return max(self._action_counts[node] - self._explored[node], 0)
+
+    def shortest_path(self, from_signature: str, to_signature: str) -> Optional[Path]:
+        """
+        Fewest-actions path, or None if unreachable (or either end unknown).
+
+        Returns:
+            [(action, next_signature), ...]; [] when from == to.
+        """
+        source = self._ids.get(from_signature)
+        target = self._ids.get(to_signature)
+        if source is None or target is None:
+            return None
+        if source == target:
+            return []
+
+        forward = {source: -1}  # node → predecessor on the source side
+        backward = {target: -1}  # node → successor on the target side
+        forward_level = [source]
+        backward_level = [target]
+        while forward_level and backward_level:
+            # Expand the smaller side by one full level
+            if len(forward_level) <= len(backward_level):
+                forward_level, meets = self._expand(
+                    forward_level, forward, backward,
+                    self._offsets, self._targets, self._out_delta,
+                )
+            else:
+                backward_level, meets = self._expand(
+                    backward_level, backward, forward,
+                    self._r_offsets, self._r_sources, self._in_delta,
+                )
+            if meets:
+                # Meets of one level can differ in depth on the other side
+                meet = min(meets, key=lambda node: _depth(node, forward) + _depth(node, backward))
+                return self._join(meet, forward, backward)
+        return None
+
+    def nearest_frontier(
+        self,
+        from_signature: str,
+        max_depth: Optional[int] = None,
+    ) -> Optional[Tuple[str, Path]]:
+        """
+        Closest screen (fewest actions) with unexplored actions, itself included.
+
+        Returns:
+            (signature, path), or None if no reachable screen has any.
+        """
+        source = self._ids.get(from_signature)
+        if source is None:
+            return None
+        counts, explored = self._action_counts, self._explored
+        offsets, targets, delta = self._offsets, self._targets, self._out_delta
+        csr_nodes = len(offsets) - 1
+        parents = {source: -1}
+        level = [source]
+        depth = 0
+        while level:
+            for node in level:
+                if counts[node] > explored[node]:
+                    return self._signatures[node], self._path_to(node, parents)
+            if max_depth is not None and depth >= max_depth:
+                return None
+            next_level = []
+            for node in level:
+                if node < csr_nodes:
+                    for successor in targets[offsets[node]:offsets[node + 1]]:
+                        if successor not in parents:
+                            parents[successor] = node
+                            next_level.append(successor)
+                for successor, _ in delta.get(node, ()):
+                    if successor not in parents:
+                        parents[successor] = node
+                        next_level.append(successor)
+            level = next_level
+            depth += 1
+        return None
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _out_edges(self, node: int) -> List[Tuple[int, int]]:
+        edges: List[Tuple[int, int]] = []
+        if node < len(self._offsets) - 1:
+            start, end = self._offsets[node], self._offsets[node + 1]
+            edges.extend(zip(self._targets[start:end], self._labels[start:end]))
+        edges.extend(self._out_delta.get(node, ()))
+        return edges
+
+    @staticmethod
+    def _expand(level, seen, other, offsets, adjacent, delta):
+        """One BFS level; returns (next level, nodes also seen by the other side)."""
+        csr_nodes = len(offsets) - 1
+        next_level = []
+        meets = []
+        for node in level:
+            successors = list(adjacent[offsets[node]:offsets[node + 1]]) if node < csr_nodes else []
+            successors.extend(successor for successor, _ in delta.get(node, ()))
+            for successor in successors:
+                if successor not in seen:
+                    seen[successor] = node
+                    if successor in other:
+                        meets.append(successor)
+                    next_level.append(successor)
+        return next_level, meets
+
+    def _join(self, meet: int, forward: Dict[int, int], backward: Dict[int, int]) -> Path:
+        path = self._path_to(meet, forward)
+        node = meet
+        while backward[node] != -1:
+            successor = backward[node]
+            path.append((self._label(node, successor), self._signatures[successor]))
+            node = successor
+        return path
+
+    def _path_to(self, node: int, parents: Dict[int, int]) -> Path:
+        hops = []
+        while parents[node] != -1:
+            previous = parents[node]
+            hops.append((self._label(previous, node), self._signatures[node]))
+            node = previous
+        hops.reverse()
+        return hops
+
+    def _label(self, source: int, target: int) -> str:
+        for other_target, label in self._out_edges(source):
+            if other_target == target:
+                return self._actions[label]
+        raise KeyError((source, target))
+
+
+def _depth(node: int, parents: Dict[int, int]) -> int:
+    depth = 0
+    while parents[node] != -1:
+        node = parents[node]
+        depth += 1
+    return depth
+
+
+def _merge(
+    count: int,
+    offsets: array,
+    adjacent: array,
+    labels: array,
+    delta: Dict[int, List[Tuple[int, int]]],
+) -> Tuple[array, array, array]:
+    """CSR arrays for `count` nodes: existing rows followed by their delta edges."""
+    csr_nodes = len(offsets) - 1
+    new_offsets = array("i", [0])
+    new_adjacent = array("i")
+    new_labels = array("i")
+    for node in range(count):
+        if node < csr_nodes:
+            start, end = offsets[node], offsets[node + 1]
+            new_adjacent.extend(adjacent[start:end])
+            new_labels.extend(labels[start:end])
+        extra = delta.get(node)
+        if extra:
+            new_adjacent.extend(other for other, _ in extra)
+            new_labels.extend(label for _, label in extra)
+        new_offsets.append(len(new_adjacent))
+    return new_offsets, new_adjacent, new_labels
@@ -0,0 +1,375 @@
+"""
+Persistent Collections: Immutable List and Map Fields for AgentState
+
+PURPOSE:
+--------
+AgentState is immutable, but its list and dict fields were plain mutable
+containers: every "update" copied them and every diff compared them
+deeply. These collections never change in place, so a new state can share
+them (and their unchanged parts) with the previous one, and "did it
+change?" is an identity check.
+
+DEPENDENCIES (ALLOWED):
+-----------------------
+- collections.abc, typing (stdlib)
+
+DEPENDENCIES (FORBIDDEN):
+-------------------------
+- NO I/O, NO external libraries
+
+TYPES:
+------
+- PVector: tuple subclass (elements shared, never copied deeply); compares
+  equal to a list with the same items, so callers written against lists
+  keep working
+- PMap: hash array mapped trie (HAMT), 32-way nodes keyed by 5-bit hash
+  slices. set()/delete() copy only the O(log32 n) nodes on the key's path;
+  every other node is shared with the original map. Iteration follows
+  insertion order, like dict
+
+DIFFS:
+------
+PMap.changed_keys(other) skips subtrees both maps share, so comparing a map
+with its own descendant costs O(changes · depth), not O(size).
+
+USAGE:
+------
+actions = PVector([a, b]).appended(c)
+cache = PMap().set("sig1", entry)
+assert cache.set("sig2", other).changed_keys(cache) == {"sig2"}
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Generic, Iterable, Iterator, Optional, Set, Tuple, TypeVar, Union
+
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+_HASH_BITS = 60  # hash bits used; keys equal in all of them share a collision node
+_ABSENT = object()
+
+
+class PVector(tuple):
+    """
+    Immutable sequence; the "update" methods return a new vector.
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, list):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = tuple.__hash__
+
+    def __repr__(self) -> str:
+        return f"PVector({list(self)!r})"
+
+    def appended(self, value: Any) -> "PVector":
+        return PVector(self + (value,))
+
+    def extended(self, values: Iterable[Any]) -> "PVector":
+        return PVector(self + tuple(values))
+
+    def replaced(self, index: int, value: Any) -> "PVector":
+        items = list(self)
+        items[index] = value
+        return PVector(items)
+
+
+# Leaves are tuples (hash, key, value, seq); inner nodes are _Node / _Collision.
+# seq is the insertion number that orders iteration.
+
+class _Node:
+    __slots__ = ("bitmap", "items")
+
+    def __init__(self, bitmap: int, items: tuple):
+        self.bitmap = bitmap
+        self.items = items
+
+
+class _Collision:
+    __slots__ = ("hash", "items")
+
+    def __init__(self, key_hash: int, items: tuple):
+        self.hash = key_hash
+        self.items = items
+
+
+_EMPTY_NODE = _Node(0, ())
+
+
+class PMap(Mapping, Generic[K, V]):
+    """
+    Immutable mapping; set()/delete()/update() return a new map.
+    """
+
+    __slots__ = ("_root", "_size", "_next_seq")
+
+    def __init__(self, items: Union[Mapping, Iterable[Tuple[Any, Any]], None] = None):
+        self._root = _EMPTY_NODE
+        self._size = 0
+        self._next_seq = 0
+        if items:
+            root, size, seq = self._root, 0, 0
+            pairs = items.items() if isinstance(items, Mapping) else items
+            for key, value in pairs:
+                root, added = _set(root, _hash(key), key, value, seq, 0)
+                size += added
+                seq += 1
+            self._root, self._size, self._next_seq = root, size, seq
+
+    @classmethod
+    def _make(cls, root, size: int, next_seq: int) -> "PMap":
+        new = object.__new__(cls)
+        new._root = root
+        new._size = size
+        new._next_seq = next_seq
+        return new
+
+    # Mapping ----------------------------------------------------------
+
+    def __getitem__(self, key: Any) -> Any:
+        value = _get(self._root, _hash(key), key)
+        if value is _ABSENT:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        value = _get(self._root, _hash(key), key)
+        return default if value is _ABSENT else value
+
+    def __contains__(self, key: object) -> bool:
+        return _get(self._root, _hash(key), key) is not _ABSENT
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        return (leaf[1] for leaf in self._ordered())
+
+    def items(self):
+        return [(leaf[1], leaf[2]) for leaf in self._ordered()]
+
+    def values(self):
+        return [leaf[2] for leaf in self._ordered()]
+
+    def __repr__(self) -> str:
+        return f"PMap({dict(self.items())!r})"
+
+    # Updates ----------------------------------------------------------
+
+    def set(self, key: Any, value: Any) -> "PMap":
+        """Map with key bound to value (keeps the key's original position)."""
+        root, added = _set(self._root, _hash(key), key, value, self._next_seq, 0)
+        if root is self._root:
+            return self
+        return self._make(root, self._size + added, self._next_seq + added)
+
+    def delete(self, key: Any) -> "PMap":
+        """Map without key (KeyError if absent)."""
+        root = _delete(self._root, _hash(key), key, 0)
+        if root is self._root:
+            raise KeyError(key)
+        return self._make(root if root is not None else _EMPTY_NODE, self._size - 1, self._next_seq)
+
+    def update(self, items: Union[Mapping, Iterable[Tuple[Any, Any]]]) -> "PMap":
+        result = self
+        pairs = items.items() if isinstance(items, Mapping) else items
+        for key, value in pairs:
+            result = result.set(key, value)
+        return result
+
+    # Diffs ------------------------------------------------------------
+
+    def changed_keys(self, other: "PMap") -> Set[Any]:
+        """Keys added, removed or rebound between two maps."""
+        if not isinstance(other, PMap):
+            other = PMap(other)
+        changed: Set[Any] = set()
+        _diff(self._root, other._root, changed)
+        return changed
+
+    def _ordered(self):
+        leaves = []
+        _collect(self._root, leaves)
+        leaves.sort(key=lambda leaf: leaf[3])
+        return leaves
+
+
+def _hash(key: Any) -> int:
+    return hash(key) & ((1 << _HASH_BITS) - 1)
+
+
+def _get(node, key_hash: int, key: Any) -> Any:
+    shift = 0
+    while True:
+        if isinstance(node, _Collision):
+            for leaf in node.items:
+                if leaf[1] == key:
+                    return leaf[2]
+            return _ABSENT
+        bit = 1 << ((key_hash >> shift) & _MASK)
+        if not node.bitmap & bit:
+            return _ABSENT
+        item = node.items[bin(node.bitmap & (bit - 1)).count("1")]
+        if type(item) is tuple:
+            return item[2] if item[0] == key_hash and (item[1] is key or item[1] == key) else _ABSENT
+        node = item
+        shift += _BITS
+
+
+def _set(node, key_hash: int, key: Any, value: Any, seq: int, shift: int):
+    """(new node, 1 if the key was added else 0); returns node itself if unchanged."""
+    if isinstance(node, _Collision) and node.hash != key_hash:
+        # A different hash reached a collision: give it a level of its own
+        node = _Node(1 << ((node.hash >> shift) & _MASK), (node,))
+    if isinstance(node, _Collision):
+        for position, leaf in enumerate(node.items):
+            if leaf[1] == key:
+                if leaf[2] is value:
+                    return node, 0
+                items = node.items[:position] + ((key_hash, key, value, leaf[3]),) + node.items[position + 1:]
+                return _Collision(key_hash, items), 0
+        return _Collision(key_hash, node.items + ((key_hash, key, value, seq),)), 1
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    position = bin(node.bitmap & (bit - 1)).count("1")
+    if not node.bitmap & bit:
+        items = node.items[:position] + ((key_hash, key, value, seq),) + node.items[position:]
+        return _Node(node.bitmap | bit, items), 1
+    item = node.items[position]
+    if type(item) is tuple:
+        if item[0] == key_hash and (item[1] is key or item[1] == key):
+            if item[2] is value:
+                return node, 0
+            child, added = (key_hash, key, value, item[3]), 0
+        else:
+            child, added = _split(item, (key_hash, key, value, seq), shift + _BITS), 1
+    else:
+        child, added = _set(item, key_hash, key, value, seq, shift + _BITS)
+        if child is item:
+            return node, 0
+    return _Node(node.bitmap, node.items[:position] + (child,) + node.items[position + 1:]), added
+
+
+def _split(first: tuple, second: tuple, shift: int):
+    """Smallest subtree holding two leaves with different keys."""
+    if first[0] == second[0]:
+        return _Collision(first[0], (first, second))
+    index_a = (first[0] >> shift) & _MASK
+    index_b = (second[0] >> shift) & _MASK
+    if index_a == index_b:
+        return _Node(1 << index_a, (_split(first, second, shift + _BITS),))
+    items = (first, second) if index_a < index_b else (second, first)
+    return _Node((1 << index_a) | (1 << index_b), items)
+
+
+def _delete(node, key_hash: int, key: Any, shift: int):
+    """New node without key (None if it became empty); node itself if key absent."""
+    if isinstance(node, _Collision):
+        items = tuple(leaf for leaf in node.items if leaf[1] != key)
+        if len(items) == len(node.items):
+            return node
+        return items[0] if len(items) == 1 else _Collision(node.hash, items)
+    bit = 1 << ((key_hash >> shift) & _MASK)
+    if not node.bitmap & bit:
+        return node
+    position = bin(node.bitmap & (bit - 1)).count("1")
+    item = node.items[position]
+    if type(item) is tuple:
+        if not (item[0] == key_hash and (item[1] is key or item[1] == key)):
+            return node
+        child = None
+    else:
+        child = _delete(item, key_hash, key, shift + _BITS)
+        if child is item:
+            return node
+    if child is None:
+        if node.bitmap == bit:
+            return None
+        items = node.items[:position] + node.items[position + 1:]
+        bitmap = node.bitmap & ~bit
+        if len(items) == 1 and type(items[0]) is tuple and shift:
+            return items[0]  # collapse a lone leaf into the parent
+        return _Node(bitmap, items)
+    if type(child) is tuple and len(node.items) == 1 and shift:
+        return child
+    return _Node(node.bitmap, node.items[:position] + (child,) + node.items[position + 1:])
+
+
+def _collect(node, leaves: list) -> None:
+    for item in node.items:
+        if type(item) is tuple:
+            leaves.append(item)
+        else:
+            _collect(item, leaves)
+
+
+def _diff(a, b, changed: Set[Any]) -> None:
+    if a is b:
+        return
+    if isinstance(a, _Node) and isinstance(b, _Node):
+        # Walk the occupied slots of both; shared children are skipped by identity
+        bits = a.bitmap | b.bitmap
+        position_a = position_b = 0
+        while bits:
+            bit = bits & -bits
+            bits ^= bit
+            item_a = item_b = None
+            if a.bitmap & bit:
+                item_a = a.items[position_a]
+                position_a += 1
+            if b.bitmap & bit:
+                item_b = b.items[position_b]
+                position_b += 1
+            if item_a is item_b:
+                continue
+            if isinstance(item_a, _Node) and isinstance(item_b, _Node):
+                _diff(item_a, item_b, changed)
+            else:
+                _diff_leaves(item_a, item_b, changed)
+        return
+    _diff_leaves(a, b, changed)
+
+
+def _diff_leaves(a, b, changed: Set[Any]) -> None:
+    """Compare two small subtrees (leaves, collisions or nodes) entry by entry."""
+    left: Dict[Any, Any] = {}
+    right: Dict[Any, Any] = {}
+    for item, entries in ((a, left), (b, right)):
+        if item is None:
+            continue
+        leaves: list = []
+        if type(item) is tuple:
+            leaves.append(item)
+        else:
+            _collect(item, leaves)
+        for leaf in leaves:
+            entries[leaf[1]] = leaf[2]
+    for key in left.keys() | right.keys():
+        before = left.get(key, _ABSENT)
+        after = right.get(key, _ABSENT)
+        if before is not after and (before is _ABSENT or after is _ABSENT or before != after):
+            changed.add(key)
+
+
+def as_pvector(values: Optional[Iterable[Any]]) -> PVector:
+    """values as a PVector (returned as is if it already is one)."""
+    if type(values) is PVector:
+        return values
+    return PVector(values or ())
+
+
+def as_pmap(items: Union[Mapping, Iterable[Tuple[Any, Any]], None]) -> PMap:
+    """items as a PMap (returned as is if it already is one)."""
+    if type(items) is PMap:
+        return items
+    return PMap(items)
@@ -11,9 +11,9 @@ Compute a stable, reproducible hash for any screen state that enables:
 
 DEPENDENCIES (ALLOWED):
 -----------------------
-- hashlib, json (stdlib)
+- hashlib, re, array, itertools (stdlib)
 - typing (stdlib)
-- UIElement domain types (same package)
+- UIElement / ElementTable domain types (same package)
 
 DEPENDENCIES (FORBIDDEN):
 -------------------------
@@ -26,6 +26,10 @@ ALGORITHM:
 1. Layout Hash: Combine element roles, bounds (quantized), hierarchy
 2. OCR Stems Hash: Normalize visible text → stems → sorted → hash
 3. Composite Hash: SHA256(layout_hash + ocr_stems_hash)
+4. SimHash: 64-bit locality-sensitive hash for near-duplicate lookup
+   (see simhash_index.py)
+5. pHash (optional): screenshot hash supplied by the caller; it only feeds
+   compute_delta, so pixel noise never changes a screen's identity
 
 INVARIANTS:
 -----------
@@ -34,22 +38,67 @@ INVARIANTS:
 - Ignores transient elements (timestamps, animations)
 - Quantize floats to 2 decimals to avoid float noise
 
+CANONICALIZATION:
+-----------------
+- Elements are taken in hierarchy order (pre-order, document order of
+  siblings), each tagged with its depth
+- Invisible elements contribute nothing (their subtrees still may)
+- Bounds are quantized to 2 decimals as integers: int(v * 100 + 0.5)
+- Layout hash = SHA256 fed column by column (role ids, depths, quantized
+  bounds) for the visible rows; no per-element hashing or string building
+- OCR text: lowercase → tokens → digits collapsed to '#' → stopwords dropped
+  → light suffix stemming (memoized) → deduplicated and sorted → SHA256
+- SimHash: one token per visible element (role, depth, quantized bounds)
+  plus one per OCR stem, each hashed to 64 bits with blake2b. Hashes are
+  memoized "spread" to one 16-bit lane per bit, so a single big-int sum()
+  yields all 64 per-bit counts
+- ElementTable input is the fast path: its qbounds column is already
+  quantized, and visible rows are selected with C-level itertools.compress
+
 TODO:
 -----
-- [ ] Implement hash_layout(elements: List[UIElement]) -> str
-- [ ] Implement hash_ocr_stems(ocr_text: str) -> str
-- [ ] Implement compute_delta(sig1: ScreenSignature, sig2: ScreenSignature) -> float
-- [ ] Add perceptual hashing for visual similarity (pHash)
+- [x] Implement hash_layout(elements: List[UIElement]) -> str
+- [x] Implement hash_ocr_stems(ocr_text: str) -> str
+- [x] Implement compute_delta(sig1: ScreenSignature, sig2: ScreenSignature) -> float
+- [x] Add perceptual hashing for visual similarity (pHash)
 - [ ] Add semantic hashing for text similarity (embeddings)
 """
 
+from array import array
 from dataclasses import dataclass
-from typing import List, Optional, Any
+from itertools import compress
+from typing import Any, Dict, List, Optional, Tuple
 import hashlib
-import json
+import re
+
+from .element_table import ElementTable, FLAG_VISIBLE, quantize, role_id
+
+
+# OCR normalization
+_TOKEN = re.compile(r"\w+")
+_DIGITS = re.compile(r"\d+")
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the
+this to was were will with you your
+""".split())
+_SUFFIXES = ("ations", "ation", "ings", "ing", "edly", "ed", "ies", "es", "ly", "s")
+_MIN_STEM = 3
+_STEM_CACHE_MAX = 50_000
+_stem_cache: Dict[str, Optional[str]] = {}
 
+# Maps a flags low byte to 1 if FLAG_VISIBLE is set, else 0
+_VISIBLE_BYTE = bytes(1 if b & FLAG_VISIBLE else 0 for b in range(256))
+_BIG_ENDIAN = array("H", [1]).tobytes()[0] == 0
 
-@dataclass(frozen=True)
+# SimHash
+SIMHASH_BITS = 64
+_LANE_BITS = 16
+_LANE_MAX = (1 << _LANE_BITS) - 1
+_TOKEN_CACHE_MAX = 50_000
+_token_cache: Dict[Any, int] = {}
+
+
+@dataclass(frozen=True, slots=True)
 class ScreenSignature:
     """
     A deterministic signature for a screen state.
@@ -59,6 +108,10 @@ class ScreenSignature:
     - hash: Composite SHA256 of layout + OCR
     - layout_hash: Hash of UI element hierarchy and bounds
     - ocr_stems_hash: Hash of normalized visible text
+    - simhash: 64-bit SimHash over layout tokens and OCR stems (None if
+      not computed); near-duplicate screens differ in few bits
+    - phash: Optional 64-bit perceptual hash of the screenshot (see
+      services/perceptual_hash.py); not part of the composite hash
     
     USAGE:
     ------
@@ -68,6 +121,8 @@ class ScreenSignature:
     hash: str = "unset"
     layout_hash: str = "unset"
     ocr_stems_hash: str = "unset"
+    simhash: Optional[int] = None
+    phash: Optional[int] = None
     
     def __eq__(self, other: object) -> bool:
         """Two signatures are equal if their composite hashes match."""
@@ -80,18 +135,241 @@ class ScreenSignature:
         return hash(self.hash)
 
 
-def compute_signature(elements: List[Any], ocr_text: str) -> ScreenSignature:
+def _stem(token: str) -> Optional[str]:
+    """Stem one lowercase token; None for stopwords."""
+    if token in _STOPWORDS:
+        return None
+    token = _DIGITS.sub("#", token)
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= _MIN_STEM:
+            return token[:-len(suffix)]
+    return token
+
+
+def normalize_ocr_stems(ocr_text: str) -> List[str]:
+    """
+    Normalize visible text to a sorted, deduplicated list of stems.
+    
+    Digits collapse to '#', so clocks, counters and badges do not change
+    the signature.
+    """
+    cache = _stem_cache
+    stems = set()
+    for token in set(_TOKEN.findall(ocr_text.lower())):
+        try:
+            stem = cache[token]
+        except KeyError:
+            stem = _stem(token)
+            if len(cache) >= _STEM_CACHE_MAX:
+                cache.clear()
+            cache[token] = stem
+        if stem is not None:
+            stems.add(stem)
+    return sorted(stems)
+
+
+def _hash_stems(stems: List[str]) -> str:
+    return hashlib.sha256("\n".join(stems).encode()).hexdigest()
+
+
+def hash_ocr_stems(ocr_text: str) -> str:
+    """SHA256 of the normalized OCR stems."""
+    return _hash_stems(normalize_ocr_stems(ocr_text))
+
+
+def _hash_columns(roles: array, depths: array, qbounds: array) -> str:
+    """Incrementally hash the layout columns (fixed little-endian widths)."""
+    h = hashlib.sha256()
+    h.update(len(roles).to_bytes(4, "little"))
+    h.update(roles.tobytes())
+    for column in (depths, qbounds):
+        if _BIG_ENDIAN:
+            column = array("H", column)
+            column.byteswap()
+        h.update(column.tobytes())
+    return h.hexdigest()
+
+
+def _table_layout_columns(table: ElementTable) -> Tuple[array, array, array]:
+    """Visible rows' (roles, depths, qbounds) columns of an ElementTable."""
+    n = len(table)
+    flags = table.flags.tobytes()
+    # Low byte of each uint16 flag holds FLAG_VISIBLE
+    low = flags[1::2] if _BIG_ENDIAN else flags[0::2]
+    visible = low.translate(_VISIBLE_BYTE)
+    if visible.count(0) == 0:
+        return table.roles, table.depths, table.qbounds
+    
+    visible4 = bytearray(4 * n)
+    for k in range(4):
+        visible4[k::4] = visible
+    return (
+        array("B", compress(table.roles, visible)),
+        array("H", compress(table.depths, visible)),
+        array("H", compress(table.qbounds, visible4)),
+    )
+
+
+def _element_layout_columns(elements: Any) -> Tuple[array, array, array]:
+    """Visible elements' (roles, depths, qbounds) columns, walked in pre-order."""
+    roles = array("B")
+    depths = array("H")
+    qbounds = array("H")
+    stack = [(element, 0) for element in reversed(list(elements))]
+    while stack:
+        element, depth = stack.pop()
+        if element.visible:
+            b = element.bounds
+            roles.append(role_id(element.role))
+            depths.append(depth)
+            qbounds.extend((quantize(b.x), quantize(b.y), quantize(b.width), quantize(b.height)))
+        children = element.children
+        if children:
+            depth += 1
+            stack.extend((child, depth) for child in reversed(children))
+    return roles, depths, qbounds
+
+
+def _layout_columns(elements: Any) -> Tuple[array, array, array]:
+    if isinstance(elements, ElementTable):
+        return _table_layout_columns(elements)
+    return _element_layout_columns(elements)
+
+
+def hash_layout(elements: Any) -> str:
+    """
+    SHA256 of the canonical layout columns.
+    
+    Args:
+        elements: An ElementTable, or root UIElements / UIElementViews (a
+            flat list of elements is treated as siblings at depth 0).
+    """
+    return _hash_columns(*_layout_columns(elements))
+
+
+def _spread_hash(token: Any) -> int:
+    """
+    Stable 64-bit hash of a feature token, spread to one 16-bit lane per bit.
+    
+    Summing spread hashes counts, per bit, how many tokens have it set.
+    """
+    digest = hashlib.blake2b(repr(token).encode(), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return sum(1 << (_LANE_BITS * bit) for bit in range(SIMHASH_BITS) if value >> bit & 1)
+
+
+def _le_bytes(column: array) -> bytes:
+    if _BIG_ENDIAN and column.itemsize > 1:
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _layout_tokens(roles: array, depths: array, qbounds: array) -> array:
+    """
+    One uint64 token per row, packed column-wise without a per-row loop.
+    
+    Bytes (little-endian): x, y, w, h (low byte of the quantized bounds;
+    normalized bounds quantize to 0..100), role, depth (2 bytes), 0.
+    """
+    n = len(roles)
+    low = _le_bytes(qbounds)[0::2]
+    depth = _le_bytes(depths)
+    packed = bytearray(8 * n)
+    for k in range(4):
+        packed[k::8] = low[k::4]
+    packed[4::8] = roles.tobytes()
+    packed[5::8] = depth[0::2]
+    packed[6::8] = depth[1::2]
+    tokens = array("Q")
+    tokens.frombytes(bytes(packed))
+    if _BIG_ENDIAN:
+        tokens.byteswap()
+    return tokens
+
+
+def _simhash(roles: array, depths: array, qbounds: array, stems: List[str]) -> int:
+    """
+    SimHash over layout tokens and OCR stems.
+    
+    Layout tokens are (role, depth, x, y, w, h) per visible element, text
+    tokens are the stems; every token has weight 1. A bit is set when more
+    than half of the tokens' hashes set it.
+    """
+    tokens = _layout_tokens(roles, depths, qbounds).tolist()
+    tokens.extend(stems)
+    if not tokens:
+        return 0
+    
+    cache = _token_cache
+    spread = list(map(cache.get, tokens))
+    if None in spread:
+        if len(cache) >= _TOKEN_CACHE_MAX:
+            cache.clear()
+        for i, token in enumerate(tokens):
+            if spread[i] is None:
+                spread[i] = cache[token] = _spread_hash(token)
+    
+    # Lanes are 16 bits wide: sum at most 0xFFFF tokens at a time
+    counts = [0] * SIMHASH_BITS
+    for start in range(0, len(spread), _LANE_MAX):
+        lanes = sum(spread[start:start + _LANE_MAX]).to_bytes(SIMHASH_BITS * _LANE_BITS // 8, "little")
+        chunk = array("H")
+        chunk.frombytes(lanes)
+        if _BIG_ENDIAN:
+            chunk.byteswap()
+        counts = [a + b for a, b in zip(counts, chunk)]
+    half = len(tokens) // 2
+    value = 0
+    for bit, count in enumerate(counts):
+        if count > half:
+            value |= 1 << bit
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two SimHashes."""
+    return (a ^ b).bit_count()
+
+
+def _visible_texts(elements: Any) -> str:
+    """Visible element text, used when no OCR text is available."""
+    if isinstance(elements, ElementTable):
+        flags = elements.flags
+        return "\n".join(
+            text for text, f in zip(elements.texts, flags)
+            if text and f & FLAG_VISIBLE
+        )
+    texts = []
+    stack = list(elements)
+    while stack:
+        element = stack.pop()
+        if element.visible and element.text:
+            texts.append(element.text)
+        stack.extend(element.children)
+    return "\n".join(texts)
+
+
+def compute_signature(
+    elements: Any,
+    ocr_text: Optional[str] = None,
+    phash: Optional[int] = None,
+) -> ScreenSignature:
     """
     Compute a deterministic signature from UI elements and OCR text.
     
-    TODO: Implement full hashing logic
-    - Quantize bounds to 2 decimals
-    - Sort elements by z-order or hierarchy
-    - Normalize OCR text (lowercase, stem, remove stopwords)
-    - Combine hashes with SHA256
-    """
-    layout_hash = "layout_placeholder"
-    ocr_stems_hash = "ocr_placeholder"
+    Args:
+        elements: ElementTable (fast path) or root UIElements / views.
+        ocr_text: Visible text from OCR. If None, visible element text is
+            used instead (stems are order-insensitive, so either works).
+        phash: Optional 64-bit perceptual hash of the screenshot.
+    """
+    columns = _layout_columns(elements)
+    layout_hash = _hash_columns(*columns)
+    if ocr_text is None:
+        ocr_text = _visible_texts(elements)
+    stems = normalize_ocr_stems(ocr_text)
+    ocr_stems_hash = _hash_stems(stems)
     composite_hash = hashlib.sha256(
         f"{layout_hash}{ocr_stems_hash}".encode()
     ).hexdigest()
@@ -100,6 +378,8 @@ def compute_signature(elements: List[Any], ocr_text: str) -> ScreenSignature:
         hash=composite_hash,
         layout_hash=layout_hash,
         ocr_stems_hash=ocr_stems_hash,
+        simhash=_simhash(*columns, stems),
+        phash=phash,
     )
 
 
@@ -108,9 +388,17 @@ def compute_delta(sig1: ScreenSignature, sig2: ScreenSignature) -> float:
     Compute similarity distance between two signatures.
     Returns [0.0, 1.0] where 0 = identical, 1 = completely different.
     
-    TODO: Implement Hamming distance or Jaccard similarity
+    Each component present on both signatures (SimHash, pHash) gives a
+    normalized Hamming distance and the largest one wins, so a canvas screen
+    with an unchanged layout but different pixels still registers. With no
+    shared component, signatures are either identical (0.0) or different (1.0).
     """
-    if sig1.hash == sig2.hash:
-        return 0.0
-    return 1.0  # Placeholder
-
+    # SimHash and pHash are both 64-bit
+    distances = [
+        hamming_distance(a, b) / SIMHASH_BITS
+        for a, b in ((sig1.simhash, sig2.simhash), (sig1.phash, sig2.phash))
+        if a is not None and b is not None
+    ]
+    if distances:
+        return max(distances)
+    return 0.0 if sig1.hash == sig2.hash else 1.0
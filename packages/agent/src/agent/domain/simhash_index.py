@@ -0,0 +1,151 @@
+"""
+SimHashIndex: Near-Duplicate Screen Lookup by Hamming Distance
+
+PURPOSE:
+--------
+Answer "is there a known screen within k bits of this SimHash?" without
+scanning every node in the graph. Screens that differ only by a clock, a
+badge or one list row land within a few bits of each other and should map
+to the same graph node instead of a new one.
+
+DEPENDENCIES (ALLOWED):
+-----------------------
+- typing (stdlib)
+- screen_signature (SIMHASH_BITS, hamming_distance)
+
+DEPENDENCIES (FORBIDDEN):
+-------------------------
+- NO ports or adapters
+- NO I/O operations (persistence is the repo's job; rebuild on load)
+
+ALGORITHM (multi-index hashing):
+--------------------------------
+- Split the 64 bits into max_distance + 1 disjoint blocks
+- By pigeonhole, two hashes within max_distance bits agree exactly on at
+  least one block
+- Keep one dict per block: block value → keys; a query probes one bucket
+  per block and verifies candidates with a full Hamming distance
+- With n entries and b-bit blocks, a query touches about
+  (max_distance + 1) * n / 2^b candidates instead of n
+
+INVARIANTS:
+-----------
+- Each key is stored once; add() with an existing key replaces its hash
+- Queries never return entries farther than the requested distance
+- Results are ordered by distance, then insertion order (a replaced key
+  counts as newly inserted)
+
+USAGE:
+------
+index = SimHashIndex(max_distance=3)
+index.add(signature.hash, signature.simhash)
+match = index.nearest(new_signature.simhash)
+if match is not None:
+    key, distance = match
+"""
+
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from .screen_signature import SIMHASH_BITS, hamming_distance
+
+
+class SimHashIndex:
+    """
+    Bit-partitioned multi-index over SimHashes.
+
+    Larger max_distance means more, narrower blocks: more tolerant lookups,
+    but bigger buckets to verify.
+    """
+
+    __slots__ = ("max_distance", "bits", "_blocks", "_tables", "_hashes", "_sequence", "_next_sequence")
+
+    def __init__(self, max_distance: int = 3, bits: int = SIMHASH_BITS):
+        if not 0 <= max_distance < bits:
+            raise ValueError(f"max_distance must be in [0, {bits}), got {max_distance}")
+        self.max_distance = max_distance
+        self.bits = bits
+
+        # (shift, mask) per block; earlier blocks take the remainder bits
+        count = max_distance + 1
+        width, extra = divmod(bits, count)
+        self._blocks: List[Tuple[int, int]] = []
+        shift = 0
+        for i in range(count):
+            size = width + (1 if i < extra else 0)
+            self._blocks.append((shift, (1 << size) - 1))
+            shift += size
+
+        # Buckets are dicts used as ordered sets
+        self._tables: List[Dict[int, Dict[Hashable, None]]] = [{} for _ in self._blocks]
+        self._hashes: Dict[Hashable, int] = {}
+        self._sequence: Dict[Hashable, int] = {}  # insertion order, the tie-break
+        self._next_sequence = 0
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._hashes
+
+    def get(self, key: Hashable) -> Optional[int]:
+        """SimHash stored for a key, or None."""
+        return self._hashes.get(key)
+
+    def add(self, key: Hashable, simhash: int) -> None:
+        """Insert or replace a key's SimHash."""
+        if key in self._hashes:
+            self.remove(key)
+        self._hashes[key] = simhash
+        self._sequence[key] = self._next_sequence
+        self._next_sequence += 1
+        for (shift, mask), table in zip(self._blocks, self._tables):
+            table.setdefault((simhash >> shift) & mask, {})[key] = None
+
+    def remove(self, key: Hashable) -> None:
+        """Remove a key. Raises KeyError if absent."""
+        simhash = self._hashes.pop(key)
+        del self._sequence[key]
+        for (shift, mask), table in zip(self._blocks, self._tables):
+            block = (simhash >> shift) & mask
+            bucket = table[block]
+            del bucket[key]
+            if not bucket:
+                del table[block]
+
+    def query(self, simhash: int, max_distance: Optional[int] = None) -> List[Tuple[Hashable, int]]:
+        """
+        All keys within max_distance bits, as (key, distance) pairs.
+
+        Args:
+            simhash: Hash to look up.
+            max_distance: Defaults to (and may not exceed) the index's.
+        """
+        if max_distance is None:
+            max_distance = self.max_distance
+        elif max_distance > self.max_distance:
+            raise ValueError(
+                f"max_distance {max_distance} exceeds index max_distance {self.max_distance}"
+            )
+
+        seen: Dict[Hashable, None] = {}
+        results: List[Tuple[Hashable, int]] = []
+        hashes = self._hashes
+        for (shift, mask), table in zip(self._blocks, self._tables):
+            bucket = table.get((simhash >> shift) & mask)
+            if not bucket:
+                continue
+            for key in bucket:
+                if key in seen:
+                    continue
+                seen[key] = None
+                distance = hamming_distance(simhash, hashes[key])
+                if distance <= max_distance:
+                    results.append((key, distance))
+        sequence = self._sequence
+        results.sort(key=lambda item: (item[1], sequence[item[0]]))
+        return results
+
+    def nearest(self, simhash: int, max_distance: Optional[int] = None) -> Optional[Tuple[Hashable, int]]:
+        """Closest (key, distance) within max_distance, or None."""
+        results = self.query(simhash, max_distance)
+        return results[0] if results else None
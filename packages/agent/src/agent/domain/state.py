@@ -15,7 +15,8 @@ DEPENDENCIES (ALLOWED):
 -----------------------
 - dataclasses (stdlib)
 - typing (stdlib)
-- datetime (stdlib)
+- datetime, operator (stdlib)
+- persistent (PVector, PMap)
 - Other domain types from this package (screen_signature, bundles, advice, counters, budgets)
 
 DEPENDENCIES (FORBIDDEN):
@@ -27,7 +28,7 @@ DEPENDENCIES (FORBIDDEN):
 
 CONTRACTS:
 ----------
-1. Every node must follow: `def run(self, state: AgentState) -> AgentState`
+1. Every node must follow: `async def run(self, state: AgentState) -> AgentState`
 2. State is IMMUTABLE - always return a new instance
 3. State is SERIALIZABLE - JSON-compatible types only
 4. No runtime handles (drivers, models, connections) inside state
@@ -35,26 +36,35 @@ CONTRACTS:
 
 IMMUTABILITY PATTERN:
 ---------------------
-Use `dataclasses.replace()` to create updated copies:
+Use the helper (fast path; shares every field not updated):
+    new_state = state.clone_with(signature=new_sig, counters=updated_counters)
+
+`dataclasses.replace()` also works (through __init__, no timestamp stamp):
     new_state = replace(state, signature=new_sig, counters=updated_counters)
 
-Or implement a helper:
-    new_state = state.clone_with(signature=new_sig, counters=updated_counters)
+List and dict fields hold persistent collections (PVector / PMap, see
+persistent.py); plain lists and dicts passed in are converted. Value types
+use __slots__. diff(previous, current) returns the changed fields, skipping
+shared ones by identity.
 
 TODO:
 -----
-- [ ] Implement clone_with() helper method
+- [x] Implement clone_with() helper method
 - [ ] Add validation methods (e.g., is_budget_exhausted(), should_stop())
-- [ ] Add serialization/deserialization (to_dict/from_dict)
-- [ ] Add state diffing utilities for telemetry
+- [x] Add serialization/deserialization — state_codec.state_to_plain/state_from_plain
+- [x] Add state diffing utilities — state_codec.changed_fields
 """
 
-from dataclasses import dataclass, field, replace
-from typing import Optional, List, Dict, Any
+from dataclasses import dataclass, field, fields
+from typing import Optional, Dict, Any, ClassVar
 from datetime import datetime
+from operator import attrgetter
+
+from .persistent import PMap, PVector, as_pmap, as_pvector
+from .screen_signature import ScreenSignature
+from .ui_element import UIElement
 
 # Forward declarations for domain types (to be implemented)
-# from .screen_signature import ScreenSignature
 # from .bundles import Bundle
 # from .ui_action import EnumeratedAction
 # from .advice import Advice
@@ -62,14 +72,14 @@ from datetime import datetime
 # from .budgets import Budgets
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Timestamps:
     """Immutable timestamp tracking for state lifecycle."""
     created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
     updated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Bounds:
     """Normalized bounding box coordinates [0.0, 1.0]."""
     x: float = 0.0
@@ -78,7 +88,7 @@ class Bounds:
     height: float = 0.0
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class EnumeratedAction:
     """
     A single action candidate enumerated from the current screen.
@@ -91,19 +101,22 @@ class EnumeratedAction:
     expected_postcondition: Optional[str] = None  # LLM-predicted outcome
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Advice:
     """
     LLM-generated or cached guidance for the current screen.
     Includes plan, confidence, and rationale reference.
     """
-    plan: List[str] = field(default_factory=list)  # ordered action steps
+    plan: PVector[str] = PVector()  # ordered action steps
     confidence: float = 0.0  # [0.0, 1.0]
     rationale: Optional[str] = None  # reference to stored rationale (filestore key)
     source: str = "cache"  # cache | llm | heuristic
+    
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "plan", as_pvector(self.plan))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Counters:
     """
     Progress and safety counters updated throughout the agent loop.
@@ -114,10 +127,11 @@ class Counters:
     no_progress_cycles: int = 0
     outside_app_steps: int = 0
     restarts_used: int = 0
-    errors: int = 0
+    errors: int = 0  # every node failure in the run
+    consecutive_errors: int = 0  # foreground failures since the last completed action (or restart)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Budgets:
     """
     Hard limits enforced by BudgetPort and orchestrator.
@@ -130,17 +144,20 @@ class Budgets:
     restart_limit: int = 2
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CacheEntry:
     """
     Cached advice and safe actions for a specific screen signature.
     TTL and versioning managed by CachePort.
     """
     advice: Advice = field(default_factory=Advice)
-    safe_actions: List[EnumeratedAction] = field(default_factory=list)
+    safe_actions: PVector[EnumeratedAction] = PVector()
+    
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "safe_actions", as_pvector(self.safe_actions))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PersistResultSummary:
     """
     Summary of persistence operations after each iteration.
@@ -150,18 +167,7 @@ class PersistResultSummary:
     edges_added: int = 0
 
 
-@dataclass(frozen=True)
-class ScreenSignature:
-    """
-    Deterministic signature for a screen state.
-    TODO: Implement in screen_signature.py with full hash logic.
-    """
-    hash: str = "unset"
-    layout_hash: str = "unset"
-    ocr_stems_hash: str = "unset"
-
-
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Bundle:
     """
     References to heavy assets (screenshot, page source) stored externally.
@@ -172,7 +178,41 @@ class Bundle:
     ocr_ref: Optional[str] = None  # FileStore key
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
+class ElementDelta:
+    """
+    One element that differs between the previous and the current screen.
+    role/text/bounds describe the element as it is now (as it was, for
+    removed elements); previous holds the old values of changed attributes.
+    """
+    change: str  # added | removed | changed
+    role: str = "unknown"
+    text: Optional[str] = None
+    bounds: Bounds = field(default_factory=Bounds)
+    previous: PMap[str, str] = field(default_factory=PMap)  # attribute → old value ("" if absent)
+    
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "previous", as_pmap(self.previous))
+
+
+@dataclass(frozen=True, slots=True)
+class ScreenDelta:
+    """
+    Element-level diff of the current screen against the previous one
+    (services.screen_diff). Totals count every element; elements keeps only
+    the most informative ones (texted, identified or interactive).
+    """
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    elements: PVector[ElementDelta] = PVector()
+    
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "elements", as_pvector(self.elements))
+
+
+@dataclass(frozen=True, slots=True)
 class AgentState:
     """
     The canonical state object for the ScreenGraph Agent.
@@ -183,7 +223,9 @@ class AgentState:
     SECTIONS:
     ---------
     1. Identity & Flow: run_id, app_id, timestamps
-    2. Perception Bundle: signature, previous_signature, bundle (refs only)
+    2. Perception Bundle: signature, previous_signature, bundle (refs only),
+       ranked_elements (top-K salient elements, without children)
+       screen_delta (element-level changes since the previous screen)
     3. Enumerated Actions: feasible actions for the current screen
     4. Plan & Advice: LLM guidance, plan cursor
     5. Progress Accounting: counters, budgets
@@ -222,9 +264,11 @@ class AgentState:
     signature: ScreenSignature = field(default_factory=ScreenSignature)
     previous_signature: Optional[ScreenSignature] = None
     bundle: Bundle = field(default_factory=Bundle)
+    ranked_elements: PVector[UIElement] = PVector()
+    screen_delta: Optional[ScreenDelta] = None  # element changes since previous screen
     
     # Enumerated Actions
-    enumerated_actions: List[EnumeratedAction] = field(default_factory=list)
+    enumerated_actions: PVector[EnumeratedAction] = PVector()
     
     # Plan & Advice
     advice: Advice = field(default_factory=Advice)
@@ -235,32 +279,56 @@ class AgentState:
     budgets: Budgets = field(default_factory=Budgets)
     
     # Persistence & Caching
-    cache: Dict[str, CacheEntry] = field(default_factory=dict)
+    cache: PMap[str, CacheEntry] = field(default_factory=PMap)
     persist_result: Optional[PersistResultSummary] = None
     
     # Lifecycle
     stop_reason: Optional[str] = None
     
     # Stop reason constants
-    STOP_SUCCESS: str = "success"
-    STOP_BUDGET_EXHAUSTED: str = "budget_exhausted"
-    STOP_CRASH: str = "crash"
-    STOP_NO_PROGRESS: str = "no_progress"
-    STOP_USER_CANCELLED: str = "user_cancelled"
+    STOP_SUCCESS: ClassVar[str] = "success"
+    STOP_BUDGET_EXHAUSTED: ClassVar[str] = "budget_exhausted"
+    STOP_CRASH: ClassVar[str] = "crash"
+    STOP_NO_PROGRESS: ClassVar[str] = "no_progress"
+    STOP_USER_CANCELLED: ClassVar[str] = "user_cancelled"
+    STOP_TIMEOUT: ClassVar[str] = "timeout"  # node exceeded its timeout with no error route
+    STOP_ERROR: ClassVar[str] = "error"  # node raised with no error route
+    
+    def __post_init__(self) -> None:
+        for name, coerce in _COLLECTION_FIELDS.items():
+            value = getattr(self, name)
+            coerced = coerce(value)
+            if coerced is not value:
+                object.__setattr__(self, name, coerced)
     
     def clone_with(self, **updates: Any) -> "AgentState":
         """
         Helper to create a new state with updated fields.
-        Automatically updates the updated_at timestamp.
+        Automatically updates the updated_at timestamp (unless timestamps
+        is one of the updates).
         
-        TODO: Implement with proper timestamp handling
+        Skips __init__: fields not updated are copied slot to slot (shared,
+        never copied deeply), and only updated list/dict fields are
+        converted to persistent collections.
+        
+        Raises:
+            TypeError: Unknown field name (like dataclasses.replace).
         """
+        clone = object.__new__(AgentState)
+        for set_slot, value in zip(_STATE_SETTERS, _get_state_fields(self)):
+            set_slot(clone, value)
+        for name, value in updates.items():
+            set_slot = _STATE_SETTER_BY_NAME.get(name)
+            if set_slot is None:
+                raise TypeError(f"AgentState has no field {name!r}")
+            coerce = _COLLECTION_FIELDS.get(name)
+            set_slot(clone, value if coerce is None else coerce(value))
         if "timestamps" not in updates:
-            updates["timestamps"] = replace(
-                self.timestamps,
-                updated_at=datetime.utcnow().isoformat()
-            )
-        return replace(self, **updates)
+            stamped = object.__new__(Timestamps)
+            _set_created_at(stamped, self.timestamps.created_at)
+            _set_updated_at(stamped, datetime.utcnow().isoformat())
+            _STATE_SETTER_BY_NAME["timestamps"](clone, stamped)
+        return clone
     
     def is_budget_exhausted(self) -> bool:
         """
@@ -280,3 +348,37 @@ class AgentState:
         """
         return self.stop_reason is not None or self.is_budget_exhausted()
 
+
+# Slot setters bypass the frozen __setattr__ (clone_with builds new instances only)
+_STATE_FIELD_NAMES = tuple(f.name for f in fields(AgentState))
+_STATE_SETTERS = tuple(AgentState.__dict__[name].__set__ for name in _STATE_FIELD_NAMES)
+_STATE_SETTER_BY_NAME = dict(zip(_STATE_FIELD_NAMES, _STATE_SETTERS))
+_get_state_fields = attrgetter(*_STATE_FIELD_NAMES)
+_set_created_at = Timestamps.__dict__["created_at"].__set__
+_set_updated_at = Timestamps.__dict__["updated_at"].__set__
+_COLLECTION_FIELDS = {
+    "ranked_elements": as_pvector,
+    "enumerated_actions": as_pvector,
+    "cache": as_pmap,
+}
+
+
+def diff(previous: AgentState, current: AgentState) -> Dict[str, Any]:
+    """
+    Fields whose values differ, mapped to their values in current.
+    
+    clone_with() shares every field it does not update, so unchanged
+    fields cost one identity check; replaced ones are compared by value
+    (PMaps only over the subtrees the two maps do not share).
+    replace(previous, **diff(previous, current)) equals current.
+    """
+    changed = {}
+    for name, before, after in zip(_STATE_FIELD_NAMES, _get_state_fields(previous), _get_state_fields(current)):
+        if before is after:
+            continue
+        if isinstance(after, PMap) and isinstance(before, PMap):
+            if after.changed_keys(before):
+                changed[name] = after
+        elif before != after:
+            changed[name] = after
+    return changed
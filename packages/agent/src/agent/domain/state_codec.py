@@ -0,0 +1,330 @@
+"""
+State Codec: Schema-Driven AgentState ⇄ JSON-Compatible Values
+
+PURPOSE:
+--------
+Turn AgentState (and the frozen dataclasses inside it) into plain dicts,
+lists and scalars and back, and name the fields that changed between two
+states. Used by the run event log (diffs + snapshots), checkpoints,
+cross-process handoff and the BFF, i.e. on every step.
+
+DEPENDENCIES (ALLOWED):
+-----------------------
+- dataclasses, functools, json, typing, zlib (stdlib)
+- Other domain modules within this package
+
+DEPENDENCIES (FORBIDDEN):
+-------------------------
+- NO I/O, NO external libraries; binary framing (msgpack) belongs to
+  adapters (see adapters/repo/state_serializer.py)
+
+FORMS:
+------
+- Named: dataclass → {field: value}; canonical JSON adds sorted keys,
+  compact separators and UTF-8. Self-describing: decoding ignores unknown
+  keys and defaults missing ones, so it survives schema changes
+- Compact: dataclass → [value, ...] in field order. No field names, so
+  much smaller, but only readable under the same schema_id()
+- Both: list/tuple/PVector → list, dict/PMap → dict, None stays None
+
+COMPILATION:
+------------
+Per dataclass, the field type hints (Optional[X], List[X], PVector[X],
+Dict[str, X], PMap[str, X], nested and self-referencing dataclasses) are
+turned once into Python source for its encoders and decoders, which is
+compiled and cached: no per-value reflection (asdict/fields) at runtime.
+Decoders build PVector/PMap directly, so __post_init__ has nothing to
+convert; compact decoders of slotted classes fill the slots without
+calling __init__ at all.
+
+USAGE:
+------
+plain = state_to_plain(state)
+state = state_from_plain(plain)
+text = state_to_json(state)  # canonical: equal states give equal text
+row = to_compact(state)  # readable under schema_id(AgentState)
+names = changed_fields(previous, state)
+"""
+
+import json
+import zlib
+from collections.abc import Mapping
+from dataclasses import MISSING, fields, is_dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple, Union, get_args, get_origin, get_type_hints
+
+from .persistent import PMap, PVector
+from .state import AgentState, diff
+
+
+Encoder = Callable[[Any], Any]
+
+
+def to_plain(value: Any) -> Any:
+    """Named JSON-compatible copy of a domain value."""
+    if is_dataclass(value) and not isinstance(value, type):
+        return _codec(type(value)).encode(value)
+    if isinstance(value, (list, tuple)):
+        return [to_plain(item) for item in value]
+    if isinstance(value, Mapping):
+        return {key: to_plain(item) for key, item in value.items()}
+    return value
+
+
+def from_plain(type_hint: Any, data: Any) -> Any:
+    """Inverse of to_plain() for a value of the given type."""
+    return _field_codec(type_hint, False).decode(data)
+
+
+def to_compact(value: Any) -> Any:
+    """Positional JSON-compatible copy of a dataclass value."""
+    return _codec(type(value)).encode_compact(value)
+
+
+def from_compact(cls: type, data: Any) -> Any:
+    """Inverse of to_compact()."""
+    return _codec(cls).decode_compact(data)
+
+
+@lru_cache(maxsize=None)
+def schema_id(cls: type) -> int:
+    """
+    32-bit fingerprint of a dataclass schema (field names and types,
+    recursively); compact data is only readable under the same id.
+    """
+    return zlib.crc32(_describe(cls, frozenset()).encode("utf-8"))
+
+
+def state_to_plain(state: AgentState) -> Dict[str, Any]:
+    return _codec(AgentState).encode(state)
+
+
+def state_from_plain(data: Dict[str, Any]) -> AgentState:
+    return _codec(AgentState).decode(data)
+
+
+def state_to_json(state: AgentState) -> str:
+    """Canonical JSON text (sorted keys, no whitespace)."""
+    return json.dumps(state_to_plain(state), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def state_from_json(text: Union[str, bytes]) -> AgentState:
+    return state_from_plain(json.loads(text))
+
+
+def fields_to_plain(state: AgentState, names: List[str]) -> Dict[str, Any]:
+    """Named plain values of selected AgentState fields."""
+    codecs = _codec(AgentState).fields
+    return {name: codecs[name].encode(getattr(state, name)) for name in names}
+
+
+def fields_from_plain(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Decoded AgentState field values (for dataclasses.replace)."""
+    codecs = _codec(AgentState).fields
+    return {name: codecs[name].decode(value) for name, value in data.items() if name in codecs}
+
+
+def field_codecs(cls: type, compact: bool = False) -> Dict[str, "FieldCodec"]:
+    """Compiled encode/decode pairs of a dataclass's fields, in field order."""
+    codec = _codec(cls)
+    return codec.compact_fields if compact else codec.fields
+
+
+def changed_fields(previous: AgentState, current: AgentState) -> List[str]:
+    """Names of AgentState fields whose values differ (see state.diff)."""
+    return list(diff(previous, current))
+
+
+# ----------------------------------------------------------------------
+# Compilation
+# ----------------------------------------------------------------------
+
+class FieldCodec:
+    """Compiled encoder and decoder of one field (or type hint)."""
+
+    __slots__ = ("encode", "decode")
+
+    def __init__(self, encode: Encoder, decode: Encoder):
+        self.encode = encode
+        self.decode = decode
+
+
+class _ClassCodec:
+    __slots__ = ("encode", "decode", "encode_compact", "decode_compact", "fields", "compact_fields")
+
+
+# Generated code resolves its E_/D_/C_/U_/K_/T_ names here at call time,
+# which lets self-referencing types (UIElement.children) work.
+_NAMESPACE: Dict[str, Any] = {"_MISSING": MISSING, "_new": object.__new__}
+_CODECS: Dict[type, _ClassCodec] = {}
+
+
+def _codec(cls: type) -> _ClassCodec:
+    codec = _CODECS.get(cls)
+    if codec is None:
+        if not (isinstance(cls, type) and is_dataclass(cls)):
+            raise TypeError(f"not a dataclass: {cls!r}")
+        codec = _compile_class(cls)
+    return codec
+
+
+def _symbol(cls: type) -> str:
+    # Unique per class object: state.Bounds and ui_element.Bounds both exist
+    return f"{cls.__name__}_{id(cls):x}"
+
+
+def _compile_class(cls: type) -> _ClassCodec:
+    codec = _ClassCodec()
+    _CODECS[cls] = codec  # registered first: references back to cls resolve
+    symbol = _symbol(cls)
+    _NAMESPACE[f"K_{symbol}"] = cls
+    hints = _hints(cls)
+    source = []
+
+    # Named encoder: {"a": <enc v.a>, ...}
+    items = ", ".join(f"{name!r}: {_encode_expr(hint, f'v.{name}', False, 0)}" for name, hint in hints.items())
+    source.append(f"def E_{symbol}(v):\n    return {{{items}}}\n")
+
+    # Named decoder: present keys only, so missing fields keep their defaults
+    lines = [f"def D_{symbol}(d):", "    kw = {}"]
+    for name, hint in hints.items():
+        lines.append(f"    x = d.get({name!r}, _MISSING)")
+        lines.append("    if x is not _MISSING:")
+        lines.append(f"        kw[{name!r}] = {_decode_expr(hint, 'x', False, 0)}")
+    lines.append(f"    return K_{symbol}(**kw)")
+    source.append("\n".join(lines) + "\n")
+
+    # Compact encoder/decoder: positional, in field order
+    row = ", ".join(_encode_expr(hint, f"v.{name}", True, 0) for name, hint in hints.items())
+    source.append(f"def C_{symbol}(v):\n    return [{row}]\n")
+    if "__slots__" in cls.__dict__:
+        # Every field is present and already decoded: fill the slots
+        # directly instead of going through __init__/__post_init__
+        lines = [f"def U_{symbol}(r):", f"    o = _new(K_{symbol})"]
+        for index, (name, hint) in enumerate(hints.items()):
+            setter = f"S_{symbol}_{name}"
+            _NAMESPACE[setter] = cls.__dict__[name].__set__
+            lines.append(f"    {setter}(o, {_decode_expr(hint, f'r[{index}]', True, 0)})")
+        lines.append("    return o")
+        source.append("\n".join(lines) + "\n")
+    else:
+        args = ", ".join(_decode_expr(hint, f"r[{index}]", True, 0) for index, hint in enumerate(hints.values()))
+        source.append(f"def U_{symbol}(r):\n    return K_{symbol}({args})\n")
+
+    exec(compile("\n".join(source), f"<state_codec {cls.__qualname__}>", "exec"), _NAMESPACE)
+    codec.encode = _NAMESPACE[f"E_{symbol}"]
+    codec.decode = _NAMESPACE[f"D_{symbol}"]
+    codec.encode_compact = _NAMESPACE[f"C_{symbol}"]
+    codec.decode_compact = _NAMESPACE[f"U_{symbol}"]
+    codec.fields = {name: _field_codec(hint, False) for name, hint in hints.items()}
+    codec.compact_fields = {name: _field_codec(hint, True) for name, hint in hints.items()}
+    return codec
+
+
+@lru_cache(maxsize=None)
+def _field_codec(type_hint: Any, compact: bool) -> FieldCodec:
+    """Compiled codec for a value of one type hint."""
+    return FieldCodec(
+        _lambda(_encode_expr(type_hint, "v", compact, 0)),
+        _lambda(_decode_expr(type_hint, "v", compact, 0)),
+    )
+
+
+def _lambda(expression: str) -> Encoder:
+    return eval(compile(f"lambda v: {expression}", "<state_codec field>", "eval"), _NAMESPACE)
+
+
+def _hints(cls: type) -> Dict[str, Any]:
+    hints = get_type_hints(cls)
+    return {f.name: hints[f.name] for f in fields(cls)}
+
+
+def _encode_expr(type_hint: Any, expr: str, compact: bool, depth: int) -> str:
+    """Source of an expression encoding `expr` (a value of type_hint)."""
+    kind, args = _shape(type_hint)
+    if kind == "optional":
+        inner = _encode_expr(args[0], expr, compact, depth)
+        return expr if inner == expr else f"(None if {expr} is None else {inner})"
+    if kind == "dataclass":
+        _codec(args[0])
+        return f"{'C' if compact else 'E'}_{_symbol(args[0])}({expr})"
+    if kind == "sequence":
+        item = f"i{depth}"
+        inner = _encode_expr(args[0], item, compact, depth + 1)
+        return f"list({expr})" if inner == item else f"[{inner} for {item} in {expr}]"
+    if kind == "mapping":
+        key, item = f"k{depth}", f"i{depth}"
+        inner = _encode_expr(args[1], item, compact, depth + 1)
+        if inner == item:
+            return f"dict({expr}.items())"
+        return f"{{{key}: {inner} for {key}, {item} in {expr}.items()}}"
+    return expr  # scalars and Any pass through
+
+
+def _decode_expr(type_hint: Any, expr: str, compact: bool, depth: int) -> str:
+    """Source of an expression decoding `expr` into a value of type_hint."""
+    kind, args = _shape(type_hint)
+    if kind == "optional":
+        inner = _decode_expr(args[0], expr, compact, depth)
+        return expr if inner == expr else f"(None if {expr} is None else {inner})"
+    if kind == "dataclass":
+        _codec(args[0])
+        return f"{'U' if compact else 'D'}_{_symbol(args[0])}({expr})"
+    if kind == "sequence":
+        item = f"i{depth}"
+        inner = _decode_expr(args[0], item, compact, depth + 1)
+        container = _container(args[1])
+        return f"{container}({expr})" if inner == item else f"{container}([{inner} for {item} in {expr}])"
+    if kind == "mapping":
+        key, item = f"k{depth}", f"i{depth}"
+        inner = _decode_expr(args[1], item, compact, depth + 1)
+        container = _container(args[2])
+        if inner == item:
+            return f"{container}({expr})"
+        return f"{container}({{{key}: {inner} for {key}, {item} in {expr}.items()}})"
+    return expr
+
+
+def _container(cls: type) -> str:
+    name = f"T_{_symbol(cls)}"
+    _NAMESPACE[name] = cls
+    return name
+
+
+def _shape(type_hint: Any) -> Tuple[str, tuple]:
+    """Classify a type hint: optional / dataclass / sequence / mapping / scalar."""
+    origin = get_origin(type_hint)
+    args = get_args(type_hint)
+    if origin is Union:
+        members = [arg for arg in args if arg is not type(None)]
+        return ("optional", (members[0],)) if len(members) == 1 else ("scalar", ())
+    if isinstance(type_hint, type) and is_dataclass(type_hint):
+        return "dataclass", (type_hint,)
+    if isinstance(origin, type) and issubclass(origin, (list, tuple)):
+        # List[X] → list, PVector[X] → PVector
+        return "sequence", (args[0] if args else Any, origin)
+    if isinstance(origin, type) and issubclass(origin, Mapping):
+        container = origin if origin in (dict, PMap) else dict
+        return "mapping", (args[0] if args else str, args[1] if len(args) > 1 else Any, container)
+    if type_hint in (list, tuple, PVector):
+        return "sequence", (Any, type_hint)
+    if type_hint in (dict, PMap):
+        return "mapping", (str, Any, type_hint)
+    return "scalar", ()
+
+
+def _describe(type_hint: Any, seen: frozenset) -> str:
+    kind, args = _shape(type_hint)
+    if kind == "dataclass":
+        cls = args[0]
+        if cls in seen:
+            return cls.__qualname__
+        inner = ",".join(f"{name}:{_describe(hint, seen | {cls})}" for name, hint in _hints(cls).items())
+        return f"{cls.__qualname__}({inner})"
+    if kind == "optional":
+        return f"?{_describe(args[0], seen)}"
+    if kind == "sequence":
+        return f"[{_describe(args[0], seen)}]"
+    if kind == "mapping":
+        return f"{{{_describe(args[1], seen)}}}"
+    return getattr(type_hint, "__name__", str(type_hint))
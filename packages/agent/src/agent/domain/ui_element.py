@@ -44,7 +44,7 @@ from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Bounds:
     """Normalized bounding box [0.0, 1.0]."""
     x: float = 0.0
@@ -61,7 +61,7 @@ class Bounds:
         return self.width * self.height
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class UIElement:
     """
     A single UI element extracted from a screen.
@@ -6,7 +6,8 @@ Each node is a discrete step with a single responsibility.
 
 PUBLIC API:
 -----------
-- build_graph(): Construct the orchestrator graph
+- build_graph(): Construct the orchestrator graph (an AgentGraph)
+- AgentGraph: Async runtime (per-node timeouts, background nodes, telemetry)
 - BaseNode: Abstract base for all nodes
 - 17 concrete node implementations
 
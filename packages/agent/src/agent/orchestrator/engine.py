@@ -0,0 +1,310 @@
+"""
+AgentGraph: Async Graph Runtime for Orchestrator Nodes
+
+PURPOSE:
+--------
+Execute the node graph built by graph.build_graph(). Nodes run as
+coroutines, each under its own timeout, and routing follows per-node route
+functions. Independent work is overlapped so an iteration costs roughly its
+critical path rather than the sum of node times:
+- Inside nodes: PerceiveNode gathers asset storage, OCR and page source
+  parsing concurrently
+- Across nodes: background nodes (Persist) start as tasks while the loop
+  moves on, and are joined before their next run or at the end of the run
+
+DEPENDENCIES (ALLOWED):
+-----------------------
+- asyncio, dataclasses, time, typing (stdlib)
+- domain types (AgentState)
+- ports (TelemetryPort, via nodes)
+- policy.constants (timeouts, transition cap)
+
+DEPENDENCIES (FORBIDDEN):
+-------------------------
+- NO adapters or SDK imports
+- NO graph frameworks (LangGraph etc.); the runtime is small and explicit
+
+EXECUTION:
+----------
+1. Run the current node: await node.run(state) under its timeout
+2. On timeout/exception: count the error (counters.errors and
+   counters.consecutive_errors) and follow the node's error route, or stop
+   with STOP_TIMEOUT / STOP_ERROR if it has none. A node added with
+   resets_error_streak=True sets consecutive_errors back to 0 when it
+   succeeds, so error routes can tell a failure streak from errors spread
+   over a long run
+3. Route: next = route(state) (a node name, or None for terminal)
+4. Background nodes: the task is started with the current state and the
+   loop routes on that same state; the result is merged back on join
+5. Before a terminal node and before returning, every background task is
+   joined; on cancellation they are cancelled
+6. on_transition(node, state), if given, sees the state after every
+   foreground node and every background join (run event log)
+
+INVARIANTS:
+-----------
+- At most one in-flight task per background node; runs of the same node
+  never overlap or reorder
+- Background failures are logged and counted (counters.errors) on join;
+  they do not redirect the loop or extend the failure streak
+- The loop stops after MAX_GRAPH_TRANSITIONS transitions (routing cycles)
+
+TELEMETRY:
+----------
+- Trace: span per node execution (context: latency_ms, changed_fields)
+- Metric: node_latency_ms (tags: node, status)
+- Log: node timeouts and errors
+
+USAGE:
+------
+graph = AgentGraph(telemetry)
+graph.add_node("Perceive", perceive_node, route="EnumerateActions", on_error="RecoverFromError")
+graph.add_node("Persist", persist_node, route="DetectProgress", background=True,
+               merge=lambda current, done: current.clone_with(persist_result=done.persist_result))
+final_state = await graph.run(initial_state, entry="Perceive")
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Optional, Union
+
+from ..domain.state import diff
+from ..ports.telemetry_port import LogLevel
+from .policy.constants import (
+    DEFAULT_NODE_TIMEOUT_MS,
+    MAX_GRAPH_TRANSITIONS,
+    NODE_TIMEOUTS_MS,
+)
+
+
+Route = Union[str, None, Callable[["AgentState"], Optional[str]]]
+Merge = Callable[["AgentState", "AgentState"], "AgentState"]
+Transition = Callable[[str, "AgentState"], object]
+
+_TIMEOUT_FROM_POLICY = -1  # sentinel: look the timeout up in NODE_TIMEOUTS_MS
+
+
+@dataclass(frozen=True)
+class NodeSpec:
+    """A node registered in the graph, with its routing and scheduling."""
+    name: str
+    node: "BaseNode"
+    route: Route
+    timeout_ms: Optional[int]
+    on_error: Optional[str] = None
+    background: bool = False
+    merge: Optional[Merge] = None
+    resets_error_streak: bool = False
+
+    def next_node(self, state: "AgentState") -> Optional[str]:
+        if callable(self.route):
+            return self.route(state)
+        return self.route
+
+
+class AgentGraph:
+    """
+    Async runtime over registered nodes.
+
+    A graph holds no per-run state, so one instance can drive several runs
+    concurrently.
+    """
+
+    def __init__(
+        self,
+        telemetry: "TelemetryPort",
+        entry: Optional[str] = None,
+        max_transitions: int = MAX_GRAPH_TRANSITIONS,
+    ):
+        self.telemetry = telemetry
+        self.entry = entry
+        self.max_transitions = max_transitions
+        self.nodes: Dict[str, NodeSpec] = {}
+
+    def add_node(
+        self,
+        name: str,
+        node: "BaseNode",
+        route: Route = None,
+        timeout_ms: Optional[int] = _TIMEOUT_FROM_POLICY,
+        on_error: Optional[str] = None,
+        background: bool = False,
+        merge: Optional[Merge] = None,
+        resets_error_streak: bool = False,
+    ) -> None:
+        """
+        Register a node.
+
+        Args:
+            name: Node name (also the key in NODE_TIMEOUTS_MS).
+            node: BaseNode instance.
+            route: Next node name, a function of the output state, or None
+                for a terminal node.
+            timeout_ms: Per-node timeout; defaults to NODE_TIMEOUTS_MS (or
+                DEFAULT_NODE_TIMEOUT_MS); None disables it.
+            on_error: Node to route to on timeout/exception.
+            background: Run as a task and route on the input state.
+            merge: For background nodes, fold the finished output into the
+                current state (default: keep the current state).
+            resets_error_streak: On success, reset counters.consecutive_errors.
+        """
+        if name in self.nodes:
+            raise ValueError(f"Node already registered: {name}")
+        if timeout_ms == _TIMEOUT_FROM_POLICY:
+            timeout_ms = NODE_TIMEOUTS_MS.get(name, DEFAULT_NODE_TIMEOUT_MS)
+        self.nodes[name] = NodeSpec(name, node, route, timeout_ms, on_error, background, merge, resets_error_streak)
+        if self.entry is None:
+            self.entry = name
+
+    def validate(self) -> None:
+        """Check that every static route and error route names a registered node."""
+        for spec in self.nodes.values():
+            targets = [spec.on_error]
+            if isinstance(spec.route, str):
+                targets.append(spec.route)
+            for target in targets:
+                if target is not None and target not in self.nodes:
+                    raise ValueError(f"{spec.name} routes to unknown node {target}")
+
+    async def run(
+        self,
+        state: "AgentState",
+        entry: Optional[str] = None,
+        on_transition: Optional[Transition] = None,
+    ) -> "AgentState":
+        """
+        Run from entry until a terminal node, then join background work.
+
+        Args:
+            on_transition: Called with (node name, resulting state) after each
+                foreground node and background join (synchronously; keep it
+                cheap, e.g. RunEventLog.append).
+
+        Returns:
+            Final state (stop_reason set by nodes, or STOP_TIMEOUT/STOP_ERROR
+            when a failing node has no error route).
+        """
+        current = entry or self.entry
+        pending: Dict[str, asyncio.Task] = {}
+        transitions = 0
+        record = on_transition or _ignore
+        try:
+            while current is not None:
+                if transitions >= self.max_transitions:
+                    self.telemetry.log(
+                        level=LogLevel.ERROR,
+                        message=f"[AgentGraph] transition cap reached at {current}",
+                        context={"run_id": state.run_id, "transitions": transitions},
+                    )
+                    state = state.clone_with(stop_reason=state.STOP_BUDGET_EXHAUSTED)
+                    break
+                transitions += 1
+                spec = self.nodes[current]
+                if spec.route is None:
+                    # Terminal nodes (Stop) see every background result
+                    for name in list(pending):
+                        state = await self._join(self.nodes[name], pending.pop(name), state)
+                        record(name, state)
+
+                if spec.background:
+                    if spec.name in pending:
+                        state = await self._join(spec, pending.pop(spec.name), state)
+                        record(spec.name, state)
+                    pending[spec.name] = asyncio.create_task(self._execute(spec, state))
+                    current = spec.next_node(state)
+                    continue
+
+                state, failed = await self._execute(spec, state)
+                if failed is not None:
+                    current = spec.on_error
+                    if current is None:
+                        state = state.clone_with(stop_reason=failed)
+                    record(spec.name, state)
+                    continue
+                record(spec.name, state)
+                current = spec.next_node(state)
+
+            for name in list(pending):
+                state = await self._join(self.nodes[name], pending.pop(name), state)
+                record(name, state)
+        finally:
+            for task in pending.values():
+                task.cancel()
+        return state
+
+    async def run_node(self, name: str, state: "AgentState") -> "AgentState":
+        """Run a single node with its timeout and telemetry (no routing)."""
+        state, _ = await self._execute(self.nodes[name], state)
+        return state
+
+    async def _execute(self, spec: NodeSpec, state: "AgentState"):
+        """
+        Run one node; returns (state, failure) where failure is None or the
+        stop reason to use if there is no error route.
+        """
+        span_id = self.telemetry.trace_start(
+            span_name=spec.name,
+            context={"run_id": state.run_id, "app_id": state.app_id},
+        )
+        started = time.perf_counter()
+        failure = None
+        try:
+            if spec.timeout_ms is None:
+                result = await spec.node.run(state)
+            else:
+                result = await asyncio.wait_for(spec.node.run(state), spec.timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            failure = state.STOP_TIMEOUT
+            self.telemetry.log(
+                level=LogLevel.WARN,
+                message=f"[{spec.name}] timed out after {spec.timeout_ms} ms",
+                context={"run_id": state.run_id, "node_type": spec.name},
+            )
+        except Exception as e:
+            failure = state.STOP_ERROR
+            self.telemetry.log(
+                level=LogLevel.ERROR,
+                message=f"[{spec.name}] failed: {e}",
+                context={
+                    "run_id": state.run_id,
+                    "node_type": spec.name,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                },
+            )
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        status = "ok" if failure is None else failure
+        self.telemetry.metric("node_latency_ms", elapsed_ms, tags={"node": spec.name, "status": status})
+        context = {"latency_ms": elapsed_ms}
+        if failure is None:
+            # Unchanged fields are shared with the input state: O(fields) identity checks
+            context["changed_fields"] = list(diff(state, result))
+        self.telemetry.trace_end(span_id=span_id, status=status, context=context)
+
+        if failure is not None:
+            counters = replace(
+                state.counters,
+                errors=state.counters.errors + 1,
+                consecutive_errors=state.counters.consecutive_errors + 1,
+            )
+            return state.clone_with(counters=counters), failure
+        if spec.resets_error_streak and result.counters.consecutive_errors:
+            result = result.clone_with(counters=replace(result.counters, consecutive_errors=0))
+        return result, None
+
+    async def _join(self, spec: NodeSpec, task: asyncio.Task, state: "AgentState") -> "AgentState":
+        """Wait for a background node and fold its result into state."""
+        result, failure = await task
+        if failure is not None:
+            return state.clone_with(
+                counters=replace(state.counters, errors=state.counters.errors + 1)
+            )
+        if spec.merge is None:
+            return state
+        return spec.merge(state, result)
+
+
+def _ignore(name: str, state: "AgentState") -> None:
+    return None
@@ -37,7 +37,8 @@ The agent loop consists of 17 nodes organized as follows:
 
 4. ERROR RECOVERY:
    RecoverFromError (transient errors)
-   RestartApp (app crash)
+   RestartApp (app crash, or MAX_RETRIES_PER_ERROR consecutive failures;
+   a successful Act ends the streak)
 
 5. TERMINATION:
    Stop (final summary)
@@ -52,39 +53,160 @@ LLM NODES (always-on, every iteration):
 
 STATE FLOW:
 -----------
-Every node follows: state_in → node.run(state_in) → state_out
+Every node follows: state_in → await node.run(state_in) → state_out
 State is immutable; nodes return new instances.
 
+RUNTIME:
+--------
+build_graph() returns an AgentGraph (engine.py): nodes run as coroutines
+under NODE_TIMEOUTS_MS, Persist runs in the background so the upserts
+overlap the next iteration, and MAX_GRAPH_TRANSITIONS bounds cycles.
+
 TODO:
 -----
-- [ ] Implement graph construction using LangGraph or similar
-- [ ] Add cycle detection
-- [ ] Add node timeout enforcement
-- [ ] Add telemetry wrapper for all nodes
+- [x] Implement graph construction (AgentGraph, no external framework)
+- [x] Add cycle detection (transition cap)
+- [x] Add node timeout enforcement
+- [x] Add telemetry wrapper for all nodes
+- [ ] Route ShouldContinue to SwitchPolicy/RestartApp once its output is in state
 """
 
+from typing import Optional
+
+from ..services.progress_detector import ProgressDetector
+from ..services.prompt_diet import PromptDiet
+from ..services.salience_ranker import SalienceRanker
+from ..services.signature_service import SignatureService
+from .engine import AgentGraph
+from .nodes.act import ActNode
+from .nodes.choose_action import ChooseActionNode
+from .nodes.detect_progress import DetectProgressNode
+from .nodes.ensure_device import EnsureDeviceNode
+from .nodes.enumerate_actions import EnumerateActionsNode
+from .nodes.launch_or_attach import LaunchOrAttachNode
+from .nodes.perceive import PerceiveNode
+from .nodes.persist import PersistNode
+from .nodes.provision_app import ProvisionAppNode
+from .nodes.recover_from_error import RecoverFromErrorNode
+from .nodes.restart_app import RestartAppNode
+from .nodes.should_continue import ShouldContinueNode
+from .nodes.stop import StopNode
+from .nodes.switch_policy import SwitchPolicyNode
+from .nodes.verify import VerifyNode
+from .nodes.wait_idle import WaitIdleNode
+from .policy.constants import MAX_RETRIES_PER_ERROR
+
+
+def _unless_stopped(next_node: str):
+    """Route to next_node, or to Stop once a stop_reason is set."""
+    return lambda state: "Stop" if state.stop_reason else next_node
+
+
+def _merge_persist_result(current: "AgentState", done: "AgentState") -> "AgentState":
+    return current.clone_with(persist_result=done.persist_result)
+
+
+def _after_error(state: "AgentState") -> str:
+    if state.should_stop():
+        return "Stop"
+    # Restart on a failure streak, not on errors spread over the run
+    if state.counters.consecutive_errors >= MAX_RETRIES_PER_ERROR:
+        return "RestartApp"
+    return "WaitIdle"
+
+
+def _after_restart(state: "AgentState") -> str:
+    if state.stop_reason or state.counters.restarts_used > state.budgets.restart_limit:
+        return "Stop"
+    return "WaitIdle"
 
-def build_graph():
+
+def build_graph(
+    driver: "DriverPort",
+    ocr: "OCRPort",
+    filestore: "FileStorePort",
+    llm: "LLMPort",
+    cache: "CachePort",
+    budget: "BudgetPort",
+    repo: "RepoPort",
+    telemetry: "TelemetryPort",
+    signature_service: Optional[SignatureService] = None,
+    salience_ranker: Optional[SalienceRanker] = None,
+    prompt_diet: Optional[PromptDiet] = None,
+    progress_detector: Optional[ProgressDetector] = None,
+) -> AgentGraph:
     """
     Build the orchestrator graph.
     
-    Returns:
-        Graph object with nodes and edges.
+    Args:
+        Ports are injected by the BFF; services default to fresh instances.
     
-    TODO:
-    - [ ] Instantiate all nodes with injected ports
-    - [ ] Define edges based on routing_rules
-    - [ ] Add error handling wrappers
-    - [ ] Add telemetry spans
-    - [ ] Return compiled graph
+    Returns:
+        AgentGraph with every node, route and error route wired, entering
+        at EnsureDevice. Run with: await graph.run(AgentState(...)).
     """
-    # Placeholder for graph construction
-    # graph = Graph()
-    # graph.add_node("EnsureDevice", ensure_device_node)
-    # graph.add_node("ProvisionApp", provision_app_node)
-    # ... (add all 17 nodes)
-    # graph.add_edge("EnsureDevice", "ProvisionApp", condition=lambda s: not s.stop_reason)
-    # ... (add all edges)
-    # return graph.compile()
-    pass
-
+    signature_service = signature_service or SignatureService()
+    salience_ranker = salience_ranker or SalienceRanker()
+    prompt_diet = prompt_diet or PromptDiet()
+    progress_detector = progress_detector or ProgressDetector()
+    llm_deps = dict(llm=llm, cache=cache, budget=budget, prompt_diet=prompt_diet, telemetry=telemetry)
+    
+    graph = AgentGraph(telemetry, entry="EnsureDevice")
+    
+    # Setup phase
+    graph.add_node("EnsureDevice", EnsureDeviceNode(driver, telemetry), route=_unless_stopped("ProvisionApp"))
+    graph.add_node("ProvisionApp", ProvisionAppNode(driver, telemetry), route=_unless_stopped("LaunchOrAttach"))
+    graph.add_node("LaunchOrAttach", LaunchOrAttachNode(driver, telemetry),
+                   route=_unless_stopped("WaitIdle"), on_error="RestartApp")
+    graph.add_node("WaitIdle", WaitIdleNode(driver, telemetry), route="Perceive")
+    
+    # Main loop
+    graph.add_node(
+        "Perceive",
+        PerceiveNode(
+            driver=driver,
+            ocr=ocr,
+            filestore=filestore,
+            signature_service=signature_service,
+            salience_ranker=salience_ranker,
+            telemetry=telemetry,
+        ),
+        route="EnumerateActions",
+        on_error="RecoverFromError",
+    )
+    graph.add_node(
+        "EnumerateActions",
+        EnumerateActionsNode(telemetry),
+        route=lambda state: "ChooseAction" if state.enumerated_actions else "ShouldContinue",
+    )
+    graph.add_node("ChooseAction", ChooseActionNode(filestore=filestore, **llm_deps),
+                   route="Act", on_error="RecoverFromError")
+    graph.add_node("Act", ActNode(driver, filestore, telemetry), route="Verify", on_error="RecoverFromError",
+                   resets_error_streak=True)
+    graph.add_node("Verify", VerifyNode(filestore=filestore, **llm_deps), route="Persist", on_error="Persist")
+    graph.add_node("Persist", PersistNode(repo, telemetry), route="DetectProgress",
+                   background=True, merge=_merge_persist_result)
+    graph.add_node(
+        "DetectProgress",
+        DetectProgressNode(filestore=filestore, progress_detector=progress_detector, **llm_deps),
+        route="ShouldContinue",
+        on_error="ShouldContinue",
+    )
+    graph.add_node(
+        "ShouldContinue",
+        ShouldContinueNode(**llm_deps),
+        route=lambda state: "Stop" if state.should_stop() else "Perceive",
+        on_error="Stop",
+    )
+    
+    # Policy routing and recovery
+    graph.add_node("SwitchPolicy", SwitchPolicyNode(filestore=filestore, **llm_deps),
+                   route="Perceive", on_error="Perceive")
+    graph.add_node("RestartApp", RestartAppNode(driver, telemetry), route=_after_restart, on_error="Stop")
+    graph.add_node("RecoverFromError", RecoverFromErrorNode(telemetry), route=_after_error, on_error="Stop")
+    
+    # Termination
+    graph.add_node("Stop", StopNode(repo, cache, telemetry, filestore=filestore), route=None)
+    
+    graph.validate()
+    return graph
@@ -66,7 +66,7 @@ class ActNode(BaseNode):
     USAGE:
     ------
     node = ActNode(driver=driver_adapter, filestore=filestore_adapter, telemetry=telemetry_adapter)
-    new_state = node.run(state)
+    new_state = await node.run(state)
     """
     
     def __init__(
@@ -79,7 +79,7 @@ class ActNode(BaseNode):
         self.driver = driver
         self.filestore = filestore
     
-    def run(self, state: "AgentState") -> "AgentState":
+    async def run(self, state: "AgentState") -> "AgentState":
         """
         Execute chosen action.
         
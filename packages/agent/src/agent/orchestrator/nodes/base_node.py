@@ -20,13 +20,17 @@ DEPENDENCIES (FORBIDDEN):
 CONTRACT:
 ---------
 Every node must implement:
-    def run(self, state: AgentState) -> AgentState
+    async def run(self, state: AgentState) -> AgentState
+
+Nodes are coroutines: all ports are async, and AgentGraph (engine.py) awaits
+each node under its per-node timeout.
 
 INVARIANTS:
 -----------
 - Nodes are stateless (no instance state between calls)
 - Nodes return NEW AgentState (immutable)
-- Nodes never raise exceptions (use stop_reason instead)
+- Nodes never raise exceptions (use stop_reason instead); AgentGraph still
+  catches timeouts and unexpected exceptions and follows the error route
 - Nodes log via TelemetryPort
 
 TODO:
@@ -52,7 +56,7 @@ class BaseNode(ABC):
             super().__init__(telemetry)
             self.driver = driver
         
-        def run(self, state: AgentState) -> AgentState:
+        async def run(self, state: AgentState) -> AgentState:
             # Implementation
             return new_state
     """
@@ -68,7 +72,7 @@ class BaseNode(ABC):
         self.node_name = self.__class__.__name__
     
     @abstractmethod
-    def run(self, state: "AgentState") -> "AgentState":
+    async def run(self, state: "AgentState") -> "AgentState":
         """
         Execute node logic and return updated state.
         
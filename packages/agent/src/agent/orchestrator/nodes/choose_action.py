@@ -46,9 +46,12 @@ LLM: **YES** (node_type="choose_action")
 
 CACHING:
 --------
-- Cache key: (choose_action, model, signature, delta_hash, topK_hash, plan_cursor)
+- Cache key: CacheKeyBuilder.build("choose_action", diet) →
+  choose_action:model:p<version>:signature:delta_hash:topK_hash:policy
 - TTL: 7 days
 - Cache hit → skip LLM call, use cached ChosenAction
+- Warmed hit: state.cache[signature] (preloaded by StartSessionUsecase)
+  with a non-empty advice plan → adopt that advice, no LLM or CachePort call
 
 VALIDATION/GUARDRAILS:
 ----------------------
@@ -94,7 +97,7 @@ class ChooseActionNode(BaseNode):
         prompt_diet=prompt_diet_service,
         telemetry=telemetry_adapter,
     )
-    new_state = node.run(state)
+    new_state = await node.run(state)
     """
     
     def __init__(
@@ -113,7 +116,7 @@ class ChooseActionNode(BaseNode):
         self.filestore = filestore
         self.prompt_diet = prompt_diet
     
-    def run(self, state: "AgentState") -> "AgentState":
+    async def run(self, state: "AgentState") -> "AgentState":
         """
         Select action via LLM.
         
@@ -125,5 +128,11 @@ class ChooseActionNode(BaseNode):
         - [ ] Update state with chosen action and advice
         - [ ] Increment counters.llm_calls
         """
+        entry = state.cache.get(state.signature.hash)
+        if entry is not None and entry.advice.plan:
+            self.telemetry.metric("cache_hit", 1, {"node": "choose_action", "tier": "warm"})
+            if state.advice is entry.advice:
+                return state
+            return state.clone_with(advice=entry.advice, plan_cursor=0)
         return state
 
@@ -90,7 +90,7 @@ class DetectProgressNode(BaseNode):
         prompt_diet=prompt_diet_service,
         telemetry=telemetry_adapter,
     )
-    new_state = node.run(state)
+    new_state = await node.run(state)
     """
     
     def __init__(
@@ -111,7 +111,7 @@ class DetectProgressNode(BaseNode):
         self.progress_detector = progress_detector
         self.prompt_diet = prompt_diet
     
-    def run(self, state: "AgentState") -> "AgentState":
+    async def run(self, state: "AgentState") -> "AgentState":
         """
         Detect progress via LLM + heuristics.
         
@@ -61,7 +61,7 @@ class EnsureDeviceNode(BaseNode):
     USAGE:
     ------
     node = EnsureDeviceNode(driver=driver_adapter, telemetry=telemetry_adapter)
-    new_state = node.run(state)
+    new_state = await node.run(state)
     
     if new_state.stop_reason == "device_offline":
         # Handle device failure
@@ -73,7 +73,7 @@ class EnsureDeviceNode(BaseNode):
         super().__init__(telemetry)
         self.driver = driver
     
-    def run(self, state: "AgentState") -> "AgentState":
+    async def run(self, state: "AgentState") -> "AgentState":
         """
         Check device connectivity.
         
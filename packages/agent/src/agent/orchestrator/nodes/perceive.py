@@ -18,12 +18,15 @@ PORTS USED:
 
 SERVICES USED:
 --------------
+- PageSourceParser: parse_page_source() → ElementTable (lazy UIElement views)
 - SignatureService: compute_signature(), compute_delta()
 - SalienceRanker: rank_elements() (top-K)
+- screen_diff: screen_delta() (element-level diff against the previous table)
 
 OUTPUTS/EFFECTS:
 ----------------
 - Updates signature, previous_signature
+- Updates screen_delta (None when the previous screen's table is not known)
 - Updates bundle (screenshot_ref, page_source_ref, ocr_ref)
 - Stores assets via FileStorePort
 
@@ -31,17 +34,41 @@ INVARIANTS:
 -----------
 - signature is deterministic (same screen → same hash)
 - bundle contains REFS only, no blobs
-- Assets are stored before signature is set
+- Asset refs are assigned before signature is set (with a write-behind
+  FileStorePort the bytes are written in the background and made durable
+  by StopNode/FinalizeRunUsecase flush())
 
 TRANSITIONS:
 ------------
 - Success → EnumerateActionsNode
 - Error → RecoverFromErrorNode
 
+DELTA:
+------
+AgentState only carries the compact ScreenDelta; the parsed table it is
+computed from is a runtime handle, so the node memoizes each run's last
+table by run_id (with the signature it produced, at most LAST_TABLE_RUNS
+runs). This is a cache, not state between calls: the diff is computed only
+when state.signature is that run's key, i.e. the previous step of the same
+run perceived the screen this one is compared against; otherwise (another
+run, a resumed run, an evicted entry) screen_delta is None. Runs sharing
+the node never see each other's tables.
+
 LLM: No
 
 CACHING: No (signature computation is fast)
 
+CONCURRENCY:
+------------
+1. Screenshot and page source are requested together
+2. Then, concurrently: screenshot + page source stored via FileStorePort,
+   OCR extracted (and stored), page source parsed to an ElementTable (in a
+   worker thread)
+3. Signature (incl. screenshot pHash) and the element diff against the
+   previous table computed in worker threads; salience ranking on the table
+Latency ≈ max(store, OCR, parse) instead of their sum; with a write-behind
+FileStorePort, store ≈ hashing time only.
+
 VALIDATION/GUARDRAILS:
 - Screenshot must be valid PNG
 - Page source must be valid XML/JSON
@@ -55,17 +82,30 @@ TELEMETRY:
 
 TODO:
 -----
-- [ ] Implement screenshot capture and storage
-- [ ] Implement page source capture and storage
-- [ ] Implement OCR extraction and storage
-- [ ] Compute signature via SignatureService
-- [ ] Compute delta from previous_signature
-- [ ] Rank top-K elements via SalienceRanker
+- [x] Implement screenshot capture and storage
+- [x] Implement page source capture and storage
+- [x] Parse page source via PageSourceParser (keep the ElementTable, not UIElement trees)
+- [x] Implement OCR extraction and storage
+- [x] Compute signature via SignatureService
+- [x] Compute delta from previous_signature (element-level, screen_diff)
+- [x] Rank top-K elements via SalienceRanker
 """
 
+import asyncio
+import json
+from collections import OrderedDict
+from typing import Tuple
+
+from ...domain.state import Bundle
+from ...domain.element_table import ElementTable
+from ...services.page_source_parser import parse_page_source
+from ...services.screen_diff import screen_delta
 from .base_node import BaseNode
 
 
+LAST_TABLE_RUNS = 32  # runs whose last table is kept for the next diff
+
+
 class PerceiveNode(BaseNode):
     """
     Capture screen state and compute signature.
@@ -80,7 +120,7 @@ class PerceiveNode(BaseNode):
         salience_ranker=salience_ranker,
         telemetry=telemetry_adapter,
     )
-    new_state = node.run(state)
+    new_state = await node.run(state)
     """
     
     def __init__(
@@ -98,17 +138,83 @@ class PerceiveNode(BaseNode):
         self.filestore = filestore
         self.signature_service = signature_service
         self.salience_ranker = salience_ranker
+        self._last_tables: "OrderedDict[str, Tuple[str, ElementTable]]" = OrderedDict()  # run_id → (hash, table)
     
-    def run(self, state: "AgentState") -> "AgentState":
+    async def run(self, state: "AgentState") -> "AgentState":
         """
         Capture screen and compute signature.
         
-        TODO:
-        - [ ] Capture screenshot, page source, OCR
-        - [ ] Store assets via FileStorePort
-        - [ ] Compute signature via SignatureService
-        - [ ] Rank top-K elements via SalienceRanker
-        - [ ] Update state with signature, bundle, ranked_elements
+        Raises:
+            Port errors propagate; AgentGraph routes them to RecoverFromError.
         """
-        return state
-
+        screenshot, page_source = await asyncio.gather(
+            self.driver.get_screenshot(),
+            self.driver.get_page_source(),
+        )
+        
+        step_id = f"step-{state.counters.steps_total:05d}"
+        screenshot_ref, page_source_ref, (ocr_text, ocr_ref), table = await asyncio.gather(
+            self.filestore.put(
+                self.filestore.generate_key(state.run_id, "screenshots", step_id, "png"),
+                screenshot,
+                content_type="image/png",
+            ),
+            self.filestore.put(
+                self.filestore.generate_key(state.run_id, "page_sources", step_id, "xml"),
+                page_source.encode("utf-8"),
+                content_type="text/xml",
+            ),
+            self._extract_and_store_ocr(state, step_id, screenshot),
+            asyncio.to_thread(parse_page_source, page_source),
+        )
+        
+        previous_table = None
+        last = self._last_tables.get(state.run_id)
+        if last is not None and last[0] == state.signature.hash:
+            previous_table = last[1]
+        signature, delta = await asyncio.gather(
+            asyncio.to_thread(self.signature_service.compute_signature, table, ocr_text, screenshot),
+            asyncio.to_thread(screen_delta, previous_table, table) if previous_table is not None else _no_delta(),
+        )
+        self._remember_table(state.run_id, signature.hash, table)
+        ranked = [view.materialize(with_children=False) for view in self.salience_ranker.rank_elements(table)]
+        
+        return state.clone_with(
+            previous_signature=state.signature,
+            signature=signature,
+            bundle=Bundle(
+                screenshot_ref=screenshot_ref,
+                page_source_ref=page_source_ref,
+                ocr_ref=ocr_ref,
+            ),
+            ranked_elements=ranked,
+            screen_delta=delta,
+        )
+    
+    def _remember_table(self, run_id: str, signature_hash: str, table: ElementTable) -> None:
+        self._last_tables[run_id] = (signature_hash, table)
+        self._last_tables.move_to_end(run_id)
+        if len(self._last_tables) > LAST_TABLE_RUNS:
+            self._last_tables.popitem(last=False)
+    
+    async def _extract_and_store_ocr(self, state: "AgentState", step_id: str, screenshot: bytes):
+        """Run OCR and store its regions; returns (full_text, ocr_ref)."""
+        result = await self.ocr.extract_text(screenshot)
+        payload = json.dumps({
+            "full_text": result.full_text,
+            "confidence": result.confidence,
+            "regions": [
+                {"text": region.text, "bounds": list(region.bounds), "confidence": region.confidence}
+                for region in result.regions
+            ],
+        }).encode("utf-8")
+        ocr_ref = await self.filestore.put(
+            self.filestore.generate_key(state.run_id, "ocr", step_id, "json"),
+            payload,
+            content_type="application/json",
+        )
+        return result.full_text, ocr_ref
+
+
+async def _no_delta() -> None:
+    return None
@@ -34,6 +34,13 @@ TRANSITIONS:
 - Success → DetectProgressNode
 - Error → RecoverFromErrorNode (with retry)
 
+SCHEDULING:
+-----------
+Runs as a background node: AgentGraph continues to DetectProgress
+immediately and joins this node (merging persist_result) before the next
+Persist or at the end of the run, so the upserts overlap the next
+iteration's LLM calls.
+
 LLM: No
 
 CACHING: No
@@ -67,7 +74,7 @@ class PersistNode(BaseNode):
     USAGE:
     ------
     node = PersistNode(repo=repo_adapter, telemetry=telemetry_adapter)
-    new_state = node.run(state)
+    new_state = await node.run(state)
     """
     
     def __init__(
@@ -78,7 +85,7 @@ class PersistNode(BaseNode):
         super().__init__(telemetry)
         self.repo = repo
     
-    def run(self, state: "AgentState") -> "AgentState":
+    async def run(self, state: "AgentState") -> "AgentState":
         """
         Persist nodes and edges.
         
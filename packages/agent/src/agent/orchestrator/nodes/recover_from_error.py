@@ -62,13 +62,13 @@ class RecoverFromErrorNode(BaseNode):
     USAGE:
     ------
     node = RecoverFromErrorNode(telemetry=telemetry_adapter)
-    new_state = node.run(state)
+    new_state = await node.run(state)
     """
     
     def __init__(self, telemetry: "TelemetryPort"):
         super().__init__(telemetry)
     
-    def run(self, state: "AgentState") -> "AgentState":
+    async def run(self, state: "AgentState") -> "AgentState":
         """
         Recover from error.
         
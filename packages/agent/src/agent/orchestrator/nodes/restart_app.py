@@ -17,7 +17,7 @@ PORTS USED:
 
 OUTPUTS/EFFECTS:
 ----------------
-- Increments counters.restarts_used
+- Increments counters.restarts_used, resets counters.consecutive_errors
 - Records restart reason
 - Resets some state (e.g., clear advice)
 
@@ -48,13 +48,16 @@ TELEMETRY:
 
 TODO:
 -----
-- [ ] Check restart budget
-- [ ] Call driver.restart_app()
-- [ ] Increment counters.restarts_used
-- [ ] Clear transient state
+- [x] Check restart budget
+- [x] Call driver.restart_app()
+- [x] Increment counters.restarts_used
+- [x] Clear transient state
 - [ ] Log restart reason
 """
 
+from dataclasses import replace
+
+from ...domain.state import Advice
 from .base_node import BaseNode
 
 
@@ -65,7 +68,7 @@ class RestartAppNode(BaseNode):
     USAGE:
     ------
     node = RestartAppNode(driver=driver_adapter, telemetry=telemetry_adapter)
-    new_state = node.run(state)
+    new_state = await node.run(state)
     """
     
     def __init__(
@@ -76,16 +79,19 @@ class RestartAppNode(BaseNode):
         super().__init__(telemetry)
         self.driver = driver
     
-    def run(self, state: "AgentState") -> "AgentState":
+    async def run(self, state: "AgentState") -> "AgentState":
         """
-        Restart app.
+        Restart app, or stop once restart_limit restarts are used.
         
-        TODO:
-        - [ ] Check restart budget
-        - [ ] Restart app via DriverPort
-        - [ ] Increment counters.restarts_used
-        - [ ] Clear transient state
-        - [ ] Stop if restart limit exceeded
+        The restart is counted before the driver call, so a restart that
+        itself fails still spends budget and error loops end at the limit.
         """
-        return state
+        counters = state.counters
+        if counters.restarts_used >= state.budgets.restart_limit:
+            return state.clone_with(stop_reason=state.STOP_BUDGET_EXHAUSTED)
+        # A restarted app gets a fresh retry streak
+        counters = replace(counters, restarts_used=counters.restarts_used + 1, consecutive_errors=0)
+        state = state.clone_with(counters=counters)
+        await self.driver.restart_app(state.app_id)
+        return state.clone_with(advice=Advice(), enumerated_actions=[], plan_cursor=0)
 
@@ -83,7 +83,7 @@ class ShouldContinueNode(BaseNode):
         prompt_diet=prompt_diet_service,
         telemetry=telemetry_adapter,
     )
-    new_state = node.run(state)
+    new_state = await node.run(state)
     """
     
     def __init__(
@@ -100,7 +100,7 @@ class ShouldContinueNode(BaseNode):
         self.budget = budget
         self.prompt_diet = prompt_diet
     
-    def run(self, state: "AgentState") -> "AgentState":
+    async def run(self, state: "AgentState") -> "AgentState":
         """
         Routing decision via LLM.
         
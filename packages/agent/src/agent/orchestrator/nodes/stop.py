@@ -13,8 +13,9 @@ INPUTS (from AgentState):
 
 PORTS USED:
 -----------
-- RepoPort: get_exploration_stats()
+- RepoPort: get_exploration_stats(), flush() (batched upserts)
 - CachePort: get_stats() (cache hit rate)
+- FileStorePort: flush() (write-behind assets become durable)
 - TelemetryPort: log()
 
 OUTPUTS/EFFECTS:
@@ -28,6 +29,8 @@ INVARIANTS:
 - Always called at end of run (normal or error)
 - Never throws exceptions
 - Logs comprehensive final state
+- Batched upserts and pending asset writes are flushed (a failed flush is
+  logged, not raised; FinalizeRunUsecase flushes again and surfaces it)
 
 TRANSITIONS:
 ------------
@@ -47,6 +50,7 @@ TELEMETRY:
 
 TODO:
 -----
+- [x] Flush batched upserts and pending asset writes
 - [ ] Query repo for final stats
 - [ ] Query cache for hit rate
 - [ ] Compute coverage % (nodes/edges vs expected)
@@ -54,6 +58,10 @@ TODO:
 - [ ] Return final state to usecase
 """
 
+from typing import Optional
+
+from ...errors.error_types import AgentError
+from ...ports.telemetry_port import LogLevel
 from .base_node import BaseNode
 
 
@@ -63,8 +71,9 @@ class StopNode(BaseNode):
     
     USAGE:
     ------
-    node = StopNode(repo=repo_adapter, cache=cache_adapter, telemetry=telemetry_adapter)
-    final_state = node.run(state)
+    node = StopNode(repo=repo_adapter, cache=cache_adapter, telemetry=telemetry_adapter,
+                    filestore=filestore_adapter)
+    final_state = await node.run(state)
     """
     
     def __init__(
@@ -72,21 +81,31 @@ class StopNode(BaseNode):
         repo: "RepoPort",
         cache: "CachePort",
         telemetry: "TelemetryPort",
+        filestore: Optional["FileStorePort"] = None,
     ):
         super().__init__(telemetry)
         self.repo = repo
         self.cache = cache
+        self.filestore = filestore
     
-    def run(self, state: "AgentState") -> "AgentState":
+    async def run(self, state: "AgentState") -> "AgentState":
         """
         Finalize run.
         
         TODO:
+        - [x] Flush batched upserts and pending asset writes
         - [ ] Query repo for exploration stats
         - [ ] Query cache for hit rate
         - [ ] Compute summary metrics
         - [ ] Log final state
         - [ ] Return final state
         """
+        for name, port in (("repo", self.repo), ("asset", self.filestore)):
+            if port is None:
+                continue
+            try:
+                await port.flush()
+            except AgentError as error:
+                self._log(LogLevel.ERROR, f"{name} flush failed", run_id=state.run_id, error=str(error))
         return state
 
@@ -81,7 +81,7 @@ class SwitchPolicyNode(BaseNode):
         prompt_diet=prompt_diet_service,
         telemetry=telemetry_adapter,
     )
-    new_state = node.run(state)
+    new_state = await node.run(state)
     """
     
     def __init__(
@@ -100,7 +100,7 @@ class SwitchPolicyNode(BaseNode):
         self.filestore = filestore
         self.prompt_diet = prompt_diet
     
-    def run(self, state: "AgentState") -> "AgentState":
+    async def run(self, state: "AgentState") -> "AgentState":
         """
         Switch policy via LLM.
         
@@ -7,6 +7,7 @@ PURPOSE: Arbitrate whether expected change occurred after action.
 INPUTS (from AgentState):
 -------------------------
 - previous_signature (before action)
+- screen_delta (element changes, from PerceiveNode)
 - signature (after action, from PerceiveNode)
 - advice.expected_postcondition (from ChooseActionNode)
 - counters.errors
@@ -21,7 +22,8 @@ PORTS USED:
 
 SERVICES USED:
 --------------
-- PromptDiet: minimal verification context (delta only)
+- PromptDiet: minimal verification context (delta only: changed elements
+  from state.screen_delta, then a few anchors)
 
 OUTPUTS/EFFECTS:
 ----------------
@@ -87,7 +89,7 @@ class VerifyNode(BaseNode):
         prompt_diet=prompt_diet_service,
         telemetry=telemetry_adapter,
     )
-    new_state = node.run(state)
+    new_state = await node.run(state)
     """
     
     def __init__(
@@ -106,7 +108,7 @@ class VerifyNode(BaseNode):
         self.filestore = filestore
         self.prompt_diet = prompt_diet
     
-    def run(self, state: "AgentState") -> "AgentState":
+    async def run(self, state: "AgentState") -> "AgentState":
         """
         Verify action via LLM.
         
@@ -60,14 +60,14 @@ class WaitIdleNode(BaseNode):
     USAGE:
     ------
     node = WaitIdleNode(driver=driver_adapter, telemetry=telemetry_adapter)
-    new_state = node.run(state)
+    new_state = await node.run(state)
     """
     
     def __init__(self, driver: "DriverPort", telemetry: "TelemetryPort"):
         super().__init__(telemetry)
         self.driver = driver
     
-    def run(self, state: "AgentState") -> "AgentState":
+    async def run(self, state: "AgentState") -> "AgentState":
         """
         Wait for UI idle state.
         
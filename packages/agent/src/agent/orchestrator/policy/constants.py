@@ -33,6 +33,25 @@ WAIT_IDLE_TIMEOUT_MS = 5000
 ACTION_TIMEOUT_MS = 10000
 PERCEPTION_TIMEOUT_MS = 30000
 
+# Per-node timeouts (milliseconds), enforced by AgentGraph
+LLM_NODE_TIMEOUT_MS = 30000
+PERSIST_TIMEOUT_MS = 10000
+DEFAULT_NODE_TIMEOUT_MS = 15000
+NODE_TIMEOUTS_MS = {
+    "WaitIdle": WAIT_IDLE_TIMEOUT_MS,
+    "Perceive": PERCEPTION_TIMEOUT_MS,
+    "Act": ACTION_TIMEOUT_MS,
+    "ChooseAction": LLM_NODE_TIMEOUT_MS,
+    "Verify": LLM_NODE_TIMEOUT_MS,
+    "DetectProgress": LLM_NODE_TIMEOUT_MS,
+    "ShouldContinue": LLM_NODE_TIMEOUT_MS,
+    "SwitchPolicy": LLM_NODE_TIMEOUT_MS,
+    "Persist": PERSIST_TIMEOUT_MS,
+}
+
+# Graph runtime
+MAX_GRAPH_TRANSITIONS = 10000  # hard stop against routing cycles
+
 # Retry limits
 MAX_RETRIES_PER_ERROR = 3
 MAX_RESTARTS = 2
@@ -48,6 +67,7 @@ MAX_PLAN_STEPS = 20
 # LLM constants
 LLM_CACHE_TTL_SECONDS = 604800  # 7 days
 ROUTING_CACHE_TTL_SECONDS = 3600  # 1 hour
+WARM_CACHE_SIGNATURES = 200  # most-visited screens preloaded at session start
 
 # This file can be extended with more constants as needed.
 
@@ -23,13 +23,16 @@ METHODS:
 - get_prompt_cache(key: str) -> Optional[dict]
 - set_prompt_cache(key: str, value: dict, ttl: int)
 - get_advice(signature: str) -> Optional[Advice]
+- get_advice_many(signatures: List[str]) -> Dict[str, Advice] (batched;
+  default loops get_advice)
 - set_advice(signature: str, advice: Advice, ttl: int)
 - invalidate(pattern: str)
 
 CACHE KEYS:
 -----------
-Prompt Cache: {node_type}:{model}:{signature}:{delta_hash}:{topK_hash}:{policy}
+Prompt Cache: {node_type}:{model}:p{prompt_version}:{signature}:{delta_hash}:{topK_hash}:{policy}
 Advice Store: advice:{signature}
+(built by services/cache_key_builder.CacheKeyBuilder)
 
 TTL:
 ----
@@ -46,12 +49,12 @@ EVICTION:
 TODO:
 -----
 - [ ] Add cache hit/miss metrics
-- [ ] Add cache warming strategies
-- [ ] Add distributed cache support
+- [x] Add cache warming strategies (StartSessionUsecase warm-up)
+- [x] Add distributed cache support (adapters/cache/redis_adapter.py)
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 
 class CachePort(ABC):
@@ -103,6 +106,26 @@ class CachePort(ABC):
         """
         pass
     
+    async def get_advice_many(self, signatures: List[str]) -> Dict[str, "Advice"]:
+        """
+        Retrieve cached advice for several screens.
+        
+        Adapters override this with a single batched lookup; the default
+        calls get_advice() once per signature.
+        
+        Args:
+            signatures: ScreenSignature hashes.
+        
+        Returns:
+            Advice by signature, for hits only.
+        """
+        found = {}
+        for signature in signatures:
+            advice = await self.get_advice(signature)
+            if advice is not None:
+                found[signature] = advice
+        return found
+    
     @abstractmethod
     async def set_advice(
         self,
@@ -23,6 +23,25 @@ METHODS:
 - delete(key: str) -> bool
 - exists(key: str) -> bool
 - generate_key(prefix: str, extension: str) -> str
+- open_read(key, chunk_bytes) -> AsyncIterator[bytes] (streaming)
+- open_write(key, content_type) -> BlobWriter (streaming; ref on close)
+- get_range(key, offset, length) -> bytes
+- ref_for(key, data) -> Optional[str] (ref put() would return, if known upfront)
+- flush() -> None (make buffered writes durable)
+
+STREAMING:
+----------
+open_read/open_write/get_range have buffering default implementations on
+top of get()/put(), so every adapter supports them; adapters override them
+to avoid holding whole blobs in memory (the local store reads ranges with
+pread and hands out mmap-backed views).
+
+WRITE-BEHIND:
+-------------
+A store that knows refs before writing (content addressing) can be wrapped
+in adapters/repo/write_behind.py: put() returns at once and the write
+happens in the background. Callers that need durability (StopNode,
+FinalizeRunUsecase) await flush(); on plain stores it is a no-op.
 
 KEY STRUCTURE:
 --------------
@@ -32,20 +51,92 @@ runs/{run_id}/rationales/{node_type}_{screen_id}.json
 
 IMMUTABILITY:
 -------------
-- Keys are content-addressed or UUID-based
+- Keys are content-addressed or UUID-based; a content-addressed store
+  returns the same ref for identical data (callers keep the ref returned
+  by put(), not the key they passed in)
 - Once stored, assets are immutable (no updates)
 - Deletion is rare (only for cleanup)
 
 TODO:
 -----
-- [ ] Add streaming for large files
-- [ ] Add compression support
+- [x] Add streaming for large files (open_read/open_write/get_range)
+- [x] Add compression support (adapter-side, see adapters/repo/compression.py)
 - [ ] Add TTL/expiration
-- [ ] Add batch operations
+- [x] Add batch operations (write-behind batching, adapters/repo/write_behind.py)
 """
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import AsyncIterator, List, Optional
+
+
+DEFAULT_CHUNK_BYTES = 256 * 1024
+
+
+class BlobWriter(ABC):
+    """
+    Streaming upload handle returned by FileStorePort.open_write().
+    
+    USAGE:
+    ------
+    async with filestore.open_write(key, "text/xml") as writer:
+        await writer.write(chunk)
+    ref = writer.ref  # set when the block exits cleanly
+    """
+    
+    ref: Optional[str] = None
+    
+    @abstractmethod
+    async def write(self, data: bytes) -> None:
+        """Append data to the blob."""
+        pass
+    
+    @abstractmethod
+    async def close(self) -> str:
+        """
+        Commit the blob.
+        
+        Returns:
+            Final key (same as put() would return for the same data).
+        
+        Raises:
+            StorageError: If the commit failed.
+        """
+        pass
+    
+    @abstractmethod
+    async def abort(self) -> None:
+        """Discard everything written so far."""
+        pass
+    
+    async def __aenter__(self) -> "BlobWriter":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            await self.close()
+        else:
+            await self.abort()
+
+
+class _BufferedBlobWriter(BlobWriter):
+    """Default BlobWriter: buffers chunks and calls put() on close."""
+    
+    def __init__(self, store: "FileStorePort", key: str, content_type: str):
+        self.store = store
+        self.key = key
+        self.content_type = content_type
+        self._chunks: List[bytes] = []
+    
+    async def write(self, data: bytes) -> None:
+        self._chunks.append(bytes(data))
+    
+    async def close(self) -> str:
+        self.ref = await self.store.put(self.key, b"".join(self._chunks), self.content_type)
+        self._chunks = []
+        return self.ref
+    
+    async def abort(self) -> None:
+        self._chunks = []
 
 
 class FileStorePort(ABC):
@@ -89,8 +180,8 @@ class FileStorePort(ABC):
             Binary data.
         
         Raises:
-            KeyNotFoundError: If key doesn't exist.
-            StorageError: If retrieval failed.
+            StorageError: If the key doesn't exist or retrieval failed
+                (FileStoreError in adapters).
         """
         pass
     
@@ -144,4 +235,72 @@ class FileStorePort(ABC):
             Key path (e.g., runs/run-123/screenshots/screen-abc.png).
         """
         pass
-
+    
+    async def open_read(
+        self,
+        key: str,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a blob in chunks.
+        
+        Args:
+            key: Storage key.
+            chunk_bytes: Maximum chunk size.
+        
+        Yields:
+            Consecutive chunks of the (decoded) blob.
+        
+        Raises:
+            StorageError: If the key doesn't exist or retrieval failed.
+        """
+        data = await self.get(key)
+        for start in range(0, len(data), chunk_bytes):
+            yield data[start:start + chunk_bytes]
+    
+    def open_write(
+        self,
+        key: str,
+        content_type: str = "application/octet-stream",
+    ) -> BlobWriter:
+        """
+        Start a streaming upload (see BlobWriter).
+        
+        Args:
+            key: Storage key.
+            content_type: MIME type.
+        """
+        return _BufferedBlobWriter(self, key, content_type)
+    
+    async def get_range(self, key: str, offset: int, length: int) -> bytes:
+        """
+        Read length bytes starting at offset (fewer at the end of the blob).
+        
+        Raises:
+            StorageError: If the key doesn't exist or retrieval failed.
+            ValueError: Negative offset or length.
+        """
+        if offset < 0 or length < 0:
+            raise ValueError("offset and length must be non-negative")
+        data = await self.get(key)
+        return data[offset:offset + length]
+    
+    def ref_for(self, key: str, data: bytes) -> Optional[str]:
+        """
+        Ref that put(key, data) will return, without storing anything.
+        
+        Returns:
+            The ref, or None if it is only known after the write (the
+            default). Content-addressed stores return the content ref,
+            which lets writes be deferred (write-behind).
+        """
+        return None
+    
+    async def flush(self) -> None:
+        """
+        Wait until every accepted write is durable.
+        
+        Raises:
+            StorageError: If a deferred write failed.
+        """
+        return None
@@ -23,11 +23,21 @@ METHODS:
 - upsert_edge(from_sig, to_sig, action, metadata) -> EdgeID
 - get_node(signature) -> Optional[Node]
 - get_neighbors(signature) -> List[Node]
+- get_top_nodes(app_id, limit) -> List[Node] (cache warm-up)
 - get_exploration_stats(run_id) -> Stats
+- flush() -> None (commit batched upserts; no-op by default)
+
+Graph navigation (shortest path, nearest frontier) runs on the domain
+GraphIndex; adapters that keep one expose it as an extension
+(SQLiteRepoAdapter.find_path()/nearest_frontier()).
 
 DATA STRUCTURES:
 ----------------
 - Node: Screen node with signature, metadata, timestamps
+  (metadata["visits"]: visit count; metadata["safe_actions"]: verified
+  EnumeratedAction fields as dicts; metadata["action_count"]: number of
+  enumerated actions, which makes the node a frontier while some are
+  untried)
 - Edge: Transition edge with action, verification, timestamps
 - Stats: Coverage, node count, edge count
 
@@ -37,11 +47,18 @@ IDEMPOTENCY:
 - Same signature → same node ID
 - Same (from, to, action) → same edge ID
 
+BATCHING:
+---------
+Adapters may batch upserts into larger transactions (the SQLite adapter
+does); reads through the port always see earlier upserts, and flush()
+makes them durable. StopNode and FinalizeRunUsecase flush.
+
 TODO:
 -----
-- [ ] Add graph queries (BFS, DFS, shortest path)
+- [x] Add graph queries (shortest path, nearest frontier) — domain GraphIndex,
+      exposed by SQLiteRepoAdapter
 - [ ] Add subgraph extraction
-- [ ] Add versioning/snapshots
+- [x] Add versioning/snapshots — run history in adapters/repo RunEventLog
 """
 
 from abc import ABC, abstractmethod
@@ -155,6 +172,22 @@ class RepoPort(ABC):
         """
         pass
     
+    @abstractmethod
+    async def get_top_nodes(self, app_id: str, limit: int) -> List[Node]:
+        """
+        Most-visited nodes of an app, across all its runs.
+        
+        Used by StartSessionUsecase to warm caches before a re-exploration.
+        
+        Args:
+            app_id: App package name.
+            limit: Maximum number of nodes.
+        
+        Returns:
+            Nodes ordered by metadata["visits"], descending.
+        """
+        pass
+    
     @abstractmethod
     async def get_exploration_stats(self, run_id: str) -> ExplorationStats:
         """
@@ -167,4 +200,12 @@ class RepoPort(ABC):
             ExplorationStats summary.
         """
         pass
-
+    
+    async def flush(self) -> None:
+        """
+        Commit upserts an adapter has batched.
+        
+        Raises:
+            PersistenceError: If the commit failed.
+        """
+        return None
@@ -8,9 +8,14 @@ PUBLIC API:
 -----------
 - SignatureService: Signature computation and deltas
 - SalienceRanker: Element ranking (top-K)
-- PromptDiet: State pruning for LLM inputs
+- PromptDiet: State pruning for LLM inputs (packed under per-node token budgets)
+- token_estimator: Fast approximate token counts (memoized per string)
+- CacheKeyBuilder: Canonical prompt-cache keys from PromptDiet outputs
 - AdviceReducer: Advice normalization/deduplication
 - ProgressDetector: Heuristic progress signals
+- PageSourceParser: Streaming page source → ElementTable
+- screen_diff: Element-level diff of consecutive screens → ScreenDelta
+- perceptual_hash: Screenshot pHash/dHash (optional numpy + Pillow)
 
 DEPENDENCIES (ALLOWED):
 -----------------------
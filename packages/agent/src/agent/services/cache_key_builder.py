@@ -0,0 +1,178 @@
+"""
+CacheKeyBuilder: Canonical Prompt-Cache Keys
+
+PURPOSE:
+--------
+Build CachePort prompt-cache keys from PromptDiet outputs, so equal pruned
+inputs always map to the same key and anything that changes the prompt
+(model, prompt template version, inputs) maps to a new one.
+
+DEPENDENCIES (ALLOWED):
+-----------------------
+- dataclasses, enum, hashlib, json, typing (stdlib)
+
+DEPENDENCIES (FORBIDDEN):
+-------------------------
+- NO ports or adapters
+- NO hashing of raw json.dumps output (key order and float noise make
+  it unstable); always go through canonical_encode
+
+KEY FORMAT:
+-----------
+{node_type}:{model}:p{prompt_version}:{signature}:{delta_hash}:{topK_hash}:{policy}
+
+- signature: diet["signature"] (ScreenSignature.hash) as-is
+- delta_hash: digest of diet["delta"]
+- topK_hash: digest of every other diet field (top-K elements/actions,
+  plan, counters, ...)
+- policy: diet["policy"] as-is
+Missing fields are written as "-". Model and prompt version are visible in
+the key so an upgrade can be invalidated with one pattern, e.g.
+cache.invalidate("choose_action:gpt-4o:p1:*").
+
+CANONICAL ENCODING:
+-------------------
+Values are normalized in one Python pass, then serialized by the C json
+encoder with sorted keys and compact separators:
+- float: rounded to FLOAT_DIGITS decimals, -0.0 → 0.0, integral floats
+  become ints (1.0 == 1); NaN/inf keep json's literal names
+- tuple → list; set/frozenset → list sorted by canonical encoding
+- Enum → value; dataclass → its fields as a dict
+- non-str dict keys → their canonical encoding (so {1: x} == {"1": x})
+Digests are blake2b-64 (stdlib, C) salted with KEY_SCHEMA_VERSION, so a
+change to the encoding itself invalidates every key.
+
+USAGE:
+------
+builder = CacheKeyBuilder(model="gpt-4o")
+key = builder.build("choose_action", diet.diet_for_choose_action(state))
+cached = await cache.get_prompt_cache(key)
+"""
+
+import hashlib
+import json
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from typing import Any, Dict, Optional
+
+
+KEY_SCHEMA_VERSION = 1
+FLOAT_DIGITS = 6
+DIGEST_BYTES = 8
+
+LLM_NODE_TYPES = (
+    "choose_action",
+    "verify",
+    "detect_progress",
+    "should_continue",
+    "switch_policy",
+)
+
+# Bump a node's version whenever its prompt template changes
+PROMPT_VERSIONS: Dict[str, int] = {node_type: 1 for node_type in LLM_NODE_TYPES}
+
+_KEYED_FIELDS = ("signature", "delta", "policy")
+_MISSING = "-"
+
+# Exact types passed through unchanged (bool/str Enum subclasses are not)
+_PLAIN = frozenset((str, int, bool, type(None)))
+
+_dumps = json.JSONEncoder(
+    sort_keys=True,
+    separators=(",", ":"),
+    ensure_ascii=False,
+).encode
+
+
+def canonical_encode(value: Any) -> str:
+    """Canonical text encoding of a JSON-like value (see module docstring)."""
+    return _dumps(_normalize(value))
+
+
+def _normalize(value: Any) -> Any:
+    # Containers inline the plain-type check: most diet leaves are str/int/bool
+    kind = type(value)
+    if kind in _PLAIN:
+        return value
+    if kind is float:
+        return _normalize_float(value)
+    if kind is dict:
+        return {
+            key if type(key) is str else canonical_encode(key):
+                item if type(item) in _PLAIN else _normalize(item)
+            for key, item in value.items()
+        }
+    if kind is list or kind is tuple:
+        return [item if type(item) in _PLAIN else _normalize(item) for item in value]
+    if isinstance(value, Enum):
+        return _normalize(value.value)
+    if isinstance(value, (set, frozenset)):
+        return [_normalize(item) for item in sorted(value, key=canonical_encode)]
+    if is_dataclass(value) and not isinstance(value, type):
+        return {f.name: _normalize(getattr(value, f.name)) for f in fields(value)}
+    for base in (str, int, float, dict, list, tuple):  # subclasses, e.g. NamedTuple
+        if isinstance(value, base):
+            return _normalize(base(value))
+    raise TypeError(f"Cannot canonically encode {type(value).__name__}")
+
+
+def _normalize_float(value: float) -> Any:
+    value = round(value, FLOAT_DIGITS) + 0.0  # + 0.0 turns -0.0 into 0.0
+    if value.is_integer():
+        return int(value)
+    return value  # NaN/inf are not integral and pass through
+
+
+def stable_digest(value: Any) -> str:
+    """64-bit hex digest of a value's canonical encoding."""
+    return hashlib.blake2b(
+        canonical_encode(value).encode("utf-8"),
+        digest_size=DIGEST_BYTES,
+        salt=KEY_SCHEMA_VERSION.to_bytes(16, "little"),
+    ).hexdigest()
+
+
+class CacheKeyBuilder:
+    """
+    Stateless builder of prompt-cache keys for the five LLM nodes.
+
+    USAGE:
+    ------
+    builder = CacheKeyBuilder(model="gpt-4o", prompt_versions={"verify": 2})
+    key = builder.build("verify", pruned)
+    """
+
+    def __init__(self, model: str, prompt_versions: Optional[Dict[str, int]] = None):
+        self.model = model
+        self.prompt_versions = {**PROMPT_VERSIONS, **(prompt_versions or {})}
+
+    def build(self, node_type: str, diet: Optional[Dict[str, Any]]) -> str:
+        """
+        Key for one LLM call.
+
+        Args:
+            node_type: One of LLM_NODE_TYPES.
+            diet: PromptDiet output for that node.
+
+        Raises:
+            ValueError: Unknown node type.
+        """
+        if node_type not in self.prompt_versions:
+            raise ValueError(f"Unknown LLM node type: {node_type}")
+        diet = diet or {}
+        rest = {name: value for name, value in diet.items() if name not in _KEYED_FIELDS}
+        delta = diet.get("delta")
+        policy = diet.get("policy")
+        return ":".join((
+            node_type,
+            self.model,
+            f"p{self.prompt_versions[node_type]}",
+            str(diet.get("signature") or _MISSING),
+            stable_digest(delta) if delta is not None else _MISSING,
+            stable_digest(rest) if rest else _MISSING,
+            str(policy.value if isinstance(policy, Enum) else policy) if policy is not None else _MISSING,
+        ))
+
+    def node_pattern(self, node_type: str) -> str:
+        """Invalidation pattern for every key of one node at the current model/version."""
+        return f"{node_type}:{self.model}:p{self.prompt_versions[node_type]}:*"
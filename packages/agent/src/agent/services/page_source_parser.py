@@ -0,0 +1,319 @@
+"""
+PageSourceParser: Streaming Page Source → ElementTable
+
+PURPOSE:
+--------
+Turn UiAutomator2 (Android) or XCUITest (iOS) page source XML into a flat
+ElementTable. Used by PerceiveNode after DriverPort.get_page_source().
+
+Page sources run to 1-5 MB for deep hierarchies. The parser is incremental
+(xml.etree.ElementTree.XMLPullParser): it can be fed chunks as they arrive,
+appends one table row per start tag, and clears each XML node once it closes,
+so it never holds a full ElementTree or a tree of UIElement dataclasses.
+
+DEPENDENCIES (ALLOWED):
+-----------------------
+- xml.etree.ElementTree, re, typing (stdlib)
+- ElementTable (domain)
+
+DEPENDENCIES (FORBIDDEN):
+-------------------------
+- NO ports or adapters
+- NO I/O operations (callers pass the XML in)
+- NO SDKs (no lxml)
+
+NORMALIZATION:
+--------------
+- Bounds are normalized to [0.0, 1.0] by the screen size: the root's
+  width/height attributes when present, otherwise the first element's extent
+- Roles come from the class name (android.widget.Button → "button")
+- text = text/value/label, falling back to content-desc/name
+- Flags: clickable, focusable, visible (displayed/visible), enabled, ...
+
+USAGE:
+------
+parser = PageSourceParser()
+for chunk in chunks:
+    parser.feed(chunk)
+table = parser.close()
+
+# or in one call
+table = parse_page_source(xml_string)
+"""
+
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Tuple, Union
+
+from ..domain.element_table import (
+    ElementTable,
+    FLAG_CLICKABLE,
+    FLAG_FOCUSABLE,
+    FLAG_VISIBLE,
+    FLAG_ENABLED,
+    FLAG_SCROLLABLE,
+    FLAG_CHECKABLE,
+    FLAG_CHECKED,
+    FLAG_SELECTED,
+    FLAG_LONG_CLICKABLE,
+    FLAG_FOCUSED,
+    FLAG_PASSWORD,
+)
+
+
+_ANDROID_BOUNDS = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+
+# Wrapper tags that are not UI elements
+_ROOT_TAGS = frozenset(("hierarchy", "AppiumAUT"))
+
+# Exact simple class names → role
+_CLASS_ROLES: Dict[str, str] = {
+    # Android
+    "Button": "button",
+    "ImageButton": "button",
+    "FloatingActionButton": "button",
+    "MaterialButton": "button",
+    "EditText": "input",
+    "AutoCompleteTextView": "input",
+    "TextInputEditText": "input",
+    "TextView": "text",
+    "CheckedTextView": "checkbox",
+    "ImageView": "image",
+    "RecyclerView": "list",
+    "ListView": "list",
+    "GridView": "list",
+    "ViewPager": "list",
+    "CheckBox": "checkbox",
+    "RadioButton": "checkbox",
+    "Switch": "switch",
+    "SwitchCompat": "switch",
+    "ToggleButton": "switch",
+    "ScrollView": "scroll",
+    "HorizontalScrollView": "scroll",
+    "NestedScrollView": "scroll",
+    "TabWidget": "tab",
+    "TabLayout": "tab",
+    "WebView": "webview",
+    # iOS
+    "XCUIElementTypeButton": "button",
+    "XCUIElementTypeTextField": "input",
+    "XCUIElementTypeSecureTextField": "input",
+    "XCUIElementTypeSearchField": "input",
+    "XCUIElementTypeTextView": "input",
+    "XCUIElementTypeStaticText": "text",
+    "XCUIElementTypeImage": "image",
+    "XCUIElementTypeIcon": "image",
+    "XCUIElementTypeTable": "list",
+    "XCUIElementTypeCollectionView": "list",
+    "XCUIElementTypeCell": "cell",
+    "XCUIElementTypeSwitch": "switch",
+    "XCUIElementTypeToggle": "switch",
+    "XCUIElementTypeScrollView": "scroll",
+    "XCUIElementTypeTab": "tab",
+    "XCUIElementTypeTabBar": "tab",
+    "XCUIElementTypeLink": "link",
+    "XCUIElementTypeWebView": "webview",
+}
+
+# Suffix fallbacks for custom subclasses (e.g. AppCompatButton, MyRecyclerView)
+_SUFFIX_ROLES: Tuple[Tuple[str, str], ...] = (
+    ("Button", "button"),
+    ("EditText", "input"),
+    ("TextField", "input"),
+    ("TextView", "text"),
+    ("ImageView", "image"),
+    ("RecyclerView", "list"),
+    ("ListView", "list"),
+    ("CheckBox", "checkbox"),
+    ("Switch", "switch"),
+    ("ScrollView", "scroll"),
+    ("Layout", "container"),
+    ("ViewGroup", "container"),
+    ("View", "container"),
+    ("Other", "container"),
+    ("Window", "container"),
+    ("Application", "container"),
+)
+
+# iOS has no clickable attribute; these roles are tappable by nature
+_IMPLICITLY_CLICKABLE = frozenset(("button", "input", "checkbox", "switch", "tab", "link", "cell"))
+
+_role_cache: Dict[str, str] = {}
+
+
+def role_for_class(class_name: str) -> str:
+    """Map a platform class name to a semantic role."""
+    role = _role_cache.get(class_name)
+    if role is not None:
+        return role
+    simple = class_name.rsplit(".", 1)[-1]
+    role = _CLASS_ROLES.get(simple)
+    if role is None:
+        role = "unknown"
+        for suffix, candidate in _SUFFIX_ROLES:
+            if simple.endswith(suffix):
+                role = candidate
+                break
+    _role_cache[class_name] = role
+    return role
+
+
+def _pixel_bounds(attrib: Dict[str, str]) -> Optional[Tuple[float, float, float, float]]:
+    """Pixel (x, y, width, height) from Android bounds or iOS x/y/width/height."""
+    raw = attrib.get("bounds")
+    if raw is not None:
+        match = _ANDROID_BOUNDS.match(raw)
+        if match is None:
+            return None
+        x1, y1, x2, y2 = (int(v) for v in match.groups())
+        return (x1, y1, x2 - x1, y2 - y1)
+    if "x" in attrib and "width" in attrib:
+        try:
+            return (
+                float(attrib["x"]),
+                float(attrib.get("y", 0)),
+                float(attrib["width"]),
+                float(attrib.get("height", 0)),
+            )
+        except ValueError:
+            return None
+    return None
+
+
+_ANDROID_FLAGS = (
+    ("clickable", FLAG_CLICKABLE),
+    ("focusable", FLAG_FOCUSABLE),
+    ("enabled", FLAG_ENABLED),
+    ("scrollable", FLAG_SCROLLABLE),
+    ("checkable", FLAG_CHECKABLE),
+    ("checked", FLAG_CHECKED),
+    ("selected", FLAG_SELECTED),
+    ("long-clickable", FLAG_LONG_CLICKABLE),
+    ("focused", FLAG_FOCUSED),
+    ("password", FLAG_PASSWORD),
+)
+
+
+class PageSourceParser:
+    """
+    Incremental page source parser producing an ElementTable.
+
+    One parser instance parses one document: feed() any number of chunks,
+    then close() to get the table.
+    """
+
+    def __init__(self, screen_width: Optional[float] = None, screen_height: Optional[float] = None):
+        self._parser = ET.XMLPullParser(events=("start", "end"))
+        self._table = ElementTable()
+        self._stack: List[int] = []  # open table rows (-1 for wrapper tags)
+        self._screen_width = screen_width
+        self._screen_height = screen_height
+
+    def feed(self, data: Union[str, bytes]) -> None:
+        """Feed a chunk of XML and process every complete tag in it."""
+        self._parser.feed(data)
+        self._drain()
+
+    def close(self) -> ElementTable:
+        """Finish parsing and return the table."""
+        self._parser.close()
+        self._drain()
+        return self._table
+
+    def _drain(self) -> None:
+        for event, node in self._parser.read_events():
+            if event == "start":
+                self._stack.append(self._on_start(node))
+            else:
+                self._stack.pop()
+                # Drop attributes and children; the row already holds what we need
+                node.clear()
+
+    def _on_start(self, node: ET.Element) -> int:
+        attrib = node.attrib
+        if node.tag in _ROOT_TAGS:
+            self._set_screen_size(attrib.get("width"), attrib.get("height"))
+            return -1
+
+        pixel = _pixel_bounds(attrib)
+        if pixel is not None and not self._screen_width:
+            # No screen size on the wrapper: the first element spans the screen
+            self._screen_width = pixel[0] + pixel[2]
+            self._screen_height = pixel[1] + pixel[3]
+
+        class_name = attrib.get("class") or attrib.get("type") or node.tag
+        role = role_for_class(class_name)
+        flags = self._flags(attrib, role)
+
+        text = attrib.get("text") or attrib.get("value") or attrib.get("label")
+        if not text:
+            text = attrib.get("content-desc") or attrib.get("name") or None
+
+        # Wrapper tags sit at the bottom of the stack as -1 (= root)
+        parent = self._stack[-1] if self._stack else -1
+
+        return self._table.append(
+            role,
+            self._normalize(pixel),
+            flags,
+            parent=parent,
+            text=text,
+            resource_id=attrib.get("resource-id") or None,
+            class_name=class_name,
+        )
+
+    def _flags(self, attrib: Dict[str, str], role: str) -> int:
+        flags = 0
+        for name, bit in _ANDROID_FLAGS:
+            if attrib.get(name) == "true":
+                flags |= bit
+        visible = attrib.get("displayed", attrib.get("visible", "true"))
+        if visible == "true":
+            flags |= FLAG_VISIBLE
+        if "enabled" not in attrib:
+            flags |= FLAG_ENABLED
+        if "clickable" not in attrib and role in _IMPLICITLY_CLICKABLE:
+            flags |= FLAG_CLICKABLE
+        return flags
+
+    def _set_screen_size(self, width: Optional[str], height: Optional[str]) -> None:
+        if self._screen_width or not width or not height:
+            return
+        try:
+            self._screen_width = float(width)
+            self._screen_height = float(height)
+        except ValueError:
+            pass
+
+    def _normalize(self, pixel: Optional[Tuple[float, float, float, float]]) -> Tuple[float, float, float, float]:
+        if pixel is None or not self._screen_width or not self._screen_height:
+            return (0.0, 0.0, 0.0, 0.0)
+        x, y, width, height = pixel
+        sw = self._screen_width
+        sh = self._screen_height
+        return (
+            min(max(x / sw, 0.0), 1.0),
+            min(max(y / sh, 0.0), 1.0),
+            min(max(width / sw, 0.0), 1.0),
+            min(max(height / sh, 0.0), 1.0),
+        )
+
+
+def parse_page_source(
+    source: Union[str, bytes],
+    screen_width: Optional[float] = None,
+    screen_height: Optional[float] = None,
+    chunk_size: int = 1 << 16,
+) -> ElementTable:
+    """
+    Parse a complete page source into an ElementTable.
+
+    Args:
+        source: Page source XML.
+        screen_width, screen_height: Screen size in the source's units, if known.
+        chunk_size: Feed size; bounds the parser's intermediate buffers.
+    """
+    parser = PageSourceParser(screen_width, screen_height)
+    for offset in range(0, len(source), chunk_size):
+        parser.feed(source[offset:offset + chunk_size])
+    return parser.close()
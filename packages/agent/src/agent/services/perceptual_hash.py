@@ -0,0 +1,136 @@
+"""
+Perceptual Hash: Visual Similarity of Screenshots
+
+PURPOSE:
+--------
+64-bit perceptual hashes (pHash, dHash) of screenshots. Layout and OCR
+hashing see nothing on canvas, game and webview screens whose page source
+barely changes between states; the screenshot does.
+
+Used by SignatureService to fill ScreenSignature.phash from the PNG bytes of
+DriverPort.get_screenshot().
+
+DEPENDENCIES (OPTIONAL):
+------------------------
+- numpy: downscaling and DCT
+- Pillow: PNG decoding
+Install with `pip install agent[perception]`. Without them AVAILABLE is
+False and signatures are computed without a perceptual component.
+
+DEPENDENCIES (FORBIDDEN):
+-------------------------
+- NO ports or adapters
+- NO I/O operations (callers pass the PNG bytes in)
+- NO GPU / OpenCV
+
+ALGORITHM:
+----------
+pHash:
+1. Decode PNG → 8-bit grayscale (Pillow, C)
+2. Box-downscale to 32x32 (NumPy reshape + sum; edges cropped to a
+   multiple of 32)
+3. 2D DCT-II as two 32x32 matrix products
+4. Keep the 8x8 lowest frequencies; bit = coefficient > median (DC excluded
+   from the median)
+dHash:
+1. Box-downscale to 9x8
+2. bit = pixel brighter than its right neighbour
+
+PERFORMANCE:
+------------
+Hashing a decoded frame takes about 1 ms. PNG decoding is bounded by
+zlib inflate of the full frame (tens of ms at 1080x2400) and releases the
+GIL, so async callers should run screenshot_phash() via asyncio.to_thread.
+
+USAGE:
+------
+if AVAILABLE:
+    value = screenshot_phash(png_bytes)
+    distance = (value ^ previous).bit_count()
+"""
+
+from functools import lru_cache
+from io import BytesIO
+
+try:
+    import numpy as np
+    from PIL import Image
+    AVAILABLE = True
+except ImportError:  # optional "perception" extra
+    np = None
+    Image = None
+    AVAILABLE = False
+
+
+HASH_SIZE = 8
+DCT_SIZE = 32
+
+
+def _require() -> None:
+    if not AVAILABLE:
+        raise ImportError("perceptual hashing requires numpy and Pillow (pip install agent[perception])")
+
+
+def decode_grayscale(png: bytes) -> "np.ndarray":
+    """Decode PNG (or any Pillow-readable) bytes to a 2D uint8 luminance array."""
+    _require()
+    with Image.open(BytesIO(png)) as image:
+        return np.asarray(image.convert("L"))
+
+
+def downscale(gray: "np.ndarray", width: int, height: int) -> "np.ndarray":
+    """
+    Box-filter a 2D array down to (height, width) float32.
+
+    The image is center-cropped to a multiple of the target size so the
+    reduction is a single reshape + sum.
+    """
+    _require()
+    rows, cols = gray.shape
+    if rows < height or cols < width:
+        raise ValueError(f"image {cols}x{rows} is smaller than {width}x{height}")
+    block_h, block_w = rows // height, cols // width
+    top = (rows - block_h * height) // 2
+    left = (cols - block_w * width) // 2
+    cropped = gray[top:top + block_h * height, left:left + block_w * width]
+    # Rows first: the inner sum runs over contiguous memory
+    sums = (
+        cropped.reshape(height, block_h, width * block_w).sum(axis=1, dtype=np.uint32)
+        .reshape(height, width, block_w).sum(axis=2)
+    )
+    return sums.astype(np.float32) / (block_h * block_w)
+
+
+@lru_cache(maxsize=4)
+def _dct_matrix(n: int) -> "np.ndarray":
+    """Orthonormal DCT-II matrix: coefficients = M @ x."""
+    k = np.arange(n, dtype=np.float64)[:, None]
+    i = np.arange(n, dtype=np.float64)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix.astype(np.float32)
+
+
+def _pack(bits: "np.ndarray") -> int:
+    """Pack a boolean array (row-major) into an int, first element = bit 0."""
+    return int.from_bytes(np.packbits(bits.ravel(), bitorder="little").tobytes(), "little")
+
+
+def phash(gray: "np.ndarray") -> int:
+    """64-bit DCT perceptual hash of a 2D grayscale array."""
+    small = downscale(gray, DCT_SIZE, DCT_SIZE)
+    matrix = _dct_matrix(DCT_SIZE)
+    low = (matrix @ small @ matrix.T)[:HASH_SIZE, :HASH_SIZE]
+    median = np.median(low.ravel()[1:])
+    return _pack(low > median)
+
+
+def dhash(gray: "np.ndarray") -> int:
+    """64-bit difference hash of a 2D grayscale array."""
+    small = downscale(gray, HASH_SIZE + 1, HASH_SIZE)
+    return _pack(small[:, :-1] > small[:, 1:])
+
+
+def screenshot_phash(png: bytes) -> int:
+    """pHash of PNG screenshot bytes."""
+    return phash(decode_grayscale(png))
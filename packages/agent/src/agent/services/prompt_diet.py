@@ -4,12 +4,14 @@ PromptDiet: State Pruning for LLM Inputs
 PURPOSE:
 --------
 Reduce AgentState to minimal context for LLM prompts.
-Focus on delta-first, top-K elements, last N events.
+Focus on delta-first, top-K elements, last N events, packed under a
+per-node token budget so prompt cost and latency stay predictable.
 
 DEPENDENCIES (ALLOWED):
 -----------------------
-- domain types (AgentState)
-- typing (stdlib)
+- domain types (AgentState, ScreenDelta, compute_delta)
+- services.token_estimator
+- dataclasses, typing (stdlib)
 
 DEPENDENCIES (FORBIDDEN):
 -------------------------
@@ -23,82 +25,363 @@ METHODS:
 - diet_for_detect_progress(state) -> dict
 - diet_for_should_continue(state) -> dict
 - diet_for_switch_policy(state) -> dict
+- pack(node_type, state) -> Diet (payload + estimated tokens + what was cut)
 
 PRUNING STRATEGIES:
 -------------------
-- Delta-first: Only changes since previous screen
+- Delta-first: Only changes since previous screen (state.screen_delta:
+  added/removed/changed elements with their previous attribute values)
 - Top-K: Only most salient elements (not entire hierarchy)
-- Last N: Only recent events (last 3 actions)
+- Last N: Only recent events (last 3 plan steps)
 - Refs only: Asset references, not blobs
 - Stems only: OCR stems, not full text
 
+PACKING:
+--------
+Each payload has required fields (signature, delta, counters, ...) and
+ranked sections (actions, elements, plan steps). Required fields always go
+in; then sections are filled in priority order, item by item in rank
+order, skipping any item that would overflow the node's token budget
+(greedy first-fit, so a long label does not block shorter ones after it).
+Section keys are always present (possibly empty) so the payload shape is
+stable for prompt templates and CacheKeyBuilder. Texts are cut to
+max_text_chars before costing.
+
+TOKEN ESTIMATES:
+----------------
+services.token_estimator (approximate, memoized per string). Diet reports
+the estimate of the packed payload; required fields alone may exceed a
+tiny budget, which the estimate then shows.
+
 TODO:
 -----
-- [ ] Implement delta extraction
-- [ ] Implement top-K filtering
-- [ ] Implement event windowing
-- [ ] Add token estimation
+- [x] Implement delta extraction (signature distance + element changes)
+- [x] Implement top-K filtering
+- [x] Implement event windowing
+- [x] Add token estimation
 """
 
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ..domain.screen_signature import compute_delta
+from .token_estimator import estimate_tokens, estimate_value_tokens
+
+
+# Per-node input token budgets (payload only; the template adds its own)
+NODE_TOKEN_BUDGETS: Dict[str, int] = {
+    "choose_action": 1200,
+    "verify": 600,
+    "detect_progress": 500,
+    "should_continue": 300,
+    "switch_policy": 600,
+}
+
+TOP_K_ACTIONS = 12
+TOP_K_ELEMENTS = 10
+LAST_N_EVENTS = 3
+MAX_TEXT_CHARS = 60
+
+
+@dataclass(frozen=True)
+class Diet:
+    """A packed payload and its accounting."""
+    node_type: str
+    payload: Dict[str, Any]
+    estimated_tokens: int
+    budget_tokens: int
+    dropped: Dict[str, int]  # section → items left out by the budget
+
 
 class PromptDiet:
     """
     Stateless service for prompt pruning.
-    
+
     USAGE:
     ------
     diet = PromptDiet()
     pruned = diet.diet_for_choose_action(state)
+    packed = diet.pack("verify", state)  # packed.estimated_tokens
     """
-    
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, int]] = None,
+        top_k_actions: int = TOP_K_ACTIONS,
+        top_k_elements: int = TOP_K_ELEMENTS,
+        last_n: int = LAST_N_EVENTS,
+        max_text_chars: int = MAX_TEXT_CHARS,
+    ):
+        """
+        Args:
+            budgets: Per-node token budgets overriding NODE_TOKEN_BUDGETS.
+            top_k_actions: Most actions offered to ChooseAction.
+            top_k_elements: Most salient elements included.
+            last_n: Plan steps kept before/after the cursor.
+            max_text_chars: Longest element/action text kept.
+        """
+        self.budgets = {**NODE_TOKEN_BUDGETS, **(budgets or {})}
+        self.top_k_actions = top_k_actions
+        self.top_k_elements = top_k_elements
+        self.last_n = last_n
+        self.max_text_chars = max_text_chars
+
+    def pack(self, node_type: str, state: "AgentState") -> Diet:
+        """
+        Pruned payload for one LLM node, packed under its budget.
+
+        Raises:
+            ValueError: Unknown node type.
+        """
+        builder = _BUILDERS.get(node_type)
+        if builder is None:
+            raise ValueError(f"Unknown LLM node type: {node_type}")
+        required, sections = builder(self, state)
+        budget = self.budgets[node_type]
+        payload, used, dropped = _pack(required, sections, budget)
+        return Diet(node_type, payload, used, budget, dropped)
+
     def diet_for_choose_action(self, state: "AgentState") -> dict:
         """
         Prune state for ChooseAction LLM call.
-        
+
         Includes:
         - signature delta (prev → curr)
-        - top-K enumerated actions
-        - current plan and cursor
+        - top-K enumerated actions (with their index in enumerated_actions)
+        - changed elements
+        - current plan and cursor (next steps first)
         - budgets remaining
-        
-        TODO: Implement pruning
         """
-        pass
-    
+        return self.pack("choose_action", state).payload
+
     def diet_for_verify(self, state: "AgentState") -> dict:
         """
         Prune state for Verify LLM call.
-        
+
         Includes:
-        - signature delta only
-        - expected postcondition
-        - verification anchors (key elements)
-        
-        TODO: Implement pruning
+        - signature delta and changed elements
+        - expected outcome: the plan step just taken (state does not record
+          which enumerated action was executed, so its predicted
+          postcondition is not sent)
+        - verification anchors (key elements), after the changes
         """
-        pass
-    
+        return self.pack("verify", state).payload
+
     def diet_for_detect_progress(self, state: "AgentState") -> dict:
         """
         Prune state for DetectProgress LLM call.
-        
-        TODO: Implement pruning
+
+        Includes:
+        - signature delta, persist result, progress counters
+        - last N plan steps taken
         """
-        pass
-    
+        return self.pack("detect_progress", state).payload
+
     def diet_for_should_continue(self, state: "AgentState") -> dict:
         """
         Prune state for ShouldContinue LLM call.
-        
-        TODO: Implement pruning
+
+        Includes:
+        - counters and budgets remaining
+        - plan progress (cursor / length)
         """
-        pass
-    
+        return self.pack("should_continue", state).payload
+
     def diet_for_switch_policy(self, state: "AgentState") -> dict:
         """
         Prune state for SwitchPolicy LLM call.
-        
-        TODO: Implement pruning
+
+        Includes:
+        - current policy (advice source, confidence) and counters
+        - last N plan steps taken and the remaining plan
         """
-        pass
+        return self.pack("switch_policy", state).payload
+
+    # ------------------------------------------------------------------
+    # Payload builders: (required fields, [(section, ranked items), ...])
+    # ------------------------------------------------------------------
+
+    def _choose_action(self, state: "AgentState"):
+        required = {
+            **_identity(state),
+            "plan_cursor": state.plan_cursor,
+            "remaining": _remaining(state),
+        }
+        return required, [
+            ("actions", [self._action(index, action) for index, action in
+                         enumerate(state.enumerated_actions[:self.top_k_actions])]),
+            ("changes", self._changes(state)),
+            ("plan", self._upcoming(state)),
+            ("elements", self._elements(state)),
+        ]
+
+    def _verify(self, state: "AgentState"):
+        required = {
+            **_identity(state),
+            "expected": self._expected_postcondition(state),
+        }
+        return required, [("changes", self._changes(state)), ("anchors", self._elements(state))]
+
+    def _detect_progress(self, state: "AgentState"):
+        counters = state.counters
+        persisted = state.persist_result
+        required = {
+            **_identity(state),
+            "persisted": None if persisted is None else [persisted.nodes_added, persisted.edges_added],
+            "counters": {
+                "steps": counters.steps_total,
+                "screens_new": counters.screens_new,
+                "no_progress": counters.no_progress_cycles,
+            },
+        }
+        return required, [("recent", self._recent(state)), ("plan", self._upcoming(state))]
+
+    def _should_continue(self, state: "AgentState"):
+        counters = state.counters
+        required = {
+            "signature": state.signature.hash,
+            "counters": {
+                "steps": counters.steps_total,
+                "no_progress": counters.no_progress_cycles,
+                "errors": counters.errors,
+                "outside_app": counters.outside_app_steps,
+            },
+            "remaining": _remaining(state),
+            "plan_progress": [state.plan_cursor, len(state.advice.plan)],
+        }
+        return required, [("recent", self._recent(state))]
+
+    def _switch_policy(self, state: "AgentState"):
+        advice = state.advice
+        counters = state.counters
+        required = {
+            **_identity(state),
+            "policy": advice.source,
+            "confidence": round(advice.confidence, 2),
+            "counters": {
+                "steps": counters.steps_total,
+                "screens_new": counters.screens_new,
+                "no_progress": counters.no_progress_cycles,
+                "restarts": counters.restarts_used,
+            },
+        }
+        return required, [("recent", self._recent(state)), ("plan", self._upcoming(state))]
+
+    # ------------------------------------------------------------------
+    # Items
+    # ------------------------------------------------------------------
+
+    def _text(self, text: Optional[str]) -> Optional[str]:
+        if text is None or len(text) <= self.max_text_chars:
+            return text
+        return text[:self.max_text_chars - 1] + "…"
+
+    def _action(self, index: int, action) -> Dict[str, Any]:
+        item: Dict[str, Any] = {"i": index, "verb": action.verb}
+        if action.target_role:
+            item["role"] = action.target_role
+        if action.text_or_icon:
+            item["text"] = self._text(action.text_or_icon)
+        return item
+
+    def _elements(self, state: "AgentState") -> List[Dict[str, Any]]:
+        items = []
+        for element in state.ranked_elements[:self.top_k_elements]:
+            item: Dict[str, Any] = {"role": element.role}
+            if element.text:
+                item["text"] = self._text(element.text)
+            bounds = element.bounds
+            item["box"] = [round(bounds.x, 2), round(bounds.y, 2), round(bounds.width, 2), round(bounds.height, 2)]
+            items.append(item)
+        return items
+
+    def _changes(self, state: "AgentState") -> List[Dict[str, Any]]:
+        """Changed elements (state.screen_delta), in the delta's order."""
+        delta = state.screen_delta
+        if delta is None:
+            return []
+        items = []
+        for element in delta.elements:
+            item: Dict[str, Any] = {"op": element.change, "role": element.role}
+            if element.text:
+                item["text"] = self._text(element.text)
+            bounds = element.bounds
+            item["box"] = [round(bounds.x, 2), round(bounds.y, 2), round(bounds.width, 2), round(bounds.height, 2)]
+            if element.previous:
+                item["was"] = {name: self._text(value) for name, value in element.previous.items()}
+            items.append(item)
+        return items
+
+    def _upcoming(self, state: "AgentState") -> List[str]:
+        """Next plan steps from the cursor (the nearest first)."""
+        plan = state.advice.plan
+        return [self._text(step) for step in plan[state.plan_cursor:state.plan_cursor + self.last_n]]
+
+    def _recent(self, state: "AgentState") -> List[str]:
+        """Last N plan steps taken (the most recent first)."""
+        plan = state.advice.plan
+        start = max(state.plan_cursor - self.last_n, 0)
+        return [self._text(step) for step in reversed(plan[start:state.plan_cursor])]
+
+    def _expected_postcondition(self, state: "AgentState") -> Optional[str]:
+        # The step just taken is the one before the cursor (plan_cursor indexes
+        # advice.plan, not enumerated_actions)
+        index = state.plan_cursor - 1
+        plan = state.advice.plan
+        return self._text(plan[index]) if 0 <= index < len(plan) else None
+
+
+_BUILDERS = {
+    "choose_action": PromptDiet._choose_action,
+    "verify": PromptDiet._verify,
+    "detect_progress": PromptDiet._detect_progress,
+    "should_continue": PromptDiet._should_continue,
+    "switch_policy": PromptDiet._switch_policy,
+}
+
+
+def _identity(state: "AgentState") -> Dict[str, Any]:
+    """Signature first, then the delta from the previous screen (with element counts when diffed)."""
+    previous = state.previous_signature
+    delta = None
+    if previous is not None:
+        delta = {"from": previous.hash, "distance": round(compute_delta(previous, state.signature), 3)}
+        elements = state.screen_delta
+        if elements is not None:
+            delta["added"] = elements.added
+            delta["removed"] = elements.removed
+            delta["changed"] = elements.changed
+    return {"signature": state.signature.hash, "delta": delta}
+
+
+def _remaining(state: "AgentState") -> Dict[str, int]:
+    counters, budgets = state.counters, state.budgets
+    return {
+        "steps": max(budgets.max_steps - counters.steps_total, 0),
+        "restarts": max(budgets.restart_limit - counters.restarts_used, 0),
+        "outside_app": max(budgets.outside_app_limit - counters.outside_app_steps, 0),
+    }
+
 
+def _pack(
+    required: Dict[str, Any],
+    sections: Sequence[Tuple[str, List[Any]]],
+    budget: int,
+) -> Tuple[Dict[str, Any], int, Dict[str, int]]:
+    """Greedy first-fit of ranked section items after the required fields."""
+    payload = dict(required)
+    used = estimate_value_tokens(payload)
+    # Section keys are always emitted: reserve "name":[] for each up front
+    used += sum(estimate_tokens(name) + 2 for name, _ in sections)
+    dropped: Dict[str, int] = {}
+    for name, items in sections:
+        packed = []
+        for item in items:
+            cost = estimate_value_tokens(item) + 1
+            if used + cost > budget:
+                dropped[name] = dropped.get(name, 0) + 1
+                continue
+            packed.append(item)
+            used += cost
+        payload[name] = packed
+    return payload, used, dropped
@@ -8,8 +8,13 @@ Used by PerceiveNode to select top-K elements for LLM context.
 
 DEPENDENCIES (ALLOWED):
 -----------------------
-- domain types (UIElement)
-- typing (stdlib)
+- domain types (UIElement, ElementTable)
+- dataclasses, heapq, math, typing (stdlib)
+
+DEPENDENCIES (OPTIONAL):
+------------------------
+- numpy: vectorized scoring over ElementTable columns (the "perception"
+  extra). Without it every path uses the pure-Python scorer.
 
 DEPENDENCIES (FORBIDDEN):
 -------------------------
@@ -18,52 +23,252 @@ DEPENDENCIES (FORBIDDEN):
 
 METHODS:
 --------
-- rank_elements(elements) -> List[UIElement]
-- compute_salience_score(element) -> float
+- rank_elements(elements) -> List[UIElement | UIElementView]
+- rank_indices(table) -> List[int]
+- score_table(table) -> numpy array of scores
+- compute_salience_score(element) -> float (pure-Python reference)
 
 RANKING FACTORS:
 ----------------
-- Visibility: Element is visible and on-screen
-- Interactivity: Clickable, focusable, scrollable
-- Size: Larger elements are more salient
+- Visibility: Element is visible and on-screen (multiplicative: hidden or
+  zero-area elements keep only hidden_factor of their score)
+- Interactivity: Clickable, focusable, long-clickable, checkable (scrollable
+  counts half)
+- Size: Larger elements are more salient (sqrt of area)
 - Position: Center-weighted, top-weighted
 - Text presence: Elements with text are more salient
 - Semantic role: Buttons > text > images
 
+SCORING:
+--------
+score = Σ weight_i * feature_i / Σ weight_i (× hidden_factor if not
+visible), every feature in [0.0, 1.0], so scores are in [0.0, 1.0]. The vectorized path computes each feature as
+one NumPy expression over the table's columns (zero-copy views of the
+arrays) and selects the top K with argpartition (O(n)) before sorting only
+those K. Ties rank in document order.
+
 TODO:
 -----
-- [ ] Implement salience scoring
-- [ ] Add semantic weighting (role-based)
+- [x] Implement salience scoring
+- [x] Add semantic weighting (role-based)
 - [ ] Add ML-based ranking (later)
 """
 
+import heapq
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Union
+
+from ..domain.element_table import (
+    ElementTable,
+    ROLES,
+    FLAG_CHECKABLE,
+    FLAG_CLICKABLE,
+    FLAG_FOCUSABLE,
+    FLAG_LONG_CLICKABLE,
+    FLAG_SCROLLABLE,
+    FLAG_VISIBLE,
+)
+
+try:
+    import numpy as np
+except ImportError:  # optional "perception" extra
+    np = None
+
+
+_INTERACTIVE = FLAG_CLICKABLE | FLAG_FOCUSABLE | FLAG_LONG_CLICKABLE | FLAG_CHECKABLE
+_MAX_CENTER_DISTANCE = math.sqrt(0.5)
+
+DEFAULT_ROLE_WEIGHTS: Dict[str, float] = {
+    "button": 1.0,
+    "input": 1.0,
+    "checkbox": 0.9,
+    "switch": 0.9,
+    "tab": 0.9,
+    "link": 0.8,
+    "cell": 0.7,
+    "list": 0.5,
+    "scroll": 0.5,
+    "text": 0.5,
+    "webview": 0.4,
+    "image": 0.3,
+    "container": 0.1,
+    "unknown": 0.1,
+}
+
+
+@dataclass(frozen=True)
+class SalienceWeights:
+    """
+    Relative weight of each ranking factor.
+
+    USAGE:
+    ------
+    weights = SalienceWeights(text=2.0, role_weights={**DEFAULT_ROLE_WEIGHTS, "image": 0.8})
+    ranker = SalienceRanker(top_k=30, weights=weights)
+    """
+    hidden_factor: float = 0.1
+    interactive: float = 3.0
+    area: float = 1.0
+    center: float = 0.5
+    top: float = 0.5
+    text: float = 1.0
+    role: float = 2.0
+    role_weights: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_ROLE_WEIGHTS))
+
+    @property
+    def total(self) -> float:
+        return self.interactive + self.area + self.center + self.top + self.text + self.role
+
+    def role_weight(self, role: str) -> float:
+        return self.role_weights.get(role, self.role_weights.get("unknown", 0.0))
+
 
 class SalienceRanker:
     """
     Stateless service for element ranking.
-    
+
     USAGE:
     ------
     ranker = SalienceRanker(top_k=50)
-    ranked = ranker.rank_elements(elements)
+    ranked = ranker.rank_elements(table)  # ElementTable → UIElementViews
+    ranked = ranker.rank_elements(roots)  # UIElement trees → UIElements
     """
-    
-    def __init__(self, top_k: int = 50):
+
+    def __init__(self, top_k: int = 50, weights: Optional[SalienceWeights] = None):
         self.top_k = top_k
-    
-    def rank_elements(self, elements: list) -> list:
+        self.weights = weights or SalienceWeights()
+        self._role_table = None
+        if np is not None:
+            self._role_table = np.array(
+                [self.weights.role_weight(role) for role in ROLES], dtype=np.float32
+            )
+
+    def rank_elements(self, elements: Union[ElementTable, list]) -> list:
         """
-        Rank elements by salience and return top-K.
-        
-        TODO: Implement scoring and sorting
+        Rank elements by salience and return top-K, best first.
+
+        Args:
+            elements: ElementTable (vectorized), or UIElements / views; lists
+                are walked with their descendants.
+
+        Returns:
+            UIElementViews for a table, otherwise the elements themselves.
         """
-        pass
-    
+        if isinstance(elements, ElementTable):
+            return [elements.view(i) for i in self.rank_indices(elements)]
+
+        flat: List[Any] = []
+        stack = list(reversed(elements))
+        while stack:
+            element = stack.pop()
+            flat.append(element)
+            stack.extend(reversed(element.children))
+
+        order = heapq.nsmallest(
+            self.top_k,
+            range(len(flat)),
+            key=lambda i: (-self.compute_salience_score(flat[i]), i),
+        )
+        return [flat[i] for i in order]
+
+    def rank_indices(self, table: ElementTable) -> List[int]:
+        """Row indices of the top-K elements of a table, best first."""
+        n = len(table)
+        k = min(self.top_k, n)
+        if k <= 0:
+            return []
+        if np is None:
+            order = heapq.nsmallest(
+                k, range(n), key=lambda i: (-self.compute_salience_score(table.view(i)), i)
+            )
+            return order
+
+        scores = self.score_table(table)
+        if k < n:
+            candidates = np.argpartition(-scores, k - 1)[:k]
+            # argpartition does not keep ties in order: take every row tied
+            # with the K-th score so document order decides
+            threshold = scores[candidates].min()
+            candidates = np.flatnonzero(scores >= threshold)
+        else:
+            candidates = np.arange(n)
+        order = candidates[np.lexsort((candidates, -scores[candidates]))]
+        return order[:k].tolist()
+
+    def score_table(self, table: ElementTable) -> "np.ndarray":
+        """Salience scores for every row of a table (float32, vectorized)."""
+        if np is None:
+            raise ImportError("vectorized salience requires numpy (pip install agent[perception])")
+        w = self.weights
+        n = len(table)
+        if n == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        flags = np.frombuffer(table.flags, dtype=np.uint16)
+        roles = np.frombuffer(table.roles, dtype=np.uint8)
+        bounds = np.frombuffer(table.bounds, dtype=np.float32).reshape(n, 4)
+        x, y, width, height = bounds[:, 0], bounds[:, 1], bounds[:, 2], bounds[:, 3]
+
+        area = width * height
+        interactive = np.where(
+            (flags & _INTERACTIVE) != 0, 1.0, np.where((flags & FLAG_SCROLLABLE) != 0, 0.5, 0.0)
+        ).astype(np.float32)
+        cx = x + width / 2
+        cy = y + height / 2
+        center = 1.0 - np.minimum(np.hypot(cx - 0.5, cy - 0.5) / _MAX_CENTER_DISTANCE, 1.0)
+        top = 1.0 - np.clip(cy, 0.0, 1.0)
+        has_text = np.fromiter(map(bool, table.texts), dtype=bool, count=n)
+
+        score = w.interactive * interactive
+        score += w.area * np.sqrt(np.clip(area, 0.0, 1.0))
+        score += w.center * center
+        score += w.top * top
+        score += w.text * has_text
+        score += w.role * self._role_table[roles]
+        score /= w.total
+        score[((flags & FLAG_VISIBLE) == 0) | (area <= 0)] *= w.hidden_factor
+        return score.astype(np.float32, copy=False)
+
     def compute_salience_score(self, element: "UIElement") -> float:
         """
         Compute salience score [0.0, 1.0].
-        
-        TODO: Combine visibility, interactivity, size, position
+
+        Pure-Python reference for one UIElement or UIElementView; the
+        vectorized table path computes the same formula.
         """
-        pass
+        w = self.weights
+        b = element.bounds
+        flags = getattr(element, "flags", None)
+        if flags is None:
+            flags = (
+                (FLAG_VISIBLE if element.visible else 0)
+                | (FLAG_CLICKABLE if element.clickable else 0)
+                | (FLAG_FOCUSABLE if element.focusable else 0)
+            )
+
+        area = b.width * b.height
+        if flags & _INTERACTIVE:
+            interactive = 1.0
+        elif flags & FLAG_SCROLLABLE:
+            interactive = 0.5
+        else:
+            interactive = 0.0
+        cx = b.x + b.width / 2
+        cy = b.y + b.height / 2
+        center = 1.0 - min(math.hypot(cx - 0.5, cy - 0.5) / _MAX_CENTER_DISTANCE, 1.0)
+        top = 1.0 - min(max(cy, 0.0), 1.0)
+        has_text = 1.0 if element.text else 0.0
 
+        score = (
+            w.interactive * interactive
+            + w.area * math.sqrt(min(max(area, 0.0), 1.0))
+            + w.center * center
+            + w.top * top
+            + w.text * has_text
+            + w.role * w.role_weight(element.role)
+        )
+        score /= w.total
+        if not (flags & FLAG_VISIBLE and area > 0):
+            score *= w.hidden_factor
+        return score
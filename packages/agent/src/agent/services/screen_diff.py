@@ -0,0 +1,332 @@
+"""
+ScreenDiff: Element-Level Delta Between Consecutive Screens
+
+PURPOSE:
+--------
+Match the elements of two ElementTables (previous and current screen) and
+report which were added, removed or changed, and which attributes changed.
+PerceiveNode stores the result as AgentState.screen_delta so delta-first
+prompts (Verify, ChooseAction) can send the few changed elements instead of
+the whole screen.
+
+DEPENDENCIES (ALLOWED):
+-----------------------
+- collections, dataclasses, typing (stdlib)
+- ElementTable, ScreenDelta, ElementDelta (domain)
+
+DEPENDENCIES (FORBIDDEN):
+-------------------------
+- NO ports or adapters
+- NO I/O operations
+
+MATCHING:
+---------
+Rows are matched in passes over hashed keys; each pass only considers rows
+the earlier passes left unmatched:
+1. resource-id, where it is unique on both screens
+2. (role, text), where it is unique on both screens
+3. structural path (xpath-like: class[n] per level, hashed parent → child)
+4. (role, text), remaining duplicates paired in document order
+5. (role, quantized bounds), paired in document order
+Unique keys go first (as in patience diff) so an element inserted at the
+top of a list does not shift the path of every sibling after it and turn
+the whole list into "changed". Every pass is one dict build plus one scan,
+so a diff is O(n + m); passes stop once either side is fully matched.
+
+CHANGED ATTRIBUTES:
+-------------------
+role, text, bounds (at the 2-decimal quantization used by signatures),
+resource_id, class, and each flag (clickable, checked, selected, ...).
+
+SUMMARY:
+--------
+summarize_diff() keeps at most max_elements informative elements (with
+text, a resource-id or an interactive flag): changed first, then added,
+then removed, each in document order. Bare layout containers are counted
+but not listed.
+
+USAGE:
+------
+diff = diff_tables(previous_table, table)
+diff.added, diff.removed, diff.changed   # rows / RowChange(before, after, attributes)
+delta = screen_delta(previous_table, table)   # → ScreenDelta for AgentState
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from ..domain.element_table import (
+    ROLES,
+    ElementTable,
+    FLAG_CLICKABLE,
+    FLAG_FOCUSABLE,
+    FLAG_VISIBLE,
+    FLAG_ENABLED,
+    FLAG_SCROLLABLE,
+    FLAG_CHECKABLE,
+    FLAG_CHECKED,
+    FLAG_SELECTED,
+    FLAG_LONG_CLICKABLE,
+    FLAG_FOCUSED,
+    FLAG_PASSWORD,
+)
+from ..domain.state import Bounds, ElementDelta, ScreenDelta
+
+
+DELTA_MAX_ELEMENTS = 20
+
+_FLAG_NAMES: Tuple[Tuple[int, str], ...] = (
+    (FLAG_CLICKABLE, "clickable"),
+    (FLAG_FOCUSABLE, "focusable"),
+    (FLAG_VISIBLE, "visible"),
+    (FLAG_ENABLED, "enabled"),
+    (FLAG_SCROLLABLE, "scrollable"),
+    (FLAG_CHECKABLE, "checkable"),
+    (FLAG_CHECKED, "checked"),
+    (FLAG_SELECTED, "selected"),
+    (FLAG_LONG_CLICKABLE, "long_clickable"),
+    (FLAG_FOCUSED, "focused"),
+    (FLAG_PASSWORD, "password"),
+)
+_FLAG_BITS: Dict[str, int] = {name: bit for bit, name in _FLAG_NAMES}
+_INTERACTIVE = FLAG_CLICKABLE | FLAG_FOCUSABLE | FLAG_CHECKABLE | FLAG_SCROLLABLE | FLAG_LONG_CLICKABLE
+
+
+@dataclass(frozen=True)
+class RowChange:
+    """A matched element whose attributes differ."""
+    before: int  # row in the previous table
+    after: int  # row in the current table
+    attributes: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class TableDiff:
+    """Element-level diff of two tables (rows in document order)."""
+    added: Tuple[int, ...]  # rows of the current table
+    removed: Tuple[int, ...]  # rows of the previous table
+    changed: Tuple[RowChange, ...]
+    unchanged: int
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+def match_rows(before: ElementTable, after: ElementTable) -> List[int]:
+    """
+    Match rows of two tables.
+
+    Returns:
+        For each row of before, its matched row in after (-1 if removed).
+    """
+    b_match = [-1] * len(before)
+    a_match = [-1] * len(after)
+    # Later passes only run while both sides still have unmatched rows
+    unmatched = min(len(before), len(after))
+    for match, keys in _PASSES:
+        if not unmatched:
+            break
+        unmatched -= match(keys(before), keys(after), b_match, a_match)
+    return b_match
+
+
+def diff_tables(before: ElementTable, after: ElementTable) -> TableDiff:
+    """Added, removed and changed elements between two screens."""
+    b_match = match_rows(before, after)
+    matched_after = set()
+    removed = []
+    changed = []
+    for b, a in enumerate(b_match):
+        if a < 0:
+            removed.append(b)
+            continue
+        matched_after.add(a)
+        attributes = _changed_attributes(before, b, after, a)
+        if attributes:
+            changed.append(RowChange(b, a, attributes))
+    added = tuple(a for a in range(len(after)) if a not in matched_after)
+    unchanged = len(before) - len(removed) - len(changed)
+    return TableDiff(added, tuple(removed), tuple(changed), unchanged)
+
+
+def summarize_diff(
+    diff: TableDiff,
+    before: ElementTable,
+    after: ElementTable,
+    max_elements: int = DELTA_MAX_ELEMENTS,
+) -> ScreenDelta:
+    """Compact ScreenDelta (for AgentState and prompts) from a TableDiff."""
+    elements: List[ElementDelta] = []
+    for change in diff.changed:
+        if len(elements) >= max_elements:
+            break
+        if _informative(after, change.after) or _informative(before, change.before):
+            previous = {name: _value(before, change.before, name) for name in change.attributes}
+            elements.append(_element("changed", after, change.after, previous))
+    for kind, table, rows in (("added", after, diff.added), ("removed", before, diff.removed)):
+        for row in rows:
+            if len(elements) >= max_elements:
+                break
+            if _informative(table, row):
+                elements.append(_element(kind, table, row))
+    return ScreenDelta(
+        added=len(diff.added),
+        removed=len(diff.removed),
+        changed=len(diff.changed),
+        unchanged=diff.unchanged,
+        elements=elements,
+    )
+
+
+def screen_delta(
+    before: ElementTable,
+    after: ElementTable,
+    max_elements: int = DELTA_MAX_ELEMENTS,
+) -> ScreenDelta:
+    """diff_tables() + summarize_diff()."""
+    return summarize_diff(diff_tables(before, after), before, after, max_elements)
+
+
+# ----------------------------------------------------------------------
+# Keys (None = row takes no part in the pass)
+# ----------------------------------------------------------------------
+
+def _id_keys(table: ElementTable) -> List[Optional[str]]:
+    return [resource_id or None for resource_id in table.resource_ids]
+
+
+def _text_keys(table: ElementTable) -> List[Optional[Tuple[int, str]]]:
+    roles = table.roles
+    return [(roles[i], text) if text else None for i, text in enumerate(table.texts)]
+
+
+def _position_keys(table: ElementTable) -> List[Tuple[int, ...]]:
+    roles, q = table.roles, table.qbounds
+    return [(roles[i], q[4 * i], q[4 * i + 1], q[4 * i + 2], q[4 * i + 3]) for i in range(len(roles))]
+
+
+def _path_keys(table: ElementTable) -> List[int]:
+    """Hashed xpath-like path per row: parent path + class[ordinal among same-class siblings]."""
+    keys = [0] * len(table)
+    ordinals: Dict[Tuple[int, str], int] = {}
+    roles, parents, class_names = table.roles, table.parents, table.class_names
+    for row in range(len(keys)):
+        name = class_names[row] or ROLES[roles[row]]
+        parent = parents[row]
+        slot = (parent, name)
+        ordinal = ordinals.get(slot, 0) + 1
+        ordinals[slot] = ordinal
+        keys[row] = hash((keys[parent] if parent >= 0 else 0, name, ordinal))
+    return keys
+
+
+# ----------------------------------------------------------------------
+# Passes
+# ----------------------------------------------------------------------
+
+def _link(b: int, a: int, b_match: List[int], a_match: List[int]) -> None:
+    b_match[b] = a
+    a_match[a] = b
+
+
+def _unique_rows(keys: Sequence[Optional[Hashable]], matched: List[int]) -> Dict[Hashable, int]:
+    rows: Dict[Hashable, int] = {}
+    for row, key in enumerate(keys):
+        if key is not None and matched[row] < 0:
+            rows[key] = -1 if key in rows else row
+    return rows
+
+
+def _match_unique(b_keys, a_keys, b_match: List[int], a_match: List[int]) -> int:
+    """Pair rows whose key occurs exactly once among the unmatched rows of each side."""
+    linked = 0
+    a_rows = _unique_rows(a_keys, a_match)
+    for key, b in _unique_rows(b_keys, b_match).items():
+        if b >= 0:
+            a = a_rows.get(key, -1)
+            if a >= 0:
+                _link(b, a, b_match, a_match)
+                linked += 1
+    return linked
+
+
+def _match_in_order(b_keys, a_keys, b_match: List[int], a_match: List[int]) -> int:
+    """Pair unmatched rows with equal keys, first with first, in document order."""
+    linked = 0
+    buckets: Dict[Hashable, deque] = {}
+    for b, key in enumerate(b_keys):
+        if key is not None and b_match[b] < 0:
+            buckets.setdefault(key, deque()).append(b)
+    if not buckets:
+        return 0
+    for a, key in enumerate(a_keys):
+        if key is None or a_match[a] >= 0:
+            continue
+        rows = buckets.get(key)
+        if rows:
+            _link(rows.popleft(), a, b_match, a_match)
+            linked += 1
+    return linked
+
+
+_PASSES = (
+    (_match_unique, _id_keys),
+    (_match_unique, _text_keys),
+    (_match_unique, _path_keys),
+    (_match_in_order, _text_keys),
+    (_match_in_order, _position_keys),
+)
+
+
+# ----------------------------------------------------------------------
+# Attributes
+# ----------------------------------------------------------------------
+
+def _changed_attributes(before: ElementTable, b: int, after: ElementTable, a: int) -> Tuple[str, ...]:
+    names = []
+    if before.roles[b] != after.roles[a]:
+        names.append("role")
+    if before.texts[b] != after.texts[a]:
+        names.append("text")
+    if before.qbounds[4 * b:4 * b + 4] != after.qbounds[4 * a:4 * a + 4]:
+        names.append("bounds")
+    if before.resource_ids[b] != after.resource_ids[a]:
+        names.append("resource_id")
+    if before.class_names[b] != after.class_names[a]:
+        names.append("class")
+    flipped = before.flags[b] ^ after.flags[a]
+    if flipped:
+        names.extend(name for bit, name in _FLAG_NAMES if flipped & bit)
+    return tuple(names)
+
+
+def _value(table: ElementTable, row: int, attribute: str) -> str:
+    """An attribute of a row rendered as a string ("" if absent)."""
+    if attribute == "role":
+        return table.role(row)
+    if attribute == "text":
+        return table.texts[row] or ""
+    if attribute == "bounds":
+        return ",".join(f"{q / 100:g}" for q in table.qbounds[4 * row:4 * row + 4])
+    if attribute == "resource_id":
+        return table.resource_ids[row] or ""
+    if attribute == "class":
+        return table.class_names[row] or ""
+    return "true" if table.flags[row] & _FLAG_BITS[attribute] else "false"
+
+
+def _informative(table: ElementTable, row: int) -> bool:
+    return bool(table.texts[row] or table.resource_ids[row] or table.flags[row] & _INTERACTIVE)
+
+
+def _element(change: str, table: ElementTable, row: int, previous: Optional[Dict[str, str]] = None) -> ElementDelta:
+    q = table.qbounds
+    return ElementDelta(
+        change=change,
+        role=table.role(row),
+        text=table.texts[row],
+        bounds=Bounds(q[4 * row] / 100, q[4 * row + 1] / 100, q[4 * row + 2] / 100, q[4 * row + 3] / 100),
+        previous=previous or {},
+    )
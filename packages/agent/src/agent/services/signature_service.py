@@ -9,7 +9,7 @@ Enable deduplication, delta computation, and caching.
 DEPENDENCIES (ALLOWED):
 -----------------------
 - domain types (ScreenSignature, UIElement)
-- hashlib, json (stdlib)
+- screen_signature domain functions (hashing lives in the domain)
 
 DEPENDENCIES (FORBIDDEN):
 -------------------------
@@ -19,24 +19,37 @@ DEPENDENCIES (FORBIDDEN):
 METHODS:
 --------
 - compute_signature(elements, ocr_text) -> ScreenSignature
-- compute_delta(sig1, sig2) -> float
+- compute_delta(sig1, sig2) -> float (SimHash Hamming distance)
+- find_similar(signature, index, max_distance) -> Optional[str]
 - normalize_elements(elements) -> List[UIElement]
 
 ALGORITHM:
 ----------
-1. Normalize elements (quantize bounds, sort by hierarchy)
+1. Normalize elements (visible only, hierarchy order, bounds quantized)
 2. Hash layout (role + bounds)
 3. Hash OCR stems (normalize text → stems → sort → hash)
 4. Combine: SHA256(layout_hash + ocr_stems_hash)
+5. SimHash over layout tokens + stems (near-duplicate detection)
+6. pHash of the screenshot, when given and perception extras are installed
 
 TODO:
 -----
-- [ ] Implement hash_layout()
-- [ ] Implement hash_ocr_stems()
-- [ ] Implement compute_delta() (Hamming/Jaccard)
-- [ ] Add perceptual hashing (pHash)
+- [x] Implement hash_layout()
+- [x] Implement hash_ocr_stems()
+- [x] Implement compute_delta() (SimHash Hamming)
+- [x] Add perceptual hashing (pHash, optional numpy + Pillow)
 """
 
+from typing import Any, List, Optional
+
+from ..domain.screen_signature import (
+    ScreenSignature,
+    compute_signature,
+    compute_delta,
+)
+from ..domain.simhash_index import SimHashIndex
+from . import perceptual_hash
+
 
 class SignatureService:
     """
@@ -49,27 +62,70 @@ class SignatureService:
     delta = service.compute_delta(prev_sig, curr_sig)
     """
     
-    def compute_signature(self, elements: list, ocr_text: str) -> "ScreenSignature":
+    def compute_signature(
+        self,
+        elements: Any,
+        ocr_text: Optional[str] = None,
+        screenshot: Optional[bytes] = None,
+    ) -> ScreenSignature:
         """
         Compute deterministic signature.
         
-        TODO: Implement full algorithm
+        Args:
+            elements: ElementTable (fast path) or root UIElements.
+            ocr_text: OCR text; None falls back to visible element text.
+            screenshot: PNG bytes; adds a pHash when numpy and Pillow are
+                installed (decoding is CPU-bound: call via asyncio.to_thread).
         """
-        pass
+        phash = None
+        if screenshot is not None and perceptual_hash.AVAILABLE:
+            phash = perceptual_hash.screenshot_phash(screenshot)
+        return compute_signature(elements, ocr_text, phash)
     
-    def compute_delta(self, sig1: "ScreenSignature", sig2: "ScreenSignature") -> float:
+    def compute_delta(self, sig1: ScreenSignature, sig2: ScreenSignature) -> float:
         """
         Compute similarity distance [0.0, 1.0].
         
-        TODO: Implement Hamming or Jaccard distance
+        The larger of the normalized SimHash (layout/text) and pHash
+        (screenshot) Hamming distances, over the components both signatures
+        have; without a shared component, 0.0 for equal hashes, else 1.0.
         """
-        pass
+        return compute_delta(sig1, sig2)
     
-    def normalize_elements(self, elements: list) -> list:
+    def find_similar(
+        self,
+        signature: ScreenSignature,
+        index: SimHashIndex,
+        max_distance: Optional[int] = None,
+    ) -> Optional[str]:
         """
-        Normalize elements for stable hashing.
+        Find a known screen that is the same as, or a near duplicate of, signature.
         
-        TODO: Quantize bounds, sort, deduplicate
+        Args:
+            signature: Newly computed signature.
+            index: SimHashIndex keyed by known signature hashes.
+            max_distance: Bit tolerance (defaults to the index's).
+        
+        Returns:
+            The matching signature hash, or None for a new screen.
         """
-        pass
-
+        if signature.hash in index:
+            return signature.hash
+        if signature.simhash is None:
+            return None
+        match = index.nearest(signature.simhash, max_distance)
+        return match[0] if match else None
+    
+    def normalize_elements(self, elements: list) -> list:
+        """
+        Normalize elements for stable hashing: the visible elements in
+        hierarchy (pre-order) order, i.e. the rows compute_signature hashes.
+        """
+        normalized: List[Any] = []
+        stack = list(reversed(elements))
+        while stack:
+            element = stack.pop()
+            if element.visible:
+                normalized.append(element)
+            stack.extend(reversed(element.children))
+        return normalized
@@ -0,0 +1,98 @@
+"""
+TokenEstimator: Fast Local Token Counts for LLM Payloads
+
+PURPOSE:
+--------
+Estimate how many tokens a prompt payload will cost without a provider
+tokenizer, so PromptDiet can pack payloads under per-node budgets and
+report their size. Exact counts belong to the LLM adapter; this only has
+to be close, monotonic and fast.
+
+DEPENDENCIES (ALLOWED):
+-----------------------
+- collections.abc, re, typing (stdlib)
+
+DEPENDENCIES (FORBIDDEN):
+-------------------------
+- NO tokenizer libraries (tiktoken etc.), NO ports or adapters
+
+APPROXIMATION:
+--------------
+Text is split the way BPE pre-tokenizers split it (optional leading
+space + letters, 1-3 digit groups, punctuation runs, whitespace), then:
+- letter run: 1 token per CHARS_PER_WORD_TOKEN characters (rounded up);
+  common words are one token
+- digit group: 1 token
+- punctuation run: 1 token per 2 characters (JSON's `":"`, `",` merge)
+- whitespace run: 1 token
+- non-ASCII character: 1 token each (conservative for CJK/emoji)
+Values (dicts, lists, scalars) are costed as their compact JSON rendering:
+string leaves through the text estimate, plus one token per quote pair,
+separator and bracket.
+
+CACHING:
+--------
+Per-string counts are memoized (screen texts, action labels and keys
+repeat on every step); the cache is cleared when it reaches
+TOKEN_CACHE_MAX entries.
+
+USAGE:
+------
+estimate_tokens("Sign in with Google")  # 4
+estimate_value_tokens({"verb": "tap", "text": "Sign in"})
+"""
+
+import re
+from collections.abc import Mapping
+from typing import Any, Dict
+
+CHARS_PER_WORD_TOKEN = 6
+TOKEN_CACHE_MAX = 50_000
+
+_PIECES = re.compile(r" ?[A-Za-z]+| ?[0-9]{1,3}| ?[^\sA-Za-z0-9]+|\s+")
+_counts: Dict[str, int] = {}
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a string (memoized)."""
+    count = _counts.get(text)
+    if count is None:
+        if len(_counts) >= TOKEN_CACHE_MAX:
+            _counts.clear()
+        count = _counts[text] = _count(text)
+    return count
+
+
+def estimate_value_tokens(value: Any) -> int:
+    """Approximate token count of a JSON-like value's compact rendering."""
+    kind = type(value)
+    if kind is str:
+        return estimate_tokens(value) + 1  # quotes
+    if value is None or kind is bool:
+        return 1
+    if kind is int or kind is float:
+        return estimate_tokens(repr(value))
+    # isinstance, so PVector (a tuple) and PMap (a Mapping) are costed as JSON too
+    if isinstance(value, (list, tuple)):
+        return 1 + sum(estimate_value_tokens(item) + 1 for item in value)
+    if isinstance(value, Mapping):
+        # {"key":value,...}: key + quotes/colon + value + comma, plus braces
+        return 1 + sum(estimate_tokens(str(key)) + 1 + estimate_value_tokens(item) for key, item in value.items())
+    return estimate_value_tokens(str(value))
+
+
+def _count(text: str) -> int:
+    total = 0
+    for piece in _PIECES.findall(text):
+        if not piece.isascii():
+            wide = sum(1 for char in piece if ord(char) > 127)
+            total += wide + (1 if len(piece.strip()) > wide else 0)
+            continue
+        last = piece[-1]
+        if last.isalpha():
+            total += -(-len(piece.lstrip(" ")) // CHARS_PER_WORD_TOKEN)
+        elif last.isdigit() or piece.isspace():
+            total += 1
+        else:
+            total += -(-len(piece) // 2)
+    return total
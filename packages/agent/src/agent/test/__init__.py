@@ -34,7 +34,7 @@ fake_driver = FakeDriverPort()
 fake_llm = FakeLLMPort()
 node = ChooseActionNode(llm=fake_llm, ...)
 state = StateFactory.create_initial()
-result = node.run(state)
+result = await node.run(state)
 
 TODO:
 -----
@@ -16,6 +16,7 @@ FIXTURES:
 - fake_llm: FakeLLMPort
 - fake_repo: FakeRepoPort
 - fake_filestore: FakeFileStorePort
+- fake_ocr: FakeOCRPort
 - fake_cache: FakeCachePort
 - fake_budget: FakeBudgetPort
 - fake_telemetry: FakeTelemetryPort
@@ -23,7 +24,7 @@ FIXTURES:
 
 TODO:
 -----
-- [ ] Implement all fake port classes
+- [ ] Implement all fake port classes (driver, filestore, OCR, telemetry, repo, cache done)
 - [ ] Add state factories (various scenarios)
 - [ ] Add fixture combinations
 """
@@ -32,26 +33,27 @@ import pytest
 from datetime import datetime
 from typing import Optional
 
+from src.agent.test.fakes import (
+    FakeCachePort,
+    FakeDriverPort,
+    FakeFileStorePort,
+    FakeOCRPort,
+    FakeRepoPort,
+    FakeTelemetryPort,
+)
 # Fake port imports (to be implemented)
 # from agent.test.fakes import (
-#     FakeDriverPort,
 #     FakeLLMPort,
-#     FakeRepoPort,
-#     FakeFileStorePort,
-#     FakeCachePort,
 #     FakeBudgetPort,
-#     FakeTelemetryPort,
 # )
 
-# Domain imports
-# from agent.domain import AgentState, Budgets, Counters, Timestamps
+from src.agent.domain import AgentState, Budgets, Counters, Timestamps
 
 
 @pytest.fixture
 def fake_driver():
     """Fake DriverPort for unit tests."""
-    # return FakeDriverPort()
-    pass
+    return FakeDriverPort()
 
 
 @pytest.fixture
@@ -64,22 +66,25 @@ def fake_llm():
 @pytest.fixture
 def fake_repo():
     """Fake RepoPort for unit tests."""
-    # return FakeRepoPort()
-    pass
+    return FakeRepoPort()
 
 
 @pytest.fixture
 def fake_filestore():
     """Fake FileStorePort for unit tests."""
-    # return FakeFileStorePort()
-    pass
+    return FakeFileStorePort()
+
+
+@pytest.fixture
+def fake_ocr():
+    """Fake OCRPort for unit tests."""
+    return FakeOCRPort()
 
 
 @pytest.fixture
 def fake_cache():
     """Fake CachePort for unit tests."""
-    # return FakeCachePort()
-    pass
+    return FakeCachePort()
 
 
 @pytest.fixture
@@ -92,25 +97,21 @@ def fake_budget():
 @pytest.fixture
 def fake_telemetry():
     """Fake TelemetryPort for unit tests."""
-    # return FakeTelemetryPort()
-    pass
+    return FakeTelemetryPort()
 
 
 @pytest.fixture
 def initial_state():
     """
     Factory for creating initial AgentState for tests.
-    
-    TODO: Implement with proper state construction
     """
-    # return AgentState(
-    #     run_id="test-run-001",
-    #     app_id="com.example.testapp",
-    #     timestamps=Timestamps(),
-    #     budgets=Budgets(),
-    #     counters=Counters(),
-    # )
-    pass
+    return AgentState(
+        run_id="test-run-001",
+        app_id="com.example.testapp",
+        timestamps=Timestamps(),
+        budgets=Budgets(),
+        counters=Counters(),
+    )
 
 
 @pytest.fixture
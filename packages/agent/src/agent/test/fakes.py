@@ -0,0 +1,246 @@
+"""
+Fake Ports for Agent Core Unit Tests
+
+In-memory port implementations with optional artificial latency, so tests
+can exercise nodes and the graph runtime without SDKs or I/O.
+"""
+
+import asyncio
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.agent.domain import Advice
+from src.agent.errors.error_types import StorageError
+from src.agent.ports.cache_port import CachePort
+from src.agent.ports.driver_port import DriverPort
+from src.agent.ports.filestore_port import FileStorePort
+from src.agent.ports.ocr_port import OCRPort, OCRResult, TextRegion
+from src.agent.ports.repo_port import Edge, ExplorationStats, Node, RepoPort
+from src.agent.ports.telemetry_port import TelemetryPort
+
+
+def make_png(width: int = 64, height: int = 128, shade: int = 200) -> bytes:
+    """Minimal valid grayscale PNG (stdlib only)."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    rows = b"".join(b"\x00" + bytes((shade + x + y) % 256 for x in range(width)) for y in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b"")
+
+
+class FakeTelemetryPort(TelemetryPort):
+    """Records logs, metrics and spans."""
+
+    def __init__(self):
+        self.logs: List[Tuple[Any, str, Dict[str, Any]]] = []
+        self.metrics: List[Tuple[str, float, Dict[str, str]]] = []
+        self.spans: List[Tuple[str, str]] = []
+        self._open: Dict[str, str] = {}
+
+    def log(self, level, message, context=None) -> None:
+        self.logs.append((level, message, context or {}))
+
+    def metric(self, name, value, tags=None) -> None:
+        self.metrics.append((name, value, tags or {}))
+
+    def trace_start(self, span_name, context=None) -> str:
+        span_id = f"span-{len(self.spans) + len(self._open)}"
+        self._open[span_id] = span_name
+        return span_id
+
+    def trace_end(self, span_id, status="ok", context=None) -> None:
+        self.spans.append((self._open.pop(span_id), status))
+
+
+class InFlight:
+    """Counts overlapping calls (async with tracker: ...); peak = most at once."""
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+
+    async def __aenter__(self) -> "InFlight":
+        self.current += 1
+        self.peak = max(self.peak, self.current)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.current -= 1
+
+
+class FakeDriverPort(DriverPort):
+    """Serves a fixed page source and screenshot."""
+
+    def __init__(self, page_source: str = "<hierarchy />", screenshot: Optional[bytes] = None, delay_s: float = 0.0):
+        self.page_source = page_source
+        self.screenshot = screenshot if screenshot is not None else make_png()
+        self.delay_s = delay_s
+        self.calls: List[str] = []
+
+    async def _call(self, name: str) -> None:
+        self.calls.append(name)
+        if self.delay_s:
+            await asyncio.sleep(self.delay_s)
+
+    async def is_device_ready(self) -> bool:
+        await self._call("is_device_ready")
+        return True
+
+    async def install_app(self, apk_path: str) -> bool:
+        await self._call("install_app")
+        return True
+
+    async def launch_app(self, package: str) -> bool:
+        await self._call("launch_app")
+        return True
+
+    async def get_current_app(self) -> str:
+        await self._call("get_current_app")
+        return "com.example"
+
+    async def get_page_source(self) -> str:
+        await self._call("get_page_source")
+        return self.page_source
+
+    async def get_screenshot(self) -> bytes:
+        await self._call("get_screenshot")
+        return self.screenshot
+
+    async def tap(self, x: float, y: float) -> None:
+        await self._call("tap")
+
+    async def swipe(self, start_x, start_y, end_x, end_y, duration_ms: int = 300) -> None:
+        await self._call("swipe")
+
+    async def type_text(self, text: str) -> None:
+        await self._call("type_text")
+
+    async def press_back(self) -> None:
+        await self._call("press_back")
+
+    async def press_home(self) -> None:
+        await self._call("press_home")
+
+    async def restart_app(self, package: str) -> bool:
+        await self._call("restart_app")
+        return True
+
+
+class FakeFileStorePort(FileStorePort):
+    """Dict-backed file store with optional per-put latency."""
+
+    def __init__(self, delay_s: float = 0.0, tracker: Optional[InFlight] = None):
+        self.blobs: Dict[str, bytes] = {}
+        self.delay_s = delay_s
+        self.tracker = tracker or InFlight()
+
+    async def put(self, key: str, data: bytes, content_type: str = "application/octet-stream") -> str:
+        async with self.tracker:
+            if self.delay_s:
+                await asyncio.sleep(self.delay_s)
+        self.blobs[key] = data
+        return key
+
+    async def get(self, key: str) -> bytes:
+        try:
+            return self.blobs[key]
+        except KeyError:
+            raise StorageError(f"missing key {key}")
+
+    async def delete(self, key: str) -> bool:
+        return self.blobs.pop(key, None) is not None
+
+    async def exists(self, key: str) -> bool:
+        return key in self.blobs
+
+    def generate_key(self, run_id: str, category: str, screen_id: str, extension: str) -> str:
+        return f"runs/{run_id}/{category}/{screen_id}.{extension}"
+
+    def ref_for(self, key: str, data: bytes) -> Optional[str]:
+        return key
+
+
+class FakeOCRPort(OCRPort):
+    """Returns fixed text after an optional delay."""
+
+    def __init__(self, text: str = "", delay_s: float = 0.0, tracker: Optional[InFlight] = None):
+        self.text = text
+        self.delay_s = delay_s
+        self.tracker = tracker or InFlight()
+
+    async def extract_text(self, image_bytes: bytes) -> OCRResult:
+        async with self.tracker:
+            if self.delay_s:
+                await asyncio.sleep(self.delay_s)
+        regions = [TextRegion(text=self.text, confidence=1.0, bounds=(0.0, 0.0, 1.0, 0.1))] if self.text else []
+        return OCRResult(full_text=self.text, regions=regions, confidence=1.0)
+
+    async def extract_text_regions(self, image_bytes: bytes) -> List[TextRegion]:
+        return (await self.extract_text(image_bytes)).regions
+
+
+class FakeRepoPort(RepoPort):
+    """In-memory ScreenGraph; nodes carry app_id and visits in metadata."""
+
+    def __init__(self):
+        self.nodes: Dict[str, Node] = {}
+        self.edges: Dict[Tuple[str, str, str], Edge] = {}
+        self.calls: List[str] = []
+
+    async def upsert_node(self, signature: str, metadata: Dict[str, Any]) -> str:
+        existing = self.nodes.get(signature)
+        merged = {**(existing.metadata if existing else {}), **metadata}
+        created_at = existing.created_at if existing else "t0"
+        self.nodes[signature] = Node(signature, merged, created_at, "t1")
+        return signature
+
+    async def upsert_edge(self, from_signature: str, to_signature: str, action: str, metadata: Dict[str, Any]) -> str:
+        key = (from_signature, to_signature, action)
+        self.edges[key] = Edge(from_signature, to_signature, action, metadata, "t0")
+        return "|".join(key)
+
+    async def get_node(self, signature: str) -> Optional[Node]:
+        return self.nodes.get(signature)
+
+    async def get_neighbors(self, signature: str) -> List[Node]:
+        return [self.nodes[to] for (frm, to, _) in self.edges if frm == signature and to in self.nodes]
+
+    async def get_top_nodes(self, app_id: str, limit: int) -> List[Node]:
+        self.calls.append("get_top_nodes")
+        nodes = [node for node in self.nodes.values() if node.metadata.get("app_id") == app_id]
+        nodes.sort(key=lambda node: node.metadata.get("visits", 0), reverse=True)
+        return nodes[:limit]
+
+    async def get_exploration_stats(self, run_id: str) -> ExplorationStats:
+        return ExplorationStats(len(self.nodes), len(self.edges), 0, 0.0)
+
+
+class FakeCachePort(CachePort):
+    """Dict-backed cache that records calls (no TTLs)."""
+
+    def __init__(self):
+        self.prompts: Dict[str, Dict[str, Any]] = {}
+        self.advice: Dict[str, Advice] = {}
+        self.calls: List[str] = []
+
+    async def get_prompt_cache(self, key: str) -> Optional[Dict[str, Any]]:
+        self.calls.append("get_prompt_cache")
+        return self.prompts.get(key)
+
+    async def set_prompt_cache(self, key: str, value: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        self.prompts[key] = value
+
+    async def get_advice(self, signature: str) -> Optional[Advice]:
+        self.calls.append("get_advice")
+        return self.advice.get(signature)
+
+    async def set_advice(self, signature: str, advice: Advice, ttl: Optional[int] = None) -> None:
+        self.advice[signature] = advice
+
+    async def invalidate(self, pattern: str) -> int:
+        return 0
+
+    async def get_stats(self) -> Dict[str, int]:
+        return {"size": len(self.prompts) + len(self.advice)}
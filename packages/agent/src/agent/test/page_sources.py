@@ -0,0 +1,38 @@
+"""
+Page Source Fixtures for Agent Core Unit Tests
+
+Sample UiAutomator2/XCUITest page sources shared by the parser, signature,
+salience, diff and graph tests.
+"""
+
+
+ANDROID_SOURCE = """<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>
+<hierarchy index="0" class="hierarchy" rotation="0" width="1000" height="2000">
+  <android.widget.FrameLayout class="android.widget.FrameLayout" resource-id="" text="" content-desc="" clickable="false" focusable="false" enabled="true" displayed="true" bounds="[0,0][1000,2000]">
+    <android.widget.TextView class="android.widget.TextView" resource-id="com.example:id/title" text="Welcome" content-desc="" clickable="false" focusable="false" enabled="true" displayed="true" bounds="[100,200][900,300]" />
+    <android.widget.Button class="android.widget.Button" resource-id="com.example:id/login" text="Log in" content-desc="" clickable="true" focusable="true" enabled="true" displayed="true" bounds="[100,1000][900,1200]" />
+    <android.widget.ImageButton class="android.widget.ImageButton" resource-id="" text="" content-desc="Settings" clickable="true" focusable="true" enabled="false" displayed="false" bounds="[900,0][1000,100]" />
+  </android.widget.FrameLayout>
+</hierarchy>"""
+
+IOS_SOURCE = """<?xml version="1.0" encoding="UTF-8"?>
+<AppiumAUT>
+  <XCUIElementTypeApplication type="XCUIElementTypeApplication" name="Example" enabled="true" visible="true" x="0" y="0" width="400" height="800">
+    <XCUIElementTypeButton type="XCUIElementTypeButton" name="login" label="Log in" enabled="true" visible="true" x="40" y="400" width="320" height="80" />
+  </XCUIElementTypeApplication>
+</AppiumAUT>"""
+
+
+def deep_source(depth: int, fanout: int) -> str:
+    """Synthetic hierarchy: a chain of `depth` layouts, each with `fanout` buttons."""
+    parts = ['<hierarchy width="1080" height="2400">']
+    for level in range(depth):
+        parts.append(f'<android.widget.LinearLayout class="android.widget.LinearLayout" bounds="[0,{level}][1080,2400]">')
+        for i in range(fanout):
+            parts.append(
+                f'<android.widget.Button class="android.widget.Button" text="Item {level}.{i}" '
+                f'clickable="true" bounds="[0,{i * 10}][540,{i * 10 + 10}]" />'
+            )
+    parts.extend('</android.widget.LinearLayout>' for _ in range(depth))
+    parts.append('</hierarchy>')
+    return ''.join(parts)
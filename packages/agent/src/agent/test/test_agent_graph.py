@@ -0,0 +1,256 @@
+"""
+Unit tests for the AgentGraph runtime and pipelined nodes.
+"""
+
+import asyncio
+from dataclasses import replace
+from unittest.mock import Mock
+
+import pytest
+
+from src.agent.domain.state import PersistResultSummary
+from src.agent.orchestrator.engine import AgentGraph
+from src.agent.orchestrator.graph import build_graph
+from src.agent.orchestrator.nodes.perceive import PerceiveNode
+from src.agent.services.salience_ranker import SalienceRanker
+from src.agent.services.signature_service import SignatureService
+from src.agent.test.fakes import FakeDriverPort, FakeFileStorePort, FakeOCRPort, InFlight, make_png
+from src.agent.test.page_sources import ANDROID_SOURCE
+
+
+class StepNode:
+    """Appends its name to a shared trace after an optional delay."""
+
+    def __init__(self, name, trace, delay_s=0.0, update=None, error=None):
+        self.name = name
+        self.trace = trace
+        self.delay_s = delay_s
+        self.update = update or {}
+        self.error = error
+
+    async def run(self, state):
+        if self.delay_s:
+            await asyncio.sleep(self.delay_s)
+        self.trace.append(self.name)
+        if self.error is not None:
+            raise self.error
+        return state.clone_with(**self.update)
+
+
+class TestAgentGraph:
+    """Tests for routing, timeouts, errors and background nodes."""
+
+    async def test_routes_until_terminal(self, fake_telemetry, initial_state):
+        """Static and computed routes are followed to the terminal node."""
+        trace = []
+        graph = AgentGraph(fake_telemetry)
+        graph.add_node("A", StepNode("A", trace), route="B")
+        graph.add_node("B", StepNode("B", trace), route=lambda s: "Stop" if len(trace) > 3 else "A")
+        graph.add_node("Stop", StepNode("Stop", trace), route=None)
+        graph.validate()
+
+        await graph.run(initial_state)
+
+        assert trace == ["A", "B", "A", "B", "Stop"]
+        assert [name for name, _ in fake_telemetry.spans] == trace
+        assert all(status == "ok" for _, status in fake_telemetry.spans)
+        assert [tags["node"] for name, _, tags in fake_telemetry.metrics] == trace
+
+    async def test_timeout_follows_error_route(self, fake_telemetry, initial_state):
+        """A node over its timeout goes to on_error and counts an error."""
+        trace = []
+        graph = AgentGraph(fake_telemetry)
+        graph.add_node("Slow", StepNode("Slow", trace, delay_s=1.0), route="Stop",
+                       timeout_ms=20, on_error="Recover")
+        graph.add_node("Recover", StepNode("Recover", trace), route="Stop")
+        graph.add_node("Stop", StepNode("Stop", trace), route=None)
+
+        final = await graph.run(initial_state)
+
+        assert trace == ["Recover", "Stop"]
+        assert (final.counters.errors, final.counters.consecutive_errors) == (1, 1)
+        assert final.stop_reason is None
+        assert fake_telemetry.spans[0] == ("Slow", "timeout")
+
+    async def test_failure_without_error_route_stops(self, fake_telemetry, initial_state):
+        """Timeouts and exceptions with no error route set the stop reason."""
+        graph = AgentGraph(fake_telemetry)
+        graph.add_node("Slow", StepNode("Slow", [], delay_s=1.0), route=None, timeout_ms=20)
+        final = await graph.run(initial_state)
+        assert final.stop_reason == final.STOP_TIMEOUT
+
+        graph = AgentGraph(fake_telemetry)
+        graph.add_node("Boom", StepNode("Boom", [], error=RuntimeError("boom")), route="Next")
+        graph.add_node("Next", StepNode("Next", []), route=None)
+        final = await graph.run(initial_state)
+        assert final.stop_reason == final.STOP_ERROR
+        assert final.counters.errors == 1
+
+    async def test_transition_cap(self, fake_telemetry, initial_state):
+        """Routing cycles stop after max_transitions."""
+        graph = AgentGraph(fake_telemetry, max_transitions=10)
+        graph.add_node("Loop", StepNode("Loop", []), route="Loop")
+        final = await graph.run(initial_state)
+        assert final.stop_reason == final.STOP_BUDGET_EXHAUSTED
+        assert len(fake_telemetry.spans) == 10
+
+    async def test_background_node_overlaps_next(self, fake_telemetry, initial_state):
+        """A background node runs alongside the next one and is merged before Stop."""
+        trace = []
+        summary = PersistResultSummary(nodes_added=1, edges_added=1)
+        choose_started = asyncio.Event()
+
+        class Persist(StepNode):
+            async def run(self, state):
+                # Only completes if Choose starts while Persist is still running
+                await asyncio.wait_for(choose_started.wait(), timeout=5)
+                return await super().run(state)
+
+        class Choose(StepNode):
+            async def run(self, state):
+                choose_started.set()
+                return await super().run(state)
+
+        graph = AgentGraph(fake_telemetry)
+        graph.add_node("Persist", Persist("Persist", trace, update={"persist_result": summary}),
+                       route="Choose", background=True,
+                       merge=lambda current, done: current.clone_with(persist_result=done.persist_result))
+        graph.add_node("Choose", Choose("Choose", trace), route="Stop")
+        graph.add_node("Stop", StepNode("Stop", trace), route=None)
+
+        final = await graph.run(initial_state)
+
+        assert trace == ["Choose", "Persist", "Stop"]
+        assert final.persist_result == summary
+        assert final.counters.errors == 0
+
+    async def test_background_failure_is_counted(self, fake_telemetry, initial_state):
+        """Background failures do not reroute the loop but count as errors."""
+        trace = []
+        graph = AgentGraph(fake_telemetry)
+        graph.add_node("Persist", StepNode("Persist", trace, error=RuntimeError("db down")),
+                       route="Stop", background=True)
+        graph.add_node("Stop", StepNode("Stop", trace), route=None)
+        final = await graph.run(initial_state)
+        assert trace == ["Persist", "Stop"]
+        assert (final.counters.errors, final.counters.consecutive_errors) == (1, 0)
+        assert final.stop_reason is None
+
+    async def test_on_transition_sees_every_state(self, fake_telemetry, initial_state):
+        """on_transition gets each foreground result and each background join."""
+        trace, seen = [], []
+        summary = PersistResultSummary(nodes_added=1)
+        graph = AgentGraph(fake_telemetry)
+        graph.add_node("A", StepNode("A", trace, update={"plan_cursor": 1}), route="Persist")
+        graph.add_node("Persist", StepNode("Persist", trace, update={"persist_result": summary}),
+                       route="Stop", background=True,
+                       merge=lambda current, done: current.clone_with(persist_result=done.persist_result))
+        graph.add_node("Stop", StepNode("Stop", trace), route=None)
+        final = await graph.run(initial_state, on_transition=lambda name, state: seen.append((name, state)))
+        assert [name for name, _ in seen] == ["A", "Persist", "Stop"]
+        assert seen[0][1].plan_cursor == 1
+        assert seen[1][1].persist_result == summary
+        assert seen[-1][1] is final
+
+    def test_validate_rejects_unknown_routes(self, fake_telemetry):
+        graph = AgentGraph(fake_telemetry)
+        graph.add_node("A", StepNode("A", []), route="Missing")
+        with pytest.raises(ValueError):
+            graph.validate()
+        with pytest.raises(ValueError):
+            graph.add_node("A", StepNode("A", []))
+
+    def test_build_graph(self, fake_driver, fake_ocr, fake_filestore, fake_telemetry):
+        """build_graph wires every node and takes timeouts from policy."""
+        graph = build_graph(
+            driver=fake_driver, ocr=fake_ocr, filestore=fake_filestore, llm=Mock(), cache=Mock(),
+            budget=Mock(), repo=Mock(), telemetry=fake_telemetry,
+        )
+        assert graph.entry == "EnsureDevice"
+        assert len(graph.nodes) == 16
+        assert graph.nodes["Persist"].background
+        assert graph.nodes["ChooseAction"].timeout_ms == 30000
+        assert graph.nodes["Stop"].route is None
+
+
+    async def test_persistent_failure_ends_at_restart_budget(self, fake_ocr, fake_filestore, fake_cache, fake_repo,
+                                                             fake_telemetry, initial_state):
+        """A node that keeps failing is retried, then restarted until restart_limit, then stopped."""
+
+        class BrokenDriver(FakeDriverPort):
+            async def get_page_source(self) -> str:
+                raise ConnectionError("device gone")
+
+        driver = BrokenDriver()
+        graph = build_graph(
+            driver=driver, ocr=fake_ocr, filestore=fake_filestore, llm=Mock(), cache=fake_cache,
+            budget=Mock(), repo=fake_repo, telemetry=fake_telemetry,
+        )
+        final = await graph.run(initial_state)
+
+        assert fake_telemetry.spans[-1] == ("Stop", "ok")
+        assert final.is_budget_exhausted()
+        assert final.counters.restarts_used == final.budgets.restart_limit
+        assert driver.calls.count("restart_app") == final.budgets.restart_limit
+        assert len(fake_telemetry.spans) < 100  # far below MAX_GRAPH_TRANSITIONS
+
+    async def test_spread_out_errors_do_not_restart(self, fake_ocr, fake_filestore, fake_cache, fake_repo,
+                                                    fake_telemetry, initial_state):
+        """Errors separated by successful actions never build a streak, however many there are."""
+
+        class FlakyAct:
+            calls = 0
+
+            async def run(self, state):
+                self.calls += 1
+                if self.calls % 2:
+                    raise ConnectionError("tap dropped")
+                return state
+
+        driver = FakeDriverPort()
+        graph = build_graph(
+            driver=driver, ocr=fake_ocr, filestore=fake_filestore, llm=Mock(), cache=fake_cache,
+            budget=Mock(), repo=fake_repo, telemetry=fake_telemetry,
+        )
+        act = FlakyAct()
+        # Loop WaitIdle → Act (fails every other call) → ... → Stop, on the real error wiring
+        graph.nodes["WaitIdle"] = replace(graph.nodes["WaitIdle"], route="Act")
+        graph.nodes["Act"] = replace(
+            graph.nodes["Act"], node=act, route=lambda state: "Stop" if act.calls >= 20 else "WaitIdle",
+        )
+        final = await graph.run(initial_state, entry="WaitIdle")
+
+        assert final.counters.errors == 10
+        assert final.counters.consecutive_errors == 0
+        assert final.counters.restarts_used == 0 and "restart_app" not in driver.calls
+        assert fake_telemetry.spans[-1] == ("Stop", "ok")
+
+
+class TestPerceiveNode:
+    """Tests for PerceiveNode's concurrent capture pipeline."""
+
+    async def test_perceive_overlaps_storage_and_ocr(self, fake_telemetry, initial_state):
+        """Storage and OCR run concurrently, not one after another."""
+        tracker = InFlight()
+        filestore = FakeFileStorePort(delay_s=0.05, tracker=tracker)
+        node = PerceiveNode(
+            driver=FakeDriverPort(page_source=ANDROID_SOURCE, screenshot=make_png()),
+            ocr=FakeOCRPort(text="Welcome Sign in", delay_s=0.05, tracker=tracker),
+            filestore=filestore,
+            signature_service=SignatureService(),
+            salience_ranker=SalienceRanker(top_k=2),
+            telemetry=fake_telemetry,
+        )
+
+        state = await node.run(initial_state)
+
+        # Screenshot put, page source put and OCR were in flight together
+        assert tracker.peak == 3
+        assert state.signature is not None
+        assert state.previous_signature == initial_state.signature
+        assert set(filestore.blobs) == {
+            state.bundle.screenshot_ref, state.bundle.page_source_ref, state.bundle.ocr_ref,
+        }
+        assert state.bundle.screenshot_ref.endswith("step-00000.png")
+        assert len(state.ranked_elements) == 2
+        assert all(not element.children for element in state.ranked_elements)
@@ -0,0 +1,128 @@
+"""
+Unit and property tests for CacheKeyBuilder.
+
+Properties are checked over seeded random JSON-like values (stdlib only).
+"""
+
+import random
+from enum import Enum
+
+import pytest
+
+from src.agent.domain.state import Bounds, EnumeratedAction
+from src.agent.services.cache_key_builder import (
+    LLM_NODE_TYPES,
+    CacheKeyBuilder,
+    canonical_encode,
+    stable_digest,
+)
+
+
+class Policy(str, Enum):
+    BREADTH = "breadth"
+
+
+def _random_value(rng: random.Random, depth: int = 0):
+    kinds = ["str", "int", "float", "bool", "none"]
+    if depth < 3:
+        kinds += ["dict", "list", "dict"]
+    kind = rng.choice(kinds)
+    if kind == "str":
+        return "".join(rng.choice("ab:;{}[]s1é ") for _ in range(rng.randint(0, 6)))
+    if kind == "int":
+        return rng.randint(-1000, 1000)
+    if kind == "float":
+        return rng.uniform(-1, 1)
+    if kind == "bool":
+        return rng.random() < 0.5
+    if kind == "none":
+        return None
+    if kind == "list":
+        return [_random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    return {f"k{rng.randint(0, 20)}": _random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))}
+
+
+def _equivalent_copy(rng: random.Random, value):
+    """Same value, different construction: shuffled dict order, tuples, float noise."""
+    if isinstance(value, dict):
+        items = list(value.items())
+        rng.shuffle(items)
+        return {k: _equivalent_copy(rng, v) for k, v in items}
+    if isinstance(value, list):
+        copied = [_equivalent_copy(rng, v) for v in value]
+        return tuple(copied) if rng.random() < 0.5 else copied
+    if isinstance(value, float):
+        return value + 1e-12
+    return value
+
+
+class TestCanonicalEncoding:
+    """Properties of the canonical encoding."""
+
+    def test_equal_inputs_give_equal_keys(self):
+        builder = CacheKeyBuilder(model="m")
+        rng = random.Random(1234)
+        for _ in range(500):
+            diet = {"signature": "abc", "delta": _random_value(rng), "top_k": _random_value(rng)}
+            twin = _equivalent_copy(rng, diet)
+            assert canonical_encode(diet) == canonical_encode(twin)
+            assert builder.build("choose_action", diet) == builder.build("choose_action", twin)
+
+    def test_different_inputs_give_different_keys(self):
+        """Distinct values never share an encoding (no collisions in the sample)."""
+        rng = random.Random(99)
+        seen = {}
+        for _ in range(2000):
+            value = _random_value(rng)
+            encoded = canonical_encode(value)
+            if encoded in seen:
+                assert canonical_encode(seen[encoded]) == encoded
+            seen[encoded] = value
+        assert canonical_encode(["a", "b"]) != canonical_encode(["ab"])
+        assert canonical_encode({"a": "b"}) != canonical_encode(["a", "b"])
+        assert canonical_encode(True) != canonical_encode(1)
+
+    def test_float_normalization(self):
+        assert canonical_encode(0.1 + 0.2) == canonical_encode(0.3)
+        assert canonical_encode(-0.0) == canonical_encode(0.0) == canonical_encode(0)
+        assert canonical_encode(1.0) == canonical_encode(1)
+        assert canonical_encode(0.5) != canonical_encode(0.500002)
+        assert canonical_encode(float("nan")) == canonical_encode(float("nan"))
+
+    def test_dataclasses_enums_and_sets(self):
+        action = EnumeratedAction(verb="tap", bounds_norm=Bounds(x=0.1, y=0.2, width=0.3, height=0.1))
+        same = EnumeratedAction(verb="tap", bounds_norm=Bounds(x=0.1, y=0.2, width=0.3, height=0.1))
+        assert stable_digest([action]) == stable_digest([same])
+        assert canonical_encode(Policy.BREADTH) == canonical_encode("breadth")
+        assert canonical_encode({"b", "a"}) == canonical_encode(frozenset(["a", "b"]))
+        with pytest.raises(TypeError):
+            canonical_encode(object())
+
+
+class TestCacheKeyBuilder:
+    """Tests for key layout and salts."""
+
+    def test_key_layout(self):
+        builder = CacheKeyBuilder(model="gpt-4o")
+        key = builder.build("verify", {"signature": "sig1", "delta": {"added": ["Login"]},
+                                       "policy": Policy.BREADTH, "top_k": [1, 2]})
+        node, model, version, signature, delta, top_k, policy = key.split(":")
+        assert (node, model, version, signature, policy) == ("verify", "gpt-4o", "p1", "sig1", "breadth")
+        assert len(delta) == len(top_k) == 16
+        assert builder.build("verify", None).endswith(":-:-:-:-")
+
+    def test_model_and_prompt_version_salt(self):
+        diet = {"signature": "sig1", "top_k": [1]}
+        base = CacheKeyBuilder(model="m1").build("choose_action", diet)
+        assert CacheKeyBuilder(model="m2").build("choose_action", diet) != base
+        bumped = CacheKeyBuilder(model="m1", prompt_versions={"choose_action": 2})
+        assert bumped.build("choose_action", diet) != base
+        assert bumped.build("verify", diet) == CacheKeyBuilder(model="m1").build("verify", diet)
+        assert base.startswith(CacheKeyBuilder(model="m1").node_pattern("choose_action")[:-1])
+
+    def test_node_types(self):
+        builder = CacheKeyBuilder(model="m")
+        keys = {builder.build(node_type, {"signature": "s"}) for node_type in LLM_NODE_TYPES}
+        assert len(keys) == 5
+        with pytest.raises(ValueError):
+            builder.build("perceive", {})
@@ -0,0 +1,89 @@
+"""
+Unit tests for GraphIndex.
+"""
+
+import random
+from collections import deque
+
+from src.agent.domain import GraphIndex
+
+
+def _bfs_distance(edges, source, target):
+    adjacency = {}
+    for frm, to, _ in edges:
+        adjacency.setdefault(frm, []).append(to)
+    seen = {source: 0}
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        if node == target:
+            return seen[node]
+        for successor in adjacency.get(node, ()):
+            if successor not in seen:
+                seen[successor] = seen[node] + 1
+                queue.append(successor)
+    return None
+
+
+def _follows(graph, source, path):
+    node = source
+    for action, successor in path:
+        assert (action, successor) in graph.neighbors(node)
+        node = successor
+    return node
+
+
+class TestGraphIndex:
+    """Tests for edge updates, shortest paths and frontier search."""
+
+    def test_paths_and_dedup(self):
+        graph = GraphIndex([("home", "login", "tap:Login"), ("login", "feed", "tap:Submit")])
+        assert graph.add_edge("home", "settings", "tap:Gear")
+        assert not graph.add_edge("home", "login", "tap:Login")
+        assert (len(graph), graph.edge_count) == (4, 3)
+
+        assert graph.shortest_path("home", "feed") == [("tap:Login", "login"), ("tap:Submit", "feed")]
+        assert graph.shortest_path("home", "home") == []
+        assert graph.shortest_path("feed", "home") is None
+        assert graph.shortest_path("home", "unknown") is None
+
+        graph.add_edge("feed", "home", "back")
+        assert graph.shortest_path("feed", "settings") == [("back", "home"), ("tap:Gear", "settings")]
+
+    def test_nearest_frontier(self):
+        graph = GraphIndex([("home", "a", "tap:A"), ("a", "b", "tap:B"), ("home", "c", "tap:C")])
+        assert graph.nearest_frontier("home") is None  # no action counts known
+
+        graph.set_action_count("home", 2)  # both tried
+        graph.set_action_count("b", 3)
+        graph.set_action_count("c", 0)
+        assert graph.unexplored("home") == 0 and graph.unexplored("b") == 3
+        assert graph.nearest_frontier("home") == ("b", [("tap:A", "a"), ("tap:B", "b")])
+        assert graph.nearest_frontier("home", max_depth=1) is None
+
+        graph.set_action_count("a", 2)
+        assert graph.nearest_frontier("home") == ("a", [("tap:A", "a")])
+        graph.add_edge("a", "d", "tap:D")
+        assert graph.unexplored("a") == 0
+        graph.add_edge("a", "e", "tap:D")  # same action, other outcome: still one explored action
+        assert graph.unexplored("a") == 0 and graph.nearest_frontier("home")[0] == "b"
+
+    def test_matches_bfs_across_compactions(self):
+        rng = random.Random(3)
+        nodes = [f"s{i}" for i in range(400)]
+        graph = GraphIndex()
+        edges = []
+        for step in range(3000):
+            edge = (rng.choice(nodes), rng.choice(nodes), f"tap:{rng.randrange(6)}")
+            if graph.add_edge(*edge):
+                edges.append(edge)
+            if step == 1500:
+                graph.compact()
+        for _ in range(100):
+            source, target = rng.choice(nodes), rng.choice(nodes)
+            path = graph.shortest_path(source, target)
+            expected = _bfs_distance(edges, source, target)
+            if expected is None:
+                assert path is None
+            else:
+                assert len(path) == expected and _follows(graph, source, path) == target
@@ -0,0 +1,128 @@
+"""
+Unit tests for PageSourceParser and ElementTable.
+"""
+
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from src.agent.domain.element_table import (
+    ElementTable, UIElementView, FLAG_CLICKABLE, FLAG_VISIBLE, FLAG_ENABLED, role_id
+)
+from src.agent.domain.ui_element import UIElement
+from src.agent.services.page_source_parser import (
+    PageSourceParser, parse_page_source, role_for_class
+)
+from src.agent.test.page_sources import ANDROID_SOURCE, IOS_SOURCE, deep_source
+
+
+class TestPageSourceParser:
+    """Tests for PageSourceParser."""
+
+    def test_android_rows(self):
+        """Rows carry role, normalized bounds, flags, text and ids."""
+        table = parse_page_source(ANDROID_SOURCE)
+
+        assert len(table) == 4
+        assert [table.role(i) for i in range(4)] == ['container', 'text', 'button', 'button']
+        assert table.bounds_of(2) == pytest.approx((0.1, 0.5, 0.8, 0.1))
+        assert table.has_flag(2, FLAG_CLICKABLE)
+        assert table.has_flag(2, FLAG_VISIBLE | FLAG_ENABLED)
+        assert not table.has_flag(3, FLAG_VISIBLE)
+        assert not table.has_flag(3, FLAG_ENABLED)
+        assert table.texts[1] == 'Welcome'
+        assert table.texts[3] == 'Settings'  # falls back to content-desc
+        assert table.resource_ids[2] == 'com.example:id/login'
+        assert list(table.parents) == [-1, 0, 0, 0]
+        assert list(table.depths) == [0, 1, 1, 1]
+        assert list(table.children(0)) == [1, 2, 3]
+
+    def test_ios_rows(self):
+        """iOS sources use x/y/width/height and implicit clickability."""
+        table = parse_page_source(IOS_SOURCE)
+
+        assert [table.role(i) for i in range(len(table))] == ['container', 'button']
+        assert table.bounds_of(1) == pytest.approx((0.1, 0.5, 0.8, 0.1))
+        assert table.has_flag(1, FLAG_CLICKABLE)
+        assert table.texts[1] == 'Log in'
+
+    def test_chunked_feed_matches_single_parse(self):
+        """Feeding arbitrary chunks yields the same table."""
+        expected = parse_page_source(ANDROID_SOURCE)
+        parser = PageSourceParser()
+        for offset in range(0, len(ANDROID_SOURCE), 7):
+            parser.feed(ANDROID_SOURCE[offset:offset + 7])
+        table = parser.close()
+
+        assert list(table.roles) == list(expected.roles)
+        assert list(table.bounds) == list(expected.bounds)
+        assert list(table.flags) == list(expected.flags)
+        assert table.texts == expected.texts
+
+    def test_screen_size_from_first_element(self):
+        """Without a sized wrapper, the first element defines the screen."""
+        source = ANDROID_SOURCE.replace(' width="1000" height="2000"', '')
+        table = parse_page_source(source)
+        assert table.bounds_of(1) == pytest.approx((0.1, 0.1, 0.8, 0.05))
+
+    def test_deep_hierarchy(self):
+        """Deep, wide hierarchies parse into a flat table."""
+        table = parse_page_source(deep_source(depth=100, fanout=20))
+
+        assert len(table) == 100 * 21
+        assert max(table.depths) == 100
+        assert all(table.parents[i] < i for i in range(1, len(table)))
+
+    def test_malformed_xml_raises(self):
+        """Malformed XML surfaces as a ParseError."""
+        with pytest.raises(ET.ParseError):
+            parse_page_source('<hierarchy><android.widget.Button></hierarchy>')
+
+    def test_role_for_class(self):
+        """Class names map to roles, with suffix fallback for subclasses."""
+        assert role_for_class('android.widget.EditText') == 'input'
+        assert role_for_class('androidx.appcompat.widget.AppCompatButton') == 'button'
+        assert role_for_class('androidx.recyclerview.widget.RecyclerView') == 'list'
+        assert role_for_class('XCUIElementTypeStaticText') == 'text'
+        assert role_for_class('com.example.Mystery') == 'unknown'
+
+
+class TestElementTableViews:
+    """Tests for lazy UIElement views."""
+
+    def test_view_matches_ui_element_api(self):
+        """Views expose the UIElement attributes and helpers."""
+        table = parse_page_source(ANDROID_SOURCE)
+        login = table.view(2)
+
+        assert login.role == 'button'
+        assert login.text == 'Log in'
+        assert login.is_interactive()
+        assert login.has_text()
+        assert login.get_tap_point() == pytest.approx((0.5, 0.55))
+        assert login.metadata == {'resource-id': 'com.example:id/login', 'class': 'android.widget.Button'}
+        assert login.parent == table.view(0)
+        assert [child.text for child in table.view(0).children] == ['Welcome', 'Log in', 'Settings']
+
+    def test_materialize(self):
+        """Materializing builds the equivalent frozen UIElement tree."""
+        table = parse_page_source(ANDROID_SOURCE)
+        roots = table.to_ui_elements()
+
+        assert len(roots) == 1
+        assert isinstance(roots[0], UIElement)
+        assert [c.role for c in roots[0].children] == ['text', 'button', 'button']
+        assert roots[0].children[1].clickable
+
+    def test_append_links_siblings(self):
+        """Manual appends maintain parent/child/sibling links."""
+        table = ElementTable()
+        root = table.append('container', (0.0, 0.0, 1.0, 1.0), FLAG_VISIBLE)
+        first = table.append('text', (0.0, 0.0, 1.0, 0.1), FLAG_VISIBLE, parent=root, text='a')
+        second = table.append('button', (0.0, 0.1, 1.0, 0.1), FLAG_CLICKABLE, parent=root, text='b')
+
+        assert list(table.children(root)) == [first, second]
+        assert table.roles[second] == role_id('button')
+        assert isinstance(table.view(first), UIElementView)
+        with pytest.raises(IndexError):
+            table.view(3)
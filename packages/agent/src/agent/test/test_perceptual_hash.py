@@ -0,0 +1,89 @@
+"""
+Unit tests for screenshot perceptual hashing.
+"""
+
+import io
+
+import pytest
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from src.agent.domain.element_table import ElementTable, FLAG_VISIBLE
+from src.agent.domain.screen_signature import SIMHASH_BITS, compute_delta
+from src.agent.services.perceptual_hash import (
+    decode_grayscale, dhash, downscale, phash, screenshot_phash
+)
+from src.agent.services.signature_service import SignatureService
+
+
+def _screen(seed: int, width: int = 360, height: int = 800) -> np.ndarray:
+    """Flat, UI-like RGB frame: cards on a light background."""
+    rng = np.random.default_rng(seed)
+    pixels = np.full((height, width, 3), 240, np.uint8)
+    for _ in range(12):
+        y, x = rng.integers(0, height - 60), rng.integers(0, width - 60)
+        pixels[y:y + rng.integers(30, 200), x:x + rng.integers(30, 300)] = rng.integers(0, 255, 3)
+    return pixels
+
+
+def _png(pixels: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _canvas_table() -> ElementTable:
+    """A single full-screen view: what a game or canvas screen exposes."""
+    table = ElementTable()
+    table.append('container', (0.0, 0.0, 1.0, 1.0), FLAG_VISIBLE)
+    return table
+
+
+class TestPerceptualHash:
+    """Tests for pHash/dHash."""
+
+    def test_decode_grayscale(self):
+        """PNG bytes decode to a 2D uint8 array of the frame's size."""
+        gray = decode_grayscale(_png(_screen(1)))
+        assert gray.shape == (800, 360)
+        assert gray.dtype == np.uint8
+
+    def test_downscale_box_mean(self):
+        """Downscaling averages blocks."""
+        gray = np.zeros((4, 4), np.uint8)
+        gray[:2, :2] = 200
+        assert downscale(gray, 2, 2).tolist() == [[200.0, 0.0], [0.0, 0.0]]
+        with pytest.raises(ValueError):
+            downscale(gray, 8, 8)
+
+    def test_hashes_are_stable_under_small_changes(self):
+        """Noise and a changed status-bar clock barely move the hash; another screen does."""
+        pixels = _screen(1)
+        noisy = np.clip(pixels.astype(int) + np.random.default_rng(9).integers(-6, 7, pixels.shape), 0, 255).astype(np.uint8)
+        clock = pixels.copy()
+        clock[5:20, 300:350] = 0
+        other = _screen(2)
+
+        base = screenshot_phash(_png(pixels))
+        assert screenshot_phash(_png(pixels)) == base
+        assert (base ^ screenshot_phash(_png(noisy))).bit_count() <= 4
+        assert (base ^ screenshot_phash(_png(clock))).bit_count() <= 4
+        assert (base ^ screenshot_phash(_png(other))).bit_count() > 16
+
+        gray = decode_grayscale(_png(pixels))
+        assert 0 <= phash(gray) < 1 << 64
+        assert dhash(gray) == dhash(decode_grayscale(_png(pixels)))
+        assert (dhash(gray) ^ dhash(decode_grayscale(_png(other)))).bit_count() > 8
+
+    def test_signature_delta_uses_phash(self):
+        """Canvas screens with identical layout differ through the screenshot."""
+        service = SignatureService()
+        first = service.compute_signature(_canvas_table(), '', screenshot=_png(_screen(1)))
+        same = service.compute_signature(_canvas_table(), '', screenshot=_png(_screen(1)))
+        second = service.compute_signature(_canvas_table(), '', screenshot=_png(_screen(2)))
+
+        assert first.phash is not None
+        assert first == second  # identity ignores pixels
+        assert compute_delta(first, same) == 0.0
+        assert compute_delta(first, second) > 16 / SIMHASH_BITS
@@ -0,0 +1,107 @@
+"""
+Unit tests for persistent collections and AgentState structural sharing.
+"""
+
+import random
+
+import pytest
+
+from src.agent.domain import AgentState, PMap, PVector, diff
+from src.agent.domain.state import Advice, CacheEntry, Counters, EnumeratedAction
+
+
+class CollidingKey:
+    """Key with a chosen hash, to force HAMT collisions."""
+
+    def __init__(self, value, key_hash):
+        self.value = value
+        self.key_hash = key_hash
+
+    def __hash__(self):
+        return self.key_hash
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and other.value == self.value
+
+
+class TestPVector:
+    """Tests for list compatibility and non-destructive updates."""
+
+    def test_compares_like_a_list(self):
+        vector = PVector([1, 2])
+        assert vector == [1, 2] and [1, 2] == vector and vector == (1, 2)
+        assert not vector != [1, 2]
+        assert vector != [1, 2, 3]
+
+    def test_updates_return_new_vectors(self):
+        vector = PVector(["a"])
+        assert vector.appended("b") == ["a", "b"]
+        assert vector.extended(["b", "c"]).replaced(0, "z") == ["z", "b", "c"]
+        assert vector == ["a"]
+
+
+class TestPMap:
+    """Tests for the HAMT against a dict model."""
+
+    def test_matches_dict_model(self):
+        rng = random.Random(0)
+        keys = [CollidingKey(n, rng.choice([rng.getrandbits(64), n % 3])) for n in range(60)] + list(range(60))
+        current, model = PMap(), {}
+        for _ in range(2000):
+            key = rng.choice(keys)
+            previous = current
+            if key in model and rng.random() < 0.3:
+                current = current.delete(key)
+                del model[key]
+            else:
+                model[key] = rng.randrange(4)
+                current = current.set(key, model[key])
+            assert current.changed_keys(previous) <= {key}
+            assert len(current) == len(model)
+            assert list(current.items()) == list(model.items())
+        assert all((key in current) == (key in model) for key in keys)
+
+    def test_persistence_and_sharing(self):
+        base = PMap({"a": 1, "b": 2})
+        updated = base.set("c", 3).delete("a")
+        assert base == {"a": 1, "b": 2}
+        assert updated == {"b": 2, "c": 3}
+        assert base.set("a", 1) is base
+        assert updated.changed_keys(base) == {"a", "c"}
+        with pytest.raises(KeyError):
+            base.delete("missing")
+
+
+class TestAgentStateSharing:
+    """Tests for clone_with, collection coercion and diff."""
+
+    def test_plain_collections_are_converted(self):
+        state = AgentState(
+            enumerated_actions=[EnumeratedAction(verb="tap")],
+            cache={"sig": CacheEntry(advice=Advice(plan=["back"]))},
+        )
+        assert isinstance(state.enumerated_actions, PVector)
+        assert isinstance(state.cache, PMap)
+        assert isinstance(state.cache["sig"].advice.plan, PVector)
+        assert isinstance(state.clone_with(ranked_elements=[]).ranked_elements, PVector)
+
+    def test_clone_with_shares_unchanged_fields(self):
+        state = AgentState(run_id="r1", enumerated_actions=[EnumeratedAction(verb="tap")])
+        clone = state.clone_with(plan_cursor=2)
+        assert clone.enumerated_actions is state.enumerated_actions
+        assert clone.timestamps.created_at == state.timestamps.created_at
+        assert clone.plan_cursor == 2 and state.plan_cursor == 0
+        with pytest.raises(TypeError):
+            state.clone_with(no_such_field=1)
+
+    def test_diff(self):
+        state = AgentState(cache={"a": CacheEntry()})
+        assert diff(state, state) == {}
+        updated = state.clone_with(
+            counters=Counters(steps_total=1),
+            cache=state.cache.set("b", CacheEntry()),
+            enumerated_actions=list(state.enumerated_actions),
+        )
+        changes = diff(state, updated)
+        assert set(changes) == {"timestamps", "counters", "cache"}
+        assert changes["counters"] == Counters(steps_total=1)
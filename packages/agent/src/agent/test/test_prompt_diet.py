@@ -0,0 +1,124 @@
+"""
+Unit tests for PromptDiet and the token estimator.
+"""
+
+import pytest
+
+from src.agent.domain import AgentState, PMap, PVector, ScreenSignature
+from src.agent.domain.state import Advice, Bounds, EnumeratedAction, PersistResultSummary
+from src.agent.domain.ui_element import UIElement
+from src.agent.services.cache_key_builder import LLM_NODE_TYPES, CacheKeyBuilder
+from src.agent.services.prompt_diet import NODE_TOKEN_BUDGETS, PromptDiet
+from src.agent.services.token_estimator import estimate_tokens, estimate_value_tokens
+
+
+def _state(actions: int = 30, elements: int = 20, cursor: int = 2, previous: bool = True) -> AgentState:
+    return AgentState(
+        signature=ScreenSignature(hash="a" * 64, simhash=0b1011),
+        previous_signature=ScreenSignature(hash="b" * 64, simhash=0b0011) if previous else None,
+        enumerated_actions=[
+            EnumeratedAction(verb="tap", target_role="button", text_or_icon=f"Open section {i}") for i in range(actions)
+        ],
+        ranked_elements=[
+            UIElement(role="button", text=f"Item {i}", bounds=Bounds(0.123, 0.456, 0.5, 0.05)) for i in range(elements)
+        ],
+        advice=Advice(plan=["tap Login", "type email", "tap Next", "scroll", "tap Settings"], source="llm", confidence=0.8),
+        plan_cursor=cursor,
+        persist_result=PersistResultSummary(nodes_added=1, edges_added=2),
+    )
+
+
+class TestTokenEstimator:
+    def test_counts(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("Sign in with Google") == 4
+        assert estimate_tokens("internationalization") == 4
+        assert estimate_tokens("こんにちは") == 5
+
+    def test_monotonic_in_length(self):
+        assert estimate_tokens("tap") <= estimate_tokens("tap the") <= estimate_tokens("tap the login button")
+
+    def test_value_costs_structure(self):
+        assert estimate_value_tokens("tap") == estimate_tokens("tap") + 1
+        assert estimate_value_tokens(["tap", "tap"]) > estimate_value_tokens(["tap"])
+        assert estimate_value_tokens({"verb": "tap"}) > estimate_value_tokens("tap")
+        assert estimate_value_tokens(None) == 1
+
+    def test_persistent_containers_cost_like_json(self):
+        assert estimate_value_tokens(PVector(["tap", "Login"])) == estimate_value_tokens(["tap", "Login"])
+        assert estimate_value_tokens(PMap({"verb": "tap"})) == estimate_value_tokens({"verb": "tap"})
+
+
+class TestPromptDiet:
+    @pytest.mark.parametrize("node_type", LLM_NODE_TYPES)
+    def test_every_node_fits_its_budget(self, node_type):
+        packed = PromptDiet().pack(node_type, _state())
+        assert packed.budget_tokens == NODE_TOKEN_BUDGETS[node_type]
+        assert packed.estimated_tokens == estimate_value_tokens(packed.payload)
+        assert packed.estimated_tokens <= packed.budget_tokens
+        assert packed.payload["signature"] == "a" * 64
+
+    def test_choose_action_top_k_with_indexes(self):
+        payload = PromptDiet(top_k_actions=5).diet_for_choose_action(_state())
+        assert [item["i"] for item in payload["actions"]] == [0, 1, 2, 3, 4]
+        assert payload["actions"][0] == {"i": 0, "verb": "tap", "role": "button", "text": "Open section 0"}
+        assert payload["plan"] == ["tap Next", "scroll", "tap Settings"]
+        assert payload["delta"]["from"] == "b" * 64
+
+    def test_delta_is_none_on_first_screen(self):
+        assert PromptDiet().diet_for_verify(_state(previous=False))["delta"] is None
+
+    def test_verify_expected_and_anchors(self):
+        state = _state()
+        # plan_cursor indexes the plan, not enumerated_actions: their predictions are not used
+        state = state.clone_with(enumerated_actions=[
+            EnumeratedAction(verb="tap", text_or_icon=f"Open section {i}", expected_postcondition=f"Section {i} open")
+            for i in range(3)
+        ])
+        payload = PromptDiet(top_k_elements=3).diet_for_verify(state)
+        assert payload["expected"] == "type email"
+        assert [anchor["text"] for anchor in payload["anchors"]] == ["Item 0", "Item 1", "Item 2"]
+        assert payload["anchors"][0]["box"] == [0.12, 0.46, 0.5, 0.05]
+
+    def test_recent_is_last_n_most_recent_first(self):
+        payload = PromptDiet(last_n=2).diet_for_switch_policy(_state(cursor=4))
+        assert payload["recent"] == ["scroll", "tap Next"]
+        assert payload["plan"] == ["tap Settings"]
+
+    def test_budget_drops_lowest_ranked_items(self):
+        diet = PromptDiet(budgets={"choose_action": 300}, top_k_actions=30)
+        packed = diet.pack("choose_action", _state())
+        assert packed.estimated_tokens <= 300
+        assert packed.dropped["actions"] > 0
+        kept = [item["i"] for item in packed.payload["actions"]]
+        assert kept == list(range(len(kept)))
+        assert "elements" in packed.payload
+
+    def test_first_fit_skips_long_item_but_keeps_shorter(self):
+        state = _state(actions=0, elements=0)
+        state = state.clone_with(enumerated_actions=[
+            EnumeratedAction(verb="tap", text_or_icon="x " * 200),
+            EnumeratedAction(verb="tap", text_or_icon="ok"),
+        ])
+        packed = PromptDiet(budgets={"choose_action": 130}, max_text_chars=400).pack("choose_action", state)
+        assert [item["i"] for item in packed.payload["actions"]] == [1]
+        assert packed.dropped == {"actions": 1}
+
+    def test_long_texts_are_truncated(self):
+        state = _state(actions=1).clone_with(
+            enumerated_actions=[EnumeratedAction(verb="tap", text_or_icon="y" * 500)]
+        )
+        text = PromptDiet(max_text_chars=20).diet_for_choose_action(state)["actions"][0]["text"]
+        assert len(text) == 20 and text.endswith("…")
+
+    def test_unknown_node_raises(self):
+        with pytest.raises(ValueError):
+            PromptDiet().pack("unknown", _state())
+
+    def test_payload_feeds_cache_key_builder(self):
+        diet, builder = PromptDiet(), CacheKeyBuilder(model="test-model")
+        state = _state()
+        first = builder.build("verify", diet.diet_for_verify(state))
+        assert first == builder.build("verify", diet.diet_for_verify(state))
+        other = state.clone_with(plan_cursor=3)
+        assert first != builder.build("verify", diet.diet_for_verify(other))
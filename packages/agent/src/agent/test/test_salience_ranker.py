@@ -0,0 +1,53 @@
+"""
+Unit tests for SalienceRanker.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.agent.domain.element_table import ElementTable, FLAG_CLICKABLE, FLAG_VISIBLE
+from src.agent.services.page_source_parser import parse_page_source
+from src.agent.services.salience_ranker import SalienceRanker, SalienceWeights
+from src.agent.test.page_sources import ANDROID_SOURCE, deep_source
+
+
+class TestSalienceRanker:
+    """Tests for vectorized and reference salience scoring."""
+
+    def test_vectorized_matches_reference(self):
+        """Table scores equal the per-element reference scorer."""
+        ranker = SalienceRanker()
+        table = parse_page_source(deep_source(depth=10, fanout=8))
+        expected = [ranker.compute_salience_score(view) for view in table.views()]
+        assert ranker.score_table(table).tolist() == pytest.approx(expected, abs=1e-5)
+        assert all(0.0 <= score <= 1.0 for score in expected)
+
+    def test_rank_order(self):
+        """Visible interactive elements outrank text, which outranks hidden ones."""
+        table = parse_page_source(ANDROID_SOURCE)
+        ranked = SalienceRanker(top_k=4).rank_elements(table)
+        assert [view.index for view in ranked] == [2, 1, 0, 3]
+
+    def test_top_k_and_ties(self):
+        """Only K rows are returned; equal scores keep document order."""
+        table = ElementTable()
+        root = table.append('container', (0.0, 0.0, 1.0, 1.0), FLAG_VISIBLE)
+        for _ in range(10):
+            table.append('button', (0.4, 0.4, 0.2, 0.2), FLAG_VISIBLE | FLAG_CLICKABLE, parent=root, text='Same')
+        assert SalienceRanker(top_k=3).rank_indices(table) == [1, 2, 3]
+        assert SalienceRanker(top_k=100).rank_indices(table) == list(range(1, 11)) + [0]
+        assert SalienceRanker(top_k=3).rank_indices(ElementTable()) == []
+
+    def test_tree_input_uses_reference(self):
+        """UIElement trees rank the same as their table."""
+        table = parse_page_source(ANDROID_SOURCE)
+        ranker = SalienceRanker(top_k=2)
+        ranked = ranker.rank_elements(table.to_ui_elements())
+        assert [element.text for element in ranked] == [view.text for view in ranker.rank_elements(table)]
+
+    def test_custom_weights(self):
+        """Role weights and factor weights are configurable."""
+        table = parse_page_source(ANDROID_SOURCE)
+        weights = SalienceWeights(interactive=0.0, role_weights={'text': 1.0, 'button': 0.0})
+        assert SalienceRanker(top_k=1, weights=weights).rank_indices(table) == [1]
@@ -0,0 +1,157 @@
+"""
+Unit tests for the screen diff service.
+"""
+
+import pytest
+
+from src.agent.domain import AgentState
+from src.agent.domain.element_table import (
+    ElementTable, FLAG_CHECKABLE, FLAG_CHECKED, FLAG_CLICKABLE, FLAG_VISIBLE
+)
+from src.agent.orchestrator.nodes.perceive import PerceiveNode
+from src.agent.services.page_source_parser import parse_page_source
+from src.agent.services.prompt_diet import PromptDiet
+from src.agent.services.salience_ranker import SalienceRanker
+from src.agent.services.screen_diff import diff_tables, match_rows, screen_delta
+from src.agent.services.signature_service import SignatureService
+from src.agent.test.fakes import FakeDriverPort, FakeFileStorePort, FakeOCRPort
+from src.agent.test.page_sources import ANDROID_SOURCE
+
+
+def _list_screen(labels, title="Inbox", ids=False) -> ElementTable:
+    """A title and a vertical list of clickable rows (optionally with repeated resource-ids)."""
+    table = ElementTable()
+    root = table.append("container", (0.0, 0.0, 1.0, 1.0), FLAG_VISIBLE, class_name="android.widget.FrameLayout")
+    table.append("text", (0.1, 0.0, 0.8, 0.1), FLAG_VISIBLE, parent=root, text=title,
+                 resource_id="app:id/title", class_name="android.widget.TextView")
+    rows = table.append("list", (0.0, 0.1, 1.0, 0.9), FLAG_VISIBLE, parent=root, class_name="android.widget.ListView")
+    for i, label in enumerate(labels):
+        table.append("button", (0.0, 0.1 + 0.1 * i, 1.0, 0.1), FLAG_VISIBLE | FLAG_CLICKABLE, parent=rows,
+                     text=label, resource_id="app:id/row" if ids else None, class_name="android.widget.Button")
+    return table
+
+
+class TestDiffTables:
+    def test_identical_screens(self):
+        diff = diff_tables(_list_screen(["a", "b"]), _list_screen(["a", "b"]))
+        assert diff.is_empty
+        assert diff.unchanged == 5
+
+    def test_text_change_matched_by_resource_id(self):
+        diff = diff_tables(_list_screen(["a"], title="Inbox"), _list_screen(["a"], title="Inbox (2)"))
+        assert diff.added == () and diff.removed == ()
+        assert [(change.before, change.after, change.attributes) for change in diff.changed] == [(1, 1, ("text",))]
+
+    def test_insertion_does_not_shift_siblings(self):
+        before = _list_screen(["Alice", "Bob", "Carol"])
+        after = _list_screen(["Zoe", "Alice", "Bob", "Carol"])
+        diff = diff_tables(before, after)
+        assert diff.added == (3,)
+        assert diff.removed == ()
+        # Existing rows are matched by text: they only moved down
+        assert match_rows(before, after) == [0, 1, 2, 4, 5, 6]
+        assert all(change.attributes == ("bounds",) for change in diff.changed)
+
+    def test_removal(self):
+        diff = diff_tables(_list_screen(["Alice", "Bob"]), _list_screen(["Bob"]))
+        assert diff.removed == (3,)
+        assert diff.added == ()
+
+    def test_duplicate_ids_and_texts_pair_in_document_order(self):
+        before = _list_screen(["Delete", "Delete"], ids=True)
+        after = _list_screen(["Delete", "Delete"], ids=True)
+        assert match_rows(before, after) == [0, 1, 2, 3, 4]
+
+    def test_flag_change(self):
+        before, after = ElementTable(), ElementTable()
+        before.append("switch", (0.1, 0.1, 0.2, 0.05), FLAG_CHECKABLE, text="Wi-Fi")
+        after.append("switch", (0.1, 0.1, 0.2, 0.05), FLAG_CHECKABLE | FLAG_CHECKED, text="Wi-Fi")
+        (change,) = diff_tables(before, after).changed
+        assert change.attributes == ("checked",)
+        (element,) = screen_delta(before, after).elements
+        assert element.change == "changed"
+        assert dict(element.previous) == {"checked": "false"}
+
+    def test_position_fallback_for_unlabelled_elements(self):
+        before, after = ElementTable(), ElementTable()
+        before.append("image", (0.1, 0.1, 0.2, 0.2), FLAG_CLICKABLE, class_name="A")
+        after.append("image", (0.1, 0.1, 0.2, 0.2), FLAG_CLICKABLE, class_name="B")
+        (change,) = diff_tables(before, after).changed
+        assert change.attributes == ("class",)
+
+    def test_parsed_sources(self):
+        before = parse_page_source(ANDROID_SOURCE)
+        after = parse_page_source(ANDROID_SOURCE.replace('text="Log in"', 'text="Logging in…"'))
+        delta = screen_delta(before, after)
+        assert (delta.added, delta.removed, delta.changed, delta.unchanged) == (0, 0, 1, 3)
+        (element,) = delta.elements
+        assert element.text == "Logging in…"
+        assert dict(element.previous) == {"text": "Log in"}
+        assert element.bounds.y == pytest.approx(0.5)
+
+
+class TestScreenDelta:
+    def test_lists_informative_elements_only(self):
+        before = _list_screen([])
+        after = ElementTable()
+        root = after.append("container", (0.0, 0.0, 1.0, 1.0), FLAG_VISIBLE)
+        dialog = after.append("container", (0.1, 0.3, 0.8, 0.4), FLAG_VISIBLE, parent=root)
+        after.append("button", (0.2, 0.6, 0.6, 0.1), FLAG_CLICKABLE, parent=dialog, text="OK")
+        delta = screen_delta(before, after)
+        assert delta.added == 2 and delta.removed == 2
+        assert [(element.change, element.text) for element in delta.elements] == [
+            ("added", "OK"), ("removed", "Inbox"),
+        ]
+
+    def test_max_elements(self):
+        delta = screen_delta(_list_screen([]), _list_screen([f"row {i}" for i in range(30)]), max_elements=5)
+        assert delta.added == 30
+        assert len(delta.elements) == 5
+
+
+class TestDeltaInPipeline:
+    async def test_perceive_sets_delta_for_consecutive_screens(self, fake_telemetry, initial_state):
+        driver = FakeDriverPort(page_source=ANDROID_SOURCE)
+        node = PerceiveNode(
+            driver=driver, ocr=FakeOCRPort(text=""), filestore=FakeFileStorePort(),
+            signature_service=SignatureService(), salience_ranker=SalienceRanker(top_k=2),
+            telemetry=fake_telemetry,
+        )
+        first = await node.run(initial_state)
+        assert first.screen_delta is None
+
+        driver.page_source = ANDROID_SOURCE.replace('text="Welcome"', 'text="Welcome back"')
+        second = await node.run(first)
+        assert (second.screen_delta.changed, second.screen_delta.added) == (1, 0)
+
+        # Another run's state is not diffed against this node's last table
+        assert (await node.run(initial_state)).screen_delta is None
+
+    async def test_runs_sharing_a_node_diff_their_own_screens(self, fake_telemetry, initial_state):
+        driver = FakeDriverPort(page_source=ANDROID_SOURCE)
+        node = PerceiveNode(
+            driver=driver, ocr=FakeOCRPort(text=""), filestore=FakeFileStorePort(),
+            signature_service=SignatureService(), salience_ranker=SalienceRanker(top_k=2),
+            telemetry=fake_telemetry,
+        )
+        run_a = await node.run(initial_state.clone_with(run_id="run-a"))
+        driver.page_source = ANDROID_SOURCE.replace('text="Log in"', 'text="Sign up"')
+        run_b = await node.run(initial_state.clone_with(run_id="run-b"))
+
+        driver.page_source = ANDROID_SOURCE.replace('text="Welcome"', 'text="Welcome back"')
+        run_a = await node.run(run_a)
+        (element,) = run_a.screen_delta.elements
+        assert dict(element.previous) == {"text": "Welcome"}
+        run_b = await node.run(run_b)
+        assert run_b.screen_delta.changed == 2
+
+    def test_prompt_diet_sends_changes(self):
+        before = parse_page_source(ANDROID_SOURCE)
+        after = parse_page_source(ANDROID_SOURCE.replace('text="Welcome"', 'text="Welcome back"'))
+        state = AgentState(previous_signature=AgentState().signature, screen_delta=screen_delta(before, after))
+        payload = PromptDiet().diet_for_verify(state)
+        assert payload["delta"]["changed"] == 1
+        assert payload["changes"] == [
+            {"op": "changed", "role": "text", "text": "Welcome back", "box": [0.1, 0.1, 0.8, 0.05],
+             "was": {"text": "Welcome"}},
+        ]
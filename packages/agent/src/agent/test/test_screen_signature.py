@@ -0,0 +1,171 @@
+"""
+Unit tests for screen signatures.
+"""
+
+import random
+
+import pytest
+
+from src.agent.domain.element_table import ElementTable, FLAG_VISIBLE, FLAG_CLICKABLE
+from src.agent.domain.screen_signature import (
+    SIMHASH_BITS, ScreenSignature, compute_delta, compute_signature, hash_layout, normalize_ocr_stems
+)
+from src.agent.domain.simhash_index import SimHashIndex
+from src.agent.services.page_source_parser import parse_page_source
+from src.agent.services.signature_service import SignatureService
+from src.agent.test.page_sources import ANDROID_SOURCE, deep_source
+
+
+def _login_table(button_y: float = 0.8, hidden_text: bool = False) -> ElementTable:
+    table = ElementTable()
+    root = table.append('container', (0.0, 0.0, 1.0, 1.0), FLAG_VISIBLE)
+    table.append('text', (0.1, 0.1, 0.8, 0.05), FLAG_VISIBLE, parent=root, text='Welcome')
+    table.append('button', (0.1, button_y, 0.8, 0.1), FLAG_VISIBLE | FLAG_CLICKABLE, parent=root, text='Sign In')
+    if hidden_text:
+        table.append('text', (0.0, 0.0, 0.1, 0.1), 0, parent=root, text='Loading')
+    return table
+
+
+class TestComputeSignature:
+    """Tests for compute_signature and its parts."""
+
+    def test_deterministic(self):
+        """The same page source always yields the same signature."""
+        first = compute_signature(parse_page_source(ANDROID_SOURCE))
+        second = compute_signature(parse_page_source(ANDROID_SOURCE))
+        assert first == second
+        assert first.layout_hash == second.layout_hash
+        assert len(first.hash) == 64
+
+    def test_table_and_tree_agree(self):
+        """The ElementTable fast path matches the UIElement tree path."""
+        table = parse_page_source(deep_source(depth=20, fanout=5))
+        assert compute_signature(table) == compute_signature(table.to_ui_elements())
+        assert hash_layout(table) == hash_layout([table.view(i) for i in table.roots()])
+
+    def test_layout_changes_change_hash(self):
+        """Moving an element past the quantization step changes the layout hash."""
+        assert hash_layout(_login_table(0.8)) != hash_layout(_login_table(0.7))
+
+    def test_float_noise_ignored(self):
+        """Differences below 2-decimal quantization do not change the hash."""
+        assert hash_layout(_login_table(0.8)) == hash_layout(_login_table(0.8012))
+
+    def test_invisible_elements_ignored(self):
+        """Invisible elements affect neither the layout nor the text stems."""
+        assert compute_signature(_login_table()) == compute_signature(_login_table(hidden_text=True))
+
+    def test_ocr_text_normalization(self):
+        """OCR stems ignore case, order, digits, stopwords and suffixes."""
+        assert normalize_ocr_stems('Signing in to the App') == normalize_ocr_stems('app SIGN in')
+        table = _login_table()
+        assert compute_signature(table, '3 new messages at 10:41') == compute_signature(table, 'New messages at 9:05 7')
+        assert compute_signature(table, 'Inbox') != compute_signature(table, 'Settings')
+
+    def test_service_delegates(self):
+        """SignatureService exposes the domain computation."""
+        table = _login_table()
+        service = SignatureService()
+        assert service.compute_signature(table) == compute_signature(table)
+        assert [e.text for e in service.normalize_elements(_login_table(hidden_text=True).to_ui_elements())] == [
+            None, 'Welcome', 'Sign In'
+        ]
+
+
+class TestSimHash:
+    """Tests for SimHash near-duplicate detection."""
+
+    def test_simhash_on_signature(self):
+        """Signatures carry a deterministic 64-bit SimHash."""
+        first = compute_signature(_login_table())
+        second = compute_signature(_login_table())
+        assert first.simhash == second.simhash
+        assert 0 <= first.simhash < 1 << SIMHASH_BITS
+        assert compute_signature(_login_table().to_ui_elements()).simhash == first.simhash
+
+    def test_near_duplicate_delta_is_small(self):
+        """One extra element in a large screen is a small delta; another screen is not."""
+        table = parse_page_source(deep_source(depth=20, fanout=10))
+        base = compute_signature(table, 'Inbox messages')
+        table.append('text', (0.9, 0.0, 0.1, 0.05), FLAG_VISIBLE, parent=0, text='3')
+        badge = compute_signature(table, 'Inbox messages')
+        other = compute_signature(parse_page_source(ANDROID_SOURCE), 'Welcome')
+
+        assert badge != base
+        assert compute_delta(base, base) == 0.0
+        assert compute_delta(base, badge) <= 3 / SIMHASH_BITS
+        assert compute_delta(base, other) > 10 / SIMHASH_BITS
+
+    def test_delta_without_simhash(self):
+        """Signatures without a SimHash fall back to 0.0 / 1.0."""
+        assert compute_delta(ScreenSignature(hash='a'), ScreenSignature(hash='a')) == 0.0
+        assert compute_delta(ScreenSignature(hash='a'), ScreenSignature(hash='b')) == 1.0
+
+
+class TestSimHashIndex:
+    """Tests for SimHashIndex."""
+
+    def test_query_within_distance(self):
+        """Entries within max_distance are found, ordered by distance."""
+        index = SimHashIndex(max_distance=3)
+        index.add('exact', 0b1011)
+        index.add('two', 0b1011 ^ (1 << 40) ^ (1 << 63))
+        index.add('far', 0b1011 ^ 0xFF00)
+
+        assert index.query(0b1011) == [('exact', 0), ('two', 2)]
+        assert index.query(0b1011, max_distance=1) == [('exact', 0)]
+        assert index.nearest(0b1011 ^ (1 << 40)) == ('exact', 1)
+        assert index.nearest(1 << 20 | 1 << 30 | 1 << 50 | 1 << 60) is None
+
+    def test_ties_in_insertion_order(self):
+        """Equal distances come back in insertion order, not block-probe order."""
+        index = SimHashIndex(max_distance=1)
+        index.add('first', 1)  # differs in the low block: found via the high block
+        index.add('second', 1 << 40)  # differs in the high block: found via the low block
+        assert index.query(0) == [('first', 1), ('second', 1)]
+
+        index.add('first', 1)  # re-added: now the newest
+        assert index.query(0) == [('second', 1), ('first', 1)]
+
+    def test_add_replace_remove(self):
+        """Re-adding a key replaces its hash; removed keys are not found."""
+        index = SimHashIndex(max_distance=2)
+        index.add('screen', 0)
+        index.add('screen', 0xFFFF)
+        assert len(index) == 1
+        assert index.query(0) == []
+        index.remove('screen')
+        assert 'screen' not in index
+        assert index.query(0xFFFF) == []
+
+    def test_matches_linear_scan(self):
+        """Results equal a brute-force Hamming scan."""
+        rng = random.Random(3)
+        hashes = {i: rng.getrandbits(64) for i in range(2000)}
+        index = SimHashIndex(max_distance=4)
+        for key, simhash in hashes.items():
+            index.add(key, simhash)
+
+        for key in range(0, 2000, 97):
+            probe = hashes[key] ^ (1 << rng.randrange(64)) ^ (1 << rng.randrange(64))
+            expected = sorted(k for k, h in hashes.items() if (h ^ probe).bit_count() <= 4)
+            assert sorted(k for k, _ in index.query(probe)) == expected
+
+    def test_invalid_distance(self):
+        """Distances outside the index's range are rejected."""
+        with pytest.raises(ValueError):
+            SimHashIndex(max_distance=64)
+        with pytest.raises(ValueError):
+            SimHashIndex(max_distance=2).query(0, max_distance=3)
+
+    def test_service_find_similar(self):
+        """SignatureService maps near duplicates onto known screens."""
+        service = SignatureService()
+        index = SimHashIndex()
+        table = parse_page_source(deep_source(depth=20, fanout=10))
+        known = service.compute_signature(table)
+        index.add(known.hash, known.simhash)
+
+        table.append('text', (0.9, 0.0, 0.1, 0.05), FLAG_VISIBLE, parent=0, text='7')
+        assert service.find_similar(service.compute_signature(table), index) == known.hash
+        assert service.find_similar(service.compute_signature(_login_table()), index) is None
@@ -0,0 +1,93 @@
+"""
+Unit tests for StartSessionUsecase and its cache warm-up.
+"""
+
+import pytest
+
+from src.agent.domain import Advice, AgentState, Budgets
+from src.agent.domain.screen_signature import ScreenSignature
+from src.agent.errors.error_types import RepoUnavailableError
+from src.agent.orchestrator.nodes.choose_action import ChooseActionNode
+from src.agent.usecases.start_session import StartSessionUsecase
+
+APP = "com.example.testapp"
+
+
+async def _seed(repo, cache):
+    for index, visits in enumerate([3, 9, 1, 5]):
+        await repo.upsert_node(f"sig{index}", {"app_id": APP, "visits": visits})
+    await repo.upsert_node("other", {"app_id": "com.other", "visits": 100})
+    await repo.upsert_node("sig1", {
+        "safe_actions": [{"verb": "tap", "text_or_icon": "Login", "bounds_norm": {"x": 0.1, "y": 0.2}}],
+    })
+    await cache.set_advice("sig1", Advice(plan=["tap Login"], confidence=0.9, source="llm"))
+    await cache.set_advice("sig3", Advice(plan=["scroll"], confidence=0.6, source="llm"))
+
+
+class TestStartSession:
+    """Tests for state initialization and cache warm-up."""
+
+    async def test_initial_state(self, fake_repo, fake_telemetry):
+        state = await StartSessionUsecase(fake_repo, fake_telemetry).execute("run-1", APP)
+        assert (state.run_id, state.app_id, state.budgets, state.cache) == ("run-1", APP, Budgets(), {})
+        with pytest.raises(ValueError):
+            await StartSessionUsecase(fake_repo, fake_telemetry).execute("", APP)
+        with pytest.raises(ValueError):
+            await StartSessionUsecase(fake_repo, fake_telemetry).execute("run-1", APP, Budgets(max_steps=0))
+
+    async def test_warms_most_visited_signatures(self, fake_repo, fake_cache, fake_telemetry):
+        await _seed(fake_repo, fake_cache)
+        usecase = StartSessionUsecase(fake_repo, fake_telemetry, cache=fake_cache, warm_limit=2)
+        state = await usecase.execute("run-1", APP)
+
+        # Top two by visits are sig1 (9) and sig3 (5); other apps are ignored
+        assert list(state.cache) == ["sig1", "sig3"]
+        assert state.cache["sig1"].advice.plan == ["tap Login"]
+        (action,) = state.cache["sig1"].safe_actions
+        assert (action.verb, action.text_or_icon, action.bounds_norm.x) == ("tap", "Login", 0.1)
+        assert state.cache["sig3"].safe_actions == []
+
+    async def test_warm_up_failure_starts_cold(self, fake_cache, fake_telemetry):
+        class BrokenRepo:
+            async def get_top_nodes(self, app_id, limit):
+                raise RepoUnavailableError("db down")
+
+        state = await StartSessionUsecase(BrokenRepo(), fake_telemetry, cache=fake_cache).execute("run-1", APP)
+        assert state.cache == {}
+        assert any("starting cold" in message for _, message, _ in fake_telemetry.logs)
+
+    @pytest.mark.parametrize("safe_actions", [
+        [{"verb": "tap", "no_such_field": 1}],
+        [{"verb": "tap", "bounds_norm": [0.1, 0.2]}],
+        ["tap Login"],
+        7,
+    ])
+    async def test_bad_metadata_skips_only_that_screen(self, fake_repo, fake_cache, fake_telemetry, safe_actions):
+        await _seed(fake_repo, fake_cache)
+        await fake_repo.upsert_node("sig2", {
+            "safe_actions": [{"verb": "scroll", "bounds_norm": {"x": 0.5, "y": 0.5}}],
+        })
+        await fake_repo.upsert_node("sig3", {"safe_actions": safe_actions})
+
+        state = await StartSessionUsecase(fake_repo, fake_telemetry, cache=fake_cache).execute("run-1", APP)
+        assert sorted(state.cache) == ["sig1", "sig2"]
+        assert state.cache["sig1"].advice.plan == ["tap Login"]
+        assert [action.verb for action in state.cache["sig2"].safe_actions] == ["scroll"]
+        assert any("malformed" in message for _, message, _ in fake_telemetry.logs)
+        assert not any("starting cold" in message for _, message, _ in fake_telemetry.logs)
+
+    async def test_choose_action_uses_warmed_entry(self, fake_repo, fake_cache, fake_telemetry):
+        await _seed(fake_repo, fake_cache)
+        state = await StartSessionUsecase(fake_repo, fake_telemetry, cache=fake_cache).execute("run-1", APP)
+        fake_cache.calls.clear()
+        node = ChooseActionNode(
+            llm=None, cache=fake_cache, budget=None, filestore=None, prompt_diet=None, telemetry=fake_telemetry,
+        )
+
+        on_known = await node.run(state.clone_with(signature=ScreenSignature(hash="sig1")))
+        assert on_known.advice.plan == ["tap Login"]
+        assert fake_cache.calls == []
+        assert ("cache_hit", 1, {"node": "choose_action", "tier": "warm"}) in fake_telemetry.metrics
+
+        on_new = await node.run(state.clone_with(signature=ScreenSignature(hash="new")))
+        assert on_new.advice == AgentState().advice
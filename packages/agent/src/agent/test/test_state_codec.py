@@ -0,0 +1,76 @@
+"""
+Unit tests for the AgentState codec.
+"""
+
+import json
+
+from src.agent.domain import AgentState, ScreenSignature, changed_fields, state_from_plain, state_to_plain
+from src.agent.domain.state import Advice, Budgets, CacheEntry, Counters, EnumeratedAction
+from src.agent.domain.state_codec import (
+    from_compact,
+    from_plain,
+    schema_id,
+    state_from_json,
+    state_to_json,
+    to_compact,
+    to_plain,
+)
+from src.agent.domain.ui_element import Bounds, UIElement
+
+
+def _rich_state():
+    child = UIElement(role="text", text="Email", bounds=Bounds(1, 2, 3, 4))
+    return AgentState(
+        run_id="r1",
+        app_id="com.example.app",
+        signature=ScreenSignature(hash="h1", layout_hash="l1", ocr_stems_hash="o1", simhash=2**63 + 5),
+        previous_signature=ScreenSignature(hash="h0"),
+        ranked_elements=[UIElement(role="list", children=[child], metadata={"resource-id": "list"})],
+        enumerated_actions=[EnumeratedAction(verb="tap", text_or_icon="Login")],
+        advice=Advice(plan=["tap Login"], confidence=0.5, source="llm"),
+        counters=Counters(steps_total=3),
+        cache={"k": CacheEntry(advice=Advice(plan=["back"]))},
+    )
+
+
+class TestStateCodec:
+    """Tests for plain round trips and field diffs."""
+
+    def test_round_trip_through_json(self):
+        state = _rich_state()
+        plain = json.loads(json.dumps(state_to_plain(state)))
+        decoded = state_from_plain(plain)
+        assert decoded == state
+        assert to_plain(decoded) == state_to_plain(state)  # ScreenSignature.__eq__ only checks hash
+        assert "STOP_SUCCESS" not in plain
+
+    def test_compact_round_trip_is_positional(self):
+        state = _rich_state()
+        row = json.loads(json.dumps(to_compact(state)))
+        assert isinstance(row, list) and row[0] == "r1"
+        assert to_plain(from_compact(AgentState, row)) == state_to_plain(state)
+        assert len(json.dumps(row)) < len(json.dumps(state_to_plain(state))) / 2
+
+    def test_canonical_json_and_missing_fields(self):
+        state = _rich_state()
+        text = state_to_json(state)
+        assert state_to_json(state_from_json(text)) == text
+        assert text == json.dumps(json.loads(text), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        partial = state_from_plain({"run_id": "r2", "unknown": 1, "counters": {"errors": 2}})
+        assert (partial.run_id, partial.counters.errors, partial.budgets) == ("r2", 2, Budgets())
+
+    def test_domain_types(self):
+        for value in (ScreenSignature(hash="h", simhash=7), EnumeratedAction(verb="tap"), Advice(plan=["x"]),
+                      Counters(errors=1), Budgets(max_steps=3), CacheEntry(safe_actions=[EnumeratedAction(verb="back")])):
+            assert from_plain(type(value), json.loads(json.dumps(to_plain(value)))) == value
+            assert from_compact(type(value), to_compact(value)) == value
+
+    def test_schema_id_tracks_fields(self):
+        assert schema_id(AgentState) == schema_id(AgentState)
+        assert schema_id(Counters) != schema_id(Budgets)
+
+    def test_changed_fields(self):
+        state = _rich_state()
+        assert changed_fields(state, state) == []
+        moved = state.clone_with(plan_cursor=1)
+        assert changed_fields(state, moved) == ["timestamps", "plan_cursor"]
@@ -8,7 +8,7 @@ Finalize agent run, compute summary, persist final state.
 DEPENDENCIES (ALLOWED):
 -----------------------
 - domain types (AgentState)
-- ports (RepoPort, TelemetryPort)
+- ports (RepoPort, TelemetryPort, FileStorePort)
 
 DEPENDENCIES (FORBIDDEN):
 -------------------------
@@ -22,6 +22,14 @@ OUTPUTS:
 --------
 - Summary dict with metrics
 
+DURABILITY:
+-----------
+Asset writes may be deferred (write-behind FileStorePort) and graph upserts
+batched (RepoPort adapters). execute() awaits RepoPort.flush() and
+FileStorePort.flush() first and lets their PersistenceError propagate:
+when finalize returns, the run's graph and every ref in its bundles are on
+storage.
+
 SUMMARY METRICS:
 ----------------
 - stop_reason: Why run ended
@@ -35,12 +43,17 @@ SUMMARY METRICS:
 
 TODO:
 -----
+- [x] Flush batched upserts and pending asset writes
 - [ ] Query repo for final stats
-- [ ] Compute summary metrics
+- [ ] Compute summary metrics (counters only so far)
 - [ ] Persist final state
-- [ ] Log final summary
+- [x] Log final summary
 """
 
+from typing import Optional
+
+from ..ports.telemetry_port import LogLevel
+
 
 class FinalizeRunUsecase:
     """
@@ -48,23 +61,40 @@ class FinalizeRunUsecase:
     
     USAGE:
     ------
-    usecase = FinalizeRunUsecase(repo=repo_port, telemetry=telemetry_port)
+    usecase = FinalizeRunUsecase(repo=repo_port, telemetry=telemetry_port, filestore=filestore_port)
     summary = await usecase.execute(final_state)
     """
     
-    def __init__(self, repo: "RepoPort", telemetry: "TelemetryPort"):
+    def __init__(
+        self,
+        repo: "RepoPort",
+        telemetry: "TelemetryPort",
+        filestore: Optional["FileStorePort"] = None,
+    ):
         self.repo = repo
         self.telemetry = telemetry
+        self.filestore = filestore
     
     async def execute(self, state: "AgentState") -> dict:
         """
         Finalize run.
         
+        Raises:
+            PersistenceError: If batched upserts or deferred asset writes
+                could not be made durable.
+        
         TODO:
         - [ ] Query repo for exploration stats
         - [ ] Compute coverage %
-        - [ ] Log final summary
-        - [ ] Return summary dict
         """
-        pass
+        await self.repo.flush()
+        if self.filestore is not None:
+            await self.filestore.flush()
+        summary = {
+            "stop_reason": state.stop_reason,
+            "steps_total": state.counters.steps_total,
+            "screens_new": state.counters.screens_new,
+        }
+        self.telemetry.log(LogLevel.INFO, "run finalized", {"run_id": state.run_id, **summary})
+        return summary
 
@@ -3,12 +3,13 @@ StartSession Usecase: Initialize Agent Run
 
 PURPOSE:
 --------
-Create initial AgentState, persist run record, validate setup.
+Create initial AgentState, persist run record, validate setup, and warm the
+caches from the app's existing ScreenGraph.
 
 DEPENDENCIES (ALLOWED):
 -----------------------
-- domain types (AgentState, Budgets)
-- ports (RepoPort, TelemetryPort)
+- domain types (AgentState, Budgets, CacheEntry)
+- ports (RepoPort, TelemetryPort, CachePort)
 
 DEPENDENCIES (FORBIDDEN):
 -------------------------
@@ -22,35 +23,64 @@ INPUTS:
 
 OUTPUTS:
 --------
-- Initial AgentState with run_id, app_id, budgets, timestamps
+- Initial AgentState with run_id, app_id, budgets, timestamps and a warmed
+  cache map (signature → CacheEntry)
+
+CACHE WARM-UP:
+--------------
+A new build of an app mostly shows the screens of the last run, so before
+the first Perceive:
+1. RepoPort.get_top_nodes(app_id, warm_limit): known signatures ranked by
+   visit count, with their verified safe actions
+2. CachePort.get_advice_many(signatures): one batched lookup, which also
+   promotes disk/remote hits into the adapter's memory tier
+3. AgentState.cache[signature] = CacheEntry(advice, safe_actions)
+The first iterations on known screens then hit the cache instead of the
+LLM. Warm-up is best effort: repo/cache failures are logged and the run
+starts cold.
 
 SIDE EFFECTS:
 -------------
-- Persists run record via RepoPort
-- Logs session start via TelemetryPort
+- Reads the ScreenGraph via RepoPort and advice via CachePort
+- Logs session start and warm-up stats via TelemetryPort
 
 TODO:
 -----
-- [ ] Implement state initialization
-- [ ] Persist run record
-- [ ] Validate inputs (app_id, budgets)
+- [x] Implement state initialization
+- [ ] Persist run record (no RepoPort method yet)
+- [x] Validate inputs (app_id, budgets)
 """
 
+from typing import Any, Dict, List, Optional
+
+from ..domain.state import Advice, AgentState, Bounds, Budgets, CacheEntry, EnumeratedAction
+from ..errors.error_types import AgentError
+from ..orchestrator.policy.constants import WARM_CACHE_SIGNATURES
+from ..ports.telemetry_port import LogLevel
+
 
 class StartSessionUsecase:
     """
     Initialize a new agent run.
-    
+
     USAGE:
     ------
-    usecase = StartSessionUsecase(repo=repo_port, telemetry=telemetry_port)
+    usecase = StartSessionUsecase(repo=repo_port, telemetry=telemetry_port, cache=cache_port)
     state = await usecase.execute(run_id="run-123", app_id="com.example.app")
     """
-    
-    def __init__(self, repo: "RepoPort", telemetry: "TelemetryPort"):
+
+    def __init__(
+        self,
+        repo: "RepoPort",
+        telemetry: "TelemetryPort",
+        cache: Optional["CachePort"] = None,
+        warm_limit: int = WARM_CACHE_SIGNATURES,
+    ):
         self.repo = repo
         self.telemetry = telemetry
-    
+        self.cache = cache
+        self.warm_limit = warm_limit
+
     async def execute(
         self,
         run_id: str,
@@ -59,12 +89,71 @@ class StartSessionUsecase:
     ) -> "AgentState":
         """
         Initialize agent run.
-        
-        TODO:
-        - [ ] Create initial AgentState
-        - [ ] Persist run record
-        - [ ] Log session start
-        - [ ] Return initial state
+
+        Raises:
+            ValueError: Empty run_id/app_id or non-positive budgets.
         """
-        pass
+        if not run_id or not app_id:
+            raise ValueError("run_id and app_id are required")
+        budgets = budgets or Budgets()
+        if budgets.max_steps <= 0 or budgets.max_time_ms <= 0:
+            raise ValueError("budgets must be positive")
+
+        warmed = await self.warm_cache(app_id)
+        self.telemetry.log(
+            LogLevel.INFO,
+            "session started",
+            {"run_id": run_id, "app_id": app_id, "warmed_signatures": len(warmed)},
+        )
+        return AgentState(run_id=run_id, app_id=app_id, budgets=budgets, cache=warmed)
+
+    async def warm_cache(self, app_id: str) -> Dict[str, CacheEntry]:
+        """
+        Cache entries for the app's most-visited known screens.
+
+        Returns:
+            signature → CacheEntry, for screens with cached advice or safe
+            actions (empty on a first exploration or on failure).
+        """
+        if self.warm_limit <= 0:
+            return {}
+        try:
+            nodes = await self.repo.get_top_nodes(app_id, self.warm_limit)
+            signatures = [node.signature for node in nodes]
+            advice = await self.cache.get_advice_many(signatures) if self.cache and signatures else {}
+        except (AgentError, ConnectionError, OSError) as error:
+            self.telemetry.log(
+                LogLevel.WARN,
+                "cache warm-up failed, starting cold",
+                {"app_id": app_id, "error": str(error)},
+            )
+            return {}
+
+        warmed: Dict[str, CacheEntry] = {}
+        for node in nodes:
+            try:
+                safe_actions = _actions_from_metadata(node.metadata.get("safe_actions", []))
+            except (TypeError, ValueError, AttributeError) as error:
+                # Malformed stored metadata: skip this screen, keep the rest
+                self.telemetry.log(
+                    LogLevel.WARN,
+                    "skipping malformed safe_actions in warm-up",
+                    {"app_id": app_id, "signature": node.signature, "error": str(error)},
+                )
+                continue
+            node_advice = advice.get(node.signature)
+            if node_advice is None and not safe_actions:
+                continue
+            warmed[node.signature] = CacheEntry(advice=node_advice or Advice(), safe_actions=safe_actions)
+        self.telemetry.metric("cache_warm_signatures", len(warmed), {"app_id": app_id})
+        self.telemetry.metric("cache_warm_advice_hits", len(advice), {"app_id": app_id})
+        return warmed
+
 
+def _actions_from_metadata(items: List[Dict[str, Any]]) -> List[EnumeratedAction]:
+    actions = []
+    for item in items:
+        fields = dict(item)
+        bounds = fields.pop("bounds_norm", None)
+        actions.append(EnumeratedAction(bounds_norm=Bounds(**bounds) if bounds else Bounds(), **fields))
+    return actions
@@ -27,6 +27,7 @@ STRUCTURE:
 ----------
 - main.py: FastAPI app creation
 - deps.py: DI composition root
+- scheduler.py: Run queue and per-device worker lanes
 - routes/: HTTP route handlers
 """
 
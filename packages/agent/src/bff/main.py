@@ -33,6 +33,7 @@ TODO:
 - [ ] Add deps.py DI container
 - [ ] Convert to contracts DTOs instead of inline Pydantic models
 - [ ] Add lifespan hooks for adapter initialization/cleanup
+- [x] Queue runs on per-device lanes (SessionScheduler, routes/scheduler.py)
 - [ ] Add structured logging
 - [ ] Add error handling middleware
 """
@@ -45,6 +46,9 @@ import logging
 import asyncio
 from datetime import datetime
 
+from .routes.scheduler import router as scheduler_router, scheduler_http_error
+from .scheduler import DeviceSpec, RunJob, SchedulerError, SessionScheduler
+
 # Import AppiumTools (from new location)
 try:
     from src.adapters.appium import (
@@ -53,6 +57,8 @@ try:
         create_execution_context,
     )
     from src.adapters.appium.factory import get_supported_platforms
+    from src.adapters.appium.driver_executor import shutdown_driver_executors
+    from src.adapters.appium.session_pool import shutdown_session_pool
 except ImportError as e:
     # Graceful degradation if legacy imports not available
     print(f"Warning: Legacy Appium imports not fully available: {e}")
@@ -60,6 +66,8 @@ except ImportError as e:
     create_driver_config = None
     create_execution_context = None
     get_supported_platforms = lambda: ["android", "ios"]
+    shutdown_driver_executors = None
+    shutdown_session_pool = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -67,6 +75,59 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(title="ScreenGraph API", version="0.1.0")
 
+
+async def run_exploration(job: RunJob, device: DeviceSpec) -> None:
+    """
+    Scheduler job runner: drive one exploration run on one device lane.
+
+    The lane stays busy until this returns, so runs on a device never
+    overlap.
+    """
+    request = job.payload
+    driver_config = create_driver_config(
+        server_url=device.appium_server_url,
+        platform=device.platform,
+        device_name=device.device_name or device.udid,
+        platform_version=device.platform_version or request.get("platform_version", ""),
+        app_package=request.get("app_package"),
+        app_activity=request.get("app_activity"),
+        bundle_id=request.get("bundle_id"),
+        udid=device.udid,
+    )
+    execution_context = create_execution_context(
+        run_id=job.run_id,
+        session_id=f"session_{job.run_id}",
+        platform=device.platform,
+        device_id=device.udid,
+    )
+    tools = create_appium_tools(device.platform, driver_config, execution_context)
+    init_result = await tools.initialize(execution_context)
+    if not init_result.success:
+        raise RuntimeError(f"AppiumTools initialization failed: {init_result.error}")
+    logger.info(f"AppiumTools initialized for run {job.run_id} on {device.udid}")
+
+    # TODO: This is where the actual screengraph generation logic would go
+    # (usecase wrapping build_graph(...).run(state) on this device)
+
+
+app.state.scheduler = SessionScheduler(runner=run_exploration)
+app.include_router(scheduler_router)
+
+
+@app.on_event("shutdown")
+async def shutdown_scheduler():
+    """Cancel queued runs and wait for running ones on every device lane."""
+    await app.state.scheduler.shutdown()
+
+
+@app.on_event("shutdown")
+async def shutdown_driver_lanes():
+    """Quit pooled sessions, then stop the per-device driver executor threads."""
+    if shutdown_session_pool:
+        await shutdown_session_pool()
+    if shutdown_driver_executors:
+        shutdown_driver_executors()
+
 # Data model for app launch config from UI
 class AppLaunchConfigRequest(BaseModel):
     app_launch_config_id: str
@@ -86,13 +147,17 @@ class ScreengraphGenerationResponse(BaseModel):
     app_launch_config_id: str
     platform: str
     tools_initialized: bool
+    status: str = "queued"
+    queue_depth: int = 0
 
 @app.post("/screengraph/generate", response_model=ScreengraphGenerationResponse)
 async def generate_screengraph(request: AppLaunchConfigRequest):
     """
     API endpoint that receives app launch config from UI after 'go' press on /setup.
     This endpoint will be called by :agent with the selected dropdown values.
-    Now includes AppiumTools initialization and basic functionality.
+    Queues the run on the SessionScheduler; a device lane initializes
+    AppiumTools and explores. Responds 429/503 with Retry-After when the
+    queue is full or no device can serve the platform.
     """
     try:
         logger.info(f"Received screengraph generation request for run {request.run_id}")
@@ -104,55 +169,43 @@ async def generate_screengraph(request: AppLaunchConfigRequest):
                 detail=f"Unsupported platform: {request.platform}. Supported: {get_supported_platforms()}"
             )
         
-        # Create driver configuration
-        driver_config = create_driver_config(
-            server_url=request.appium_server_url,
-            platform=request.platform,
-            device_name=request.device_name,
-            platform_version=request.platform_version,
-            app_package=request.app_package,
-            app_activity=request.app_activity,
-            bundle_id=request.bundle_id
-        )
-        
-        # Create execution context
-        execution_context = create_execution_context(
-            run_id=request.run_id,
-            session_id=f"session_{request.run_id}",
-            platform=request.platform,
-            device_id=request.device_name
-        )
-        
-        # Create AppiumTools instance
-        tools = create_appium_tools(request.platform, driver_config, execution_context)
-        
-        # Initialize tools
-        init_result = await tools.initialize(execution_context)
-        tools_initialized = init_result.success
+        scheduler = app.state.scheduler
+        # Devices named by the UI join the farm on first use
+        if request.device_name not in {device.udid for device in scheduler.devices()}:
+            scheduler.register_device(DeviceSpec(
+                udid=request.device_name,
+                platform=request.platform,
+                platform_version=request.platform_version,
+                device_name=request.device_name,
+                appium_server_url=request.appium_server_url,
+            ))
         
-        if tools_initialized:
-            logger.info(f"AppiumTools initialized successfully for {request.platform}")
-            
-            # TODO: This is where the actual screengraph generation logic would go
-            # For now, we have the tools ready for use
-            
-            # Example: Take a screenshot to verify tools are working
-            # screenshot_result = await tools.screenshot()
-            # if screenshot_result.success:
-            #     logger.info("Screenshot captured successfully")
-            
-        else:
-            logger.warning(f"Failed to initialize AppiumTools: {init_result.error}")
+        app_id = request.app_package or request.bundle_id or request.app_launch_config_id
+        try:
+            job = scheduler.submit(RunJob(
+                run_id=request.run_id,
+                app_id=app_id,
+                platform=request.platform,
+                payload=request.model_dump(),
+            ))
+        except SchedulerError as e:
+            raise scheduler_http_error(e)
+        except ValueError as e:
+            raise HTTPException(status_code=409, detail=str(e))
         
         return ScreengraphGenerationResponse(
             success=True,
-            message="Screengraph generation started with AppiumTools",
+            message="Screengraph generation queued",
             run_id=request.run_id,
             app_launch_config_id=request.app_launch_config_id,
             platform=request.platform,
-            tools_initialized=tools_initialized
+            tools_initialized=False,
+            status=job.status,
+            queue_depth=scheduler.status()["queue_depth"],
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error processing screengraph request: {e}")
         raise HTTPException(status_code=500, detail=str(e))
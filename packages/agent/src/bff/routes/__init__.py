@@ -7,5 +7,6 @@ Each file defines one router for a resource.
 PUBLIC API:
 -----------
 - sessions: Session management routes
+- scheduler: Device farm and run queue routes
 """
 
@@ -0,0 +1,109 @@
+"""
+Scheduler Routes: Device Farm and Run Queue
+
+PURPOSE:
+--------
+HTTP routes for the SessionScheduler: register devices, inspect the run
+queue and lane utilization, and look up or cancel runs.
+
+DEPENDENCIES (ALLOWED):
+-----------------------
+- FastAPI, Pydantic
+- bff.scheduler
+
+DEPENDENCIES (FORBIDDEN):
+-------------------------
+- NO adapters
+- NO business logic
+
+ROUTES:
+-------
+- GET /scheduler/status: Queue depth and per-device lane utilization
+- POST /scheduler/devices: Register (or update) a device
+- DELETE /scheduler/devices/{udid}: Retire a device after its current run
+- GET /scheduler/runs/{run_id}: Run status
+- DELETE /scheduler/runs/{run_id}: Cancel a queued run
+
+ERRORS:
+-------
+scheduler_http_error() maps admission errors to HTTP: SchedulerFullError →
+429, NoDeviceError → 503, both with Retry-After.
+"""
+
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel
+
+from ..scheduler import (
+    DeviceSpec,
+    NoDeviceError,
+    SchedulerError,
+    SchedulerFullError,
+    SessionScheduler,
+)
+
+
+router = APIRouter(prefix="/scheduler", tags=["scheduler"])
+
+
+class DeviceRequest(BaseModel):
+    udid: str
+    platform: str = "android"
+    platform_version: str = ""
+    device_name: str = ""
+    appium_server_url: str = "http://localhost:4723"
+
+
+def get_scheduler(request: Request) -> SessionScheduler:
+    """The scheduler created by main.py (app.state.scheduler)."""
+    return request.app.state.scheduler
+
+
+def scheduler_http_error(error: SchedulerError) -> HTTPException:
+    """Map a scheduler admission error to 429 / 503 with Retry-After."""
+    status_code = 429 if isinstance(error, SchedulerFullError) else 503
+    return HTTPException(
+        status_code=status_code,
+        detail=str(error),
+        headers={"Retry-After": str(error.retry_after_s)},
+    )
+
+
+@router.get("/status")
+async def scheduler_status(request: Request):
+    """Queue depth, per-app backlog and lane utilization."""
+    return get_scheduler(request).status()
+
+
+@router.post("/devices")
+async def register_device(device: DeviceRequest, request: Request):
+    """Register a device; its lane starts taking queued runs immediately."""
+    scheduler = get_scheduler(request)
+    try:
+        scheduler.register_device(DeviceSpec(**device.model_dump()))
+    except RuntimeError as e:
+        raise scheduler_http_error(NoDeviceError(str(e)))
+    return {"registered": device.udid, "devices_total": len(scheduler.devices())}
+
+
+@router.delete("/devices/{udid}")
+async def unregister_device(udid: str, request: Request):
+    """Retire a device; waits for its current run to finish."""
+    if not await get_scheduler(request).unregister_device(udid):
+        raise HTTPException(status_code=404, detail=f"Unknown device: {udid}")
+    return {"unregistered": udid}
+
+
+@router.get("/runs/{run_id}")
+async def get_run(run_id: str, request: Request):
+    job = get_scheduler(request).get_job(run_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown run: {run_id}")
+    return job.to_dict()
+
+
+@router.delete("/runs/{run_id}")
+async def cancel_run(run_id: str, request: Request):
+    """Cancel a queued run (running runs are not interrupted)."""
+    if not get_scheduler(request).cancel(run_id):
+        raise HTTPException(status_code=409, detail=f"Run {run_id} is not queued")
+    return {"cancelled": run_id}
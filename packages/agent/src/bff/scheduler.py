@@ -0,0 +1,396 @@
+"""
+BFF Scheduler: Exploration Runs Across a Device Farm
+
+PURPOSE:
+--------
+Queue exploration runs and execute them on a pool of devices, so one BFF
+instance can keep a rack of emulators busy. Each registered device gets one
+worker lane (an asyncio task) that runs one job at a time; Appium sessions
+are not safe to drive concurrently.
+
+DEPENDENCIES (ALLOWED):
+-----------------------
+- asyncio, collections, dataclasses, time, typing (stdlib)
+
+DEPENDENCIES (FORBIDDEN):
+-------------------------
+- NO FastAPI (routes/scheduler.py maps errors to HTTP)
+- NO adapters (the job runner is injected by main.py)
+- NO agent orchestrator or domain imports
+
+SCHEDULING:
+-----------
+- Device registry keyed by UDID; one lane per device
+- Jobs queue per app; lanes take apps round-robin, so one app that
+  enqueues many runs cannot starve the others
+- A job runs only on a device of its platform, or on its pinned UDID
+- Within one app, jobs run in FIFO order (skipping jobs no idle device
+  can serve)
+- Unregistering (or re-registering with another platform) a device fails
+  the queued jobs no remaining device can serve, so they neither wait
+  forever nor hold queue capacity
+
+BACKPRESSURE:
+-------------
+- SchedulerFullError (HTTP 429): max_queue_depth jobs are already waiting
+- NoDeviceError (HTTP 503): no registered device can ever serve the job
+Both carry retry_after_s for the Retry-After header.
+
+USAGE:
+------
+scheduler = SessionScheduler(runner=run_exploration, max_queue_depth=100)
+scheduler.register_device(DeviceSpec(udid="emulator-5554", platform="android"))
+job = scheduler.submit(RunJob(run_id="run-1", app_id="com.example", platform="android"))
+status = scheduler.status()
+await scheduler.shutdown()
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+
+DEFAULT_MAX_QUEUE_DEPTH = 100
+DEFAULT_RETRY_AFTER_S = 30
+MAX_FINISHED_JOBS = 1000  # finished jobs kept for run lookups
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+
+class SchedulerError(Exception):
+    """Base class for scheduler admission errors."""
+
+    def __init__(self, message: str, retry_after_s: int = DEFAULT_RETRY_AFTER_S):
+        super().__init__(message)
+        self.retry_after_s = retry_after_s
+
+
+class SchedulerFullError(SchedulerError):
+    """The run queue is at capacity (all devices busy)."""
+    pass
+
+
+class NoDeviceError(SchedulerError):
+    """No registered device can serve the job."""
+    pass
+
+
+@dataclass(frozen=True)
+class DeviceSpec:
+    """A device the scheduler can run explorations on."""
+    udid: str
+    platform: str
+    platform_version: str = ""
+    device_name: str = ""
+    appium_server_url: str = "http://localhost:4723"
+
+
+@dataclass
+class RunJob:
+    """
+    One exploration run. Mutated by the scheduler as it moves through
+    queued → running → succeeded/failed/cancelled.
+    """
+    run_id: str
+    app_id: str
+    platform: str
+    udid: Optional[str] = None  # pin to one device
+    payload: Dict[str, Any] = field(default_factory=dict)
+    status: str = JOB_QUEUED
+    device_udid: Optional[str] = None
+    error: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def can_run_on(self, device: DeviceSpec) -> bool:
+        if self.udid is not None:
+            return self.udid == device.udid
+        return self.platform == device.platform
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary (payload omitted)."""
+        data = asdict(self)
+        data.pop("payload")
+        return data
+
+
+JobRunner = Callable[[RunJob, DeviceSpec], Awaitable[Any]]
+
+
+@dataclass
+class _Lane:
+    device: DeviceSpec
+    task: Optional[asyncio.Task] = None
+    job: Optional[RunJob] = None
+    runs_completed: int = 0
+    runs_failed: int = 0
+    busy_s: float = 0.0
+    busy_since: Optional[float] = None
+    created_at: float = field(default_factory=time.monotonic)
+    retiring: bool = False
+
+    def utilization(self, now: float) -> float:
+        busy = self.busy_s + (now - self.busy_since if self.busy_since is not None else 0.0)
+        elapsed = now - self.created_at
+        return busy / elapsed if elapsed > 0 else 0.0
+
+
+class SessionScheduler:
+    """
+    Job queue, device registry and per-device worker lanes.
+
+    Must be used from one event loop; lanes are started on registration.
+    """
+
+    def __init__(
+        self,
+        runner: JobRunner,
+        max_queue_depth: int = DEFAULT_MAX_QUEUE_DEPTH,
+        retry_after_s: int = DEFAULT_RETRY_AFTER_S,
+    ):
+        self.runner = runner
+        self.max_queue_depth = max_queue_depth
+        self.retry_after_s = retry_after_s
+        self._lanes: Dict[str, _Lane] = {}
+        self._queues: "OrderedDict[str, Deque[RunJob]]" = OrderedDict()  # app_id → jobs, in rotation order
+        self._jobs: Dict[str, RunJob] = {}
+        self._finished: Deque[str] = deque()
+        self._queued = 0
+        self._wakeup: Optional[asyncio.Condition] = None
+        self._notifications: Set[asyncio.Task] = set()  # strong refs until they run
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Device registry
+    # ------------------------------------------------------------------
+
+    def register_device(self, device: DeviceSpec) -> None:
+        """Add a device (or update its spec) and start its lane."""
+        if self._closed:
+            raise RuntimeError("Scheduler is shut down")
+        lane = self._lanes.get(device.udid)
+        if lane is not None and not lane.retiring:
+            lane.device = device
+            self._fail_unservable()
+            return
+        lane = _Lane(device=device)
+        self._lanes[device.udid] = lane
+        lane.task = asyncio.get_running_loop().create_task(
+            self._lane_loop(lane), name=f"scheduler-lane-{device.udid}"
+        )
+
+    async def unregister_device(self, udid: str) -> bool:
+        """
+        Stop a device's lane after its current job; returns False if unknown.
+
+        Queued jobs that no remaining device can run (pinned to this UDID,
+        or of a platform no other device has) fail at once.
+        """
+        lane = self._lanes.get(udid)
+        if lane is None:
+            return False
+        lane.retiring = True
+        self._fail_unservable()
+        await self._notify()
+        if lane.task is not None:
+            await lane.task
+        if self._lanes.get(udid) is lane:
+            del self._lanes[udid]
+        return True
+
+    def devices(self) -> List[DeviceSpec]:
+        return [lane.device for lane in self._lanes.values() if not lane.retiring]
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+
+    def submit(self, job: RunJob) -> RunJob:
+        """
+        Enqueue a run.
+
+        Raises:
+            ValueError: run_id is already queued or running.
+            NoDeviceError: no registered device can serve the job.
+            SchedulerFullError: the queue is at max_queue_depth.
+        """
+        if self._closed:
+            raise NoDeviceError("Scheduler is shut down", self.retry_after_s)
+        existing = self._jobs.get(job.run_id)
+        if existing is not None and existing.status in (JOB_QUEUED, JOB_RUNNING):
+            raise ValueError(f"Run {job.run_id} is already {existing.status}")
+        if not any(job.can_run_on(device) for device in self.devices()):
+            raise NoDeviceError(
+                f"No registered device for platform={job.platform} udid={job.udid}",
+                self.retry_after_s,
+            )
+        if self._queued >= self.max_queue_depth:
+            raise SchedulerFullError(
+                f"Run queue full ({self._queued} queued)", self.retry_after_s
+            )
+
+        job.status = JOB_QUEUED
+        self._jobs[job.run_id] = job
+        self._queues.setdefault(job.app_id, deque()).append(job)
+        self._queued += 1
+        self._notify_nowait()
+        return job
+
+    def cancel(self, run_id: str) -> bool:
+        """Cancel a queued run (running runs are not interrupted)."""
+        job = self._jobs.get(run_id)
+        if job is None or job.status != JOB_QUEUED:
+            return False
+        queue = self._queues[job.app_id]
+        queue.remove(job)
+        if not queue:
+            del self._queues[job.app_id]
+        self._queued -= 1
+        self._finish(job, JOB_CANCELLED)
+        return True
+
+    def get_job(self, run_id: str) -> Optional[RunJob]:
+        return self._jobs.get(run_id)
+
+    def status(self) -> Dict[str, Any]:
+        """Queue depth and lane utilization snapshot."""
+        now = time.monotonic()
+        lanes = [
+            {
+                "udid": lane.device.udid,
+                "platform": lane.device.platform,
+                "busy": lane.job is not None,
+                "run_id": lane.job.run_id if lane.job is not None else None,
+                "runs_completed": lane.runs_completed,
+                "runs_failed": lane.runs_failed,
+                "utilization": round(lane.utilization(now), 4),
+            }
+            for lane in self._lanes.values()
+        ]
+        busy = sum(lane["busy"] for lane in lanes)
+        return {
+            "queue_depth": self._queued,
+            "queue_capacity": self.max_queue_depth,
+            "queued_by_app": {app_id: len(queue) for app_id, queue in self._queues.items()},
+            "devices_total": len(lanes),
+            "devices_busy": busy,
+            "utilization": round(busy / len(lanes), 4) if lanes else 0.0,
+            "lanes": lanes,
+        }
+
+    async def shutdown(self) -> None:
+        """Cancel queued runs, stop lanes and wait for running jobs to end."""
+        self._closed = True
+        for run_id in [job.run_id for queue in self._queues.values() for job in queue]:
+            self.cancel(run_id)
+        for lane in self._lanes.values():
+            lane.retiring = True
+        await self._notify()
+        tasks = [lane.task for lane in self._lanes.values() if lane.task is not None]
+        tasks.extend(self._notifications)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._lanes.clear()
+
+    # ------------------------------------------------------------------
+    # Lanes
+    # ------------------------------------------------------------------
+
+    def _take(self, device: DeviceSpec) -> Optional[RunJob]:
+        """Next job for a device: first eligible job of the first app in rotation."""
+        for app_id, queue in self._queues.items():
+            for job in queue:
+                if job.can_run_on(device):
+                    queue.remove(job)
+                    # Served app goes to the back of the rotation
+                    if queue:
+                        self._queues.move_to_end(app_id)
+                    else:
+                        del self._queues[app_id]
+                    self._queued -= 1
+                    return job
+        return None
+
+    async def _lane_loop(self, lane: _Lane) -> None:
+        condition = self._condition()
+        while True:
+            async with condition:
+                job = None
+                while not lane.retiring:
+                    job = self._take(lane.device)
+                    if job is not None:
+                        break
+                    await condition.wait()
+            if job is None:
+                return
+            await self._run_job(lane, job)
+
+    async def _run_job(self, lane: _Lane, job: RunJob) -> None:
+        lane.job = job
+        lane.busy_since = time.monotonic()
+        job.status = JOB_RUNNING
+        job.device_udid = lane.device.udid
+        job.started_at = time.time()
+        try:
+            await self.runner(job, lane.device)
+        except asyncio.CancelledError:
+            self._finish(job, JOB_CANCELLED)
+            raise
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            lane.runs_failed += 1
+            self._finish(job, JOB_FAILED)
+        else:
+            lane.runs_completed += 1
+            self._finish(job, JOB_SUCCEEDED)
+        finally:
+            lane.busy_s += time.monotonic() - lane.busy_since
+            lane.busy_since = None
+            lane.job = None
+
+    def _fail_unservable(self) -> None:
+        """Fail queued jobs that no registered device can run."""
+        devices = self.devices()
+        for app_id in list(self._queues):
+            queue = self._queues[app_id]
+            for job in [job for job in queue if not any(job.can_run_on(device) for device in devices)]:
+                queue.remove(job)
+                self._queued -= 1
+                job.error = f"NoDeviceError: no registered device for platform={job.platform} udid={job.udid}"
+                self._finish(job, JOB_FAILED)
+            if not queue:
+                del self._queues[app_id]
+
+    def _finish(self, job: RunJob, status: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+        self._finished.append(job.run_id)
+        while len(self._finished) > MAX_FINISHED_JOBS:
+            run_id = self._finished.popleft()
+            old = self._jobs.get(run_id)
+            if old is not None and old.status not in (JOB_QUEUED, JOB_RUNNING):
+                del self._jobs[run_id]
+
+    def _condition(self) -> asyncio.Condition:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Condition()
+        return self._wakeup
+
+    async def _notify(self) -> None:
+        condition = self._condition()
+        async with condition:
+            condition.notify_all()
+
+    def _notify_nowait(self) -> None:
+        """Wake lanes from synchronous code (submit)."""
+        # The loop only keeps weak references to tasks: hold it until it has run
+        task = asyncio.get_running_loop().create_task(self._notify())
+        self._notifications.add(task)
+        task.add_done_callback(self._notifications.discard)
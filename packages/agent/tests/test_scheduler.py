@@ -0,0 +1,210 @@
+"""Tests for the BFF session scheduler and its routes."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.bff.routes.scheduler import router
+from src.bff.scheduler import (
+    JOB_CANCELLED,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_SUCCEEDED,
+    DeviceSpec,
+    NoDeviceError,
+    RunJob,
+    SchedulerFullError,
+    SessionScheduler,
+)
+
+
+class GatedRunner:
+    """Job runner that records starts and blocks until released."""
+
+    def __init__(self):
+        self.started = []
+        self.release = asyncio.Event()
+
+    async def __call__(self, job, device):
+        self.started.append((job.run_id, device.udid))
+        await self.release.wait()
+        if job.payload.get("fail"):
+            raise RuntimeError("boom")
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_one_job_per_lane_and_status():
+    runner = GatedRunner()
+    scheduler = SessionScheduler(runner)
+    scheduler.register_device(DeviceSpec(udid="emu-1", platform="android"))
+    scheduler.register_device(DeviceSpec(udid="emu-2", platform="android"))
+    for i in range(3):
+        scheduler.submit(RunJob(run_id=f"run-{i}", app_id="com.a", platform="android"))
+    await _settle()
+
+    assert sorted(udid for _, udid in runner.started) == ["emu-1", "emu-2"]
+    status = scheduler.status()
+    assert status["queue_depth"] == 1
+    assert status["devices_busy"] == 2
+    assert status["utilization"] == 1.0
+
+    runner.release.set()
+    await _settle()
+    assert all(scheduler.get_job(f"run-{i}").status == JOB_SUCCEEDED for i in range(3))
+    assert scheduler.status()["queue_depth"] == 0
+    await scheduler.shutdown()
+
+
+async def test_fair_across_apps():
+    """A burst from one app does not starve another app's run."""
+    order = []
+
+    async def runner(job, device):
+        order.append(job.app_id)
+
+    scheduler = SessionScheduler(runner)
+    scheduler.register_device(DeviceSpec(udid="emu-1", platform="android"))
+    # Queue everything before the lane gets to run
+    for i in range(4):
+        scheduler.submit(RunJob(run_id=f"a-{i}", app_id="com.a", platform="android"))
+    scheduler.submit(RunJob(run_id="b-0", app_id="com.b", platform="android"))
+    await _settle()
+    await asyncio.sleep(0.01)
+
+    assert order[:2] == ["com.a", "com.b"]
+    assert len(order) == 5
+    await scheduler.shutdown()
+
+
+async def test_platform_and_pinning():
+    runner = GatedRunner()
+    scheduler = SessionScheduler(runner)
+    scheduler.register_device(DeviceSpec(udid="emu-1", platform="android"))
+    scheduler.register_device(DeviceSpec(udid="sim-1", platform="ios"))
+    scheduler.submit(RunJob(run_id="ios", app_id="app", platform="ios"))
+    scheduler.submit(RunJob(run_id="pinned", app_id="app", platform="android", udid="emu-1"))
+    await _settle()
+    assert sorted(runner.started) == [("ios", "sim-1"), ("pinned", "emu-1")]
+
+    with pytest.raises(NoDeviceError):
+        scheduler.submit(RunJob(run_id="x", app_id="app", platform="android", udid="emu-9"))
+    runner.release.set()
+    await scheduler.shutdown()
+
+
+async def test_backpressure_and_failures():
+    runner = GatedRunner()
+    scheduler = SessionScheduler(runner, max_queue_depth=1, retry_after_s=7)
+    with pytest.raises(NoDeviceError):
+        scheduler.submit(RunJob(run_id="early", app_id="app", platform="android"))
+
+    scheduler.register_device(DeviceSpec(udid="emu-1", platform="android"))
+    scheduler.submit(RunJob(run_id="r0", app_id="app", platform="android", payload={"fail": True}))
+    await _settle()
+    scheduler.submit(RunJob(run_id="r1", app_id="app", platform="android"))
+    with pytest.raises(SchedulerFullError) as excinfo:
+        scheduler.submit(RunJob(run_id="r2", app_id="app", platform="android"))
+    assert excinfo.value.retry_after_s == 7
+    with pytest.raises(ValueError):
+        scheduler.submit(RunJob(run_id="r1", app_id="app", platform="android"))
+
+    assert scheduler.cancel("r1")
+    assert scheduler.get_job("r1").status == JOB_CANCELLED
+    runner.release.set()
+    await _settle()
+    job = scheduler.get_job("r0")
+    assert job.status == JOB_FAILED
+    assert "boom" in job.error
+    assert scheduler.status()["lanes"][0]["runs_failed"] == 1
+    await scheduler.shutdown()
+
+
+async def test_unregister_waits_for_running_job():
+    runner = GatedRunner()
+    scheduler = SessionScheduler(runner)
+    scheduler.register_device(DeviceSpec(udid="emu-1", platform="android"))
+    scheduler.submit(RunJob(run_id="r0", app_id="app", platform="android"))
+    await _settle()
+
+    retire = asyncio.create_task(scheduler.unregister_device("emu-1"))
+    await _settle()
+    assert not retire.done()
+    runner.release.set()
+    assert await retire
+    assert scheduler.get_job("r0").status == JOB_SUCCEEDED
+    assert scheduler.devices() == []
+    await scheduler.shutdown()
+
+
+async def test_unregister_fails_jobs_no_device_can_run():
+    runner = GatedRunner()
+    scheduler = SessionScheduler(runner, max_queue_depth=3)
+    scheduler.register_device(DeviceSpec(udid="emu-1", platform="android"))
+    scheduler.register_device(DeviceSpec(udid="emu-2", platform="android"))
+    scheduler.register_device(DeviceSpec(udid="sim-1", platform="ios"))
+    scheduler.submit(RunJob(run_id="busy-1", app_id="app", platform="android", udid="emu-1"))
+    scheduler.submit(RunJob(run_id="busy-2", app_id="app", platform="android", udid="emu-2"))
+    scheduler.submit(RunJob(run_id="busy-3", app_id="app", platform="ios"))
+    await _settle()
+    scheduler.submit(RunJob(run_id="pinned", app_id="app", platform="android", udid="emu-1"))
+    scheduler.submit(RunJob(run_id="any-android", app_id="app", platform="android"))
+    scheduler.submit(RunJob(run_id="ios", app_id="app", platform="ios"))
+
+    retire_emu = asyncio.create_task(scheduler.unregister_device("emu-1"))
+    retire_sim = asyncio.create_task(scheduler.unregister_device("sim-1"))
+    await _settle()
+    for run_id in ("pinned", "ios"):
+        job = scheduler.get_job(run_id)
+        assert job.status == JOB_FAILED and "NoDeviceError" in job.error
+    # Still servable by emu-2, and the freed capacity takes new runs
+    assert scheduler.get_job("any-android").status == JOB_QUEUED
+    assert scheduler.status()["queue_depth"] == 1
+    scheduler.submit(RunJob(run_id="next", app_id="app", platform="android"))
+
+    runner.release.set()
+    assert await retire_emu and await retire_sim
+    await _settle()
+    assert scheduler.get_job("any-android").status == JOB_SUCCEEDED
+    assert scheduler.get_job("next").status == JOB_SUCCEEDED
+    await scheduler.shutdown()
+
+
+async def test_submit_wakeups_are_kept_until_they_run():
+    runner = GatedRunner()
+    scheduler = SessionScheduler(runner)
+    scheduler.register_device(DeviceSpec(udid="emu-1", platform="android"))
+    scheduler.submit(RunJob(run_id="r0", app_id="app", platform="android"))
+    assert len(scheduler._notifications) == 1
+    await _settle()
+    assert not scheduler._notifications
+    assert runner.started == [("r0", "emu-1")]
+    runner.release.set()
+    await scheduler.shutdown()
+
+
+def test_scheduler_routes() -> None:
+    app = FastAPI()
+    app.include_router(router)
+
+    async def runner(job, device):
+        pass
+
+    with TestClient(app) as client:
+        app.state.scheduler = SessionScheduler(runner)
+        response = client.post("/scheduler/devices", json={"udid": "emu-1", "platform": "android"})
+        assert response.status_code == 200
+
+        status = client.get("/scheduler/status").json()
+        assert [lane["udid"] for lane in status["lanes"]] == ["emu-1"]
+        assert status["queue_depth"] == 0
+
+        assert client.get("/scheduler/runs/missing").status_code == 404
+        assert client.delete("/scheduler/runs/missing").status_code == 409
+        assert client.delete("/scheduler/devices/emu-1").status_code == 200
+        assert client.delete("/scheduler/devices/emu-1").status_code == 404